@@ -33,6 +33,63 @@ CLOUD_LOGGING_ENABLED=bool(
 
 BQ_REGION= os.getenv("BQ_REGION", "US")
 
+# Maximum number of values firestore accepts in a single "in" query
+FIRESTORE_IN_QUERY_LIMIT = 30
+# Maximum number of writes firestore accepts in a single batch
+FIRESTORE_BATCH_WRITE_LIMIT = 500
+# Maximum number of "in" query chunks fetched concurrently by bulk lookups
+BULK_FETCH_MAX_WORKERS = int(os.getenv("BULK_FETCH_MAX_WORKERS", "8"))
+# Threads of the process wide pool used to read the levels of a hierarchy
+HIERARCHY_MAX_WORKERS = int(os.getenv("HIERARCHY_MAX_WORKERS", "16"))
+# Nodes read by a single get_all call when reading a hierarchy level
+HIERARCHY_FETCH_CHUNK_SIZE = int(
+  os.getenv("HIERARCHY_FETCH_CHUNK_SIZE", "100"))
+# Documents the facet counts of all the submitted assessments are spread
+# over, each firestore document sustaining about one write per second
+SUBMITTED_ASSESSMENT_FACET_SHARDS = int(
+  os.getenv("SUBMITTED_ASSESSMENT_FACET_SHARDS", "10"))
+# Seconds a total_count is reused for the same filters, 0 disables caching
+TOTAL_COUNT_CACHE_TTL = int(os.getenv("TOTAL_COUNT_CACHE_TTL", "0"))
+# Same for the list endpoints whose total_count used to be a fixed
+# placeholder, counted by streaming the key of every matching document
+LIST_TOTAL_COUNT_CACHE_TTL = int(
+  os.getenv("LIST_TOTAL_COUNT_CACHE_TTL", "60"))
+
+REDIS_HOST = os.getenv("REDIS_HOST", "redis-master")
+REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
+# Size of the connection pools of the sync and asyncio redis clients
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+# Prefix added to every cache key, shared by the sync and asyncio clients
+CACHE_KEY_PREFIX = os.getenv("CACHE_KEY_PREFIX", "")
+
+# In-process cache kept in front of redis by the layered cache_service API
+CACHE_LOCAL_MAX_ENTRIES = int(os.getenv("CACHE_LOCAL_MAX_ENTRIES", "1024"))
+# Seconds a value is served from the process before redis is asked again
+CACHE_LOCAL_TTL = int(os.getenv("CACHE_LOCAL_TTL", "30"))
+# Fraction by which redis expiry times are randomly shortened
+CACHE_TTL_JITTER = float(os.getenv("CACHE_TTL_JITTER", "0.1"))
+# Seconds a cache tag keeps the keys tagged with it after its last write
+CACHE_TAG_TTL = int(os.getenv("CACHE_TAG_TTL", str(7 * 24 * 3600)))
+
+# Serve fetch_tree reads of curriculum pathways from materialized snapshots
+TREE_SNAPSHOTS_ENABLED = bool(
+  os.getenv("TREE_SNAPSHOTS_ENABLED", "true").lower() in ("true",))
+# Seconds after which a snapshot is rebuilt even without a tracked change
+TREE_SNAPSHOT_MAX_AGE = int(os.getenv("TREE_SNAPSHOT_MAX_AGE", "86400"))
+# Snapshots whose compressed nodes and node keys exceed this many bytes are
+# not stored, firestore documents are limited to 1 MiB
+TREE_SNAPSHOT_MAX_SIZE = int(os.getenv("TREE_SNAPSHOT_MAX_SIZE", "1000000"))
+
+# Size of the chunks of the resumable uploads to GCS, a multiple of 256 KiB
+GCS_UPLOAD_CHUNK_SIZE = int(
+  os.getenv("GCS_UPLOAD_CHUNK_SIZE", str(8 * 1024 * 1024)))
+# Files transferred concurrently by the uploads and downloads of folders
+GCS_TRANSFER_MAX_WORKERS = int(os.getenv("GCS_TRANSFER_MAX_WORKERS", "8"))
+# Retries of a file transfer failing with a transient error, the delay
+# before the first retry in seconds being doubled on every retry
+GCS_TRANSFER_MAX_RETRIES = int(os.getenv("GCS_TRANSFER_MAX_RETRIES", "3"))
+GCS_TRANSFER_RETRY_DELAY = float(os.getenv("GCS_TRANSFER_RETRY_DELAY", "1"))
+
 SERVICES = {
   "user-management": {
     "host": "user-management",
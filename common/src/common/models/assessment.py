@@ -2,7 +2,7 @@
 
 from common.models import NodeItem, BaseModel
 from common.utils.errors import ResourceNotFoundException
-from fireo.fields import TextField, ListField, MapField, NumberField, BooleanField, DateTime
+from fireo.fields import TextField, ListField, MapField, NumberField, BooleanField, DateTime, IDField
 
 
 ASSESSMENT_LITERALS = {
@@ -172,6 +172,9 @@ class Assessment(NodeItem):
   # hierarchy
   prerequisites = MapField()
   parent_nodes = MapField()
+  # uuid, alias and collection type of the ancestors reached through the
+  # first parent, nearest first, None until they are stored
+  ancestors = ListField(default=None)
   child_nodes = MapField()
   # meta fields
   order = NumberField()
@@ -237,6 +240,17 @@ class SubmittedAssessment(NodeItem):
   metadata = MapField(default={})
   submitted_rubrics = ListField()
   overall_feedback = TextField()
+  # search fields denormalized from the learning hierarchy and the users so
+  # that the submissions are filtered and sorted by firestore queries, None
+  # until they are stored
+  assessment_name = TextField(default=None)
+  assessment_search_tokens = ListField(default=None)
+  unit_id = TextField(default=None)
+  unit_name = TextField(default=None)
+  discipline_id = TextField(default=None)
+  discipline_name = TextField(default=None)
+  instructor_id = TextField(default=None)
+  learner_name = TextField(default=None)
 
   class Meta:
     collection_name = BaseModel.DATABASE_PREFIX + "submitted_assessments"
@@ -261,3 +275,23 @@ class SubmittedAssessment(NodeItem):
     """
     return SubmittedAssessment.collection.filter("name", "==", name).filter(
         "is_deleted", "==", is_deleted).fetch()
+
+
+class SubmittedAssessmentFacet(BaseModel):
+  """Number of submitted assessments having each value of the filters of the
+  grading queue, for all the submissions or for those of one assessor. The
+  id of the document is the scope of the counts, see
+  SubmittedAssessmentFacetHandler"""
+  id = IDField()
+  # "<autogradable|human_graded>_<status>" to facet name to value to count
+  counts = MapField(default={})
+
+  class Meta:
+    collection_name = BaseModel.DATABASE_PREFIX + \
+      "submitted_assessment_facets"
+    ignore_none_field = False
+
+  @classmethod
+  def find_by_scope(cls, scope):
+    """Returns the facet counts of a scope or None if there are none"""
+    return cls.collection.get(f"{cls.collection_name}/{scope}")
@@ -16,10 +16,12 @@ FireO BaseModel to be inherited by all other objects in ORM
 """
 
 import datetime
+from concurrent.futures import ThreadPoolExecutor
 import fireo
 from fireo.models import Model
 from fireo.fields import DateTime, TextField
 from common.utils.errors import ResourceNotFoundException
+from common.utils.pagination import fetch_page
 import common.config
 
 
@@ -122,6 +124,119 @@ class BaseModel(Model):
           f"{cls.collection_name} with id {object_id} is not found")
     return obj
 
+  @classmethod
+  def find_by_ids(cls, object_ids):
+    """Looks up in the Database and returns the objects of this type for all
+       the given ids (not keys)
+
+        Args:
+            object_ids (list): the document ids without collection_name
+        Returns:
+            tuple: list of the objects found, in the order of object_ids,
+            and list of the ids that were not found
+        """
+    return cls.find_by_field_values("id", object_ids,
+                                    [("deleted_at_timestamp", "==", None)])
+
+  @classmethod
+  def find_by_uuids(cls, uuids, is_deleted=False):
+    """Looks up in the Database and returns the objects of this type for all
+       the given uuids
+
+        Args:
+            uuids (list): uuids of the objects
+            is_deleted (bool): soft delete flag to filter on, only applied
+            to the models having an is_deleted field
+        Returns:
+            tuple: list of the objects found, in the order of uuids,
+            and list of the uuids that were not found
+        """
+    filters = []
+    if "is_deleted" in cls._meta.field_list:
+      filters.append(("is_deleted", "==", is_deleted))
+    return cls.find_by_field_values("uuid", uuids, filters)
+
+  @classmethod
+  def find_by_field_values(cls, field_name, values, filters=None):
+    """Fetches the objects whose field matches any of the given values.
+       The values are split in chunks that fit a firestore "in" query and
+       the chunks are fetched concurrently
+
+        Args:
+            field_name (str): name of the field to match
+            values (list): values of the field to look up
+            filters (list): additional (field, operator, value) filters
+        Returns:
+            tuple: list of the objects found, in the order of values,
+            and list of the values that were not found
+        """
+    objects_by_value = {}
+    for objects in cls.map_field_value_chunks(
+        field_name, values, lambda query: list(query.fetch()), filters):
+      for obj in objects:
+        objects_by_value.setdefault(getattr(obj, field_name), obj)
+
+    found_objects = []
+    missing_values = []
+    for value in values:
+      if value in objects_by_value:
+        found_objects.append(objects_by_value[value])
+      else:
+        missing_values.append(value)
+    return found_objects, missing_values
+
+  @classmethod
+  def find_all_by_field_values(cls, field_name, values, filters=None):
+    """Fetches all the objects whose field matches any of the given values,
+       with one concurrent "in" query per chunk of values
+
+        Args:
+            field_name (str): name of the field to match
+            values (list): values of the field to look up
+            filters (list): additional (field, operator, value) filters
+        Returns:
+            list: objects found, grouped by chunk of values
+        """
+    return [
+        obj for objects in cls.map_field_value_chunks(
+            field_name, values, lambda query: list(query.fetch()), filters)
+        for obj in objects
+    ]
+
+  @classmethod
+  def map_field_value_chunks(cls, field_name, values, fetch_chunk,
+                             filters=None):
+    """Splits the values in chunks that fit a firestore "in" query and runs
+       fetch_chunk on the query of each chunk concurrently
+
+        Args:
+            field_name (str): name of the field to match
+            values (list): values of the field to look up
+            fetch_chunk (function): returns the result of a chunk from its
+            query
+            filters (list): additional (field, operator, value) filters
+        Returns:
+            list: results of fetch_chunk, in the order of the chunks
+        """
+    unique_values = list(dict.fromkeys(values))
+    chunk_size = common.config.FIRESTORE_IN_QUERY_LIMIT
+    chunks = [
+        unique_values[index:index + chunk_size]
+        for index in range(0, len(unique_values), chunk_size)
+    ]
+    if not chunks:
+      return []
+
+    def run_chunk(chunk):
+      query = cls.collection.filter(field_name, "in", chunk)
+      for each_filter in filters or []:
+        query = query.filter(*each_filter)
+      return fetch_chunk(query)
+
+    max_workers = min(len(chunks), common.config.BULK_FETCH_MAX_WORKERS)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+      return list(executor.map(run_chunk, chunks))
+
   @classmethod
   def delete_by_id(cls, doc_id):
     """Deletes from the Database the object of this type by id (not key)
@@ -189,6 +304,24 @@ class BaseModel(Model):
         None).order(order_by).offset(skip).fetch(limit)
     return list(objects)
 
+  @classmethod
+  def fetch_all_by_page(cls, page_token=None, limit=1000,
+                        order_by="-created_time"):
+    """ fetch a page of documents, continuing after the page of page_token
+
+    Args:
+        page_token (str, optional): next_page_token of the previous page.
+          Defaults to None, which fetches the first page.
+        limit (int, optional): _description_. Defaults to 1000.
+        order_by (str, optional): _description_. Defaults to "-created_time".
+
+    Returns:
+        tuple: list of objects and the token of the next page
+    """
+    return fetch_page(
+        cls.collection.filter("deleted_at_timestamp", "==", None), limit,
+        order_by, page_token)
+
   @classmethod
   def fetch_all_documents(cls, limit=1000):
     """Fetches all documents of the collection in batches
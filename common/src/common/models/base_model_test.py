@@ -0,0 +1,57 @@
+# Copyright 2023 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Unit test for the bulk lookups of base_model.py
+"""
+# disabling these rules, as they cause issues with pytest fixtures
+# pylint: disable=unused-import
+# pylint: disable=unused-argument,redefined-outer-name
+from common.models import CourseTemplate, LearningObject
+from common.config import FIRESTORE_IN_QUERY_LIMIT
+from common.testing.example_objects import (TEST_COURSE_TEMPLATE,
+                                            CHILD_LEARNING_OBJECTS)
+from common.testing.firestore_emulator import clean_firestore, firestore_emulator
+
+
+def test_find_by_ids(clean_firestore):
+  '''test for bulk lookup by id keeping the input order'''
+  ids = []
+  for _ in range(FIRESTORE_IN_QUERY_LIMIT + 3):
+    course_template = CourseTemplate.from_dict(TEST_COURSE_TEMPLATE)
+    course_template.save()
+    ids.append(course_template.id)
+  CourseTemplate.soft_delete_by_id(ids[0])
+  ids.reverse()
+
+  course_templates, missing_ids = CourseTemplate.find_by_ids(
+      ids + ["missing_id"])
+  assert [i.id for i in course_templates] == ids[:-1]
+  assert missing_ids == [ids[-1], "missing_id"]
+
+
+def test_find_by_uuids(clean_firestore):
+  '''test for bulk lookup by uuid filtering soft deleted objects'''
+  uuids = []
+  for _ in range(FIRESTORE_IN_QUERY_LIMIT + 3):
+    learning_object = LearningObject.from_dict(CHILD_LEARNING_OBJECTS[0])
+    learning_object.is_deleted = False
+    learning_object.save()
+    learning_object.uuid = learning_object.id
+    learning_object.update()
+    uuids.append(learning_object.id)
+  LearningObject.delete_by_uuid(uuids[-1])
+
+  learning_objects, missing_uuids = LearningObject.find_by_uuids(uuids)
+  assert [i.uuid for i in learning_objects] == uuids[:-1]
+  assert missing_uuids == [uuids[-1]]
@@ -81,6 +81,11 @@ class CurriculumPathway(NodeItem):
   prerequisites = MapField(default={})
   child_nodes = MapField(default={})
   parent_nodes = MapField(default={})
+  # uuid, alias and collection type of the ancestors reached through the
+  # first parent, nearest first, None until they are stored
+  ancestors = ListField(default=None)
+  # uuids of the assessments below the node, None until they are indexed
+  assessment_ids = ListField(default=None)
   # meta fields
   order = NumberField()
   alias = TextField(default="unit", validator=check_alias("CP"))
@@ -151,6 +156,11 @@ class LearningExperience(NodeItem):
   prerequisites = MapField(default={})
   child_nodes = MapField(default={})
   parent_nodes = MapField(default={})
+  # uuid, alias and collection type of the ancestors reached through the
+  # first parent, nearest first, None until they are stored
+  ancestors = ListField(default=None)
+  # uuids of the assessments below the node, None until they are indexed
+  assessment_ids = ListField(default=None)
   # meta fields
   order = NumberField()
   alias = TextField(default="learning_experience", validator=check_alias("LE"))
@@ -204,6 +214,11 @@ class LearningObject(NodeItem):
   prerequisites = MapField(default={})
   child_nodes = MapField(default={})
   parent_nodes = MapField(default={})
+  # uuid, alias and collection type of the ancestors reached through the
+  # first parent, nearest first, None until they are stored
+  ancestors = ListField(default=None)
+  # uuids of the assessments below the node, None until they are indexed
+  assessment_ids = ListField(default=None)
   # meta fields
   order = NumberField()
   alias = TextField(default="module", validator=check_alias("LO"))
@@ -213,6 +228,9 @@ class LearningObject(NodeItem):
   is_hidden = BooleanField(default=False)
   is_archived = BooleanField(default=False)
   is_deleted = BooleanField(default=False)
+  # uuid of the cognitive wrapper module gating a project module, "" if its
+  # learning experience has none and None until it is indexed
+  cognitive_wrapper_uuid = TextField(default=None)
 
   class Meta:
     collection_name = BaseModel.DATABASE_PREFIX + "learning_objects"
@@ -269,6 +287,9 @@ class LearningResource(NodeItem):
   references = MapField(default={})
   # hierarchy
   parent_nodes = MapField(default={})
+  # uuid, alias and collection type of the ancestors reached through the
+  # first parent, nearest first, None until they are stored
+  ancestors = ListField(default=None)
   child_nodes = MapField(default={})
   prerequisites = MapField(default={})
   # meta fields
@@ -45,6 +45,20 @@ class NodeItem(BaseModel):
 
     return child
 
+  def get_ancestor(self, alias):
+    """Returns the nearest stored ancestor with the given alias without
+    reading any node
+    Args:
+      alias: str - alias of the ancestor, e.g. discipline
+    Returns:
+      dict - uuid, alias and collection_type of the ancestor, None if there
+        is no such ancestor or the ancestors of the node are not stored
+    """
+    for ancestor in getattr(self, "ancestors", None) or []:
+      if ancestor.get("alias") == alias:
+        return ancestor
+    return None
+
   # TODO: make transactional?
   def load_tree(self):
     """ loads entire tree """
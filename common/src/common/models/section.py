@@ -16,6 +16,7 @@ Module to add section in Fireo
 """
 from fireo.fields import TextField, ReferenceField, IDField, NumberField
 from common.models import BaseModel, CourseTemplate, Cohort
+from common.utils.errors import ResourceNotFoundException
 
 
 def check_section_status(field_val):
@@ -81,6 +82,23 @@ class Section(BaseModel):
         None).order(order_by).offset(skip).fetch(limit)
     return list(objects)
 
+  @classmethod
+  def find_by_classroom_id(cls, classroom_id):
+    """Find the section using the classroom course id
+
+    Args:
+        classroom_id (str): google classroom course id of the section
+
+    Returns:
+        Section: Section Object
+    """
+    section = cls.collection.filter("classroom_id", "==", classroom_id).filter(
+        "deleted_at_timestamp", "==", None).get()
+    if section is None:
+      raise ResourceNotFoundException(
+          f"{cls.__name__} with classroom_id {classroom_id} not found")
+    return section
+
   @classmethod
   def get_section_by_status(cls,
                           status,
@@ -0,0 +1,79 @@
+# Copyright 2022 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Module to add materialized learning hierarchy snapshots in Fireo
+"""
+import base64
+import json
+import zlib
+from fireo.fields import TextField, IDField, NumberField, ListField
+from common.models import BaseModel
+
+
+def get_node_key(collection_type, uuid):
+  """Returns the key of a node in a snapshot e.g. learning_objects/{uuid}"""
+  return f"{collection_type}/{uuid}"
+
+
+class TreeSnapshot(BaseModel):
+  """Fields of every node of the learning hierarchy below a root node,
+  stored in a single compressed document whose id is the uuid of the root
+  """
+  id = IDField()
+  root_type = TextField(required=True)
+  version = NumberField(default=0)
+  node_keys = ListField(default=[])
+  nodes = TextField(default="")
+
+  class Meta:
+    ignore_none_field = False
+    collection_name = BaseModel.DATABASE_PREFIX + "tree_snapshots"
+
+  @classmethod
+  def find_by_root(cls, uuid):
+    """Returns the snapshot of a root node or None if there is none"""
+    return cls.collection.get(f"{cls.collection_name}/{uuid}")
+
+  @classmethod
+  def find_by_node_keys(cls, node_keys):
+    """Returns the snapshots containing any of the given node keys"""
+    snapshots = {}
+    # array-contains-any accepts up to 10 values
+    for index in range(0, len(node_keys), 10):
+      for snapshot in cls.collection.filter(
+          "node_keys", "array_contains_any",
+          node_keys[index:index + 10]).fetch():
+        snapshots[snapshot.id] = snapshot
+    return list(snapshots.values())
+
+  def get_nodes(self):
+    """Returns the node fields by node key"""
+    if not self.nodes:
+      return {}
+    return json.loads(zlib.decompress(base64.b64decode(self.nodes)))
+
+  def get_size(self):
+    """Returns an estimate of the stored size of the document in bytes: the
+    node keys are stored uncompressed and indexed along with the compressed
+    nodes"""
+    return len(self.nodes or "") + 1 + sum(
+        len(node_key.encode("utf-8")) + 1 for node_key in self.node_keys or [])
+
+  def set_nodes(self, nodes):
+    """Stores the node fields by node key and bumps the version"""
+    self.nodes = base64.b64encode(
+        zlib.compress(json.dumps(nodes, default=str).encode("utf-8"))).decode(
+            "utf-8")
+    self.node_keys = list(nodes)
+    self.version = (self.version or 0) + 1
@@ -16,8 +16,9 @@
 import regex
 from common.models import BaseModel, NodeItem, LearningUnit
 from common.utils.errors import ResourceNotFoundException
+from common.utils.search_tokens import get_prefix_tokens
 from fireo.fields import (ReferenceField, TextField, NumberField, MapField,
-                          ListField, BooleanField)
+                          ListField, BooleanField, IDField)
 
 USER_TYPES = ["learner", "faculty", "assessor", "admin", "coach", "instructor",
               "lxe", "curriculum_designer","robot"]
@@ -71,11 +72,44 @@ class User(BaseModel):
   photo_url = TextField()
   inspace_user = MapField(default={})
   is_deleted = BooleanField(default=False)
+  # prefix tokens of the email and the names, kept up to date on save and
+  # update so that the users are searched with an array_contains query
+  search_tokens = ListField(default=None)
 
   class Meta:
     collection_name = BaseModel.DATABASE_PREFIX + "users"
     ignore_none_field = False
 
+  def get_search_tokens(self):
+    """Returns the prefix tokens the user is searched by, None when the
+    email or the names are not loaded on the object"""
+    if None in (self.email, self.first_name, self.last_name):
+      return None
+    return get_prefix_tokens(self.email,
+                             f"{self.first_name} {self.last_name}",
+                             self.last_name)
+
+  def save(self,
+           input_datetime=None,
+           transaction=None,
+           batch=None,
+           merge=None,
+           no_return=False):
+    """overrides the default method to store the search tokens"""
+    self.search_tokens = self.get_search_tokens()
+    return super().save(input_datetime, transaction, batch, merge, no_return)
+
+  def update(self,
+             input_datetime=None,
+             key=None,
+             transaction=None,
+             batch=None):
+    """overrides the default method to refresh the search tokens"""
+    search_tokens = self.get_search_tokens()
+    if search_tokens is not None:
+      self.search_tokens = search_tokens
+    return super().update(input_datetime, key, transaction, batch)
+
   @classmethod
   def find_by_user_id(cls, user_id, is_deleted=False):
     """Find the user using user_id
@@ -91,6 +125,22 @@ class User(BaseModel):
           f"{cls.__name__} with user_id {user_id} not found")
     return user
 
+  @classmethod
+  def find_by_user_ids(cls, user_ids, is_deleted=False):
+    """Find the users using a list of user_ids
+    Args:
+        user_ids (list): user_ids of users
+    Returns:
+        tuple: list of user Objects in the order of user_ids and list of
+        user_ids that were not found
+    """
+    return cls.find_by_field_values("user_id", user_ids,
+                                    [("is_deleted", "==", is_deleted)])
+
+  @classmethod
+  def find_by_uuids(cls, uuids, is_deleted=False):
+    return cls.find_by_user_ids(uuids, is_deleted)
+
   @classmethod
   def find_by_uuid(cls, user_id, is_deleted=False):
     """Find the user using user_id
@@ -467,3 +517,15 @@ class AssociationGroup(BaseModel):
     """
     return cls.collection.filter("associations.users",
                                  "array_contains", id_).get()
+
+
+class LearnerMembership(BaseModel):
+  """Learner association group a learner belongs to. The id of the document
+  is the user_id of the learner, see LearnerMembershipHandler"""
+  id = IDField()
+  association_group_id = TextField(required=True)
+
+  class Meta:
+    collection_name = BaseModel.DATABASE_PREFIX + "learner_memberships"
+    ignore_none_field = False
+
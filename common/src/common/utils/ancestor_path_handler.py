@@ -0,0 +1,197 @@
+"""Materialized path of the ancestors of the nodes of the learning hierarchy"""
+from common.models.tree_snapshot import get_node_key
+from common.utils.collection_references import (LOS_COLLECTIONS,
+                                                collection_references)
+from common.utils.errors import ResourceNotFoundException
+from common.utils.logging_handler import Logger
+from common.utils.node_loader import NodeLoader
+
+
+class AncestorPathHandler():
+  """Keeps the chain of ancestors of every node of the learning hierarchy in
+  its ancestors field, nearest first.
+
+  Each level of the chain is the first parent of the level below it, the
+  same parent traverse_up climbs to, so any ancestor of a node can be looked
+  up with NodeItem.get_ancestor without reading the levels in between. The
+  chain of a node is derived from the chain of its first parent and is
+  propagated to its descendants whenever its parents or alias change.
+  """
+
+  @classmethod
+  def get_entry(cls, collection_type, fields):
+    """Returns the level of a chain describing the given node"""
+    return {
+        "uuid": fields["uuid"],
+        "alias": fields.get("alias"),
+        "collection_type": collection_type
+    }
+
+  @classmethod
+  def get_first_parent(cls, fields):
+    """Returns the collection type and uuid of the first parent of a node,
+    (None, None) for a root node"""
+    for parent_type, parent_uuids in (fields.get("parent_nodes") or
+                                      {}).items():
+      for parent_uuid in parent_uuids:
+        return parent_type, parent_uuid
+    return None, None
+
+  @classmethod
+  def get_path(cls, collection_type, fields):
+    """Returns the chain of ancestors of the children of a node whose chain
+    is stored in its fields"""
+    return [cls.get_entry(collection_type, fields)] + (
+        fields.get("ancestors") or [])
+
+  @classmethod
+  def get_ancestors(cls, collection_type, fields, loader, chains=None):
+    """Computes the chain of ancestors of a node from its parents
+    Args:
+      collection_type: str - collection type of the node
+      fields: dict - fields of the node
+      loader: NodeLoader - used to read the parents
+      chains: dict - node key to the chain of the children of the nodes
+        already computed, see get_path. When given, the chains stored in the
+        parents are recomputed instead of being trusted
+    Returns:
+      list - uuid, alias and collection_type of each ancestor, nearest first
+    """
+    levels = []
+    keys = []
+    tail = []
+    visited = {get_node_key(collection_type, fields["uuid"])}
+    node_fields = fields
+    while True:
+      parent_type, parent_uuid = cls.get_first_parent(node_fields)
+      if parent_type not in LOS_COLLECTIONS:
+        break
+      parent_key = get_node_key(parent_type, parent_uuid)
+      if chains is not None and parent_key in chains:
+        tail = chains[parent_key]
+        break
+      if parent_key in visited:
+        Logger.warning(f"Cycle in the parent nodes of {parent_key}")
+        break
+      visited.add(parent_key)
+      try:
+        parent = loader.load(parent_type, parent_uuid)
+      except ResourceNotFoundException as e:
+        Logger.warning(f"Missing parent node {parent_key}: {e}")
+        break
+      levels.append(cls.get_entry(parent_type, parent))
+      keys.append(parent_key)
+      if chains is None and parent.get("ancestors") is not None:
+        tail = parent["ancestors"]
+        break
+      node_fields = parent
+
+    ancestors = levels + tail
+    if chains is not None:
+      for index, key in enumerate(keys):
+        chains[key] = ancestors[index:]
+      chains[get_node_key(collection_type, fields["uuid"])] = [
+          cls.get_entry(collection_type, fields)
+      ] + ancestors
+    return ancestors
+
+  @classmethod
+  def update(cls, collection_type, fields, loader=None):
+    """Stores the chain of a node whose parents or alias may have changed
+    and propagates it to its descendants
+    Args:
+      collection_type: str - collection type of the node
+      fields: dict - current fields of the node
+      loader: NodeLoader - optionally primed with the parents of the node
+    Returns:
+      list - node keys of the nodes whose chain was updated
+    """
+    if collection_type not in LOS_COLLECTIONS:
+      return []
+    loader = loader or NodeLoader()
+    ancestors = cls.get_ancestors(collection_type, fields, loader)
+    updated_keys = []
+    if fields.get("ancestors") != ancestors:
+      node = collection_references[collection_type].find_by_uuid(
+          fields["uuid"])
+      node.ancestors = ancestors
+      node.update()
+      updated_keys.append(get_node_key(collection_type, fields["uuid"]))
+    updated_keys.extend(
+        cls.update_descendants(collection_type, {
+            **fields, "ancestors": ancestors
+        }))
+    return updated_keys
+
+  @classmethod
+  def update_nodes(cls, collection_type, uuids):
+    """Recomputes the chains of the given nodes, e.g. after a parent was
+    removed from them, and propagates them to their descendants"""
+    if collection_type not in LOS_COLLECTIONS or not uuids:
+      return []
+    loader = NodeLoader()
+    nodes, _ = collection_references[collection_type].find_by_uuids(uuids)
+    updated_keys = []
+    for node in nodes:
+      updated_keys.extend(
+          cls.update(collection_type, node.get_fields(reformat_datetime=True),
+                     loader))
+    return updated_keys
+
+  @classmethod
+  def update_descendants(cls, collection_type, fields):
+    """Propagates the chain of a node to the descendants reached through
+    their first parent, reading each level of children once and stopping
+    wherever the stored chain is already up to date"""
+    updated_keys = []
+    visited = {get_node_key(collection_type, fields["uuid"])}
+    current_level = [(collection_type, fields)]
+    while current_level:
+      next_level = []
+      for parent_type, parent_fields in current_level:
+        path = cls.get_path(parent_type, parent_fields)
+        for child_type, child_uuids in (parent_fields.get("child_nodes") or
+                                        {}).items():
+          if child_type not in LOS_COLLECTIONS or not child_uuids:
+            continue
+          children, _ = collection_references[child_type].find_by_uuids(
+              child_uuids)
+          for child in children:
+            child_key = get_node_key(child_type, child.uuid)
+            child_fields = child.get_fields(reformat_datetime=True)
+            if child_key in visited or cls.get_first_parent(child_fields) != (
+                parent_type, parent_fields["uuid"]):
+              continue
+            visited.add(child_key)
+            if child.ancestors == path:
+              continue
+            child.ancestors = path
+            child.update()
+            updated_keys.append(child_key)
+            next_level.append((child_type, {**child_fields, "ancestors": path}))
+      current_level = next_level
+    return updated_keys
+
+  @classmethod
+  def backfill(cls):
+    """Recomputes and stores the chain of every node of the learning
+    hierarchy, used to index the nodes created before the chains existed
+    Returns:
+      int - number of nodes whose chain was updated
+    """
+    loader = NodeLoader()
+    chains = {}
+    updated_count = 0
+    for collection_type in LOS_COLLECTIONS:
+      collection = collection_references[collection_type]
+      nodes = collection.collection.filter("is_deleted", "==", False).fetch()
+      for node in nodes:
+        fields = node.get_fields(reformat_datetime=True)
+        ancestors = cls.get_ancestors(collection_type, fields, loader, chains)
+        if node.ancestors != ancestors:
+          node.ancestors = ancestors
+          node.update()
+          updated_count += 1
+      Logger.info(f"Backfilled the ancestors of the {collection_type}, "
+                  f"{updated_count} nodes updated so far")
+    return updated_count
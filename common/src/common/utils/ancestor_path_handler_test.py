@@ -0,0 +1,169 @@
+"""Unit test cases for the materialized ancestor paths"""
+from common.models import (CurriculumPathway, LearningExperience,
+                           LearningObject)
+# disabling pylint rules that conflict with pytest fixtures
+# pylint: disable=unused-argument,redefined-outer-name,unused-import
+from common.testing.firestore_emulator import (clean_firestore,
+                                               firestore_emulator)
+from common.utils.ancestor_path_handler import AncestorPathHandler
+from common.utils.node_loader import NodeLoader
+from common.utils.parent_child_nodes_handler import ParentChildNodesHandler
+
+DISCIPLINE = {
+    "uuid": "discipline",
+    "alias": "discipline",
+    "parent_nodes": {}
+}
+UNIT = {
+    "uuid": "unit",
+    "alias": "unit",
+    "parent_nodes": {"curriculum_pathways": ["discipline"]}
+}
+LEARNING_EXPERIENCE = {
+    "uuid": "le",
+    "alias": "learning_experience",
+    "parent_nodes": {"curriculum_pathways": ["unit", "other_unit"]}
+}
+MODULE = {
+    "uuid": "module",
+    "alias": "module",
+    "parent_nodes": {"learning_experiences": ["le"]}
+}
+
+
+def get_loader():
+  loader = NodeLoader()
+  loader.prime("curriculum_pathways", DISCIPLINE)
+  loader.prime("curriculum_pathways", UNIT)
+  loader.prime("learning_experiences", LEARNING_EXPERIENCE)
+  return loader
+
+
+def test_get_ancestors():
+  ancestors = AncestorPathHandler.get_ancestors("learning_objects", MODULE,
+                                                get_loader())
+  assert [ancestor["uuid"] for ancestor in ancestors] == [
+      "le", "unit", "discipline"
+  ]
+  assert ancestors[0] == {
+      "uuid": "le",
+      "alias": "learning_experience",
+      "collection_type": "learning_experiences"
+  }
+
+  # the stored ancestors of a parent are used without climbing further
+  loader = NodeLoader()
+  loader.prime("learning_experiences", {
+      **LEARNING_EXPERIENCE, "ancestors": [{
+          "uuid": "unit",
+          "alias": "unit",
+          "collection_type": "curriculum_pathways"
+      }]
+  })
+  ancestors = AncestorPathHandler.get_ancestors("learning_objects", MODULE,
+                                                loader)
+  assert [ancestor["uuid"] for ancestor in ancestors] == ["le", "unit"]
+
+
+def test_get_ancestors_with_chains():
+  chains = {}
+  AncestorPathHandler.get_ancestors("learning_objects", MODULE, get_loader(),
+                                    chains)
+  assert [ancestor["uuid"] for ancestor in chains["curriculum_pathways/unit"]
+         ] == ["unit", "discipline"]
+  assert [
+      ancestor["uuid"] for ancestor in chains["learning_objects/module"]
+  ] == ["module", "le", "unit", "discipline"]
+
+  # the chains already computed are used without reading the parents
+  other_module = {**MODULE, "uuid": "other_module"}
+  ancestors = AncestorPathHandler.get_ancestors("learning_objects",
+                                                other_module, NodeLoader(),
+                                                chains)
+  assert [ancestor["uuid"] for ancestor in ancestors] == [
+      "le", "unit", "discipline"
+  ]
+
+
+def test_get_ancestors_with_cycle():
+  loader = NodeLoader()
+  loader.prime("curriculum_pathways", {
+      "uuid": "a",
+      "alias": "unit",
+      "parent_nodes": {"curriculum_pathways": ["b"]}
+  })
+  loader.prime("curriculum_pathways", {
+      "uuid": "b",
+      "alias": "discipline",
+      "parent_nodes": {"curriculum_pathways": ["a"]}
+  })
+  ancestors = AncestorPathHandler.get_ancestors(
+      "curriculum_pathways", loader.load("curriculum_pathways", "a"), loader)
+  assert [ancestor["uuid"] for ancestor in ancestors] == ["b"]
+
+
+def test_get_ancestor():
+  module = LearningObject.from_dict({
+      **MODULE, "ancestors":
+          AncestorPathHandler.get_ancestors("learning_objects", MODULE,
+                                            get_loader())
+  })
+  assert module.get_ancestor("discipline")["uuid"] == "discipline"
+  assert module.get_ancestor("program") is None
+  module.ancestors = None
+  assert module.get_ancestor("discipline") is None
+
+
+def create_node(model, **fields):
+  node = model()
+  node.name = fields.pop("name", "Node")
+  for key, value in fields.items():
+    setattr(node, key, value)
+  node.is_deleted = False
+  node.save()
+  node.uuid = node.id
+  node.update()
+  return node
+
+
+def test_update_parent_references(clean_firestore):
+  discipline = create_node(CurriculumPathway, alias="discipline",
+                           parent_nodes={}, child_nodes={})
+  ParentChildNodesHandler.update_parent_references(
+      discipline.get_fields(), CurriculumPathway, "add")
+  unit = create_node(
+      CurriculumPathway,
+      alias="unit",
+      parent_nodes={"curriculum_pathways": [discipline.id]},
+      child_nodes={"learning_experiences": []})
+  ParentChildNodesHandler.update_parent_references(
+      unit.get_fields(), CurriculumPathway, "add")
+  learning_experience = create_node(
+      LearningExperience,
+      parent_nodes={"curriculum_pathways": [unit.id]},
+      child_nodes={})
+  ParentChildNodesHandler.update_parent_references(
+      learning_experience.get_fields(), LearningExperience, "add")
+
+  learning_experience = LearningExperience.find_by_uuid(learning_experience.id)
+  assert learning_experience.get_ancestor("discipline")["uuid"] == \
+    discipline.id
+
+  # a change of alias is propagated to the descendants
+  unit = CurriculumPathway.find_by_uuid(unit.id)
+  unit_fields = unit.get_fields()
+  input_fields = {**unit_fields, "alias": "level"}
+  unit.alias = "level"
+  unit.update()
+  ParentChildNodesHandler.update_ancestors(input_fields, unit_fields,
+                                           CurriculumPathway)
+  learning_experience = LearningExperience.find_by_uuid(learning_experience.id)
+  assert learning_experience.get_ancestor("level")["uuid"] == unit.id
+
+  # the backfill recomputes the chains that are not stored
+  learning_experience.ancestors = None
+  learning_experience.update()
+  assert AncestorPathHandler.backfill() == 1
+  learning_experience = LearningExperience.find_by_uuid(learning_experience.id)
+  assert learning_experience.get_ancestor("discipline")["uuid"] == \
+    discipline.id
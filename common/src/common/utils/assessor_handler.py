@@ -2,30 +2,39 @@
     This module is responsible to handle Assessor related
     functionality that can be used by other services
 """
-from common.models import SubmittedAssessment, AssociationGroup
+import json
+from uuid import uuid4
+from common.models import SubmittedAssessment, AssociationGroup, BatchJobModel
 from common.utils.collection_references import (collection_references)
+from common.utils.descendant_index import DescendantIndex
+from common.utils.errors import ResourceNotFoundException
+from common.utils.logging_handler import Logger
+from common.utils.submitted_assessment_search import (
+    SubmittedAssessmentSearchHandler)
 from typing import Optional
 
+ASSESSOR_UPDATE_JOB_TYPE = "update_assessor_of_submitted_assessments"
+
 def get_last_submitted_assessement_of_assessments(assessment_ids, assessor_id):
   """Returns last submitted assessment whose assessor
     is not equal to assessor_id and
-    related to assessments of aand repl discipline"""
-  collection_manager = SubmittedAssessment.collection
-  if len(assessment_ids) <= 30:
-    last_submitted_assessments = collection_manager.filter(
-        "assessment_id", "in", assessment_ids).order("-created_time").fetch()
-    for submitted_assessment in last_submitted_assessments:
-      if not submitted_assessment == assessor_id:
-        last_submitted_assessment = submitted_assessment
-        break
-  else:
-    collection_manager = collection_manager.order("-created_time").fetch()
-    for assessment in collection_manager:
-      if assessment.assessment_id in assessment_ids and \
-        not assessment.assessor_id == assessor_id:
-        last_submitted_assessment = assessment
-        break
-  return last_submitted_assessment
+    related to assessments of a discipline. The assessment ids are
+    queried in chunks concurrently and the latest of the chunks is kept"""
+  def get_last_of_chunk(query):
+    for submitted_assessment in query.order("-created_time").fetch():
+      if not submitted_assessment.assessor_id == assessor_id:
+        return submitted_assessment
+    return None
+
+  last_submitted_assessments = [
+      submitted_assessment
+      for submitted_assessment in SubmittedAssessment.map_field_value_chunks(
+          "assessment_id", assessment_ids, get_last_of_chunk)
+      if submitted_assessment
+  ]
+  return max(last_submitted_assessments,
+             key=lambda submitted_assessment: submitted_assessment.created_time,
+             default=None)
 
 def get_assessors_of_dag(dag_id):
   """Function to get assessors tagged to Discipline Association Groups"""
@@ -42,24 +51,38 @@ def get_assessors_of_dag(dag_id):
 
   return assessors_list
 
-def remove_assessor_for_submitted_assessments(submitted_assessments):
-  """Unassigns assessor of submitted assessments"""
-  for sub_assessment in submitted_assessments:
-    # FIXME: Assign None for the assessor.
-    # fireo=1.4.1 is not supporting none value while updating
-    sub_assessment.assessor_id = ""
-    sub_assessment.assessor_session_id = ""
-    sub_assessment.update()
+def get_progress_handler(submitted_assessments, on_progress=None):
+  """Returns the function reporting the number of submitted assessments
+  updated so far to on_progress, along with the total number"""
+  if not on_progress:
+    return None
+  total_count = len(submitted_assessments)
+  return lambda updated_count: on_progress(updated_count, total_count)
+
+def remove_assessor_for_submitted_assessments(submitted_assessments,
+                                              on_progress=None):
+  """Unassigns assessor of submitted assessments with batched writes"""
+  # FIXME: Assign None for the assessor.
+  # fireo=1.4.1 is not supporting none value while updating
+  SubmittedAssessmentSearchHandler.update_submissions(
+      ((sub_assessment, {
+          "assessor_id": "",
+          "assessor_session_id": ""
+      }) for sub_assessment in submitted_assessments),
+      get_progress_handler(submitted_assessments, on_progress))
 
 def replace_assessor_of_submitted_assessments(
     dag_id,
     submitted_assessments,
     assessment_ids,
-    exclude_user_id: Optional[str] = None):
-  """Replaces assessor of submitted assessments"""
+    exclude_user_id: Optional[str] = None,
+    on_progress=None):
+  """Replaces assessor of submitted assessments with batched writes, the
+  assessors of the group are assigned in turns"""
   assessor_list = get_assessors_of_dag(dag_id)
   if not assessor_list:
-    remove_assessor_for_submitted_assessments(submitted_assessments)
+    remove_assessor_for_submitted_assessments(submitted_assessments,
+                                              on_progress)
     return
   assessor_list = [
       assessor["user"]
@@ -88,62 +111,47 @@ def replace_assessor_of_submitted_assessments(
                       ["assessor_id"]) + 1) %len(assessor_list)
     else:
       index = 0
-    for sub_assessment in submitted_assessments:
-      sub_assessment.assessor_id = assessor_list[index % len(assessor_list)]
-      sub_assessment.assessor_session_id = ""
-      sub_assessment.update()
-      index += 1
+    SubmittedAssessmentSearchHandler.update_submissions(
+        ((sub_assessment, {
+            "assessor_id": assessor_list[(index + position) %
+                                         len(assessor_list)],
+            "assessor_session_id": ""
+        }) for position, sub_assessment in enumerate(submitted_assessments)),
+        get_progress_handler(submitted_assessments, on_progress))
   else:
-    remove_assessor_for_submitted_assessments(submitted_assessments)
+    remove_assessor_for_submitted_assessments(submitted_assessments,
+                                              on_progress)
 
 def filter_submitted_assessments(assessment_ids,
                         assessor_id: Optional[str] = None):
-  """Filters non_evaluated submitted assessments based on assessment_ids and
-   assessor_id"""
-  collection_manager = collection_references["submitted_assessments"].collection
-  collection_manager = collection_manager.filter("status", "==",
-                                            "evaluation_pending")
+  """Filters evaluation pending submitted assessments based on
+   assessment_ids and assessor_id, with one concurrent "in" query per chunk
+   of assessment ids"""
+  filters = [("status", "==", "evaluation_pending")]
   if assessor_id:
-    collection_manager = collection_manager.filter("assessor_id", "==",
-                            assessor_id)
-  if len(assessment_ids) <= 30:
-    collection_manager = collection_manager.filter("assessment_id", "in",
-                                                   assessment_ids).fetch()
-  else:
-    collection_manager = collection_manager.fetch()
-    collection_manager = [
-        sub_assessment for sub_assessment in collection_manager
-        if sub_assessment.assessement_id in assessment_ids
-    ]
-  return collection_manager
+    filters.append(("assessor_id", "==", assessor_id))
+  return collection_references[
+      "submitted_assessments"].find_all_by_field_values(
+          "assessment_id", assessment_ids, filters)
 
 def get_all_assessments_of_a_discipline(discipline_id, collection_type,
                                         child_collection_type, assessment_ids):
   """This function is to traverse from curriculum_pathway with
-  alias discipline to assessments and returns assessment ids"""
-  node = collection_references[collection_type].find_by_uuid(discipline_id)
-  node = node.get_fields(reformat_datetime=True)
-  if node.get("child_nodes"):
-    for cp_unit in node.get("child_nodes").get(child_collection_type, []):
-      if collection_type == "curriculum_pathways" and node.get(
-          "alias") == "discipline":
-        get_all_assessments_of_a_discipline(cp_unit, child_collection_type,
-                                            "learning_experiences",
-                                            assessment_ids)
-      elif collection_type == "curriculum_pathways" and node.get(
-          "alias") == "unit":
-        get_all_assessments_of_a_discipline(cp_unit, child_collection_type,
-                                            "learning_objects", assessment_ids)
-      elif collection_type == "learning_experiences":
-        get_all_assessments_of_a_discipline(cp_unit, child_collection_type,
-                                            "assessments", assessment_ids)
-      elif collection_type == "learning_objects":
-        assessment_ids.append(cp_unit)
+  alias discipline to assessments and returns assessment ids.
+  The assessment ids are read from the descendant index of the discipline"""
+  del child_collection_type  # every level below the discipline is indexed
+  assessment_ids += DescendantIndex.get_assessment_ids(collection_type,
+                                                       discipline_id)
   return assessment_ids
 
 def traverse_down(uuid,level,child_level,res):
   """This function is to traverse from curriculum_pathway with
-  alias discipline to assessments and returns assessment ids"""
+  alias discipline to assessments and returns assessment ids.
+  The assessment ids are read from the descendant index of the node"""
+  if child_level == "assessments" and \
+    level in DescendantIndex.INDEXED_COLLECTIONS:
+    res += DescendantIndex.get_assessment_ids(level, uuid)
+    return res
   node = collection_references[level].find_by_uuid(uuid)
   node = node.get_fields(reformat_datetime=True)
   child_nodes =  node.get("child_nodes")
@@ -158,9 +166,12 @@ def traverse_down(uuid,level,child_level,res):
 def update_assessor_of_submitted_assessments_of_a_discipline(
   dag_id: str,
   discipline_id: str,
-  input_assessor = None
+  input_assessor = None,
+  on_progress = None
 ):
-  """Function to update assessor for submitted assessments of discipline"""
+  """Function to update assessor for submitted assessments of discipline,
+  on_progress is called with the number of submitted assessments updated so
+  far and the total number after each batch of updates"""
   assessor_id = None
   if input_assessor:
     assessor_id = input_assessor.get("user")
@@ -179,14 +190,95 @@ def update_assessor_of_submitted_assessments_of_a_discipline(
     if assessor_id:
       replace_assessor_of_submitted_assessments(
                   dag_id,submitted_assessments,
-                  assessment_ids,assessor_id)
+                  assessment_ids,assessor_id,on_progress)
       task_status = 1
       response_msg = f"Successfully replaced assessor {assessor_id} "\
         f"for submitted assessments of discipline with uuid {discipline_id}."
     else:
-      remove_assessor_for_submitted_assessments(submitted_assessments)
+      remove_assessor_for_submitted_assessments(submitted_assessments,
+                                                on_progress)
       task_status = 1
       response_msg = "Successfully unassigned assessor for all evaluation "\
       f"pending submitted assessments of discipline with uuid {discipline_id}"
 
   return task_status, response_msg
+
+def get_dag_id_of_discipline(discipline_id):
+  """Returns the uuid of the discipline association group the discipline is
+  active in, None if there is none"""
+  group = AssociationGroup.collection.filter(
+      "association_type", "==", "discipline").filter(
+      "associations.curriculum_pathways", "array_contains", {
+          "curriculum_pathway_id": discipline_id,
+          "status": "active"
+      }).get()
+  return group.uuid if group else None
+
+def create_assessor_update_job(discipline_id, assessor_id=None, dag_id=None):
+  """Records a pending job updating the assessor of the evaluation pending
+  submitted assessments of a discipline, see run_assessor_update_job"""
+  name = str(uuid4())
+  job = BatchJobModel()
+  job.id_ = name
+  job.uuid = name
+  job.name = name
+  job.type = ASSESSOR_UPDATE_JOB_TYPE
+  job.status = "pending"
+  job.input_data = json.dumps({
+      "discipline_id": discipline_id,
+      "assessor_id": assessor_id,
+      "dag_id": dag_id
+  })
+  job.result_data = {"updated_count": 0, "total_count": None}
+  job.save()
+  return job
+
+def run_assessor_update_job(job_name):
+  """Runs a job created by create_assessor_update_job, the number of
+  submitted assessments updated is stored on the job after every batch so
+  that the progress can be polled"""
+  job = BatchJobModel.find_by_uuid(job_name)
+  input_data = json.loads(job.input_data)
+  job.status = "active"
+  job.update()
+
+  def report_progress(updated_count, total_count):
+    job.result_data = {
+        "updated_count": updated_count,
+        "total_count": total_count
+    }
+    job.update()
+
+  try:
+    input_assessor = None
+    if input_data.get("assessor_id"):
+      input_assessor = {"user": input_data["assessor_id"]}
+    _, response_msg = update_assessor_of_submitted_assessments_of_a_discipline(
+        input_data.get("dag_id"), input_data["discipline_id"], input_assessor,
+        report_progress)
+    if job.result_data.get("total_count") is None:
+      job.result_data = {"updated_count": 0, "total_count": 0}
+    job.status = "succeeded"
+    job.message = response_msg
+  except Exception as e: # pylint: disable=broad-exception-caught
+    Logger.error(f"Batch Job {job_name}: Failed with error {e}")
+    job.status = "failed"
+    job.errors = {"error_message": str(e)}
+  job.update()
+  return job
+
+def get_assessor_update_job(job_name):
+  """Returns the status and the progress of an assessor update job"""
+  job = BatchJobModel.find_by_uuid(job_name)
+  if job.type != ASSESSOR_UPDATE_JOB_TYPE:
+    raise ResourceNotFoundException(
+        f"Assessor update job with name {job_name} not found")
+  return {
+      "job_name": job.uuid,
+      "status": job.status,
+      "message": job.message,
+      "input_data": json.loads(job.input_data),
+      "updated_count": job.result_data.get("updated_count", 0),
+      "total_count": job.result_data.get("total_count"),
+      "errors": job.errors
+  }
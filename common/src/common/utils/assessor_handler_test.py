@@ -14,7 +14,10 @@ with mock.patch(
 from common.utils.assessor_handler import (
     replace_assessor_of_submitted_assessments,
     update_assessor_of_submitted_assessments_of_a_discipline,
-    filter_submitted_assessments
+    filter_submitted_assessments,
+    create_assessor_update_job,
+    run_assessor_update_job,
+    get_assessor_update_job
 )
 from common.testing.firestore_emulator import (firestore_emulator,
                                                clean_firestore)
@@ -390,3 +393,48 @@ def test_replace_assessor_with_new_assessor_for_submitted_assessments_negative(
       submitted_assessement_1.uuid)
   assert get_submitted_assessment_1.assessor_id == ""
 
+def test_filter_submitted_assessments_of_many_assessments(clean_firestore):
+  assessment_ids = [f"assessment{index}" for index in range(65)]
+  for assessment_id in assessment_ids[::16]:
+    create_submitted_assessment({
+        **SUBMITTED_ASSESSMENT_EXAMPLE, "assessment_id": assessment_id,
+        "type": "project", "status": "evaluation_pending",
+        "assessor_id": "assessor_id"
+    })
+  create_submitted_assessment({
+      **SUBMITTED_ASSESSMENT_EXAMPLE, "assessment_id": assessment_ids[1],
+      "type": "project", "status": "evaluated", "assessor_id": "assessor_id"
+  })
+
+  # the assessment ids are queried in chunks of 30
+  submitted_assessments = filter_submitted_assessments(
+      assessment_ids, "assessor_id")
+  assert sorted(submitted_assessment.assessment_id
+                for submitted_assessment in submitted_assessments) == \
+      sorted(assessment_ids[::16])
+  assert not filter_submitted_assessments(assessment_ids, "other_assessor")
+
+def test_run_assessor_update_job(mocker, clean_firestore):
+  submitted_assessments = [
+      create_submitted_assessment({
+          **SUBMITTED_ASSESSMENT_EXAMPLE, "type": "project",
+          "status": "evaluation_pending", "assessor_id": "assessor_id"
+      }) for _ in range(3)
+  ]
+  mocker.patch(
+      "common.utils.assessor_handler.traverse_down",
+      return_value=[SUBMITTED_ASSESSMENT_EXAMPLE["assessment_id"]])
+  mocker.patch(
+      "common.utils.assessor_handler.get_assessors_of_dag",
+      return_value=[{"user": "assessor_id"}, {"user": "new_assessor_id"}])
+
+  job = create_assessor_update_job("discipline_id", "assessor_id", "dag_id")
+  assert get_assessor_update_job(job.uuid)["status"] == "pending"
+  run_assessor_update_job(job.uuid)
+
+  job_status = get_assessor_update_job(job.uuid)
+  assert job_status["status"] == "succeeded"
+  assert (job_status["updated_count"], job_status["total_count"]) == (3, 3)
+  for submitted_assessment in submitted_assessments:
+    assert SubmittedAssessment.find_by_uuid(
+        submitted_assessment.uuid).assessor_id == "new_assessor_id"
@@ -0,0 +1,143 @@
+"""Asyncio variant of the cache_service methods for async routes."""
+import asyncio
+import weakref
+import redis.asyncio as aioredis
+from common.config import (CACHE_LOCAL_TTL, REDIS_HOST, REDIS_PORT,
+                           REDIS_MAX_CONNECTIONS)
+from common.utils.cache_service import (decode_value, encode_value,
+                                        jitter_ttl, local_cache, make_key,
+                                        make_tag_key, queue_set)
+
+
+# asyncio redis clients by event loop, dropped along with their loop
+_clients = weakref.WeakKeyDictionary()
+
+
+def get_client():
+  """Returns the asyncio redis client of the running event loop, created on
+  first use as the connections of a pool can only be used by the loop they
+  were opened in"""
+  loop = asyncio.get_running_loop()
+  client = _clients.get(loop)
+  if client is None:
+    pool = aioredis.ConnectionPool(host=REDIS_HOST, port=REDIS_PORT, db=0,
+                                   max_connections=REDIS_MAX_CONNECTIONS)
+    client = _clients[loop] = aioredis.Redis(connection_pool=pool)
+  return client
+
+
+async def get_value(key):
+  """
+        Checks for key in the process cache and then in redis, if found then,
+        Returns value against that key else Returns None
+        Args:
+            key: String
+        Returns:
+            value: String or Dict or List or Number or None
+    """
+  value = local_cache.get(key)
+  if value is None:
+    value = await get_client().get(make_key(key))
+    if value is not None:
+      local_cache.set(key, value, CACHE_LOCAL_TTL)
+  return decode_value(value)
+
+
+async def set_value(key, value, expiry_time=3600, tags=None):
+  """
+        Stores value against key in redis with a jittered expiry time and in
+        the process cache
+        Args:
+            key: String
+            value: String or Dict or List or Number
+            expiry_time: Number(Expiry time in Secs, default 3600)
+            tags: List of String, invalidate_tag of any of them deletes key
+        Returns:
+            True or False
+    """
+  return await set_many({key: value}, expiry_time, {key: tags})
+
+
+async def get_many(keys):
+  """
+        Returns the values of several keys, the keys missing in the process
+        cache are read from redis in a single round trip
+        Args:
+            keys: List of String
+        Returns:
+            values: Dict of key and value, None for missing keys
+    """
+  values = {key: local_cache.get(key) for key in keys}
+  missing_keys = [key for key, value in values.items() if value is None]
+  if missing_keys:
+    redis_values = await get_client().mget(
+        [make_key(key) for key in missing_keys])
+    for key, value in zip(missing_keys, redis_values):
+      if value is not None:
+        local_cache.set(key, value, CACHE_LOCAL_TTL)
+        values[key] = value
+  return {key: decode_value(value) for key, value in values.items()}
+
+
+async def set_many(mapping, expiry_time=3600, tags=None):
+  """
+        Stores several values in redis in a single pipelined round trip
+        Args:
+            mapping: Dict of key and value
+            expiry_time: Number(Expiry time in Secs, default 3600)
+            tags: Dict of key and its list of tags
+        Returns:
+            True or False
+    """
+  tags = tags or {}
+  async with get_client().pipeline(transaction=False) as pipeline:
+    set_positions = []
+    for key, value in mapping.items():
+      value = encode_value(value)
+      local_cache.set(key, value, expiry_time)
+      set_positions.append(len(pipeline))
+      queue_set(pipeline, key, value, jitter_ttl(expiry_time), tags.get(key))
+    results = await pipeline.execute()
+    return all(results[position] for position in set_positions)
+
+
+async def delete_many(keys):
+  """
+        Deletes several keys from the process cache and redis
+        Args:
+            keys: List of String
+        Returns:
+            Number of keys deleted from redis
+    """
+  if not keys:
+    return 0
+  for key in keys:
+    local_cache.delete(key)
+  return await get_client().delete(*[make_key(key) for key in keys])
+
+
+async def invalidate_tag(*tags):
+  """
+        Deletes every key stored with any of the given tags
+        Args:
+            tags: String e.g. "section:{section_id}", "user:{user_id}"
+        Returns:
+            Number of keys deleted from redis
+    """
+  async with get_client().pipeline(transaction=False) as pipeline:
+    for tag in tags:
+      pipeline.smembers(make_tag_key(tag))
+    members = await pipeline.execute()
+
+    keys = set()
+    for tag, tag_members in zip(tags, members):
+      tag_members = [member.decode("utf-8") for member in tag_members]
+      if tag_members:
+        keys.update(tag_members)
+        pipeline.srem(make_tag_key(tag), *tag_members)
+    if not keys:
+      return 0
+    for key in keys:
+      local_cache.delete(key)
+    pipeline.delete(*[make_key(key) for key in keys])
+    return (await pipeline.execute())[-1]
@@ -0,0 +1,139 @@
+"""Unit test cases for the asyncio cache service"""
+import asyncio
+from unittest import mock
+import pytest
+# disabling pylint rules that conflict with pytest fixtures
+# pylint: disable=unused-argument
+from common.utils import cache_service
+from common.utils.async_cache_service import (get_client, get_value,
+                                              set_value, get_many, set_many,
+                                              delete_many, invalidate_tag)
+
+
+class FakeAsyncRedis():
+  """Dict backed stand in for the calls of redis.asyncio.Redis"""
+
+  def __init__(self):
+    self.data = {}
+    self.round_trips = 0
+
+  async def get(self, key):
+    self.round_trips += 1
+    return self.data.get(key)
+
+  async def set(self, key, value, ex=None):
+    self.round_trips += 1
+    self.data[key] = value
+    return True
+
+  async def mget(self, keys):
+    self.round_trips += 1
+    return [self.data.get(key) for key in keys]
+
+  async def delete(self, *keys):
+    self.round_trips += 1
+    return len([self.data.pop(key) for key in keys if key in self.data])
+
+  def pipeline(self, transaction=True):
+    return FakeAsyncPipeline(self)
+
+
+class FakeAsyncPipeline():
+  """Queues the calls of a pipeline until execute"""
+
+  def __init__(self, fake_redis):
+    self.fake_redis = fake_redis
+    self.commands = []
+
+  async def __aenter__(self):
+    return self
+
+  async def __aexit__(self, *args):
+    pass
+
+  def __len__(self):
+    return len(self.commands)
+
+  def set(self, key, value, ex=None):
+    def command():
+      self.fake_redis.data[key] = value
+      return True
+    self.commands.append(command)
+
+  def sadd(self, key, *members):
+    self.commands.append(lambda: self.fake_redis.data.setdefault(
+        key, set()).update(member.encode("utf-8") for member in members))
+
+  def expire(self, key, seconds):
+    self.commands.append(lambda: True)
+
+  def smembers(self, key):
+    self.commands.append(lambda: set(self.fake_redis.data.get(key, set())))
+
+  def srem(self, key, *members):
+    self.commands.append(lambda: self.fake_redis.data[key].difference_update(
+        member.encode("utf-8") for member in members))
+
+  def delete(self, *keys):
+    self.commands.append(lambda: len(
+        [self.fake_redis.data.pop(key) for key in keys
+         if key in self.fake_redis.data]))
+
+  async def execute(self):
+    self.fake_redis.round_trips += 1
+    commands, self.commands = self.commands, []
+    return [command() for command in commands]
+
+
+@pytest.fixture(name="fake_async_redis")
+def fixture_fake_async_redis():
+  fake_redis = FakeAsyncRedis()
+  cache_service.local_cache.clear()
+  with mock.patch("common.utils.async_cache_service.get_client",
+                  return_value=fake_redis):
+    yield fake_redis
+  cache_service.local_cache.clear()
+
+
+def test_get_client_per_event_loop():
+  async def get_clients():
+    return get_client(), get_client()
+
+  first_client, same_client = asyncio.run(get_clients())
+  assert first_client is same_client
+  other_client, _ = asyncio.run(get_clients())
+  assert other_client is not first_client
+
+
+def test_set_value_and_get_value(fake_async_redis):
+  assert asyncio.run(set_value("key", {"a": 1}))
+  cache_service.local_cache.clear()
+  assert asyncio.run(get_value("key")) == {"a": 1}
+  # the value read from redis is kept in the process cache
+  assert cache_service.get_value("key") == {"a": 1}
+
+
+def test_many_keys(fake_async_redis):
+  sections = {f"progress::section_{i}::user": i * 10 for i in range(5)}
+  assert asyncio.run(set_many(sections))
+  cache_service.local_cache.clear()
+  fake_async_redis.round_trips = 0
+
+  values = asyncio.run(get_many(list(sections) + ["missing"]))
+  assert values == {**sections, "missing": None}
+  assert fake_async_redis.round_trips == 1
+
+  assert asyncio.run(delete_many(list(sections))) == 5
+  assert not fake_async_redis.data
+
+
+def test_invalidate_tag(fake_async_redis):
+  asyncio.run(set_value("analytics::u1", {"a": 1}, tags=["user:u1"]))
+  asyncio.run(set_many({"section::s1::u1": 10, "section::s1::u2": 20},
+                       tags={"section::s1::u1": ["user:u1", "section:s1"],
+                             "section::s1::u2": ["section:s1"]}))
+  assert asyncio.run(invalidate_tag("user:u1")) == 2
+  assert asyncio.run(get_value("section::s1::u2")) == 20
+  assert asyncio.run(invalidate_tag("section:s1")) == 1
+  assert asyncio.run(get_many(["analytics::u1", "section::s1::u2"])) == {
+      "analytics::u1": None, "section::s1::u2": None}
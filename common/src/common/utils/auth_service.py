@@ -1,14 +1,154 @@
 """Firebase token validation"""
+import hashlib
 import json
+import time
 import requests
+from requests.adapters import HTTPAdapter
 from fastapi import Depends
 from fastapi.security import HTTPBearer
+from common.models import TempUser
+from common.utils.cache_service import LocalCache, get_or_set
 from common.utils.errors import InvalidTokenError
 from common.utils.http_exceptions import Unauthenticated, InternalServerError
-from common.utils.config import SERVICES
+from common.utils.config import (SERVICES, AUTH_TOKEN_VERIFICATION,
+                                 AUTH_USER_CACHE_TTL, AUTH_TOKEN_CACHE_TTL,
+                                 AUTH_TOKEN_CACHE_MAX_ENTRIES,
+                                 AUTH_HTTP_POOL_SIZE,
+                                 AUTH_HTTP_CONNECT_TIMEOUT,
+                                 AUTH_HTTP_READ_TIMEOUT)
+from common.utils.id_token_verifier import verify_id_token
+from common.utils.logging_handler import Logger
 
 auth_scheme = HTTPBearer(auto_error=False)
 
+# keep-alive connections to the authentication service shared by requests
+session = requests.Session()
+session.mount("http://", HTTPAdapter(pool_connections=AUTH_HTTP_POOL_SIZE,
+                                     pool_maxsize=AUTH_HTTP_POOL_SIZE))
+timeout = (AUTH_HTTP_CONNECT_TIMEOUT, AUTH_HTTP_READ_TIMEOUT)
+
+# validated tokens by the hash of the token
+validated_tokens = LocalCache(max_entries=AUTH_TOKEN_CACHE_MAX_ENTRIES,
+                              ttl=AUTH_TOKEN_CACHE_TTL)
+
+
+def get_token_hash(token):
+  return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def get_auth_user_data(email):
+  """Returns the fields of the user of a token used to enrich its claims,
+  None if there is no such user"""
+  user = TempUser.find_by_email(email)
+  if user is None:
+    return None
+  user_fields = user.get_fields(reformat_datetime=True)
+  return {
+      "status": user_fields.get("status"),
+      "user_type": user_fields.get("user_type"),
+      "access_api_docs": user_fields.get("access_api_docs") or False
+  }
+
+
+def verify_token_locally(id_token):
+  """
+    Verifies the ID token in this service and enriches its claims with the
+    user type, which is shared between services through the cache
+    Args:
+        id_token: String
+    Raises:
+        InvalidTokenError: If the token is invalid or the user is unknown or
+        inactive
+    Returns:
+        Dict: same data as returned by the authentication service
+  """
+  decoded_token = verify_id_token(id_token)
+  email = decoded_token.get("email")
+  if not email:
+    raise InvalidTokenError("Unauthorized")
+  user_data = get_or_set(f"auth_user::{email}",
+                         lambda: get_auth_user_data(email),
+                         AUTH_USER_CACHE_TTL)
+  if user_data is None or user_data.get("status") == "inactive":
+    raise InvalidTokenError("Unauthorized")
+  return {
+      **decoded_token,
+      "access_api_docs": user_data["access_api_docs"],
+      "user_type": user_data["user_type"]
+  }
+
+
+def verify_token_remotely(token_dict):
+  """
+    Validates the token with the authentication service
+    Args:
+        token_dict: Dict with scheme and credentials of the bearer token
+    Raises:
+        InvalidTokenError: If the token is invalid
+    Returns:
+        Dict: decoded token along with the user type
+  """
+  api_endpoint = "http://authentication/authentication/api/v1/validate"
+  res = session.get(
+      url=api_endpoint,
+      headers={
+          "Content-Type":
+          "application/json",
+          "Authorization":
+          f"{token_dict['scheme']} {token_dict['credentials']}"
+      },
+      timeout=timeout)
+  data = res.json()
+  if res.status_code == 200 and data["success"] is True:
+    return data.get("data")
+  raise InvalidTokenError(data["message"])
+
+
+def verify_token(token_dict):
+  """
+    Validates the bearer token locally or with the authentication service
+    depending on AUTH_TOKEN_VERIFICATION. Local verification falls back to
+    the authentication service when it cannot decide, e.g. if the signing
+    certificates or the cache are unavailable
+    Args:
+        token_dict: Dict with scheme and credentials of the bearer token
+    Raises:
+        InvalidTokenError: If the token is invalid
+    Returns:
+        Dict: decoded token along with the user type
+  """
+  if AUTH_TOKEN_VERIFICATION == "local":
+    try:
+      return verify_token_locally(token_dict["credentials"])
+    except InvalidTokenError:
+      raise
+    except Exception as e: # pylint: disable = broad-except
+      Logger.warning(
+          f"Local token verification failed, validating remotely: {e}")
+  return verify_token_remotely(token_dict)
+
+
+def get_token_data(token_dict):
+  """
+    Returns the data of a bearer token validated by this process in the last
+    AUTH_TOKEN_CACHE_TTL seconds, validates it otherwise. Tokens are never
+    kept beyond their exp
+    Args:
+        token_dict: Dict with scheme and credentials of the bearer token
+    Raises:
+        InvalidTokenError: If the token is invalid
+    Returns:
+        Dict: decoded token along with the user type
+  """
+  token_hash = get_token_hash(token_dict["credentials"])
+  data = validated_tokens.get(token_hash)
+  if data is None:
+    data = verify_token(token_dict)
+    expires_in = data.get("exp", 0) - time.time()
+    if expires_in > 0:
+      validated_tokens.set(token_hash, data, expires_in)
+  return {**data}
+
 # pylint: disable = consider-using-f-string
 def validate_token(token: auth_scheme = Depends()):
   """_summary_
@@ -29,21 +169,7 @@ def validate_token(token: auth_scheme = Depends()):
       raise InvalidTokenError("Unauthorized")
     token_dict = dict(token)
     if token_dict["credentials"]:
-      api_endpoint = "http://authentication/authentication/api/v1/validate"
-      res = requests.get(
-          url=api_endpoint,
-          headers={
-              "Content-Type":
-              "application/json",
-              "Authorization":
-              f"{token_dict['scheme']} {token_dict['credentials']}"
-          },
-          timeout=60)
-      data = res.json()
-      if res.status_code == 200 and data["success"] is True:
-        return data.get("data")
-      else:
-        raise InvalidTokenError(data["message"])
+      return get_token_data(token_dict)
     else:
       raise InvalidTokenError("Unauthorized")
   except InvalidTokenError as e:
@@ -72,22 +198,11 @@ def validate_user_type_and_token(accepted_user_types: list,
       raise InvalidTokenError("Unauthorized")
     token_dict = dict(token)
     if token_dict["credentials"]:
-      api_endpoint = "http://authentication/authentication/api/v1/validate"
-      res = requests.get(
-          url=api_endpoint,
-          headers={
-              "Content-Type":
-              "application/json",
-              "Authorization":
-              f"{token_dict['scheme']} {token_dict['credentials']}"
-          },
-          timeout=60)
-      data = res.json()
-      if res.status_code == 200 and data["success"] is True and data["data"][
-          "user_type"] in accepted_user_types:
-        return data.get("data")
+      data = get_token_data(token_dict)
+      if data["user_type"] in accepted_user_types:
+        return data
       else:
-        raise InvalidTokenError(data["message"])
+        raise InvalidTokenError("Unauthorized")
     else:
       raise InvalidTokenError("Unauthorized")
   except InvalidTokenError as e:
@@ -109,12 +224,13 @@ def user_verification(token: str) -> json:
   """
   api_endpoint = "http://{}:{}/authentication/api/v1/validate".format(
     SERVICES["authentication"]["host"], SERVICES["authentication"]["port"])
-  response = requests.get(
+  response = session.get(
     url=api_endpoint,
     headers={
       "Content-Type": "application/json",
       "Authorization": token
     },
+    timeout=timeout
   )
 
   return response
@@ -0,0 +1,108 @@
+"""Unit test cases for the token validation of the services"""
+from unittest import mock
+import pytest
+# disabling pylint rules that conflict with pytest fixtures
+# pylint: disable=unused-argument
+from fastapi.security import HTTPAuthorizationCredentials
+from common.testing.firebase_test_keys import (TEST_CERTIFICATES,
+                                               TEST_FIREBASE_PROJECT_ID,
+                                               create_test_id_token)
+from common.utils import auth_service, id_token_verifier
+from common.utils.auth_service import validate_token, validate_user
+from common.utils.errors import CertificatesUnavailableError
+from common.utils.http_exceptions import Unauthenticated
+
+USER_DATA = {"status": "active", "user_type": "faculty",
+             "access_api_docs": False}
+
+
+@pytest.fixture(name="local_verification")
+def fixture_local_verification():
+  """Verifies tokens with the test key set, yields the remote verification"""
+  id_token_verifier.certificate_cache.set_certificates(TEST_CERTIFICATES)
+  auth_service.validated_tokens.clear()
+  with mock.patch("common.utils.auth_service.AUTH_TOKEN_VERIFICATION",
+                  "local"), \
+      mock.patch("common.utils.id_token_verifier.FIREBASE_PROJECT_ID",
+                 TEST_FIREBASE_PROJECT_ID), \
+      mock.patch("common.utils.auth_service.get_or_set",
+                 side_effect=lambda key, loader, expiry_time: loader()), \
+      mock.patch("common.utils.auth_service.verify_token_remotely") as remote:
+    yield remote
+  id_token_verifier.certificate_cache.set_certificates({}, 0)
+  auth_service.validated_tokens.clear()
+
+
+def bearer(token):
+  return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+def test_validate_token_locally(local_verification):
+  with mock.patch("common.utils.auth_service.get_auth_user_data",
+                  return_value=USER_DATA):
+    data = validate_user(bearer(create_test_id_token()))
+  assert data["user_id"] == "test_user_id"
+  assert data["user_type"] == "faculty"
+  assert data["access_api_docs"] is False
+  local_verification.assert_not_called()
+
+
+def test_validate_token_locally_inactive_user(local_verification):
+  with mock.patch("common.utils.auth_service.get_auth_user_data",
+                  return_value={**USER_DATA, "status": "inactive"}):
+    with pytest.raises(Unauthenticated):
+      validate_token(bearer(create_test_id_token()))
+  with mock.patch("common.utils.auth_service.get_auth_user_data",
+                  return_value=None):
+    with pytest.raises(Unauthenticated):
+      validate_token(bearer(create_test_id_token()))
+  with pytest.raises(Unauthenticated):
+    validate_token(bearer(create_test_id_token(expires_in=-3600)))
+  local_verification.assert_not_called()
+
+
+def test_validate_token_falls_back_to_remote(local_verification):
+  local_verification.return_value = {"user_id": "test_user_id",
+                                     "user_type": "faculty"}
+  with mock.patch("common.utils.auth_service.verify_id_token",
+                  side_effect=CertificatesUnavailableError("down")):
+    assert validate_token(bearer(create_test_id_token())) == \
+        local_verification.return_value
+  local_verification.assert_called_once()
+
+
+def test_validate_user_type(local_verification):
+  with mock.patch("common.utils.auth_service.get_auth_user_data",
+                  return_value={**USER_DATA, "user_type": "learner"}):
+    with pytest.raises(Unauthenticated):
+      validate_user(bearer(create_test_id_token()))
+
+
+def test_validated_token_cache(local_verification):
+  token = create_test_id_token()
+  with mock.patch("common.utils.auth_service.get_auth_user_data",
+                  return_value=USER_DATA) as get_auth_user_data:
+    data = validate_user(bearer(token))
+    data["user_type"] = "changed by the caller"
+    assert validate_user(bearer(token))["user_type"] == "faculty"
+  get_auth_user_data.assert_called_once()
+
+  # expired tokens are not kept
+  auth_service.validated_tokens.clear()
+  local_verification.return_value = {**USER_DATA, "exp": 0}
+  with mock.patch("common.utils.auth_service.verify_id_token",
+                  side_effect=CertificatesUnavailableError("down")):
+    validate_user(bearer(token))
+    validate_user(bearer(token))
+  assert local_verification.call_count == 2
+
+
+def test_remote_validation_uses_session():
+  response = mock.Mock(status_code=200)
+  response.json.return_value = {"success": True, "data": {"user_id": "u1"}}
+  with mock.patch.object(auth_service.session, "get",
+                         return_value=response) as get:
+    data = auth_service.verify_token_remotely(
+        {"scheme": "Bearer", "credentials": "token"})
+  assert data == {"user_id": "u1"}
+  assert get.call_args.kwargs["timeout"] == auth_service.timeout
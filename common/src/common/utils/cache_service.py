@@ -1,9 +1,51 @@
 """Utility methods for caching related operations."""
 import datetime
+import functools
+import inspect
 import json
+import random
+import threading
+import time
+from collections import OrderedDict
+import msgpack
 import redis
+from common.config import (CACHE_LOCAL_MAX_ENTRIES, CACHE_LOCAL_TTL,
+                           CACHE_TTL_JITTER, CACHE_KEY_PREFIX, REDIS_HOST,
+                           REDIS_PORT, REDIS_MAX_CONNECTIONS, CACHE_TAG_TTL)
+
+pool = redis.ConnectionPool(host=REDIS_HOST, port=REDIS_PORT, db=0,
+                            max_connections=REDIS_MAX_CONNECTIONS)
+r = redis.Redis(connection_pool=pool)
+
+# Marks values encoded with msgpack, values without it are JSON
+BINARY_PREFIX = b"\x00mp"
+
+def make_key(key):
+  """Returns the namespaced redis key of a cache key"""
+  return CACHE_KEY_PREFIX + key
+
+
+def make_tag_key(tag):
+  """Returns the redis key of the set holding the cache keys of a tag"""
+  return make_key(f"tag::{tag}")
+
+
+def queue_set(pipeline, key, value, expiry_time, tags=None):
+  """Queues the write of a value and its tags on a redis pipeline"""
+  pipeline.set(make_key(key), value, ex=expiry_time)
+  for tag in tags or []:
+    pipeline.sadd(make_tag_key(tag), key)
+    pipeline.expire(make_tag_key(tag), CACHE_TAG_TTL)
+
+
+def store(key, value, expiry_time, tags=None):
+  """Writes an encoded value to redis along with its tags"""
+  if not tags:
+    return r.set(make_key(key), value, ex=expiry_time)
+  pipeline = r.pipeline(transaction=False)
+  queue_set(pipeline, key, value, expiry_time, tags)
+  return pipeline.execute()[0]
 
-r = redis.Redis(host="redis-master", port=6379, db=0)
 
 def json_serial(obj):
   """JSON serializer for objects not serializable by default json code"""
@@ -11,18 +53,138 @@ def json_serial(obj):
     return obj.isoformat()
   raise TypeError (f"Type {type(obj)} not serializable")
 
-def set_key(key, value, expiry_time=3600):
+
+def encode_value(value):
+  """
+        Encodes a value with msgpack, falls back to JSON for values msgpack
+        cannot represent
+        Args:
+            value: String or Dict or List or Number
+        Returns:
+            bytes
+    """
+  try:
+    return BINARY_PREFIX + msgpack.packb(
+        value, default=json_serial, use_bin_type=True)
+  except (TypeError, ValueError, OverflowError):
+    return json.dumps(value, default=json_serial).encode("utf-8")
+
+
+def decode_value(value):
+  """
+        Decodes a value stored by encode_value or set_key
+        Args:
+            value: bytes or None
+        Returns:
+            value: String or Dict or List or Number or None
+    """
+  if value is None:
+    return None
+  if value.startswith(BINARY_PREFIX):
+    return msgpack.unpackb(value[len(BINARY_PREFIX):], raw=False,
+                           strict_map_key=False)
+  return json.loads(value)
+
+
+def jitter_ttl(expiry_time):
+  """Randomly shortens an expiry time so that keys set together do not
+  expire together"""
+  return max(1, int(expiry_time * (1 - CACHE_TTL_JITTER * random.random())))
+
+
+class LocalCache():
+  """Bounded in-process LRU cache of encoded values with an expiry time"""
+
+  def __init__(self, max_entries, ttl):
+    self.max_entries = max_entries
+    self.ttl = ttl
+    self._entries = OrderedDict()
+    self._lock = threading.Lock()
+
+  def get(self, key):
+    """Returns the value of key or None if it is missing or expired"""
+    with self._lock:
+      entry = self._entries.get(key)
+      if entry is None:
+        return None
+      value, expires_at = entry
+      if expires_at <= time.monotonic():
+        del self._entries[key]
+        return None
+      self._entries.move_to_end(key)
+      return value
+
+  def set(self, key, value, expiry_time):
+    if self.max_entries <= 0 or self.ttl <= 0:
+      return
+    expires_at = time.monotonic() + min(expiry_time, self.ttl)
+    with self._lock:
+      self._entries[key] = (value, expires_at)
+      self._entries.move_to_end(key)
+      while len(self._entries) > self.max_entries:
+        self._entries.popitem(last=False)
+
+  def delete(self, key):
+    with self._lock:
+      self._entries.pop(key, None)
+
+  def clear(self):
+    with self._lock:
+      self._entries.clear()
+
+
+class SingleFlight():
+  """Runs a function once per key for concurrent callers of the same key,
+  the other callers wait for and share its result"""
+
+  def __init__(self):
+    self._calls = {}
+    self._lock = threading.Lock()
+
+  def do(self, key, fn):
+    """Returns fn() computed once for all the concurrent callers of key"""
+    with self._lock:
+      call = self._calls.get(key)
+      is_leader = call is None
+      if is_leader:
+        call = {"done": threading.Event(), "result": None, "error": None}
+        self._calls[key] = call
+
+    if not is_leader:
+      call["done"].wait()
+      if call["error"] is not None:
+        raise call["error"]
+      return call["result"]
+
+    try:
+      call["result"] = fn()
+      return call["result"]
+    except Exception as e:
+      call["error"] = e
+      raise
+    finally:
+      with self._lock:
+        del self._calls[key]
+      call["done"].set()
+
+
+local_cache = LocalCache(CACHE_LOCAL_MAX_ENTRIES, CACHE_LOCAL_TTL)
+single_flight = SingleFlight()
+
+
+def set_key(key, value, expiry_time=3600, tags=None):
   """
         Stores value against key in cache with default expiry time of 1hr
         Args:
             key: String
             value: String or Dict or Number
             exp: Number(Expiry time in Secs, default 3600)
+            tags: List of String, invalidate_tag of any of them deletes key
         Returns:
             True or False
     """
   value = json.dumps(value,default=json_serial)
-  return r.set(key, value, ex=expiry_time)
+  return store(key, value, expiry_time, tags)
 
 
 def get_key(key):
@@ -34,13 +196,12 @@ def get_key(key):
         Returns:
             value: String or Dict or Number or None
     """
-  value = r.get(key)
-  return_value = json.loads(value) if value is not None else None
-  return return_value
+  return decode_value(r.get(make_key(key)))
 
 
 def delete_key(key):
-  r.delete(key)
+  local_cache.delete(key)
+  r.delete(make_key(key))
 
 
 def set_key_normal(key, value, expiry_time=3600):
@@ -53,7 +214,7 @@ def set_key_normal(key, value, expiry_time=3600):
         Returns:
             True or False
     """
-  return r.set(key, value, ex=expiry_time)
+  return r.set(make_key(key), value, ex=expiry_time)
 
 
 def get_key_normal(key):
@@ -66,4 +227,189 @@ def get_key_normal(key):
             value: String or Dict or Number or None
     """
 
-  return r.get(key)
+  return r.get(make_key(key))
+
+
+def get_value(key):
+  """
+        Checks for key in the process cache and then in redis, if found then,
+        Returns value against that key else Returns None
+        Args:
+            key: String
+        Returns:
+            value: String or Dict or List or Number or None
+    """
+  value = local_cache.get(key)
+  if value is None:
+    value = r.get(make_key(key))
+    if value is not None:
+      local_cache.set(key, value, CACHE_LOCAL_TTL)
+  return decode_value(value)
+
+
+def set_value(key, value, expiry_time=3600, tags=None):
+  """
+        Stores value against key in redis with a jittered expiry time and in
+        the process cache
+        Args:
+            key: String
+            value: String or Dict or List or Number
+            expiry_time: Number(Expiry time in Secs, default 3600)
+            tags: List of String, invalidate_tag of any of them deletes key
+        Returns:
+            True or False
+    """
+  value = encode_value(value)
+  local_cache.set(key, value, expiry_time)
+  return store(key, value, jitter_ttl(expiry_time), tags)
+
+
+def get_many(keys):
+  """
+        Returns the values of several keys, the keys missing in the process
+        cache are read from redis in a single round trip
+        Args:
+            keys: List of String
+        Returns:
+            values: Dict of key and value, None for missing keys
+    """
+  values = {key: local_cache.get(key) for key in keys}
+  missing_keys = [key for key, value in values.items() if value is None]
+  if missing_keys:
+    redis_values = r.mget([make_key(key) for key in missing_keys])
+    for key, value in zip(missing_keys, redis_values):
+      if value is not None:
+        local_cache.set(key, value, CACHE_LOCAL_TTL)
+        values[key] = value
+  return {key: decode_value(value) for key, value in values.items()}
+
+
+def set_many(mapping, expiry_time=3600, tags=None):
+  """
+        Stores several values in redis in a single pipelined round trip
+        Args:
+            mapping: Dict of key and value
+            expiry_time: Number(Expiry time in Secs, default 3600)
+            tags: Dict of key and its list of tags
+        Returns:
+            True or False
+    """
+  tags = tags or {}
+  pipeline = r.pipeline(transaction=False)
+  set_positions = []
+  for key, value in mapping.items():
+    value = encode_value(value)
+    local_cache.set(key, value, expiry_time)
+    set_positions.append(len(pipeline))
+    queue_set(pipeline, key, value, jitter_ttl(expiry_time), tags.get(key))
+  results = pipeline.execute()
+  return all(results[position] for position in set_positions)
+
+
+def delete_many(keys):
+  """
+        Deletes several keys from the process cache and redis
+        Args:
+            keys: List of String
+        Returns:
+            Number of keys deleted from redis
+    """
+  if not keys:
+    return 0
+  for key in keys:
+    local_cache.delete(key)
+  return r.delete(*[make_key(key) for key in keys])
+
+
+def invalidate_tag(*tags):
+  """
+        Deletes every key stored with any of the given tags. Other processes
+        may keep serving their in-process copy for up to CACHE_LOCAL_TTL
+        Args:
+            tags: String e.g. "section:{section_id}", "user:{user_id}"
+        Returns:
+            Number of keys deleted from redis
+    """
+  pipeline = r.pipeline(transaction=False)
+  for tag in tags:
+    pipeline.smembers(make_tag_key(tag))
+  members = pipeline.execute()
+
+  keys = set()
+  for tag, tag_members in zip(tags, members):
+    tag_members = [member.decode("utf-8") for member in tag_members]
+    if tag_members:
+      keys.update(tag_members)
+      # only the keys read above are removed so that keys tagged in the
+      # meantime are not lost
+      pipeline.srem(make_tag_key(tag), *tag_members)
+  if not keys:
+    return 0
+  for key in keys:
+    local_cache.delete(key)
+  pipeline.delete(*[make_key(key) for key in keys])
+  return pipeline.execute()[-1]
+
+
+def get_or_set(key, loader, expiry_time=3600, tags=None):
+  """
+        Returns the cached value of key, on a miss the value is computed by
+        loader and cached. Concurrent misses of the same key in the process
+        call loader only once
+        Args:
+            key: String
+            loader: Function without arguments returning the value
+            expiry_time: Number(Expiry time in Secs, default 3600)
+            tags: List of String, invalidate_tag of any of them deletes key
+        Returns:
+            value: String or Dict or List or Number or None
+    """
+  def load():
+    value = local_cache.get(key)
+    if value is None:
+      value = r.get(make_key(key))
+      if value is None:
+        result = loader()
+        if result is None:
+          return None
+        value = encode_value(result)
+        store(key, value, jitter_ttl(expiry_time), tags)
+      local_cache.set(key, value, expiry_time)
+    return value
+
+  value = local_cache.get(key)
+  if value is None:
+    value = single_flight.do(key, load)
+  # every caller decodes its own copy so that cached values are not shared
+  return decode_value(value)
+
+
+def cached(key, ttl=3600, tags=None):
+  """
+        Decorator caching the return value of a function with get_or_set.
+        None return values are not cached
+        Args:
+            key: String format pattern filled with the arguments of the
+              function e.g. "{cohort_id}::{user_id}", or a function called
+              with the same arguments returning the key
+            ttl: Number(Expiry time in Secs, default 3600)
+            tags: List of String format patterns filled like key
+              e.g. ["cohort:{cohort_id}", "user:{user_id}"]
+    """
+  def decorator(func):
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+      arguments = signature.bind(*args, **kwargs)
+      arguments.apply_defaults()
+      if callable(key):
+        cache_key = key(*args, **kwargs)
+      else:
+        cache_key = key.format(**arguments.arguments)
+      cache_tags = [tag.format(**arguments.arguments) for tag in tags or []]
+      return get_or_set(cache_key, lambda: func(*args, **kwargs), ttl,
+                        cache_tags)
+
+    return wrapper
+  return decorator
@@ -0,0 +1,230 @@
+"""Unit test cases for the layered cache service"""
+import datetime
+import threading
+import time
+from unittest import mock
+import pytest
+# disabling pylint rules that conflict with pytest fixtures
+# pylint: disable=unused-argument
+from common.utils import cache_service
+from common.utils.cache_service import (LocalCache, cached, decode_value,
+                                        encode_value, get_or_set, get_value,
+                                        set_key, get_key, delete_key,
+                                        set_value, get_many, set_many,
+                                        delete_many, invalidate_tag)
+
+
+class FakeRedis():
+  """Dict backed stand in for the get/set/delete calls of redis.Redis"""
+
+  def __init__(self):
+    self.data = {}
+    self.expiry = {}
+    self.mget_calls = 0
+    self.pipeline_calls = 0
+
+  def get(self, key):
+    return self.data.get(key)
+
+  def set(self, key, value, ex=None):
+    if isinstance(value, str):
+      value = value.encode("utf-8")
+    self.data[key] = value
+    self.expiry[key] = ex
+    return True
+
+  def mget(self, keys):
+    self.mget_calls += 1
+    return [self.data.get(key) for key in keys]
+
+  def delete(self, *keys):
+    return len([self.data.pop(key) for key in keys if key in self.data])
+
+  def sadd(self, key, *members):
+    members = {member.encode("utf-8") for member in members}
+    tag_members = self.data.setdefault(key, set())
+    added = len(members - tag_members)
+    tag_members.update(members)
+    return added
+
+  def smembers(self, key):
+    return set(self.data.get(key, set()))
+
+  def srem(self, key, *members):
+    tag_members = self.data.get(key, set())
+    members = {member.encode("utf-8") for member in members}
+    removed = len(tag_members & members)
+    tag_members -= members
+    return removed
+
+  def expire(self, key, seconds):
+    self.expiry[key] = seconds
+    return key in self.data
+
+  def pipeline(self, transaction=True):
+    return FakePipeline(self)
+
+
+class FakePipeline():
+  """Queues the calls of a pipeline until execute"""
+
+  def __init__(self, fake_redis):
+    self.fake_redis = fake_redis
+    self.commands = []
+
+  def __len__(self):
+    return len(self.commands)
+
+  def __getattr__(self, name):
+    method = getattr(self.fake_redis, name)
+    return lambda *args, **kwargs: self.commands.append(
+        (method, args, kwargs))
+
+  def execute(self):
+    self.fake_redis.pipeline_calls += 1
+    commands, self.commands = self.commands, []
+    return [method(*args, **kwargs) for method, args, kwargs in commands]
+
+
+@pytest.fixture(name="fake_redis")
+def fixture_fake_redis():
+  fake_redis = FakeRedis()
+  cache_service.local_cache.clear()
+  with mock.patch("common.utils.cache_service.r", fake_redis):
+    yield fake_redis
+  cache_service.local_cache.clear()
+
+
+def test_encode_value():
+  value = {"name": "test", "marks": [1, 2.5], "time":
+           datetime.datetime(2023, 1, 1)}
+  encoded = encode_value(value)
+  assert encoded.startswith(cache_service.BINARY_PREFIX)
+  assert decode_value(encoded) == {"name": "test", "marks": [1, 2.5],
+                                   "time": "2023-01-01T00:00:00"}
+  # integers msgpack cannot represent fall back to JSON
+  assert decode_value(encode_value({"big": 2**70})) == {"big": 2**70}
+  assert decode_value(b'{"legacy": true}') == {"legacy": True}
+
+
+def test_local_cache_lru_and_expiry():
+  local_cache = LocalCache(max_entries=2, ttl=60)
+  local_cache.set("a", b"1", 60)
+  local_cache.set("b", b"2", 60)
+  assert local_cache.get("a") == b"1"
+  local_cache.set("c", b"3", 60)
+  assert local_cache.get("b") is None
+  assert local_cache.get("a") == b"1"
+
+  local_cache.set("d", b"4", 0.01)
+  time.sleep(0.02)
+  assert local_cache.get("d") is None
+
+
+def test_set_value_and_get_value(fake_redis):
+  assert set_value("key", {"a": 1}, 100)
+  assert 90 <= fake_redis.expiry["key"] <= 100
+  fake_redis.data.clear()
+  # served from the process cache without redis
+  assert get_value("key") == {"a": 1}
+  delete_key("key")
+  assert get_value("key") is None
+
+
+def test_get_key_reads_json(fake_redis):
+  set_key("key", [1, 2])
+  assert get_key("key") == [1, 2]
+
+
+def test_get_or_set_single_flight(fake_redis):
+  calls = []
+  started = threading.Event()
+  release = threading.Event()
+
+  def loader():
+    calls.append(1)
+    started.set()
+    release.wait(5)
+    return {"value": 1}
+
+  results = []
+  threads = [
+      threading.Thread(
+          target=lambda: results.append(get_or_set("key", loader)))
+      for _ in range(5)
+  ]
+  threads[0].start()
+  started.wait(5)
+  for thread in threads[1:]:
+    thread.start()
+  time.sleep(0.05)
+  release.set()
+  for thread in threads:
+    thread.join()
+
+  assert len(calls) == 1
+  assert results == [{"value": 1}] * 5
+  assert results[0] is not results[1]
+
+
+def test_cached_decorator(fake_redis):
+  calls = []
+
+  @cached(key="{cohort_id}::{user_id}", ttl=60)
+  def get_progress(cohort_id, user_id, headers=None):
+    calls.append((cohort_id, user_id))
+    return [{"section_id": cohort_id, "progress_percentage": 50}]
+
+  assert get_progress("c1", "u1") == get_progress("c1", user_id="u1")
+  get_progress("c2", "u1")
+  assert calls == [("c1", "u1"), ("c2", "u1")]
+  assert "c1::u1" in fake_redis.data
+
+
+def test_many_keys(fake_redis):
+  assert set_many({"section::1": {"progress": 10}, "section::2": [1]}, 60)
+  assert fake_redis.pipeline_calls == 1
+  cache_service.local_cache.delete("section::2")
+
+  values = get_many(["section::1", "section::2", "section::3"])
+  assert values == {"section::1": {"progress": 10}, "section::2": [1],
+                    "section::3": None}
+  assert fake_redis.mget_calls == 1
+
+  assert delete_many(["section::1", "section::2"]) == 2
+  assert get_many(["section::1"]) == {"section::1": None}
+
+
+def test_key_prefix(fake_redis):
+  with mock.patch("common.utils.cache_service.CACHE_KEY_PREFIX", "lms::"):
+    set_key("key", 1)
+    assert get_key("key") == 1
+  assert "lms::key" in fake_redis.data
+
+
+def test_invalidate_tag(fake_redis):
+  calls = []
+
+  @cached(key="{cohort_id}::{user_id}", ttl=60,
+          tags=["cohort:{cohort_id}", "user:{user_id}"])
+  def get_progress(cohort_id, user_id):
+    calls.append((cohort_id, user_id))
+    return {"progress": 10}
+
+  get_progress("c1", "u1")
+  get_progress("c1", "u2")
+  set_key("analytics::u1", {"courses": []}, tags=["user:u1"])
+  set_many({"section::s1::u1": 10, "section::s2::u1": 20}, 60,
+           {"section::s1::u1": ["section:s1"],
+            "section::s2::u1": ["section:s2"]})
+
+  assert invalidate_tag("user:u1", "section:s1") == 3
+  assert get_key("analytics::u1") is None
+  assert get_many(["section::s1::u1", "section::s2::u1"]) == {
+      "section::s1::u1": None, "section::s2::u1": 20}
+  get_progress("c1", "u1")
+  get_progress("c1", "u2")
+  assert calls == [("c1", "u1"), ("c1", "u2"), ("c1", "u1")]
+
+  assert invalidate_tag("cohort:c1") == 2
+  assert invalidate_tag("cohort:c1") == 0
@@ -0,0 +1,60 @@
+"""Index of the cognitive wrapper module gating each project module"""
+from common.models import LearningExperience, LearningObject
+
+
+class CognitiveWrapperIndex():
+  """Keeps the uuid of the cognitive wrapper sibling of every project module
+  in its cognitive_wrapper_uuid field, so that the ungate flag of the first
+  learning resource of a project is a lookup in the learner progress"""
+
+  @classmethod
+  def find_cognitive_wrapper(cls, unit_fields, modules):
+    """Returns the uuid of the cognitive wrapper among the modules of a
+    learning experience, "" if there is none
+    Args:
+      unit_fields: dict - fields of the learning experience
+      modules: dict - uuid to fields of its child learning objects
+    """
+    cognitive_wrapper_uuid = ""
+    for level in unit_fields.get("child_nodes", {}).values():
+      for module_id in level[::-1]:
+        module = modules.get(module_id)
+        if module is not None and module.get("type") == "cognitive_wrapper":
+          cognitive_wrapper_uuid = module_id
+          break
+    return cognitive_wrapper_uuid
+
+  @classmethod
+  def update(cls, unit_uuids):
+    """Updates the index of the project modules of the given learning
+    experiences
+    Args:
+      unit_uuids: list - uuids of learning experiences whose modules were
+        added, removed or changed
+    Returns:
+      list - uuids of the project modules whose index changed
+    """
+    units, _ = LearningExperience.find_by_uuids(unit_uuids)
+    module_uuids = [
+        module_id for unit in units
+        for level in (unit.child_nodes or {}).values() for module_id in level
+    ]
+    modules, _ = LearningObject.find_by_uuids(module_uuids)
+    modules = {module.uuid: module for module in modules}
+    module_fields = {
+        uuid: {"type": module.type} for uuid, module in modules.items()
+    }
+
+    updated_uuids = []
+    for unit in units:
+      cognitive_wrapper_uuid = cls.find_cognitive_wrapper(
+          {"child_nodes": unit.child_nodes or {}}, module_fields)
+      for level in (unit.child_nodes or {}).values():
+        for module_id in level:
+          module = modules.get(module_id)
+          if module is not None and module.type == "project" and \
+              module.cognitive_wrapper_uuid != cognitive_wrapper_uuid:
+            module.cognitive_wrapper_uuid = cognitive_wrapper_uuid
+            module.update()
+            updated_uuids.append(module_id)
+    return updated_uuids
@@ -0,0 +1,69 @@
+"""Unit test cases for the cognitive wrapper index"""
+import types
+from common.models import LearningExperience, LearningObject
+# disabling pylint rules that conflict with pytest fixtures
+# pylint: disable=unused-argument,redefined-outer-name,unused-import
+from common.testing.example_objects import CHILD_LEARNING_OBJECTS
+from common.testing.firestore_emulator import (clean_firestore,
+                                               firestore_emulator)
+from common.utils.cognitive_wrapper_index import CognitiveWrapperIndex
+from common.utils.node_loader import NodeLoader
+from common.utils.parent_child_nodes_handler import ParentChildNodesHandler
+
+
+def test_find_cognitive_wrapper():
+  unit = {"child_nodes": {"learning_objects": ["cw_1", "project", "cw_2"]}}
+  modules = {
+      "cw_1": {"type": "cognitive_wrapper"},
+      "project": {"type": "project"},
+      "cw_2": {"type": "cognitive_wrapper"}
+  }
+  assert CognitiveWrapperIndex.find_cognitive_wrapper(unit, modules) == "cw_2"
+  modules["cw_2"]["type"] = "srl"
+  assert CognitiveWrapperIndex.find_cognitive_wrapper(unit, modules) == "cw_1"
+  assert CognitiveWrapperIndex.find_cognitive_wrapper(
+      unit, {"project": {"type": "project"}}) == ""
+
+
+def test_ungate_uses_index():
+  loader = NodeLoader()
+  loader.prime("learning_objects", {
+      "uuid": "project",
+      "type": "project",
+      "cognitive_wrapper_uuid": "cw",
+      "parent_nodes": {"learning_experiences": ["unit"]}
+  })
+  learner_profile = types.SimpleNamespace(
+      progress={"learning_objects": {"cw": {"is_locked": False}}},
+      achievements=None)
+  node = {"uuid": "lr", "order": 1, "type": "static", "alias": "lr",
+          "parent_nodes": {"learning_objects": ["project"]}}
+  node = ParentChildNodesHandler.update_hierarchy_with_profile_data(
+      learner_profile, node, "learning_resources", "lr", loader=loader)
+  assert node["ungate"] is True
+
+
+def test_update(clean_firestore):
+  module_ids = []
+  for module_type in ["cognitive_wrapper", "project"]:
+    module = LearningObject.from_dict(CHILD_LEARNING_OBJECTS[0])
+    module.type = module_type
+    module.is_deleted = False
+    module.save()
+    module.uuid = module.id
+    module.update()
+    module_ids.append(module.id)
+
+  unit = LearningExperience()
+  unit.name = "Unit"
+  unit.child_nodes = {"learning_objects": module_ids}
+  unit.parent_nodes = {}
+  unit.is_deleted = False
+  unit.save()
+  unit.uuid = unit.id
+  unit.update()
+
+  assert CognitiveWrapperIndex.update([unit.id]) == [module_ids[1]]
+  project = LearningObject.find_by_uuid(module_ids[1])
+  assert project.cognitive_wrapper_uuid == module_ids[0]
+  assert not CognitiveWrapperIndex.update([unit.id])
@@ -1,5 +1,8 @@
 """Common functionalities for various data models"""
 from common.utils.parent_child_nodes_handler import ParentChildNodesHandler
+from common.utils.hierarchy_change_handler import HierarchyChangeHandler
+from common.utils.submitted_assessment_search import (
+    SubmittedAssessmentSearchHandler)
 
 class CommonAPIHandler:
   """Class containing common functions used by various data models"""
@@ -28,6 +31,11 @@ class CommonAPIHandler:
 
     updated_doc_fields = \
         existing_doc_object.get_fields(reformat_datetime=True)
+    collection_name = ParentChildNodesHandler.get_collection_name(collection)
+    HierarchyChangeHandler.node_changed(collection_name, updated_doc_fields,
+                                        existing_doc_object_dict)
+    SubmittedAssessmentSearchHandler.node_renamed(
+        collection_name, updated_doc_fields, existing_doc_object_dict)
 
     return updated_doc_fields
 
@@ -72,9 +80,7 @@ class CommonAPIHandler:
     versioned_doc.uuid = versioned_doc.id
     versioned_doc.update()
     updated_doc_fields = versioned_doc.get_fields(reformat_datetime=True)
-    ParentChildNodesHandler.update_child_references(
-        updated_doc_fields, collection, operation="add")
-    ParentChildNodesHandler.update_parent_references(
+    ParentChildNodesHandler.update_nodes_references(
         updated_doc_fields, collection, operation="add")
     return updated_doc_fields
 
@@ -103,9 +109,7 @@ class CommonAPIHandler:
       copy_doc.id
     copy_doc.update()
     copy_doc_fields = copy_doc.get_fields(reformat_datetime=True)
-    ParentChildNodesHandler.update_child_references(
-        copy_doc_fields, collection, operation="add")
-    ParentChildNodesHandler.update_parent_references(
+    ParentChildNodesHandler.update_nodes_references(
         copy_doc_fields, collection, operation="add")
     return copy_doc_fields
 
@@ -163,6 +167,9 @@ class CommonAPIHandler:
     versioned_doc.is_implicit = True
     versioned_doc.update()
     updated_doc_fields = versioned_doc.get_fields(reformat_datetime=True)
+    HierarchyChangeHandler.node_changed(
+        ParentChildNodesHandler.get_collection_name(collection),
+        updated_doc_fields)
 
     return updated_doc_fields
 
@@ -173,6 +180,7 @@ class CommonAPIHandler:
     prerequisites of all the documents in the given 'collection'.
     """
     docs = collection.collection.fetch()
+    updated_uuids = []
     for doc in docs:
       doc_dict = doc.to_dict()
       prerequisites = doc_dict.get("prerequisites", {})
@@ -181,3 +189,7 @@ class CommonAPIHandler:
         if key_field and uuid in key_field:
           doc.prerequisites[key].remove(uuid)
           doc.update()
+          updated_uuids.append(doc.uuid)
+    HierarchyChangeHandler.nodes_changed(
+        {ParentChildNodesHandler.get_collection_name(collection):
+         updated_uuids})
@@ -48,6 +48,9 @@ JOB_TYPE_CREATE_KNOWLEDGE_GRAPH_EMBEDDING = "create_knowledge_graph_embedding"
 JOB_TYPE_DEEP_KNOWLEDGE_TRACING = "deep-knowledge-tracing"
 JOB_TYPE_VALIDATE_AND_UPLOAD_ZIP = "validate_and_upload_zip"
 JOB_TYPE_QUERY_ENGINE_BUILD = "query_engine_build"
+JOB_TYPE_BACKFILL_ANCESTOR_PATHS = "backfill_ancestor_paths"
+JOB_TYPE_COPY_LEARNING_HIERARCHY = "copy_learning_hierarchy"
+JOB_TYPE_DELETE_LEARNING_HIERARCHY = "delete_learning_hierarchy"
 
 JOB_TYPES_WITH_PREDETERMINED_TITLES = [
     JOB_TYPE_UNIFIED_ALIGNMENT,
@@ -68,7 +71,10 @@ JOB_TYPES_WITH_PREDETERMINED_TITLES = [
     JOB_TYPE_CREATE_KNOWLEDGE_GRAPH_EMBEDDING,
     JOB_TYPE_DEEP_KNOWLEDGE_TRACING,
     JOB_TYPE_VALIDATE_AND_UPLOAD_ZIP,
-    JOB_TYPE_QUERY_ENGINE_BUILD
+    JOB_TYPE_QUERY_ENGINE_BUILD,
+    JOB_TYPE_BACKFILL_ANCESTOR_PATHS,
+    JOB_TYPE_COPY_LEARNING_HIERARCHY,
+    JOB_TYPE_DELETE_LEARNING_HIERARCHY
 ]
 
 class JobTypes(Enum):
@@ -117,5 +123,26 @@ SERVICES = {
   }
 }
 
+# "local" verifies Firebase ID tokens in the calling service and only falls
+# back to the authentication service when that is not possible, "remote"
+# always asks the authentication service
+AUTH_TOKEN_VERIFICATION = os.getenv("AUTH_TOKEN_VERIFICATION", "remote")
+FIREBASE_PROJECT_ID = os.getenv("FIREBASE_PROJECT_ID") or \
+  os.getenv("PROJECT_ID") or os.getenv("GOOGLE_CLOUD_PROJECT")
+FIREBASE_CERTIFICATES_URL = os.getenv(
+  "FIREBASE_CERTIFICATES_URL",
+  "https://www.googleapis.com/robot/v1/metadata/x509/"
+  "securetoken@system.gserviceaccount.com")
+# Seconds the user type of a token's user is kept in the shared cache
+AUTH_USER_CACHE_TTL = int(os.getenv("AUTH_USER_CACHE_TTL", "300"))
+# Seconds a validated token is kept in the process, never beyond its exp
+AUTH_TOKEN_CACHE_TTL = int(os.getenv("AUTH_TOKEN_CACHE_TTL", "60"))
+AUTH_TOKEN_CACHE_MAX_ENTRIES = int(
+  os.getenv("AUTH_TOKEN_CACHE_MAX_ENTRIES", "10000"))
+# Connection pool and timeouts of the calls to the authentication service
+AUTH_HTTP_POOL_SIZE = int(os.getenv("AUTH_HTTP_POOL_SIZE", "20"))
+AUTH_HTTP_CONNECT_TIMEOUT = float(os.getenv("AUTH_HTTP_CONNECT_TIMEOUT", "3"))
+AUTH_HTTP_READ_TIMEOUT = float(os.getenv("AUTH_HTTP_READ_TIMEOUT", "30"))
+
 STAFF_USERS = ["assessor", "instructor", "coach"]
 EXTERNAL_USER_PROPERTY_PREFIX = os.getenv("EXTERNAL_USER_PROPERTY_PREFIX")
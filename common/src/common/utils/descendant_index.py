@@ -0,0 +1,127 @@
+"""Index of the assessments below the nodes of the learning hierarchy"""
+from common.models.tree_snapshot import get_node_key
+from common.utils.collection_references import collection_references
+
+
+class DescendantIndex():
+  """Keeps the uuids of every assessment below a curriculum pathway, learning
+  experience or learning object in its assessment_ids field, so that the
+  assessments of a discipline are looked up with a single read.
+
+  The index of a node is the union of the indexes of its children and of
+  its child assessments. When nodes change, only they are recomputed from
+  their direct children, and the change is propagated to their parents
+  until an index stays the same. The indexes that are not stored yet are
+  computed and stored on their first lookup.
+  """
+
+  INDEXED_COLLECTIONS = [
+      "curriculum_pathways", "learning_experiences", "learning_objects"
+  ]
+
+  @classmethod
+  def get_assessment_ids(cls, collection_type, uuid):
+    """Returns the uuids of the assessments below a node
+    Args:
+      collection_type: str - collection type of the node
+      uuid: str - uuid of the node
+    Raises:
+      ResourceNotFoundException: If the node does not exist
+    Returns:
+      list - uuids of the assessments
+    """
+    node = collection_references[collection_type].find_by_uuid(uuid)
+    if node.assessment_ids is not None:
+      return node.assessment_ids
+    return cls.compute(collection_type, node, {}, {})
+
+  @classmethod
+  def update(cls, nodes):
+    """Recomputes the indexes of the given nodes and of their ancestors
+    Args:
+      nodes: dict - collection type to list of uuids of the nodes whose
+        children were added, removed or changed
+    Returns:
+      dict - collection type to list of uuids of the nodes whose index was
+        updated
+    """
+    cache = {}
+    computed = {}
+    updated_nodes = {}
+    current_level = nodes
+    while current_level:
+      next_level = {}
+      for collection_type, uuids in current_level.items():
+        if collection_type not in cls.INDEXED_COLLECTIONS:
+          continue
+        for uuid, node in cls.load_nodes(cache, collection_type,
+                                         uuids).items():
+          previous_ids = node.assessment_ids
+          computed.pop(get_node_key(collection_type, uuid), None)
+          if cls.compute(collection_type, node, cache,
+                         computed) == previous_ids:
+            continue
+          updated_nodes.setdefault(collection_type, []).append(uuid)
+          for parent_type, parent_uuids in (node.parent_nodes or {}).items():
+            next_level.setdefault(parent_type, []).extend(parent_uuids)
+      current_level = {
+          collection_type: list(dict.fromkeys(uuids))
+          for collection_type, uuids in next_level.items() if uuids
+      }
+    return updated_nodes
+
+  @classmethod
+  def compute(cls, collection_type, node, cache, computed):
+    """Computes and stores the index of a node from its children, computing
+    the indexes of the children that are not stored yet
+    Args:
+      collection_type: str - collection type of the node
+      node: model object of the node
+      cache: dict - node key to the model objects already read
+      computed: dict - node key to the indexes computed in this call
+    Returns:
+      list - uuids of the assessments below the node
+    """
+    node_key = get_node_key(collection_type, node.uuid)
+    # guards against a cycle in the hierarchy
+    computed[node_key] = []
+    assessment_ids = []
+    for child_type, child_uuids in (node.child_nodes or {}).items():
+      if child_type == "assessments":
+        assessment_ids.extend(child_uuids)
+      elif child_type in cls.INDEXED_COLLECTIONS and child_uuids:
+        children = cls.load_nodes(cache, child_type, child_uuids)
+        for child_uuid, child in children.items():
+          child_key = get_node_key(child_type, child_uuid)
+          if child_key in computed:
+            assessment_ids.extend(computed[child_key])
+          elif child.assessment_ids is not None:
+            assessment_ids.extend(child.assessment_ids)
+          else:
+            assessment_ids.extend(
+                cls.compute(child_type, child, cache, computed))
+    assessment_ids = list(dict.fromkeys(assessment_ids))
+    computed[node_key] = assessment_ids
+    if node.assessment_ids != assessment_ids:
+      node.assessment_ids = assessment_ids
+      node.update()
+    return assessment_ids
+
+  @classmethod
+  def load_nodes(cls, cache, collection_type, uuids):
+    """Returns the model objects of the existing nodes by uuid, reading the
+    ones that are not cached yet"""
+    missing_uuids = [
+        uuid for uuid in uuids
+        if get_node_key(collection_type, uuid) not in cache
+    ]
+    if missing_uuids:
+      documents, _ = collection_references[collection_type].find_by_uuids(
+          missing_uuids)
+      for document in documents:
+        cache[get_node_key(collection_type, document.uuid)] = document
+    return {
+        uuid: cache[get_node_key(collection_type, uuid)]
+        for uuid in uuids
+        if get_node_key(collection_type, uuid) in cache
+    }
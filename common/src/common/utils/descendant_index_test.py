@@ -0,0 +1,58 @@
+"""Unit test cases for the descendant index"""
+from common.models import (CurriculumPathway, LearningExperience,
+                           LearningObject)
+# disabling pylint rules that conflict with pytest fixtures
+# pylint: disable=unused-argument,redefined-outer-name,unused-import
+from common.testing.firestore_emulator import (clean_firestore,
+                                               firestore_emulator)
+from common.utils.assessor_handler import traverse_down
+from common.utils.descendant_index import DescendantIndex
+
+
+def create_node(model, **fields):
+  node = model()
+  node.name = "Node"
+  for key, value in fields.items():
+    setattr(node, key, value)
+  node.is_deleted = False
+  node.save()
+  node.uuid = node.id
+  node.update()
+  return node
+
+
+def test_descendant_index(clean_firestore):
+  module = create_node(LearningObject,
+                       child_nodes={"assessments": ["assessment_1"]})
+  unit = create_node(LearningExperience,
+                     child_nodes={"learning_objects": [module.id],
+                                  "assessments": ["assessment_2"]})
+  module.parent_nodes = {"learning_experiences": [unit.id]}
+  module.update()
+  discipline = create_node(CurriculumPathway, alias="discipline",
+                           child_nodes={"learning_experiences": [unit.id]})
+  unit.parent_nodes = {"curriculum_pathways": [discipline.id]}
+  unit.update()
+
+  # the indexes are computed and stored on the first lookup
+  assert traverse_down(discipline.id, "curriculum_pathways", "assessments",
+                       []) == ["assessment_1", "assessment_2"]
+  assert LearningObject.find_by_uuid(module.id).assessment_ids == [
+      "assessment_1"
+  ]
+
+  # a change below the discipline is propagated to its ancestors
+  module = LearningObject.find_by_uuid(module.id)
+  module.child_nodes = {"assessments": ["assessment_1", "assessment_3"]}
+  module.update()
+  assert DescendantIndex.update({"learning_objects": [module.id]}) == {
+      "learning_objects": [module.id],
+      "learning_experiences": [unit.id],
+      "curriculum_pathways": [discipline.id]
+  }
+  assert DescendantIndex.get_assessment_ids(
+      "curriculum_pathways",
+      discipline.id) == ["assessment_1", "assessment_3", "assessment_2"]
+
+  # nodes whose index stays the same are not propagated
+  assert not DescendantIndex.update({"learning_objects": [module.id]})
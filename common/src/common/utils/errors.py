@@ -67,6 +67,15 @@ class TokenNotFoundError(Exception):
     super().__init__(self.message)
 
 
+class CertificatesUnavailableError(Exception):
+  """Error class to be raised when token signing certificates cannot be
+  obtained"""
+
+  def __init__(self, message="Token signing certificates unavailable"):
+    self.message = message
+    super().__init__(self.message)
+
+
 class InvalidCredentialsError(Exception):
   """Error class to be raised when invalid/incorrect credentials are passed"""
 
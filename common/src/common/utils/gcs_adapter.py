@@ -1,13 +1,26 @@
 """Module for GCS Services"""
 import os
+import base64
+import functools
+import hashlib
+import shutil
+import time
 import gcsfs
 import traceback
 import logging
 import glob
+import mimetypes
+from concurrent.futures import ThreadPoolExecutor
 from io import StringIO
 import csv
 from datetime import timedelta
+from zipfile import ZipFile
+import requests
+from google.api_core import exceptions as api_exceptions
 from google.cloud import storage
+from common.config import (GCS_UPLOAD_CHUNK_SIZE, GCS_TRANSFER_MAX_WORKERS,
+                           GCS_TRANSFER_MAX_RETRIES, GCS_TRANSFER_RETRY_DELAY)
+from common.utils.errors import PayloadTooLargeError
 from common.utils.logging_handler import Logger
 
 # pylint: disable=consider-using-f-string, logging-format-interpolation
@@ -15,6 +28,22 @@ from common.utils.logging_handler import Logger
 
 gcs_bucket = os.environ.get("GCP_PROJECT")
 
+# errors of a transfer that are worth retrying
+TRANSIENT_ERRORS = (api_exceptions.TooManyRequests,
+                    api_exceptions.InternalServerError,
+                    api_exceptions.BadGateway,
+                    api_exceptions.ServiceUnavailable,
+                    api_exceptions.GatewayTimeout,
+                    requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout, ConnectionError)
+
+
+@functools.lru_cache(maxsize=None)
+def get_storage_client():
+  """Returns the storage client shared by the process, which keeps its
+  credentials and connection pool across calls"""
+  return storage.Client()
+
 
 class GcsCrudService:
   """
@@ -26,7 +55,7 @@ class GcsCrudService:
       self.storage_client = storage.Client.from_service_account_json(
           signurl_sa_path)
     else:
-      self.storage_client = storage.Client()
+      self.storage_client = get_storage_client()
     self.bucket_name = bucket_name
     self.bucket = self.storage_client.bucket(bucket_name)
 
@@ -71,7 +100,7 @@ class GcsCrudService:
 
   def get_blob_from_gcs_path(self, gcs_path):
     """returns blob object using gcs_path"""
-    storage_client = storage.Client()
+    storage_client = self.storage_client
     bucket_name = gcs_path.split("gs://")[1].split("/")[0]
     blob_name = gcs_path.split(bucket_name)[-1].strip("/")
     bucket = storage_client.bucket(bucket_name)
@@ -208,17 +237,194 @@ class GcsCrudService:
 
       Returns: uri
       """
-    client = storage.Client()
-    bucket = client.get_bucket(self.bucket_name)
+    bucket = self.storage_client.get_bucket(self.bucket_name)
     blob = bucket.blob(f"{prefix}/{file_name}")
     blob.upload_from_filename(file_path)
     return f"gs://{self.bucket_name}/{prefix}/{file_name}"
 
 
-def download_blob(base_path, destination_folder="data"):
-  """Download all the files from the GCS path into a local folder."""
-  storage_client = storage.Client()
+def get_file_checksum(file_path):
+  """Returns the base64 encoded md5 hash of a local file, in the format of
+  the md5_hash of a GCS blob"""
+  md5 = hashlib.md5()
+  with open(file_path, "rb") as file:
+    for chunk in iter(lambda: file.read(1024 * 1024), b""):
+      md5.update(chunk)
+  return base64.b64encode(md5.digest()).decode("utf-8")
+
+
+class GcsBackend():
+  """Transfers single files between the local disk and GCS"""
+
+  def __init__(self, client=None):
+    self.client = client or get_storage_client()
+
+  def list_checksums(self, bucket_name, prefix):
+    """Returns the md5 hash of the blobs under a prefix, by blob name. The
+    composite blobs have no md5 hash and map to None"""
+    return {
+        blob.name: blob.md5_hash
+        for blob in self.client.list_blobs(bucket_name, prefix=prefix)
+        if not blob.name.endswith("/")
+    }
+
+  def upload(self, bucket_name, source_path, blob_name):
+    self.client.bucket(bucket_name).blob(blob_name).upload_from_filename(
+        source_path)
+
+  def download(self, bucket_name, blob_name, destination_path):
+    self.client.bucket(bucket_name).blob(blob_name).download_to_filename(
+        destination_path)
+
+
+class LocalBackend():
+  """Stand-in of GcsBackend for the tests, storing each bucket as a folder
+  of a local directory"""
+
+  def __init__(self, root):
+    self.root = root
+
+  def get_path(self, bucket_name, blob_name):
+    return os.path.join(self.root, bucket_name, *blob_name.split("/"))
+
+  def list_checksums(self, bucket_name, prefix):
+    bucket_path = os.path.join(self.root, bucket_name)
+    checksums = {}
+    for file_path in glob.glob(bucket_path + "/**", recursive=True):
+      blob_name = os.path.relpath(file_path, bucket_path).replace(os.sep, "/")
+      if os.path.isfile(file_path) and blob_name.startswith(prefix):
+        checksums[blob_name] = get_file_checksum(file_path)
+    return checksums
+
+  def upload(self, bucket_name, source_path, blob_name):
+    destination_path = self.get_path(bucket_name, blob_name)
+    os.makedirs(os.path.dirname(destination_path), exist_ok=True)
+    shutil.copyfile(source_path, destination_path)
+
+  def download(self, bucket_name, blob_name, destination_path):
+    shutil.copyfile(self.get_path(bucket_name, blob_name), destination_path)
+
+
+class TransferEngine():
+  """Uploads and downloads whole folders, transferring the files
+  concurrently on a bounded thread pool.
+
+  Each file is retried with an exponential backoff on the transient errors
+  of GCS, and the files whose md5 hash matches on both sides can be skipped
+  so that a folder synced again only moves the files that changed.
+  """
+
+  def __init__(self,
+               backend=None,
+               max_workers=GCS_TRANSFER_MAX_WORKERS,
+               max_retries=GCS_TRANSFER_MAX_RETRIES,
+               retry_delay=GCS_TRANSFER_RETRY_DELAY):
+    self.backend = backend or GcsBackend()
+    self.max_workers = max_workers
+    self.max_retries = max_retries
+    self.retry_delay = retry_delay
+
+  def with_retries(self, transfer, *args):
+    """Runs a transfer, retrying it on a transient error after a delay
+    doubled on every attempt"""
+    for attempt in range(self.max_retries + 1):
+      try:
+        return transfer(*args)
+      except TRANSIENT_ERRORS as e:
+        if attempt == self.max_retries:
+          raise
+        delay = self.retry_delay * 2**attempt
+        Logger.warning(f"Transfer of {args} failed with {e}, "
+                       f"retrying in {delay} seconds")
+        time.sleep(delay)
+
+  def run(self, transfer, tasks):
+    """Runs a transfer for each of the tasks on the thread pool"""
+    if not tasks:
+      return
+    with ThreadPoolExecutor(max_workers=min(len(tasks), self.max_workers),
+                            thread_name_prefix="gcs_transfer") as executor:
+      list(
+          executor.map(lambda task: self.with_retries(transfer, *task),
+                       tasks))
+
+  def upload_folder(self,
+                    bucket_name,
+                    src_path,
+                    dest_base_path,
+                    skip_unchanged=False):
+    """Uploads the files of a local folder, keeping their folder structure
+    under dest_base_path
+    Args:
+      bucket_name: str - name of the bucket
+      src_path: str - local folder to upload
+      dest_base_path: str - folder of the bucket the files are uploaded to
+      skip_unchanged: bool - whether the files already uploaded with the
+        same md5 hash are skipped
+    Returns:
+      list - names of the blobs uploaded
+    """
+    tasks = []
+    for source_path in glob.glob(src_path + "/**", recursive=True):
+      if os.path.isfile(source_path):
+        relative_path = os.path.relpath(source_path, src_path)
+        tasks.append(
+            (bucket_name, source_path,
+             dest_base_path + "/" + relative_path.replace(os.sep, "/")))
+    if skip_unchanged and tasks:
+      checksums = self.backend.list_checksums(bucket_name,
+                                              dest_base_path + "/")
+      tasks = [
+          task for task in tasks
+          if checksums.get(task[2]) != get_file_checksum(task[1])
+      ]
+    self.run(self.backend.upload, tasks)
+    for _, source_path, blob_name in tasks:
+      logging.info("File {} uploaded to {}.".format(source_path, blob_name))
+    return [blob_name for _, _, blob_name in tasks]
+
+  def download_folder(self,
+                      bucket_name,
+                      prefix,
+                      destination_folder,
+                      skip_unchanged=False,
+                      flatten=False):
+    """Downloads the blobs under a prefix to a local folder, keeping their
+    folder structure below the prefix
+    Args:
+      bucket_name: str - name of the bucket
+      prefix: str - prefix of the blobs to download
+      destination_folder: str - local folder the blobs are downloaded to
+      skip_unchanged: bool - whether the local files with the same md5 hash
+        as their blob are skipped
+      flatten: bool - whether the blobs are all downloaded directly in the
+        destination folder
+    Returns:
+      list - (blob name, local path) of every blob under the prefix
+    """
+    files = []
+    # blobs flattened to the same path are downloaded once, the last wins
+    tasks = {}
+    for blob_name, checksum in self.backend.list_checksums(
+        bucket_name, prefix).items():
+      relative_path = blob_name[len(prefix):].lstrip("/")
+      if flatten:
+        relative_path = relative_path.rsplit("/", 1)[-1]
+      destination_path = os.path.join(destination_folder,
+                                      *relative_path.split("/"))
+      files.append((blob_name, destination_path))
+      if skip_unchanged and checksum and os.path.isfile(
+          destination_path) and get_file_checksum(destination_path) == checksum:
+        continue
+      os.makedirs(os.path.dirname(destination_path), exist_ok=True)
+      tasks[destination_path] = (bucket_name, blob_name, destination_path)
+    self.run(self.backend.download, list(tasks.values()))
+    return files
 
+
+def download_blob(base_path, destination_folder="data"):
+  """Download all the files from the GCS path into a local folder. The files
+  already downloaded and unchanged since are skipped"""
   if (base_path.startswith("gs://") is not True or
       base_path.endswith("/") is True):
     logging.error("GCS path names must start with \
@@ -232,28 +438,9 @@ def download_blob(base_path, destination_folder="data"):
 
   bucket_name = path[0]
   prefix = "/".join(path[1:])
-  delimiter = "/".join(path[1:])
 
-  blobs = storage_client.list_blobs(
-      bucket_name, prefix=prefix + "/", delimiter=delimiter + "/")
-
-  for blob in blobs:
-    destination_folder_path = blob.name.replace(prefix,
-                                                destination_folder).rsplit(
-                                                    "/", 1)[0]
-    os.makedirs(destination_folder_path, exist_ok=True)
-    destination_file_name = blob.name.replace(prefix, destination_folder)
-
-    if not os.path.isfile(destination_file_name):
-      if destination_file_name != (destination_folder + "/"):
-        try:
-          blob.download_to_filename(destination_file_name)
-        except TypeError:
-          logging.error("Error downloading file %s: ",
-                        str(destination_file_name))
-          continue
-    else:
-      logging.info("Files already exists")
+  TransferEngine().download_folder(bucket_name, prefix + "/",
+                                   destination_folder, skip_unchanged=True)
 
 
 def upload_blob(bucket_name, source_file_name, destination_blob_name):
@@ -266,7 +453,7 @@ def upload_blob(bucket_name, source_file_name, destination_blob_name):
   destination_blob_name = "storage-object-name"
   """
 
-  storage_client = storage.Client()
+  storage_client = get_storage_client()
   bucket = storage_client.bucket(bucket_name)
   blob = bucket.blob(destination_blob_name)
 
@@ -279,7 +466,7 @@ def upload_blob(bucket_name, source_file_name, destination_blob_name):
 def download_file_from_gcs(gcs_path, destination_folder_path="data/"):
   """downloads file from gcs"""
   try:
-    storage_client = storage.Client()
+    storage_client = get_storage_client()
     bucket_name = gcs_path.split("gs://")[1].split("/")[0]
     bucket = storage_client.get_bucket(bucket_name)
     blob_name = gcs_path.split(bucket_name)[-1].strip("/")
@@ -300,7 +487,7 @@ def is_valid_path(gcs_path):
     gcs_uri: gs://bucket-name/prefix/filename.extension
     Returns Boolean value
   """
-  storage_client = storage.Client()
+  storage_client = get_storage_client()
   if gcs_path.startswith("gs://") is not True:
     return False
   gcs_uri = gcs_path.strip("/")
@@ -323,30 +510,125 @@ def upload_file_to_bucket(bucket_name, prefix, file_name, file):
 
     Returns: uri
     """
-  client = storage.Client()
+  client = get_storage_client()
   bucket = client.get_bucket(bucket_name)
   blob = bucket.blob(f"{prefix}/{file_name}")
   blob.upload_from_file(file, rewind=True)
   return f"gs://{bucket_name}/{prefix}/{file_name}"
 
 
-def upload_folder(bucket_name, src_path, dest_base_path):
-  """Function to upload folder to destination"""
-  storage_client = storage.Client()
-  bucket = storage_client.bucket(bucket_name)
-  for source_file in glob.glob(src_path+"/**",recursive=True):
-    # The name of file on GCS once uploaded
-    if os.path.isfile(source_file):
-      destination_blob_name = dest_base_path+"/"+source_file.replace(
-        src_path+"/","")
-      blob = bucket.blob(destination_blob_name)
-      # The content that will be uploaded
-      blob.upload_from_filename(source_file)
-      logging.info(
-      "File {} uploaded to {}.".format(
-      source_file, destination_blob_name
-    )
-  )
+class SizeLimitedStream():
+  """Wraps a file object read from its current position and raises
+  PayloadTooLargeError as soon as a read goes past max_size bytes, so that
+  the size of a file is enforced while it is streamed rather than by
+  reading it whole beforehand"""
+
+  def __init__(self, file, max_size):
+    self.file = file
+    self.max_size = max_size
+    self.start = file.tell()
+
+  def read(self, size=-1):
+    data = self.file.read(size)
+    # the position is checked rather than a count of the bytes read, as an
+    # upload retrying a chunk seeks back in the stream
+    if self.file.tell() - self.start > self.max_size:
+      raise PayloadTooLargeError(
+          f"File size is larger than {self.max_size} bytes")
+    return data
+
+  def tell(self):
+    return self.file.tell()
+
+  def seek(self, offset, whence=os.SEEK_SET):
+    return self.file.seek(offset, whence)
+
+
+def upload_stream_to_bucket(bucket_name,
+                            blob_name,
+                            file,
+                            content_type=None,
+                            max_size=None,
+                            chunk_size=GCS_UPLOAD_CHUNK_SIZE):
+  """Streams a file object to gcs with a resumable upload sent in chunks, so
+  that no more than a chunk of the file is held in memory
+
+    Args:
+        bucket_name
+        blob_name: path of the file in the bucket
+        file: File object to be uploaded, read from its start
+        content_type: content type of the file
+        max_size: size in bytes above which the upload is aborted, the file
+          is then not created in the bucket
+        chunk_size: size of the chunks, a multiple of 256 KiB
+
+    Raises:
+        PayloadTooLargeError: if the file is larger than max_size
+
+    Returns: uri
+    """
+  client = get_storage_client()
+  bucket = client.bucket(bucket_name)
+  blob = bucket.blob(blob_name, chunk_size=chunk_size)
+  file.seek(0)
+  if max_size is not None:
+    file = SizeLimitedStream(file, max_size)
+  blob.upload_from_file(file, content_type=content_type)
+  return f"gs://{bucket_name}/{blob_name}"
+
+
+def get_zip_member_path(member_name):
+  """Returns the path a zip member is stored at, without the empty, "." and
+  ".." components that zipfile also drops when extracting"""
+  return "/".join(
+      part for part in member_name.replace("\\", "/").split("/")
+      if part not in ("", ".", ".."))
+
+
+def upload_zip_to_bucket(bucket_name,
+                         file,
+                         dest_base_path,
+                         chunk_size=GCS_UPLOAD_CHUNK_SIZE):
+  """Uploads the files of a zip archive to gcs, keeping their folder
+  structure under dest_base_path. Each member is streamed out of the
+  archive to its blob, without extracting the archive to disk
+
+    Args:
+        bucket_name
+        file: seekable file object of the zip archive
+        dest_base_path: folder the files are uploaded to
+        chunk_size: size of the chunks of the resumable uploads of the
+          members too large for a single request, a multiple of 256 KiB
+
+    Returns: list of the uploaded blob names
+    """
+  client = get_storage_client()
+  bucket = client.bucket(bucket_name)
+  blob_names = []
+  file.seek(0)
+  with ZipFile(file) as archive:
+    for member in archive.infolist():
+      member_path = get_zip_member_path(member.filename)
+      if member.is_dir() or not member_path:
+        continue
+      blob_name = f"{dest_base_path}/{member_path}"
+      blob = bucket.blob(blob_name, chunk_size=chunk_size)
+      with archive.open(member) as member_file:
+        blob.upload_from_file(member_file,
+                              size=member.file_size,
+                              content_type=mimetypes.guess_type(member_path)[0])
+      logging.info("File {} uploaded to {}.".format(member.filename,
+                                                    blob_name))
+      blob_names.append(blob_name)
+  return blob_names
+
+
+def upload_folder(bucket_name, src_path, dest_base_path,
+                  skip_unchanged=False):
+  """Function to upload folder to destination, the files being uploaded
+  concurrently"""
+  return TransferEngine().upload_folder(bucket_name, src_path,
+                                        dest_base_path, skip_unchanged)
 
 
 def write_csv_to_bucket(bucket_name, prefix, file_name, file):
@@ -359,7 +641,7 @@ def write_csv_to_bucket(bucket_name, prefix, file_name, file):
         file: Dataframe to be uploaded
     Returns: uri
   """
-  client = storage.Client()
+  client = get_storage_client()
   bucket = client.bucket(bucket_name)
   file_path = f"{prefix}/{file_name}"
   blob = bucket.blob(file_path)
@@ -370,7 +652,7 @@ def write_csv_to_bucket(bucket_name, prefix, file_name, file):
 
 def get_blob_from_gcs_path(gcs_path):
   """returns blob object using gcs_path"""
-  storage_client = storage.Client()
+  storage_client = get_storage_client()
   bucket_name = gcs_path.split("gs://")[1].split("/")[0]
   blob_name = gcs_path.split(bucket_name)[-1].strip("/")
   bucket = storage_client.bucket(bucket_name)
@@ -401,7 +683,7 @@ def move_file_within_bucket(bucket_name, src_path, dest_path):
       then src_path and dest_path should be
         `path/to/file/abc.txt`
   """
-  storage_client = storage.Client()
+  storage_client = get_storage_client()
   bucket = storage_client.bucket(bucket_name)
 
   # Remove Bucket name from src_path if it exists
@@ -433,7 +715,7 @@ def delete_file_from_gcs(bucket_name, src_path):
       then src_path should be
         `path/to/file/abc.txt`
   """
-  storage_client = storage.Client()
+  storage_client = get_storage_client()
   bucket = storage_client.bucket(bucket_name)
 
   # Remove Bucket name from src_path if it exists
@@ -0,0 +1,134 @@
+"""Unit test cases for the streaming uploads and transfers of GCS"""
+import io
+import zipfile
+import pytest
+from common.utils.errors import PayloadTooLargeError
+from common.utils.gcs_adapter import (SizeLimitedStream, get_zip_member_path,
+                                      upload_stream_to_bucket,
+                                      upload_zip_to_bucket, LocalBackend,
+                                      TransferEngine)
+# pylint: disable=redefined-outer-name
+
+
+class FakeBlob():
+  """Blob reading the uploaded file object as a resumable upload does"""
+
+  def __init__(self, name, uploads, chunk_size):
+    self.name = name
+    self.uploads = uploads
+    self.chunk_size = chunk_size
+
+  def upload_from_file(self, file, size=None, content_type=None):
+    chunks = []
+    while True:
+      chunk = file.read(self.chunk_size if size is None else size)
+      if not chunk:
+        break
+      chunks.append(chunk)
+    self.uploads[self.name] = (b"".join(chunks), content_type)
+
+
+@pytest.fixture
+def uploads(mocker):
+  uploads = {}
+  client = mocker.patch("common.utils.gcs_adapter.get_storage_client")
+  client.return_value.bucket.return_value.blob.side_effect = \
+    lambda name, chunk_size: FakeBlob(name, uploads, chunk_size)
+  return uploads
+
+
+def test_size_limited_stream():
+  stream = SizeLimitedStream(io.BytesIO(b"abcdef"), 4)
+  assert stream.read(4) == b"abcd"
+  stream.seek(2)
+  assert stream.read(2) == b"cd"
+  with pytest.raises(PayloadTooLargeError):
+    stream.read(2)
+
+
+def test_upload_stream_to_bucket(uploads):
+  file = io.BytesIO(b"x" * 10)
+  file.read()
+  assert upload_stream_to_bucket(
+      "bucket", "folder/file.pdf", file, "application/pdf",
+      chunk_size=4) == "gs://bucket/folder/file.pdf"
+  assert uploads["folder/file.pdf"] == (b"x" * 10, "application/pdf")
+
+  with pytest.raises(PayloadTooLargeError):
+    upload_stream_to_bucket("bucket", "folder/large.pdf", file, max_size=8,
+                            chunk_size=4)
+  assert "folder/large.pdf" not in uploads
+
+
+def test_upload_zip_to_bucket(uploads):
+  archive = io.BytesIO()
+  with zipfile.ZipFile(archive, "w") as zip_file:
+    zip_file.writestr("course/", "")
+    zip_file.writestr("course/index.html", "<html></html>")
+    zip_file.writestr("../course/style.css", "body {}")
+
+  assert upload_zip_to_bucket("bucket", archive, "folder") == [
+      "folder/course/index.html", "folder/course/style.css"
+  ]
+  assert uploads["folder/course/index.html"] == (b"<html></html>",
+                                                 "text/html")
+  assert uploads["folder/course/style.css"] == (b"body {}", "text/css")
+  assert get_zip_member_path("./a//b/../c") == "a/b/c"
+
+
+def write_file(path, content):
+  path.parent.mkdir(parents=True, exist_ok=True)
+  path.write_text(content)
+
+
+class FlakyBackend(LocalBackend):
+  """Local backend failing the first upload of every file"""
+
+  def __init__(self, root):
+    super().__init__(root)
+    self.attempts = {}
+
+  def upload(self, bucket_name, source_path, blob_name):
+    self.attempts[blob_name] = self.attempts.get(blob_name, 0) + 1
+    if self.attempts[blob_name] == 1:
+      raise ConnectionError("Connection reset")
+    super().upload(bucket_name, source_path, blob_name)
+
+
+def test_transfer_folder(tmp_path):
+  write_file(tmp_path / "src" / "weights.h5", "weights")
+  write_file(tmp_path / "src" / "params" / "config.json", "{}")
+  engine = TransferEngine(FlakyBackend(str(tmp_path / "gcs")), max_workers=2,
+                          retry_delay=0)
+
+  assert sorted(engine.upload_folder(
+      "bucket", str(tmp_path / "src"), "model/course")) == [
+          "model/course/params/config.json", "model/course/weights.h5"
+      ]
+  assert engine.backend.attempts == {
+      "model/course/params/config.json": 2,
+      "model/course/weights.h5": 2
+  }
+
+  # only the files that changed are transferred again
+  write_file(tmp_path / "src" / "weights.h5", "new weights")
+  assert engine.upload_folder("bucket", str(tmp_path / "src"), "model/course",
+                              skip_unchanged=True) == [
+                                  "model/course/weights.h5"
+                              ]
+
+  destination = tmp_path / "data"
+  files = engine.download_folder("bucket", "model/course/", str(destination),
+                                 skip_unchanged=True)
+  assert sorted(files) == [
+      ("model/course/params/config.json",
+       str(destination / "params" / "config.json")),
+      ("model/course/weights.h5", str(destination / "weights.h5"))
+  ]
+  assert (destination / "weights.h5").read_text() == "new weights"
+
+  files = engine.download_folder("bucket", "model/", str(destination),
+                                 flatten=True)
+  assert sorted(path for _, path in files) == [
+      str(destination / "config.json"), str(destination / "weights.h5")
+  ]
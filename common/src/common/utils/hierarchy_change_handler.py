@@ -0,0 +1,55 @@
+"""Updates the data derived from the learning hierarchy after it changes"""
+from common.utils.cognitive_wrapper_index import CognitiveWrapperIndex
+from common.utils.collection_references import LOS_COLLECTIONS
+from common.utils.descendant_index import DescendantIndex
+from common.utils.logging_handler import Logger
+from common.utils.tree_snapshot_handler import TreeSnapshotHandler
+
+# pylint: disable = broad-except
+
+
+class HierarchyChangeHandler():
+  """Keeps the cognitive wrapper index, the descendant index and the tree
+  snapshots in sync with the nodes created, updated or deleted in the
+  learning hierarchy"""
+
+  @classmethod
+  def node_changed(cls, collection_type, *document_fields):
+    """Handles the change of a node, which also changes its parents, with
+    the parents taken from every given version of the node fields"""
+    nodes = {}
+    for fields in document_fields:
+      nodes.setdefault(collection_type, []).append(fields["uuid"])
+      for parent_type, parent_uuids in (fields.get("parent_nodes")
+                                        or {}).items():
+        nodes.setdefault(parent_type, []).extend(parent_uuids)
+    cls.nodes_changed(nodes)
+
+  @classmethod
+  def nodes_changed(cls, nodes):
+    """Handles the change of the given nodes
+    Args:
+      nodes: dict - collection type to list of uuids of the nodes that were
+        created, updated or deleted
+    """
+    nodes = {
+        collection_type: list(dict.fromkeys(uuids))
+        for collection_type, uuids in nodes.items()
+        if collection_type in LOS_COLLECTIONS and uuids
+    }
+    if not nodes:
+      return
+
+    if nodes.get("learning_experiences"):
+      try:
+        updated_uuids = CognitiveWrapperIndex.update(
+            nodes["learning_experiences"])
+        nodes.setdefault("learning_objects", []).extend(updated_uuids)
+      except Exception as e:
+        Logger.error(f"Failed to update the cognitive wrapper index: {e}")
+    try:
+      for collection_type, uuids in DescendantIndex.update(nodes).items():
+        nodes.setdefault(collection_type, []).extend(uuids)
+    except Exception as e:
+      Logger.error(f"Failed to update the descendant index: {e}")
+    TreeSnapshotHandler.refresh_nodes(nodes)
@@ -0,0 +1,184 @@
+"""Breadth-first walk and batched writes over the learning hierarchy"""
+import datetime
+from fireo.database import db
+from common.config import (HIERARCHY_FETCH_CHUNK_SIZE,
+                           FIRESTORE_BATCH_WRITE_LIMIT)
+from common.utils.collection_references import collection_references
+from common.utils.worker_pool import get_worker_pool
+
+# collections of the nodes referenced by the hierarchy that can be deleted
+# along with it, and the field of the node referencing them
+REFERENCE_FIELDS = {
+    "achievements": ("achievements",),
+    "skills": ("references", "skills"),
+    "competencies": ("references", "competencies")
+}
+
+
+class HierarchyWalker():
+  """Walks the learning hierarchy below a set of nodes level by level.
+
+  The nodes of a level are read with get_all in chunks fetched concurrently
+  and the writes made on a level are committed in batches of the firestore
+  write limit, so that a hierarchy of n nodes takes about n / chunk size
+  reads and n / 500 commits instead of a read and a write per node. The
+  levels are numbered from the walk, which lets a walk interrupted after a
+  level resume from the next one.
+  """
+
+  @classmethod
+  def get_reference(cls, collection_type, uuid):
+    """Returns the firestore reference of a node"""
+    return db.conn.collection(
+        collection_references[collection_type].collection_name).document(uuid)
+
+  @classmethod
+  def get_nodes(cls, collection_type, uuids):
+    """Reads the nodes of a collection with batched get_all reads of the
+    firestore client, in chunks fetched concurrently on the shared worker
+    pool
+    Args:
+      collection_type: str - key of the collection in collection_references
+      uuids: list - uuids of the nodes, the missing ones are skipped
+    Returns:
+      list - fields of the nodes found in the order of uuids, soft deleted
+      ones included
+    """
+    collection_class = collection_references[collection_type]
+
+    def fetch_chunk(chunk):
+      # the fireo get_all reads the documents one by one, the client reads
+      # them in a single request
+      snapshots = {
+          snapshot.id: snapshot for snapshot in db.conn.get_all(
+              [cls.get_reference(collection_type, uuid) for uuid in chunk])
+          if snapshot.exists
+      }
+      return [
+          collection_class.from_dict(snapshots[uuid].to_dict()).get_fields(
+              reformat_datetime=True)
+          for uuid in chunk
+          if uuid in snapshots
+      ]
+
+    chunks = [
+        uuids[index:index + HIERARCHY_FETCH_CHUNK_SIZE]
+        for index in range(0, len(uuids), HIERARCHY_FETCH_CHUNK_SIZE)
+    ]
+    return [
+        node_fields for nodes in get_worker_pool().map(fetch_chunk, chunks)
+        for node_fields in nodes
+    ]
+
+  @classmethod
+  def iter_levels(cls, roots, skip_deleted=False):
+    """Yields the nodes of the hierarchy below and including the given nodes,
+    level by level
+    Args:
+      roots: dict - uuids of the nodes of the first level, by collection type
+      skip_deleted: bool - whether the soft deleted nodes and the nodes only
+        reached through them are skipped
+    Yields:
+      list - (collection type, fields) of the nodes of each level, a node
+      reached from several parents is yielded once
+    """
+    visited = set()
+    level_uuids = roots
+    while level_uuids:
+      level, next_uuids = [], {}
+      for collection_type, uuids in level_uuids.items():
+        uuids = [
+            uuid for uuid in dict.fromkeys(uuids)
+            if (collection_type, uuid) not in visited
+        ]
+        visited.update((collection_type, uuid) for uuid in uuids)
+        for fields in cls.get_nodes(collection_type, uuids):
+          if skip_deleted and fields.get("is_deleted"):
+            continue
+          level.append((collection_type, fields))
+          for child_type, child_uuids in (fields.get("child_nodes") or
+                                          {}).items():
+            next_uuids.setdefault(child_type, []).extend(child_uuids)
+      if level:
+        yield level
+      level_uuids = next_uuids
+
+  @classmethod
+  def commit_writes(cls, writes, add_write):
+    """Commits writes in batches of the firestore write limit, the batches
+    being committed concurrently on the shared worker pool. Each batch is
+    atomic, the writes are expected to be idempotent so that a failed commit
+    can be retried as a whole
+    Args:
+      writes: list - writes to commit
+      add_write: function - adds a write to a batch
+    """
+    chunks = [
+        writes[index:index + FIRESTORE_BATCH_WRITE_LIMIT]
+        for index in range(0, len(writes), FIRESTORE_BATCH_WRITE_LIMIT)
+    ]
+
+    def commit_chunk(chunk):
+      batch = db.conn.batch()
+      for write in chunk:
+        add_write(batch, write)
+      batch.commit()
+
+    list(get_worker_pool().map(commit_chunk, chunks))
+
+  @classmethod
+  def get_reference_uuids(cls, fields, reference_type):
+    """Returns the uuids of the nodes of a collection referenced by a node"""
+    value = fields
+    for key in REFERENCE_FIELDS[reference_type]:
+      value = (value or {}).get(key)
+    return value or []
+
+  @classmethod
+  def delete_hierarchy(cls,
+                       roots,
+                       reference_types=(),
+                       completed_levels=0,
+                       on_level=None):
+    """Soft deletes the nodes of the hierarchy below and including the given
+    nodes, a level per step
+    Args:
+      roots: dict - uuids of the nodes to delete, by collection type
+      reference_types: list - collections among achievements, skills and
+        competencies whose nodes referenced by the hierarchy are deleted
+      completed_levels: int - number of levels deleted by a previous walk
+      on_level: function - called with the number of levels deleted and the
+        number of nodes of the level after each level
+    Returns:
+      int - number of nodes soft deleted
+    """
+    timestamp = datetime.datetime.utcnow()
+    deleted_count = 0
+
+    def add_write(batch, write):
+      collection_type, uuid = write
+      reference = cls.get_reference(collection_type, uuid)
+      if collection_type in REFERENCE_FIELDS:
+        batch.delete(reference)
+      else:
+        batch.update(reference, {
+            "is_deleted": True,
+            "last_modified_time": timestamp
+        })
+
+    for index, level in enumerate(cls.iter_levels(roots)):
+      if index < completed_levels:
+        continue
+      writes = [(collection_type, fields["uuid"])
+                for collection_type, fields in level
+                if not fields.get("is_deleted")]
+      deleted_count += len(writes)
+      for reference_type in reference_types:
+        writes.extend(
+            (reference_type, uuid) for uuid in dict.fromkeys(
+                uuid for _, fields in level
+                for uuid in cls.get_reference_uuids(fields, reference_type)))
+      cls.commit_writes(writes, add_write)
+      if on_level:
+        on_level(index + 1, len(level))
+    return deleted_count
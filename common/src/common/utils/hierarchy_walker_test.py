@@ -0,0 +1,112 @@
+"""Unit test cases for the walk and batched writes over the hierarchy"""
+from common.models import (CurriculumPathway, LearningExperience,
+                           LearningObject, Achievement)
+# disabling pylint rules that conflict with pytest fixtures
+# pylint: disable=unused-argument,redefined-outer-name,unused-import
+from common.testing.firestore_emulator import (clean_firestore,
+                                               firestore_emulator)
+from common.utils.hierarchy_walker import HierarchyWalker
+
+
+def create_node(collection, name, parent_nodes=None, child_nodes=None,
+                achievements=None):
+  """Creates a node of the hierarchy"""
+  node = collection.from_dict({
+      "uuid": "",
+      "name": name,
+      "parent_nodes": parent_nodes or {},
+      "child_nodes": child_nodes or {},
+      "achievements": achievements or [],
+      "is_deleted": False
+  })
+  node.save()
+  node.uuid = node.id
+  node.update()
+  return node
+
+
+def create_hierarchy():
+  """Creates a pathway, an experience and two modules sharing an
+  achievement"""
+  achievement = Achievement.from_dict({
+      "uuid": "",
+      "name": "Badge",
+      "type": "completion badge"
+  })
+  achievement.save()
+  achievement.uuid = achievement.id
+  achievement.update()
+  pathway = create_node(CurriculumPathway, "Program")
+  experience = create_node(
+      LearningExperience, "Experience",
+      {"curriculum_pathways": [pathway.uuid]})
+  learning_objects = [
+      create_node(LearningObject, name,
+                  {"learning_experiences": [experience.uuid]},
+                  achievements=[achievement.id])
+      for name in ["Module 1", "Module 2"]
+  ]
+  experience.child_nodes = {
+      "learning_objects": [node.uuid for node in learning_objects]
+  }
+  experience.update()
+  pathway.child_nodes = {"learning_experiences": [experience.uuid]}
+  pathway.update()
+  return pathway, experience, learning_objects, achievement
+
+
+def test_iter_levels(clean_firestore):
+  pathway, experience, learning_objects, _ = create_hierarchy()
+  levels = list(HierarchyWalker.iter_levels(
+      {"curriculum_pathways": [pathway.uuid]}))
+  assert [[fields["uuid"] for _, fields in level] for level in levels] == [
+      [pathway.uuid], [experience.uuid],
+      [node.uuid for node in learning_objects]
+  ]
+
+  # a dangling child uuid is skipped
+  experience.child_nodes["learning_objects"].append("missing_uuid")
+  experience.update()
+  assert [
+      fields["uuid"] for fields in HierarchyWalker.get_nodes(
+          "learning_objects",
+          experience.child_nodes["learning_objects"])
+  ] == [node.uuid for node in learning_objects]
+  assert len(list(HierarchyWalker.iter_levels(
+      {"curriculum_pathways": [pathway.uuid]}))[2]) == 2
+
+  LearningExperience.delete_by_uuid(experience.uuid)
+  assert len(list(HierarchyWalker.iter_levels(
+      {"curriculum_pathways": [pathway.uuid]}, skip_deleted=True))) == 1
+
+
+def test_delete_hierarchy_resume(clean_firestore):
+  pathway, experience, learning_objects, achievement = create_hierarchy()
+  progress = []
+  # the first two levels were deleted by an interrupted walk
+  deleted_count = HierarchyWalker.delete_hierarchy(
+      {"curriculum_pathways": [pathway.uuid]}, ["achievements"], 2,
+      lambda levels, count: progress.append((levels, count)))
+  assert deleted_count == 2
+  assert progress == [(3, 2)]
+  assert CurriculumPathway.find_by_id(pathway.uuid).is_deleted is False
+  for node in learning_objects:
+    assert LearningObject.find_by_id(node.uuid).is_deleted is True
+  assert Achievement.collection.get(achievement.key) is None
+
+  assert HierarchyWalker.delete_hierarchy(
+      {"curriculum_pathways": [pathway.uuid]}) == 2
+  assert LearningExperience.find_by_id(experience.uuid).is_deleted is True
+
+
+def test_get_nodes_batched_read(mocker):
+  snapshots = [
+      mocker.Mock(id=uuid, exists=uuid != "missing",
+                  to_dict=lambda uuid=uuid: {"uuid": uuid, "name": uuid})
+      for uuid in ["b", "missing", "a"]
+  ]
+  get_all = mocker.patch("common.utils.hierarchy_walker.db.conn.get_all",
+                         return_value=snapshots)
+  nodes = HierarchyWalker.get_nodes("learning_objects", ["a", "missing", "b"])
+  assert [fields["uuid"] for fields in nodes] == ["a", "b"]
+  get_all.assert_called_once()
@@ -0,0 +1,117 @@
+"""Local verification of Firebase ID tokens"""
+import re
+import threading
+import time
+import requests
+from google.auth import exceptions as google_auth_exceptions
+from google.auth import jwt
+from common.utils.config import (FIREBASE_CERTIFICATES_URL,
+                                 FIREBASE_PROJECT_ID)
+from common.utils.errors import (InvalidTokenError,
+                                 CertificatesUnavailableError)
+
+# Certificates are fetched again at most this often for unknown key ids
+MIN_REFRESH_INTERVAL = 60
+# Used when the certificates response has no Cache-Control max-age
+DEFAULT_MAX_AGE = 3600
+CLOCK_SKEW_IN_SECONDS = 10
+
+
+class CertificateCache():
+  """Cached copy of the token signing certificates, fetched again once the
+  Cache-Control max-age of the previous response has passed"""
+
+  def __init__(self, url):
+    self.url = url
+    self._certificates = {}
+    self._expires_at = 0
+    self._fetched_at = 0
+    self._lock = threading.Lock()
+
+  def set_certificates(self, certificates, max_age=DEFAULT_MAX_AGE):
+    """Replaces the cached certificates, e.g. with a test key set"""
+    with self._lock:
+      self._certificates = dict(certificates)
+      self._fetched_at = time.monotonic()
+      self._expires_at = self._fetched_at + max_age
+
+  def get_certificate(self, key_id):
+    """
+      Returns the certificate of a key id, refreshing the certificates when
+      they expired or when the key id is unknown (keys are rotated)
+      Args:
+        key_id: String
+      Returns:
+        String: PEM certificate
+    """
+    with self._lock:
+      now = time.monotonic()
+      if now >= self._expires_at or (
+          key_id not in self._certificates and
+          now - self._fetched_at >= MIN_REFRESH_INTERVAL):
+        self._refresh()
+      certificate = self._certificates.get(key_id)
+    if certificate is None:
+      raise CertificatesUnavailableError(
+          f"Certificate for key id {key_id} not found")
+    return certificate
+
+  def _refresh(self):
+    """Fetches the certificates, kept for the max-age of the response"""
+    try:
+      response = requests.get(self.url, timeout=10)
+      response.raise_for_status()
+      certificates = response.json()
+    except (requests.exceptions.RequestException, ValueError) as e:
+      raise CertificatesUnavailableError(str(e)) from e
+    max_age = DEFAULT_MAX_AGE
+    match = re.search(r"max-age=(\d+)",
+                      response.headers.get("Cache-Control", ""))
+    if match:
+      max_age = int(match.group(1))
+    self._certificates = certificates
+    self._fetched_at = time.monotonic()
+    self._expires_at = self._fetched_at + max_age
+
+
+certificate_cache = CertificateCache(FIREBASE_CERTIFICATES_URL)
+
+
+def verify_id_token(id_token, project_id=None):
+  """
+    Verifies the signature and the claims of a Firebase ID token
+    Args:
+      id_token: String
+      project_id: String, firebase project the token was issued for
+    Raises:
+      InvalidTokenError: If the token is malformed, expired or not issued
+        for the project
+      CertificatesUnavailableError: If the signing certificate could not be
+        obtained
+    Returns:
+      Dict: decoded token claims along with uid
+  """
+  project_id = project_id or FIREBASE_PROJECT_ID
+  try:
+    header = jwt.decode_header(id_token)
+  except (ValueError, TypeError) as e:
+    raise InvalidTokenError("Invalid token") from e
+  if header.get("alg") != "RS256" or not header.get("kid"):
+    raise InvalidTokenError("Invalid token")
+
+  certificate = certificate_cache.get_certificate(header["kid"])
+  try:
+    claims = jwt.decode(id_token, certs=certificate, audience=project_id,
+                        clock_skew_in_seconds=CLOCK_SKEW_IN_SECONDS)
+  except (ValueError, google_auth_exceptions.GoogleAuthError) as e:
+    raise InvalidTokenError(f"Invalid token: {e}") from e
+
+  if claims.get("iss") != f"https://securetoken.google.com/{project_id}":
+    raise InvalidTokenError("Invalid token issuer")
+  subject = claims.get("sub")
+  if not isinstance(subject, str) or not subject or len(subject) > 128:
+    raise InvalidTokenError("Invalid token subject")
+  if claims.get("auth_time", 0) > time.time() + CLOCK_SKEW_IN_SECONDS:
+    raise InvalidTokenError("Invalid token auth_time")
+  claims["uid"] = subject
+  return claims
@@ -0,0 +1,77 @@
+"""Unit test cases for the local ID token verification"""
+import time
+from unittest import mock
+import pytest
+import requests
+from common.testing.firebase_test_keys import (TEST_CERTIFICATES,
+                                               TEST_FIREBASE_PROJECT_ID,
+                                               TEST_KEY_ID,
+                                               create_test_id_token)
+from common.utils import id_token_verifier
+from common.utils.id_token_verifier import CertificateCache, verify_id_token
+from common.utils.errors import (InvalidTokenError,
+                                 CertificatesUnavailableError)
+
+
+@pytest.fixture(name="test_certificates", autouse=True)
+def fixture_test_certificates():
+  id_token_verifier.certificate_cache.set_certificates(TEST_CERTIFICATES)
+  yield
+  id_token_verifier.certificate_cache.set_certificates({}, 0)
+
+
+def test_verify_id_token():
+  token = create_test_id_token({"email": "user@example.com"})
+  claims = verify_id_token(token, TEST_FIREBASE_PROJECT_ID)
+  assert claims["uid"] == claims["sub"]
+  assert claims["email"] == "user@example.com"
+
+
+def test_verify_id_token_wrong_project():
+  token = create_test_id_token(project_id="other-project")
+  with pytest.raises(InvalidTokenError):
+    verify_id_token(token, TEST_FIREBASE_PROJECT_ID)
+
+  token = create_test_id_token(
+      {"iss": "https://securetoken.google.com/other-project"})
+  with pytest.raises(InvalidTokenError, match="issuer"):
+    verify_id_token(token, TEST_FIREBASE_PROJECT_ID)
+
+
+def test_verify_id_token_expired():
+  token = create_test_id_token(expires_in=-3600)
+  with pytest.raises(InvalidTokenError):
+    verify_id_token(token, TEST_FIREBASE_PROJECT_ID)
+
+
+def test_verify_id_token_malformed():
+  with pytest.raises(InvalidTokenError):
+    verify_id_token("not-a-token", TEST_FIREBASE_PROJECT_ID)
+
+
+def test_certificate_cache_refresh():
+  response = mock.Mock(headers={"Cache-Control": "public, max-age=100"})
+  response.json.return_value = TEST_CERTIFICATES
+  certificate_cache = CertificateCache("https://certificates")
+  with mock.patch("common.utils.id_token_verifier.requests.get",
+                  return_value=response) as get:
+    assert certificate_cache.get_certificate(TEST_KEY_ID)
+    assert certificate_cache.get_certificate(TEST_KEY_ID)
+    assert get.call_count == 1
+    # unknown key ids are not fetched again right after a refresh
+    with pytest.raises(CertificatesUnavailableError):
+      certificate_cache.get_certificate("rotated-key-id")
+    assert get.call_count == 1
+
+    with mock.patch("common.utils.id_token_verifier.time.monotonic",
+                    return_value=time.monotonic() + 101):
+      certificate_cache.get_certificate(TEST_KEY_ID)
+    assert get.call_count == 2
+
+
+def test_certificate_cache_unavailable():
+  certificate_cache = CertificateCache("https://certificates")
+  with mock.patch("common.utils.id_token_verifier.requests.get",
+                  side_effect=requests.exceptions.ConnectionError("down")):
+    with pytest.raises(CertificatesUnavailableError):
+      certificate_cache.get_certificate(TEST_KEY_ID)
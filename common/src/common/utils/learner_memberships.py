@@ -0,0 +1,190 @@
+"""Index of the learner association group of each learner"""
+import datetime
+from google.cloud import firestore
+from fireo.database import db
+from common.config import FIRESTORE_BATCH_WRITE_LIMIT
+from common.models import AssociationGroup, LearnerMembership
+from common.utils.errors import ValidationError
+from common.utils.logging_handler import Logger
+
+# learners added or removed per transaction, which also writes the group
+LEARNERS_PER_TRANSACTION = FIRESTORE_BATCH_WRITE_LIMIT - 1
+
+
+class LearnerMembershipHandler():
+  """Keeps, for every learner of a learner association group, a document
+  named after the user_id of the learner holding the uuid of the group, so
+  that the group of a learner is read by id instead of scanning the users of
+  every learner association group.
+
+  The memberships are written in the same transaction as the users of the
+  group, which also checks that the learners do not belong to a group yet.
+  The learners are added in transactions of at most LEARNERS_PER_TRANSACTION
+  learners, the whole roster is checked before the first one so that the
+  learners are usually added all or none.
+  """
+
+  @classmethod
+  def get_document(cls, user_id):
+    """Returns the firestore reference of the membership of a learner"""
+    return db.conn.collection(LearnerMembership.collection_name).document(
+        user_id)
+
+  @classmethod
+  def get_association_group_ids(cls, user_ids, transaction=None):
+    """Returns the groups of the learners with a single read
+    Args:
+      user_ids: list - user_ids of the learners
+      transaction: firestore transaction the memberships are read in
+    Returns:
+      dict - user_id to the uuid of the group of the learners belonging to
+        a learner association group
+    """
+    references = [
+        cls.get_document(user_id) for user_id in dict.fromkeys(user_ids)
+    ]
+    if not references:
+      return {}
+    return {
+        snapshot.id: snapshot.get("association_group_id")
+        for snapshot in db.conn.get_all(references, transaction=transaction)
+        if snapshot.exists
+    }
+
+  @classmethod
+  def add_learners(cls, association_group, user_ids, status):
+    """Adds learners to the users of a learner association group along with
+    their memberships
+    Args:
+      association_group: AssociationGroup object of learner type
+      user_ids: list - user_ids of the learners to add
+      status: str - status of the learners in the group
+    Raises:
+      ValidationError: if a learner already belongs to a learner association
+        group, no learner is added then. A learner added to another group
+        by a concurrent request between two transactions only fails its own
+        transaction, the learners of the previous transactions stay added
+    """
+    group_reference = db.conn.document(association_group.key)
+
+    @firestore.transactional
+    def add_chunk(transaction, chunk):
+      users = (group_reference.get(transaction=transaction).to_dict() or
+               {}).get("users") or []
+      if cls.get_association_group_ids(chunk, transaction):
+        raise ValidationError("A user can be part of only one learner "\
+          "association group at a time")
+      timestamp = datetime.datetime.utcnow()
+      present_user_ids = {user["user"] for user in users}
+      users = users + [{
+          "user": user_id,
+          "status": status
+      } for user_id in chunk if user_id not in present_user_ids]
+      transaction.update(group_reference, {
+          "users": users,
+          "last_modified_time": timestamp
+      })
+      for user_id in chunk:
+        transaction.set(cls.get_document(user_id), {
+            "association_group_id": association_group.uuid,
+            "created_time": timestamp,
+            "last_modified_time": timestamp
+        })
+
+    user_ids = list(dict.fromkeys(user_ids))
+    if cls.get_association_group_ids(user_ids):
+      raise ValidationError("A user can be part of only one learner "\
+        "association group at a time")
+    for index in range(0, len(user_ids), LEARNERS_PER_TRANSACTION):
+      add_chunk(db.conn.transaction(),
+                user_ids[index:index + LEARNERS_PER_TRANSACTION])
+
+  @classmethod
+  def remove_learners(cls, association_group, user_ids):
+    """Removes learners from the users of a learner association group along
+    with their memberships
+    Args:
+      association_group: AssociationGroup object of learner type
+      user_ids: list - user_ids of the learners to remove
+    """
+    group_reference = db.conn.document(association_group.key)
+
+    @firestore.transactional
+    def remove_chunk(transaction, chunk):
+      users = (group_reference.get(transaction=transaction).to_dict() or
+               {}).get("users") or []
+      group_ids = cls.get_association_group_ids(chunk, transaction)
+      transaction.update(group_reference, {
+          "users": [user for user in users if user["user"] not in chunk],
+          "last_modified_time": datetime.datetime.utcnow()
+      })
+      for user_id, group_id in group_ids.items():
+        if group_id == association_group.uuid:
+          transaction.delete(cls.get_document(user_id))
+
+    user_ids = list(dict.fromkeys(user_ids))
+    for index in range(0, len(user_ids), LEARNERS_PER_TRANSACTION):
+      remove_chunk(db.conn.transaction(),
+                   user_ids[index:index + LEARNERS_PER_TRANSACTION])
+
+  @classmethod
+  def delete_memberships(cls, association_group_uuid, user_ids):
+    """Deletes the memberships of learners to a group, after they were
+    removed from its users by another write or the group was deleted
+    Args:
+      association_group_uuid: str - uuid of the learner association group
+      user_ids: list - user_ids of the learners
+    Returns:
+      int - number of memberships deleted
+    """
+    user_ids = [
+        user_id
+        for user_id, group_id in cls.get_association_group_ids(user_ids).items()
+        if group_id == association_group_uuid
+    ]
+    for index in range(0, len(user_ids), FIRESTORE_BATCH_WRITE_LIMIT):
+      batch = db.conn.batch()
+      for user_id in user_ids[index:index + FIRESTORE_BATCH_WRITE_LIMIT]:
+        batch.delete(cls.get_document(user_id))
+      batch.commit()
+    return len(user_ids)
+
+  @classmethod
+  def rebuild(cls):
+    """Recomputes every membership from the users of the learner association
+    groups, used to index the learners added before the memberships existed
+    Returns:
+      int - number of memberships written
+    """
+    memberships = {}
+    for group in AssociationGroup.collection.filter(
+        "association_type", "==", "learner").fetch():
+      for user in group.users or []:
+        if memberships.setdefault(user["user"], group.uuid) != group.uuid:
+          Logger.warning(f"Learner {user['user']} belongs to the learner "
+                         f"association groups {memberships[user['user']]} "
+                         f"and {group.uuid}")
+
+    stale_user_ids = [
+        membership.id for membership in LearnerMembership.collection.fetch()
+        if membership.id not in memberships
+    ]
+    timestamp = datetime.datetime.utcnow()
+    writes = list(memberships.items()) + [
+        (user_id, None) for user_id in stale_user_ids
+    ]
+    for index in range(0, len(writes), FIRESTORE_BATCH_WRITE_LIMIT):
+      batch = db.conn.batch()
+      for user_id, group_uuid in writes[index:index +
+                                        FIRESTORE_BATCH_WRITE_LIMIT]:
+        if group_uuid is None:
+          batch.delete(cls.get_document(user_id))
+        else:
+          batch.set(cls.get_document(user_id), {
+              "association_group_id": group_uuid,
+              "created_time": timestamp,
+              "last_modified_time": timestamp
+          })
+      batch.commit()
+    Logger.info(f"Rebuilt the memberships of {len(memberships)} learners")
+    return len(memberships)
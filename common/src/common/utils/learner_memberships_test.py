@@ -0,0 +1,62 @@
+"""Unit test cases for the learner memberships"""
+import pytest
+from common.models import AssociationGroup
+# disabling pylint rules that conflict with pytest fixtures
+# pylint: disable=unused-argument,redefined-outer-name,unused-import
+from common.testing.firestore_emulator import (clean_firestore,
+                                               firestore_emulator)
+from common.utils.errors import ValidationError
+from common.utils.learner_memberships import LearnerMembershipHandler
+
+
+def create_group(name, user_ids):
+  """Creates a learner association group having the given learners"""
+  group = AssociationGroup.from_dict({
+      "name": name,
+      "association_type": "learner",
+      "users": [{"user": user_id, "status": "active"} for user_id in user_ids]
+  })
+  group.uuid = ""
+  group.save()
+  group.uuid = group.id
+  group.update()
+  return group
+
+
+def test_learner_memberships(clean_firestore, mocker):
+  # the learners added before the memberships existed are indexed
+  group = create_group("first group", ["learner1", "learner2"])
+  assert LearnerMembershipHandler.get_association_group_ids(
+      ["learner1", "learner3"]) == {}
+  assert LearnerMembershipHandler.rebuild() == 2
+  assert LearnerMembershipHandler.get_association_group_ids(
+      ["learner1", "learner3"]) == {"learner1": group.uuid}
+
+  other_group = create_group("second group", [])
+  LearnerMembershipHandler.add_learners(other_group, ["learner3"], "active")
+  assert AssociationGroup.find_by_uuid(other_group.uuid).users == [{
+      "user": "learner3",
+      "status": "active"
+  }]
+
+  # a roster spanning several transactions is checked before the first one
+  mocker.patch("common.utils.learner_memberships.LEARNERS_PER_TRANSACTION",
+               1)
+  with pytest.raises(ValidationError):
+    LearnerMembershipHandler.add_learners(other_group,
+                                          ["learner4", "learner1"], "active")
+  assert LearnerMembershipHandler.get_association_group_ids(
+      ["learner4"]) == {}
+  assert len(AssociationGroup.find_by_uuid(other_group.uuid).users) == 1
+
+  LearnerMembershipHandler.remove_learners(group, ["learner1"])
+  assert [user["user"] for user in AssociationGroup.find_by_uuid(
+      group.uuid).users] == ["learner2"]
+  assert LearnerMembershipHandler.get_association_group_ids(
+      ["learner1", "learner2", "learner3"]) == {
+          "learner2": group.uuid,
+          "learner3": other_group.uuid
+      }
+
+  assert LearnerMembershipHandler.delete_memberships(
+      group.uuid, ["learner2", "learner3"]) == 1
@@ -0,0 +1,67 @@
+"""Request scoped batched loader for hierarchy nodes"""
+import copy
+from common.utils.collection_references import collection_references
+from common.utils.errors import ResourceNotFoundException
+
+
+class NodeLoader():
+  """Batches node lookups by uuid and remembers every node it has read.
+
+  One loader should be created per request so that the identity map never
+  serves data across requests. Every call to `load_many` reads all the uuids
+  that are not cached yet with a bulk find_by_uuids and returns copies of
+  the documents so that callers can safely mutate them.
+  """
+
+  def __init__(self):
+    self._identity_map = {}
+
+  def prime(self, collection_type, document_fields):
+    """Adds an already fetched document to the identity map"""
+    self._identity_map[(collection_type,
+                        document_fields["uuid"])] = copy.deepcopy(
+                            document_fields)
+
+  def is_loaded(self, collection_type, uuid):
+    """Returns whether the node is in the identity map"""
+    return (collection_type, uuid) in self._identity_map
+
+  def load(self, collection_type, uuid):
+    """Returns the document fields of a single node"""
+    return self.load_many(collection_type, [uuid])[uuid]
+
+  def load_many(self, collection_type, uuids):
+    """Returns the document fields for the given uuids of a collection
+    Args:
+      collection_type: str - key of the collection in collection_references
+      uuids: list - uuids of the nodes to be fetched
+    Raises:
+      ResourceNotFoundException: If any of the nodes does not exist
+    Returns:
+      dict - mapping of uuid to document fields
+    """
+    missing_uuids = []
+    for uuid in uuids:
+      if (collection_type, uuid) not in self._identity_map and \
+          uuid not in missing_uuids:
+        missing_uuids.append(uuid)
+
+    if missing_uuids:
+      collection = collection_references[collection_type]
+      documents, not_found_uuids = collection.find_by_uuids(missing_uuids)
+      found_uuids = [
+          uuid for uuid in missing_uuids if uuid not in not_found_uuids
+      ]
+      for uuid, document in zip(found_uuids, documents):
+        self._identity_map[(collection_type, uuid)] = \
+          document.get_fields(reformat_datetime=True)
+
+    nodes = {}
+    for uuid in uuids:
+      document_fields = self._identity_map.get((collection_type, uuid))
+      if document_fields is None:
+        raise ResourceNotFoundException(
+            f"{collection_references[collection_type].__name__} with uuid "
+            f"{uuid} not found")
+      nodes[uuid] = copy.deepcopy(document_fields)
+    return nodes
@@ -0,0 +1,54 @@
+"""Unit test cases for the request scoped node loader"""
+import pytest
+from common.models import LearningObject
+# disabling pylint rules that conflict with pytest fixtures
+# pylint: disable=unused-argument,redefined-outer-name,unused-import
+from common.testing.example_objects import CHILD_LEARNING_OBJECTS
+from common.testing.firestore_emulator import (clean_firestore,
+                                               firestore_emulator)
+from common.utils.node_loader import NodeLoader
+from common.utils.errors import ResourceNotFoundException
+from common.config import FIRESTORE_IN_QUERY_LIMIT
+
+
+@pytest.fixture(name="insert_learning_objects")
+def test_insert_learning_objects():
+  ids = []
+  for index in range(FIRESTORE_IN_QUERY_LIMIT + 5):
+    lo = LearningObject.from_dict(CHILD_LEARNING_OBJECTS[0])
+    lo.name = f"Online presentation {index}"
+    lo.is_deleted = False
+    lo.save()
+    lo.uuid = lo.id
+    lo.update()
+    ids.append(lo.id)
+  yield ids
+  for each_id in ids:
+    LearningObject.delete_by_id(each_id)
+
+
+def test_load_many(clean_firestore, insert_learning_objects):
+  loader = NodeLoader()
+  nodes = loader.load_many("learning_objects", insert_learning_objects)
+  assert list(nodes.keys()) == insert_learning_objects
+  for uuid, node in nodes.items():
+    assert node["uuid"] == uuid
+
+
+def test_load_returns_copies_from_identity_map(clean_firestore,
+                                               insert_learning_objects):
+  loader = NodeLoader()
+  uuid = insert_learning_objects[0]
+  node = loader.load("learning_objects", uuid)
+  node["name"] = "changed"
+
+  LearningObject.delete_by_id(uuid)
+  cached_node = loader.load("learning_objects", uuid)
+  assert cached_node["name"] != "changed"
+
+
+def test_load_many_missing_uuid(clean_firestore, insert_learning_objects):
+  loader = NodeLoader()
+  with pytest.raises(ResourceNotFoundException):
+    loader.load_many("learning_objects",
+                     insert_learning_objects[:2] + ["missing_uuid"])
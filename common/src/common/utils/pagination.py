@@ -1,6 +1,23 @@
 """
 Functions for unified Pagination Logic
 """
+import base64
+import datetime
+import json
+import threading
+import time
+import fireo
+from fireo.database import db
+from fireo.managers.managers import Manager
+from fireo.queries.query_wrapper import ModelWrapper
+from google.cloud.firestore_v1.document import DocumentSnapshot
+from google.cloud.firestore_v1.field_path import FieldPath
+from common.utils.errors import ValidationError
+from common.config import TOTAL_COUNT_CACHE_TTL
+
+# short lived in-process cache of document counts keyed by filter signature
+_count_cache = {}
+_count_cache_lock = threading.Lock()
 
 def get_slice(sorted_list, skip, limit):
   """
@@ -12,3 +29,254 @@ def get_slice(sorted_list, skip, limit):
             limit `int`: step value
   """
   return sorted_list[skip * limit:skip * limit + limit]
+
+
+def get_order_by(sort_by, sort_order):
+  """
+    Returns the fireo order string for a sort field and sort order
+    --------------------------------------------------------
+        Input:
+            sort_by `str`: field name
+            sort_order `str`: ascending / descending
+  """
+  return sort_by if sort_order == "ascending" else f"-{sort_by}"
+
+
+def _get_sort_value(obj, field_name):
+  """Returns the value of a (possibly nested map) field of a fireo object"""
+  name, *nested_keys = field_name.split(".")
+  value = getattr(obj, name)
+  for key in nested_keys:
+    value = (value or {}).get(key)
+  return value
+
+
+def encode_page_token(obj, order_by=None):
+  """
+    Builds the opaque page token pointing right after the given object
+    --------------------------------------------------------
+        Input:
+            obj `Model`: last fireo object of the current page
+            order_by `str`: fireo order string used for the page
+  """
+  cursor = {"order_by": order_by, "id": obj.id}
+  if order_by:
+    value = _get_sort_value(obj, order_by.lstrip("-"))
+    if isinstance(value, datetime.datetime):
+      cursor["value"] = value.isoformat()
+      cursor["is_datetime"] = True
+    else:
+      cursor["value"] = value
+  token = json.dumps(cursor).encode("utf-8")
+  return base64.urlsafe_b64encode(token).decode("utf-8")
+
+
+def decode_page_token(page_token, order_by=None):
+  """
+    Decodes a page token generated by encode_page_token
+    --------------------------------------------------------
+        Input:
+            page_token `str`: opaque page token
+            order_by `str`: fireo order string of the current request
+        Raises:
+            ValidationError: If the token is malformed or was generated
+            for a different sort order
+  """
+  try:
+    cursor = json.loads(base64.urlsafe_b64decode(page_token.encode("utf-8")))
+  except ValueError as e:
+    raise ValidationError("Invalid page_token") from e
+  if not isinstance(cursor, dict) or "id" not in cursor or \
+      cursor.get("order_by") != order_by:
+    raise ValidationError("Invalid page_token for the given sort order")
+  if cursor.get("is_datetime"):
+    cursor["value"] = datetime.datetime.fromisoformat(cursor["value"])
+  return cursor
+
+
+def _get_cursor_data(model_cls, field_name, value):
+  """Returns the document data of a page cursor, the value of a nested map
+  field being nested under its keys"""
+  name, *nested_keys = field_name.split(".")
+  for key in reversed(nested_keys):
+    value = {key: value}
+  # pylint: disable=protected-access
+  return {model_cls._meta.get_field(name).db_column_name: value}
+
+
+def _get_cursor_key(value, document_id):
+  """Returns the key ordering a document like firestore does for a sort
+  field, firestore ordering null values before the other values and the
+  documents sharing a sort value by their id"""
+  return (value is not None, value, document_id)
+
+
+def _is_after_cursor(obj, cursor, order_by):
+  """Returns whether a fireo object comes after the document a page token
+  points to in the order of the query"""
+  if not order_by:
+    return obj.id > cursor["id"]
+  obj_key = _get_cursor_key(_get_sort_value(obj, order_by.lstrip("-")),
+                            obj.id)
+  cursor_key = _get_cursor_key(cursor["value"], cursor["id"])
+  # the document ids are ordered in the direction of the sort field
+  if order_by.startswith("-"):
+    return obj_key < cursor_key
+  return obj_key > cursor_key
+
+
+def fetch_page(query, limit, order_by=None, page_token=None, skip=0):
+  """
+    Fetches a page of a firestore query. Pages are addressed either with
+    skip (offset) or with a page token returned by a previous call, which
+    continues right after the last document of that page using the sort
+    value and the document id instead of scanning the skipped documents
+    --------------------------------------------------------
+        Input:
+            query `FilterQuery`: fireo query with all the filters applied
+            limit `int`: size of the page
+            order_by `str`: fireo order string e.g. "-created_time"
+            page_token `str`: next_page_token of the previous page
+            skip `int`: offset value, not allowed along with page_token
+        Returns:
+            tuple: list of fireo objects and the token of the next page,
+            None when there are no more documents
+  """
+  if page_token and skip:
+    raise ValidationError("Please use either skip or page_token, not both")
+
+  if isinstance(query, Manager):
+    query = query.filter()
+  if order_by:
+    query = query.order(order_by)
+  model_cls = query.model.__class__
+  firestore_query = query.query()
+  if page_token:
+    cursor = decode_page_token(page_token, order_by)
+    document_data = _get_cursor_data(model_cls, order_by.lstrip("-"),
+                                     cursor["value"]) if order_by else {}
+    reference = db.conn.document(
+        fireo.utils.utils.generateKeyFromId(model_cls, cursor["id"]))
+    # A snapshot cursor makes firestore order by the document id after the
+    # sort field, so documents sharing the same sort value are not skipped
+    firestore_query = firestore_query.start_after(
+        DocumentSnapshot(reference, document_data, True, None, None, None))
+  elif skip:
+    firestore_query = firestore_query.offset(skip)
+
+  # Fetch one extra document to know if there is a next page
+  objects = [
+      ModelWrapper.from_query_result(model_cls(), snapshot)
+      for snapshot in firestore_query.limit(limit + 1).stream()
+  ]
+  next_page_token = None
+  if len(objects) > limit:
+    objects = objects[:limit]
+    next_page_token = encode_page_token(objects[-1], order_by)
+  return objects, next_page_token
+
+
+def fetch_filtered_page(query, limit, matches, order_by=None, page_token=None,
+                        skip=0):
+  """
+    Fetches a page of the documents of a firestore query that also match a
+    filter firestore can not apply, e.g. a second "in" filter. Every
+    document of the query is read to count the matching ones, so it should
+    only be used when the filters can not be expressed as a query. The page
+    tokens are compatible with the ones of fetch_page
+    --------------------------------------------------------
+        Input:
+            query `FilterQuery`: fireo query with the filters firestore
+            can apply
+            limit `int`: size of the page
+            matches `function`: returns whether a fireo object is kept
+            order_by `str`: fireo order string e.g. "-created_time"
+            page_token `str`: next_page_token of the previous page
+            skip `int`: offset value, not allowed along with page_token
+        Returns:
+            tuple: list of fireo objects, the token of the next page and the
+            number of matching documents
+  """
+  if page_token and skip:
+    raise ValidationError("Please use either skip or page_token, not both")
+  cursor = decode_page_token(page_token, order_by) if page_token else None
+
+  if isinstance(query, Manager):
+    query = query.filter()
+  if order_by:
+    query = query.order(order_by)
+  objects = []
+  has_next_page = False
+  count = 0
+  # documents before the page, None once the page has started. A page token
+  # is compared with the sort value and id of the documents, so the page
+  # starts even if the last document of the previous page no longer matches
+  to_skip = skip or None
+  for obj in query.fetch():
+    if not matches(obj):
+      continue
+    count += 1
+    if cursor is not None and not _is_after_cursor(obj, cursor, order_by):
+      continue
+    if to_skip is not None:
+      to_skip -= 1
+      if not to_skip:
+        to_skip = None
+    elif len(objects) < limit:
+      objects.append(obj)
+    else:
+      has_next_page = True
+  next_page_token = encode_page_token(objects[-1],
+                                      order_by) if has_next_page else None
+  return objects, next_page_token, count
+
+
+def _get_filter_signature(query):
+  """Returns a key identifying the collection and filters of a query"""
+  model_cls = query.model.__class__
+  # pylint: disable=protected-access
+  return json.dumps(
+      [model_cls._meta.collection_name, query.parent, query.select_query],
+      default=str)
+
+
+def count_documents(query, cache_ttl=TOTAL_COUNT_CACHE_TTL):
+  """
+    Counts the documents matching a firestore query on the server side.
+    Uses an aggregation count query when the installed firestore client
+    supports it, otherwise streams only the document keys so that no
+    document data is read. The key of every matching document is still
+    read and billed then, so the count of a large collection should be
+    reused with cache_ttl
+    --------------------------------------------------------
+        Input:
+            query `Manager/FilterQuery`: fireo query with all the filters
+            applied, without ordering, offset or limit
+            cache_ttl `int`: number of seconds the count is reused for
+            queries having the same filters, 0 disables the cache
+        Returns:
+            int: number of matching documents
+  """
+  if isinstance(query, Manager):
+    query = query.filter()
+
+  signature = None
+  if cache_ttl:
+    signature = _get_filter_signature(query)
+    with _count_cache_lock:
+      cached = _count_cache.get(signature)
+    if cached and cached[1] > time.monotonic():
+      return cached[0]
+
+  firestore_query = query.query()
+  if hasattr(firestore_query, "count"):
+    result = firestore_query.count().get()
+    count = int(result[0][0].value)
+  else:
+    count = sum(1 for _ in firestore_query.select(
+        [FieldPath.document_id()]).stream())
+
+  if signature:
+    with _count_cache_lock:
+      _count_cache[signature] = (count, time.monotonic() + cache_ttl)
+  return count
@@ -0,0 +1,147 @@
+"""Unit test cases for the pagination helpers"""
+import pytest
+from common.models import CourseTemplate, CurriculumPathway
+# disabling pylint rules that conflict with pytest fixtures
+# pylint: disable=unused-argument,redefined-outer-name,unused-import
+from common.testing.example_objects import TEST_COURSE_TEMPLATE
+from common.testing.firestore_emulator import (clean_firestore,
+                                               firestore_emulator)
+from common.utils.pagination import (fetch_page, fetch_filtered_page,
+                                     encode_page_token, decode_page_token,
+                                     count_documents)
+from common.utils.errors import ValidationError
+
+
+@pytest.fixture(name="insert_course_templates")
+def test_insert_course_templates():
+  ids = []
+  for index in range(7):
+    course_template = CourseTemplate.from_dict(TEST_COURSE_TEMPLATE)
+    # every two templates share the same sort value
+    course_template.name = f"name {index // 2}"
+    course_template.save()
+    ids.append(course_template.id)
+  yield ids
+
+
+def test_fetch_page_with_page_token(clean_firestore, insert_course_templates):
+  fetched_ids = []
+  page_token = None
+  while True:
+    course_templates, page_token = fetch_page(
+        CourseTemplate.collection, 3, "-name", page_token)
+    fetched_ids.extend(i.id for i in course_templates)
+    if page_token is None:
+      break
+  assert len(fetched_ids) == len(insert_course_templates)
+  assert set(fetched_ids) == set(insert_course_templates)
+
+
+def test_fetch_page_nested_sort_field(clean_firestore):
+  ids = []
+  for index in range(5):
+    pathway = CurriculumPathway.from_dict({
+        "uuid": "",
+        "name": f"Program {index}",
+        "metadata": {"level": index // 2}
+    })
+    pathway.save()
+    ids.append(pathway.id)
+
+  fetched_ids = []
+  page_token = None
+  while True:
+    pathways, page_token = fetch_page(CurriculumPathway.collection, 2,
+                                      "-metadata.level", page_token)
+    fetched_ids.extend(i.id for i in pathways)
+    if page_token is None:
+      break
+  assert sorted(fetched_ids) == sorted(ids)
+  assert CurriculumPathway.find_by_id(fetched_ids[0]).metadata == {"level": 2}
+
+
+def test_fetch_page_with_skip(clean_firestore, insert_course_templates):
+  first_page, _ = fetch_page(CourseTemplate.collection, 3, "name")
+  second_page, page_token = fetch_page(CourseTemplate.collection, 3, "name",
+                                       skip=3)
+  assert {i.id for i in first_page}.isdisjoint({i.id for i in second_page})
+  assert page_token is not None
+
+
+def test_page_token_sort_order_mismatch(clean_firestore,
+                                        insert_course_templates):
+  course_template = CourseTemplate.find_by_id(insert_course_templates[0])
+  page_token = encode_page_token(course_template, "-created_time")
+  assert decode_page_token(page_token, "-created_time")["id"] == \
+    course_template.id
+  with pytest.raises(ValidationError):
+    fetch_page(CourseTemplate.collection, 3, "created_time", page_token)
+
+
+def test_count_documents(clean_firestore, insert_course_templates):
+  assert count_documents(CourseTemplate.collection) == 7
+  assert count_documents(
+      CourseTemplate.collection.filter("name", "==", "name 0")) == 2
+
+
+def test_count_documents_cache(clean_firestore, insert_course_templates):
+  query = CourseTemplate.collection.filter("name", "==", "name 3")
+  assert count_documents(query, cache_ttl=60) == 1
+  CourseTemplate.delete_by_id(insert_course_templates[-1])
+  assert count_documents(
+      CourseTemplate.collection.filter("name", "==", "name 3"),
+      cache_ttl=60) == 1
+  assert count_documents(
+      CourseTemplate.collection.filter("name", "==", "name 3")) == 0
+
+
+class FakeDocument():
+
+  def __init__(self, index):
+    self.id = f"id_{index}"
+    self.index = index
+
+
+class FakeQuery():
+  """Query returning the same documents in any order"""
+
+  def __init__(self, count):
+    self.documents = [FakeDocument(index) for index in range(count)]
+
+  def order(self, order_by):
+    del order_by
+    return self
+
+  def fetch(self):
+    return iter(self.documents)
+
+
+def is_even(document):
+  return document.index % 2 == 0
+
+
+def test_fetch_filtered_page():
+  query = FakeQuery(10)
+  documents, page_token, count = fetch_filtered_page(query, 2, is_even,
+                                                     "index")
+  assert [document.index for document in documents] == [0, 2]
+  assert count == 5
+
+  documents, page_token, count = fetch_filtered_page(query, 2, is_even,
+                                                     "index", page_token)
+  assert [document.index for document in documents] == [4, 6]
+  documents, page_token, _ = fetch_filtered_page(query, 2, is_even, "index",
+                                                 page_token)
+  assert [document.index for document in documents] == [8]
+  assert page_token is None
+
+  # the page starts after the token even if its document no longer matches
+  documents, _, _ = fetch_filtered_page(
+      query, 2, is_even, "index", encode_page_token(FakeDocument(3), "index"))
+  assert [document.index for document in documents] == [4, 6]
+
+  documents, _, _ = fetch_filtered_page(query, 2, is_even, "index", skip=1)
+  assert [document.index for document in documents] == [2, 4]
+  with pytest.raises(ValidationError):
+    fetch_filtered_page(query, 2, is_even, "index",
+                        encode_page_token(documents[0], "index"), 1)
@@ -1,27 +1,26 @@
 """Functions to get and update child and parent nodes data"""
+import copy
+import fireo
 from typing_extensions import Literal
 from common.utils.collection_references import collection_references, LOS_COLLECTIONS
-import copy
-from concurrent.futures import ThreadPoolExecutor
-from itertools import repeat
+from common.utils.node_loader import NodeLoader
+from common.utils.ancestor_path_handler import AncestorPathHandler
+from common.utils.cognitive_wrapper_index import CognitiveWrapperIndex
+from common.utils.hierarchy_change_handler import HierarchyChangeHandler
+from common.utils.hierarchy_walker import HierarchyWalker
+from common.utils.prerequisite_ordering import PrerequisiteOrdering
+from common.config import FIRESTORE_BATCH_WRITE_LIMIT
 #pylint: disable=dangerous-default-value
 class ParentChildNodesHandler():
   """ Class to handle parent child node relationship operations """
 
   @classmethod
-  def load_child_nodes_data(cls, document_fields):
+  def load_child_nodes_data(cls, document_fields, loader=None):
     """To fetch the data of the child nodes for a given document
         and their subsequent ones"""
-    child_nodes_dict = cls.get_child_nodes(document_fields)
-
-    for collection_name, document_id_list in child_nodes_dict.items():
-      for list_index, child_node_document_id in enumerate(document_id_list):
-        collection = collection_references[collection_name]
-        document = collection.find_by_uuid(child_node_document_id)
-        child_document_fields = document.get_fields(reformat_datetime=True)
-        document_id_list[list_index] = cls.load_child_nodes_data(
-            child_document_fields)
-
+    if loader is None:
+      loader = NodeLoader()
+    cls.expand_nodes_by_level(document_fields, loader, ["child_nodes"])
     return document_fields
 
   @classmethod
@@ -30,100 +29,154 @@ class ParentChildNodesHandler():
                       coll_name,
                       learner_profile,
                       keys_to_expand,
-                      list_to_expand):
+                      list_to_expand,
+                      loader=None):
     """To fetch the data of the child nodes for a given document
         and their subsequent ones"""
-    all_child_nodes = {}
-    for key in keys_to_expand:
-      all_child_nodes[key] = cls.get_nodes_by_key(document_fields, key)
-    for key in list_to_expand:
-      all_child_nodes[key] = cls.get_nodes_by_key(document_fields, key)
+    if loader is None:
+      loader = NodeLoader()
     document_fields = cls.update_hierarchy_with_profile_data(
-        learner_profile, document_fields, coll_name, document_fields["uuid"])
-    for field_name, child_nodes_dict in all_child_nodes.items():
-      if field_name in list_to_expand:
-        child_nodes_list = child_nodes_dict
-        for list_index, child_node_document_id in enumerate(child_nodes_list):
-          collection = collection_references[field_name]
-          document = collection.find_by_uuid(child_node_document_id)
-          child_document_fields = document.get_fields(reformat_datetime=True)
-          child_nodes_list[list_index] = cls.load_nodes_data(
-              child_document_fields,
-              field_name,
-              learner_profile,
-              keys_to_expand,
-              list_to_expand)
-      else:
-        for collection_name, document_id_list in child_nodes_dict.items():
-          for list_index, child_node_document_id in enumerate(document_id_list):
-            collection = collection_references[collection_name]
-            document = collection.find_by_uuid(child_node_document_id)
-            child_document_fields = document.get_fields(reformat_datetime=True)
-            child_document_fields = cls.update_hierarchy_with_profile_data(
-                learner_profile, child_document_fields, collection_name,
-                child_node_document_id)
-            document_id_list[list_index] = cls.load_nodes_data(
-                child_document_fields,
-                collection_name,
-                learner_profile,
-                keys_to_expand,
-                list_to_expand)
+        learner_profile, document_fields, coll_name, document_fields["uuid"],
+        loader=loader)
+    cls.expand_nodes_by_level(document_fields, loader, keys_to_expand,
+                              list_to_expand, learner_profile)
     return document_fields
 
+  @classmethod
+  def expand_nodes_by_level(cls,
+                            document_fields,
+                            loader,
+                            keys_to_expand,
+                            list_to_expand=None,
+                            learner_profile=None):
+    """Replaces the uuids referenced under the given keys with the data of
+    those nodes, recursively for the whole hierarchy.
+    The hierarchy is expanded breadth first so that every level is fetched
+    with a few batched reads instead of one read per node.
+    Args:
+      document_fields: dict - root node, updated in place
+      loader: NodeLoader - request scoped loader used to fetch the nodes
+      keys_to_expand: list - keys holding a map of collection to uuids
+      list_to_expand: list - keys holding a list of uuids of the collection
+        with the same name
+      learner_profile: LearnerProfile - profile used to update the nodes
+    """
+    list_to_expand = list_to_expand or []
+    current_level = [document_fields]
+    while current_level:
+      # Every reference is (list holding the uuid, index, collection name)
+      references = []
+      for node_fields in current_level:
+        for key in keys_to_expand:
+          for collection_type, document_id_list in cls.get_nodes_by_key(
+              node_fields, key).items():
+            references.extend((document_id_list, list_index, collection_type)
+                              for list_index in range(len(document_id_list)))
+        for key in list_to_expand:
+          document_id_list = cls.get_nodes_by_key(node_fields, key)
+          references.extend((document_id_list, list_index, key)
+                            for list_index in range(len(document_id_list)))
+
+      uuids_by_collection = {}
+      for document_id_list, list_index, collection_type in references:
+        uuids_by_collection.setdefault(collection_type,
+                                       []).append(document_id_list[list_index])
+      for collection_type, uuids in uuids_by_collection.items():
+        loader.load_many(collection_type, uuids)
+
+      next_level = []
+      for document_id_list, list_index, collection_type in references:
+        child_node_document_id = document_id_list[list_index]
+        child_document_fields = loader.load(collection_type,
+                                            child_node_document_id)
+        child_document_fields = cls.update_hierarchy_with_profile_data(
+            learner_profile, child_document_fields, collection_type,
+            child_node_document_id, loader=loader)
+        document_id_list[list_index] = child_document_fields
+        next_level.append(child_document_fields)
+      current_level = next_level
+
   @classmethod
   def load_hierarchy_progress(cls, document_fields, coll_name, learner_profile,
-    is_progress_updated = False):
-    """To fetch learner progress for a given learning node
+    is_progress_updated = False, loader=None):
+    """To fetch learner progress for a given learning node.
+    The hierarchy is read breadth first, every level with a few get_all
+    calls run on the shared worker pool, and the learner progress is
+    overlaid on the nodes in memory. The nodes are then sorted and their
+    recent child node computed from the deepest level up.
     Args:
       document_fields: dict - dictionary of fields of given learning node
       coll_name: str - collection name / hierarchy level of the learning node
       learner_profile: dict - learner profile dictionary
       is_progress_updated - whether progress is already updated
+      loader: NodeLoader - request scoped loader, nodes already in it are
+        not read again
     Returns:
       dict - nested dictionary containing learner progress
     """
-    all_child_nodes = document_fields.get("child_nodes",{})
+    if loader is None:
+      loader = NodeLoader()
     if not is_progress_updated:
       document_fields = cls.update_hierarchy_with_profile_data(
-        learner_profile, document_fields, coll_name, document_fields["uuid"])
-    for collection_name, document_id_list in all_child_nodes.items():
-      if not document_id_list:
+        learner_profile, document_fields, coll_name, document_fields["uuid"],
+        loader=loader)
+
+    # Every level is a list of (node fields, collection name) to expand
+    levels = []
+    current_level = [(document_fields, coll_name)]
+    while current_level:
+      levels.append(current_level)
+      uuids_by_collection = {}
+      for node_fields, _ in current_level:
+        for collection_name, document_id_list in node_fields.get(
+            "child_nodes", {}).items():
+          uuids_by_collection.setdefault(collection_name,
+                                         []).extend(document_id_list)
+      for collection_name, uuids in uuids_by_collection.items():
+        cls.fetch_nodes(collection_name, uuids, loader)
+
+      next_level = []
+      for node_fields, _ in current_level:
+        for collection_name, document_id_list in node_fields.get(
+            "child_nodes", {}).items():
+          for list_index, child_node_id in enumerate(document_id_list):
+            child_document_fields = cls.update_hierarchy_with_profile_data(
+                learner_profile, loader.load(collection_name, child_node_id),
+                collection_name, child_node_id, node_fields["uuid"],
+                loader=loader)
+            document_id_list[list_index] = child_document_fields
+            if collection_name == "curriculum_pathways" or (
+                collection_name == "learning_objects") or (
+                collection_name == "learning_experiences" and
+                child_document_fields.get("status") != "not_attempted"):
+              next_level.append((child_document_fields, collection_name))
+            elif collection_name == "learning_experiences":
+              child_document_fields["recent_child_node"] = {}
+      current_level = next_level
+
+    for level in reversed(levels):
+      for node_fields, node_coll_name in level:
+        cls.sort_child_nodes_by_recent_activity(node_fields, node_coll_name)
+    return document_fields
+
+  @classmethod
+  def sort_child_nodes_by_recent_activity(cls, document_fields, coll_name):
+    """Sorts the loaded child nodes of a node and sets its recent child node,
+    the child nodes of the learning experiences and objects below it are
+    dropped from the response"""
+    all_child_nodes = document_fields.get("child_nodes", {})
+    for collection_name, document_list in all_child_nodes.items():
+      if not document_list:
         continue
       learning_objects_counts = 0
       if collection_name == "learning_objects":
-        learning_objects_counts = len(document_id_list)
-      collection_class = collection_references[collection_name]
-      keys = [f"{collection_class.collection_name}/{id}"
-      for id in document_id_list]
-      all_child_docs = [node.get_fields(reformat_datetime=True)
-      for node in collection_class.collection.get_all(keys)]
-      child_count = len(document_id_list)
-      # map the arguments to the function using threads in the thread pool
-      with ThreadPoolExecutor(max_workers=child_count) as executor:
-        all_child_docs = list(
-          executor.map(cls.update_hierarchy_with_profile_data,
-        repeat(learner_profile),all_child_docs,repeat(collection_name),
-        document_id_list,repeat(document_fields["uuid"])))
-
-      for list_index, child_document_fields in enumerate(all_child_docs):
-        if collection_name == "curriculum_pathways":
-          document_id_list[list_index] = cls.load_hierarchy_progress(
-            child_document_fields, collection_name, learner_profile,
-            is_progress_updated = True)
-        elif collection_name in ["learning_experiences", "learning_objects"]:
-          if not (collection_name == "learning_experiences" and \
-              child_document_fields.get("status") == "not_attempted"):
-            child_document_fields = cls.load_hierarchy_progress(
-            child_document_fields, collection_name, learner_profile,
-            is_progress_updated = True)
-          else:
-            child_document_fields["recent_child_node"] = {}
-          del child_document_fields["child_nodes"]
-          document_id_list[list_index] = child_document_fields
-        else:
-          document_id_list[list_index] = child_document_fields
+        learning_objects_counts = len(document_list)
+      if collection_name in ["learning_experiences", "learning_objects"]:
+        for child_document_fields in document_list:
+          child_document_fields.pop("child_nodes", None)
       all_child_nodes[collection_name] = cls.sort_nodes_by_recent_activity(
-        document_id_list, coll_name, learning_objects_counts)
+        document_list, coll_name, learning_objects_counts,
+        document_fields.get("uuid"))
     # Condition to ensure we do not fill in recent child node data for
     # curriculum pathways
     if coll_name != "curriculum_pathways":
@@ -132,22 +185,27 @@ class ParentChildNodesHandler():
         all_child_collection_nodes.extend(document_list)
       document_fields["recent_child_node"] = cls.recent_child_node(
         all_child_collection_nodes, document_fields.get("uuid"))
-    return document_fields
 
   @classmethod
-  def reinitialize_ordering(cls, nodes):
-    """ function to reinitialize the order according to prerequisites
+  def fetch_nodes(cls, collection_type, uuids, loader):
+    """Reads the nodes missing in the loader with get_all, in chunks fetched
+    concurrently on the shared worker pool, and adds them to the loader"""
+    missing_uuids = [
+        uuid for uuid in dict.fromkeys(uuids)
+        if not loader.is_loaded(collection_type, uuid)
+    ]
+    if not missing_uuids:
+      return
+    for node_fields in HierarchyWalker.get_nodes(collection_type,
+                                                 missing_uuids):
+      loader.prime(collection_type, node_fields)
+
+  @classmethod
+  def reinitialize_ordering(cls, nodes, parent_uuid=None):
+    """ function to reinitialize the order according to prerequisites, a
+    prerequisite cycle is reported along with the parent when it is given
     """
-    for given_order in range(len(nodes)):
-      for current_order in range(len(nodes)):
-        if nodes[given_order]["uuid"] in nodes[
-          current_order]["prerequisites"].get(
-          "learning_objects",[]) and nodes[given_order][
-          "uuid"] != nodes[current_order]["uuid"]:
-          nodes[current_order]["order"] = nodes[given_order][
-            "order"]+1
-    sorted_nodes = sorted(nodes, key=lambda x: x["order"])
-    return sorted_nodes
+    return PrerequisiteOrdering.sort_nodes(nodes, parent_uuid)
 
   @classmethod
   def recent_child_node(cls, nodes, parent_node):
@@ -181,7 +239,8 @@ class ParentChildNodesHandler():
   @classmethod
   #pylint: disable = unused-argument
   def sort_nodes_by_recent_activity(cls, nodes, coll_name,
-                                    learning_objects_counts):
+                                    learning_objects_counts,
+                                    parent_uuid=None):
     """Sorts the passed nodes based on the recent activity with
     sorting preferences as following
     1. latest attempted active nodes
@@ -190,6 +249,7 @@ class ParentChildNodesHandler():
     4. completed nodes
     Args:
     nodes : List of nodes of a given hierarchy level
+    parent_uuid : uuid of the parent of the nodes
     Returns : List of sorted nodes
     """
     # NOTE: Use coll_name to add specific conditions
@@ -221,121 +281,181 @@ class ParentChildNodesHandler():
     else:
       sorted_nodes = sorted(nodes, key=lambda x: x["order"])
       if len(sorted_nodes) == learning_objects_counts:
-        sorted_nodes = cls.reinitialize_ordering(sorted_nodes)
+        sorted_nodes = cls.reinitialize_ordering(sorted_nodes, parent_uuid)
     return sorted_nodes
 
   @classmethod
-  def return_child_nodes_data(cls, document_dict):
+  def return_child_nodes_data(cls, document_dict, loader=None):
     """To fetch the data of the child nodes for a given document
         and their subsequent ones"""
-    #child_nodes_dict = cls.get_child_nodes(document_fields)
-
     document_fields = copy.deepcopy(document_dict)
-
-    if "child_nodes" in document_fields:
-      child_nodes_dict = document_fields.get("child_nodes")
-
-    for collection_name, document_id_list in child_nodes_dict.items():
-      for list_index, child_node_document_id in enumerate(document_id_list):
-        collection = collection_references[collection_name]
-        document = collection.find_by_uuid(child_node_document_id)
-        child_document_fields = document.get_fields(reformat_datetime=True)
-        document_id_list[list_index] = cls.load_child_nodes_data(
-            child_document_fields)
-
-    return document_fields
+    return cls.load_child_nodes_data(document_fields, loader)
 
   @classmethod
   def load_immediate_parent_nodes_data(cls,
                                        document_fields,
-                                       learner_profile=None):
+                                       learner_profile=None,
+                                       loader=None):
     """To fetch the data of the immediate parent nodes of a given document"""
+    if loader is None:
+      loader = NodeLoader()
     parent_nodes_dict = cls.get_parent_nodes(document_fields)
 
     for collection_type, document_id_list in parent_nodes_dict.items():
+      loader.load_many(collection_type, document_id_list)
       for list_index, each_document_id in enumerate(document_id_list):
-        collection = collection_references[collection_type]
-        parent_document = collection.find_by_uuid(each_document_id)
-        parent_document_fields = parent_document.get_fields(
-            reformat_datetime=True)
+        parent_document_fields = loader.load(collection_type, each_document_id)
         parent_document_fields = cls.update_hierarchy_with_profile_data(
             learner_profile, parent_document_fields, collection_type,
-            each_document_id)
+            each_document_id, loader=loader)
         document_id_list[list_index] = parent_document_fields
 
     return document_fields
 
+  @classmethod
+  def find_nodes(cls, nodes_dict, nodes=None):
+    """Reads the documents of the uuids of each collection type with grouped
+    "in" queries instead of one read per uuid
+    Args:
+      nodes_dict: dict - collection type to the list of uuids to read
+      nodes: dict - (collection type, uuid) to the documents already read,
+        the documents read are added to it
+    Returns:
+      dict - (collection type, uuid) to the document
+    Raises:
+      ResourceNotFoundException: if a document does not exist
+    """
+    nodes = {} if nodes is None else nodes
+    for collection_type, document_id_list in nodes_dict.items():
+      missing_ids = [
+          document_id for document_id in dict.fromkeys(document_id_list)
+          if (collection_type, document_id) not in nodes
+      ]
+      if not missing_ids:
+        continue
+      collection = collection_references[collection_type]
+      documents, not_found_ids = collection.find_by_uuids(missing_ids)
+      if not_found_ids:
+        # raises the not found error of the collection
+        collection.find_by_uuid(not_found_ids[0])
+      for document in documents:
+        nodes[(collection_type, document.uuid)] = document
+    return nodes
+
+  @classmethod
+  def write_nodes(cls, documents):
+    """Writes the documents with a single batch, which is atomic as long as
+    they fit the firestore write limit, larger sets are split in chunks"""
+    documents = list(documents)
+    for index in range(0, len(documents), FIRESTORE_BATCH_WRITE_LIMIT):
+      batch = fireo.batch()
+      for document in documents[index:index + FIRESTORE_BATCH_WRITE_LIMIT]:
+        document.update(batch=batch)
+      batch.commit()
+
+  @classmethod
+  def update_reference(cls, document, key, collection_name, uuid,
+                       operation: Literal["add", "remove"]):
+    """Adds/removes a uuid in the child or parent nodes of a document"""
+    references = getattr(document, key)[collection_name]
+    if operation == "add" and uuid not in references:
+      references.append(uuid)
+    if operation == "remove" and uuid in references:
+      references.remove(uuid)
+
   @classmethod
   def validate_parent_child_nodes_references(cls, input_dict):
     """To validate that the document uuid present in the child nodes and parent
     nodes for a given document exists"""
-    child_nodes_dict = cls.get_child_nodes(input_dict)
-    if child_nodes_dict is not None:
-      for collection_type, document_id_list in child_nodes_dict.items():
-        for each_document_id in document_id_list:
-          collection = collection_references[collection_type]
-          collection.find_by_uuid(each_document_id)
-
-    parent_nodes_dict = cls.get_parent_nodes(input_dict)
-    if parent_nodes_dict is not None:
-      for collection_type, document_id_list in parent_nodes_dict.items():
-        for each_document_id in document_id_list:
-          collection = collection_references[collection_type]
-          collection.find_by_uuid(each_document_id)
+    cls.find_nodes(cls.get_child_nodes(input_dict))
+    cls.find_nodes(cls.get_parent_nodes(input_dict))
 
   @classmethod
   def update_child_references(cls, document_fields, collection,
-                              operation: Literal["add", "remove"]):
+                              operation: Literal["add", "remove"],
+                              nodes=None):
     """To add/remove the references of given document in the parent nodes of a
-    child document"""
+    child document. The child documents are read and written in batches, the
+    documents read are added to nodes when given and written by the caller
+    along with the other updates of the operation"""
     collection_name = cls.get_collection_name(collection)
     child_nodes_dict = cls.get_child_nodes(document_fields)
+    updated_nodes = cls.find_nodes(child_nodes_dict, nodes)
 
     for collection_type, document_id_list in child_nodes_dict.items():
       for each_document_id in document_id_list:
-        collection = collection_references[collection_type]
-        child_document = collection.find_by_uuid(each_document_id)
-
-        if operation == "add":
-          if document_fields.get(
-              "uuid") not in child_document.parent_nodes[collection_name]:
-            child_document.parent_nodes[collection_name].append(
-                document_fields.get("uuid"))
-
-        if operation == "remove":
-          if document_fields.get(
-              "uuid") in child_document.parent_nodes[collection_name]:
-            child_document.parent_nodes[collection_name].remove(
-                document_fields.get("uuid"))
-        child_document.update()
+        cls.update_reference(updated_nodes[(collection_type,
+                                            each_document_id)],
+                             "parent_nodes", collection_name,
+                             document_fields.get("uuid"), operation)
+    if nodes is None:
+      cls.write_nodes(updated_nodes.values())
 
   @classmethod
   def update_parent_references(cls, document_fields, collection,
-                               operation: Literal["add", "remove"]):
+                               operation: Literal["add", "remove"],
+                               nodes=None):
     """To add/remove the references of given document in the child nodes of a
-    parent document"""
+    parent document. The parent documents are read and written in batches,
+    the documents read are added to nodes when given and written by the
+    caller along with the other updates of the operation"""
     collection_name = cls.get_collection_name(collection)
     parent_nodes_dict = cls.get_parent_nodes(document_fields)
+    updated_nodes = cls.find_nodes(parent_nodes_dict, nodes)
 
     for collection_type, document_id_list in parent_nodes_dict.items():
       for each_document_id in document_id_list:
-        collection = collection_references[collection_type]
-        parent_document = collection.find_by_uuid(each_document_id)
-        if operation == "add":
-          if document_fields.get(
-              "uuid") not in parent_document.child_nodes[collection_name]:
-            parent_document.child_nodes[collection_name].append(
-                document_fields.get("uuid"))
-        if operation == "remove":
-          if document_fields.get(
-              "uuid") in parent_document.child_nodes[collection_name]:
-            parent_document.child_nodes[collection_name].remove(
-                document_fields.get("uuid"))
-        parent_document.update()
+        cls.update_reference(updated_nodes[(collection_type,
+                                            each_document_id)],
+                             "child_nodes", collection_name,
+                             document_fields.get("uuid"), operation)
+    if nodes is None:
+      cls.write_nodes(updated_nodes.values())
+      cls.parent_references_updated(document_fields, collection_name,
+                                    operation, updated_nodes)
+
+  @classmethod
+  def parent_references_updated(cls, document_fields, collection_name,
+                                operation, nodes):
+    """Updates the data derived from the hierarchy once the references of a
+    document were written in its parents"""
+    loader = NodeLoader()
+    for (collection_type, _), document in nodes.items():
+      loader.prime(collection_type, document.get_fields(reformat_datetime=True))
+    if operation == "add":
+      AncestorPathHandler.update(collection_name, document_fields, loader)
+    HierarchyChangeHandler.node_changed(collection_name, document_fields)
+
+  @classmethod
+  def update_nodes_references(cls, document_fields, collection,
+                              operation: Literal["add", "remove"]):
+    """To add/remove the references of given document in its child and parent
+    documents, written together in a single batch"""
+    nodes = {}
+    cls.update_child_references(document_fields, collection, operation, nodes)
+    cls.update_parent_references(document_fields, collection, operation, nodes)
+    cls.write_nodes(nodes.values())
+    cls.parent_references_updated(document_fields,
+                                  cls.get_collection_name(collection),
+                                  operation, nodes)
+
+  @classmethod
+  def get_removed_nodes(cls, base_nodes_dict, nodes_dict):
+    """Returns the uuids of each collection type of base_nodes_dict missing in
+    nodes_dict, none when nodes_dict is empty as the nodes are not updated"""
+    if not nodes_dict:
+      return {}
+    return {
+        collection_type: [
+            document_id for document_id in document_id_list
+            if document_id not in (nodes_dict.get(collection_type) or [])
+        ] for collection_type, document_id_list in base_nodes_dict.items()
+    }
 
   @classmethod
   def compare_and_update_child_nodes_references(cls, base_doc_dict, doc_dict,
-                                                collection, operation):
+                                                collection, operation,
+                                                nodes=None):
     """
     This function is used to add/remove the references of given document in the
     parent nodes of a child document
@@ -343,34 +463,27 @@ class ParentChildNodesHandler():
       base_doc_dict: Base document object that is used as reference
       doc_dict: Document object that is being compared with base one
       collection: The collection of the document
-      operation: add or remove the node"""
-    base_child_nodes_dict = cls.get_child_nodes(base_doc_dict)
-    child_nodes_dict = cls.get_child_nodes(doc_dict)
-
+      operation: add or remove the node
+      nodes: documents read, written by the caller when given"""
     collection_name = cls.get_collection_name(collection)
+    uuid = doc_dict.get("uuid") if operation == "add" else base_doc_dict.get(
+        "uuid")
+    changed_nodes_dict = cls.get_removed_nodes(
+        cls.get_child_nodes(base_doc_dict), cls.get_child_nodes(doc_dict))
+    updated_nodes = cls.find_nodes(changed_nodes_dict, nodes)
 
-    for collection_type, document_id_list in base_child_nodes_dict.items():
+    for collection_type, document_id_list in changed_nodes_dict.items():
       for each_document_id in document_id_list:
-        if child_nodes_dict and each_document_id not in child_nodes_dict.get(
-          collection_type):
-          collection = collection_references[collection_type]
-          child_document = collection.find_by_uuid(each_document_id)
-
-          if operation == "add":
-            if doc_dict.get(
-                "uuid") not in child_document.parent_nodes[collection_name]:
-              child_document.parent_nodes[collection_name].append(
-                  doc_dict.get("uuid"))
-          if operation == "remove":
-            if base_doc_dict.get(
-                "uuid") in child_document.parent_nodes[collection_name]:
-              child_document.parent_nodes[collection_name].remove(
-                  base_doc_dict.get("uuid"))
-          child_document.update()
+        cls.update_reference(updated_nodes[(collection_type,
+                                            each_document_id)],
+                             "parent_nodes", collection_name, uuid, operation)
+    if nodes is None:
+      cls.write_nodes(updated_nodes.values())
 
   @classmethod
   def compare_and_update_parent_nodes_references(cls, base_doc_dict, doc_dict,
-                                                 collection, operation):
+                                                 collection, operation,
+                                                 nodes=None):
     """
     This function is used to add/remove the references of given document in the
     child nodes of a parent document
@@ -378,68 +491,91 @@ class ParentChildNodesHandler():
       base_doc_dict: Base document object that is used as reference
       doc_dict: Document object that is being compared with base one
       collection: The collection of the document
-      operation: add or remove the node"""
-    base_parent_nodes_dict = cls.get_parent_nodes(base_doc_dict)
-    parent_nodes_dict = cls.get_parent_nodes(doc_dict)
-
+      operation: add or remove the node
+      nodes: documents read, written by the caller when given"""
     collection_name = cls.get_collection_name(collection)
-    for collection_type, document_id_list in base_parent_nodes_dict.items():
+    uuid = doc_dict.get("uuid") if operation == "add" else base_doc_dict.get(
+        "uuid")
+    changed_nodes_dict = cls.get_removed_nodes(
+        cls.get_parent_nodes(base_doc_dict), cls.get_parent_nodes(doc_dict))
+    updated_nodes = cls.find_nodes(changed_nodes_dict, nodes)
+
+    for collection_type, document_id_list in changed_nodes_dict.items():
       for each_document_id in document_id_list:
-        if parent_nodes_dict and each_document_id not in parent_nodes_dict.get(
-          collection_type):
-          collection = collection_references[collection_type]
-          parent_document = collection.find_by_uuid(each_document_id)
-
-          if operation == "add":
-            if doc_dict.get(
-                "uuid") not in parent_document.child_nodes[collection_name]:
-              parent_document.child_nodes[collection_name].append(
-                  doc_dict.get("uuid"))
-          if operation == "remove":
-            if base_doc_dict.get(
-                "uuid") in parent_document.child_nodes[collection_name]:
-              parent_document.child_nodes[collection_name].remove(
-                  base_doc_dict.get("uuid"))
-          parent_document.update()
+        cls.update_reference(updated_nodes[(collection_type,
+                                            each_document_id)],
+                             "child_nodes", collection_name, uuid, operation)
+    if nodes is None:
+      cls.write_nodes(updated_nodes.values())
 
   @classmethod
   def compare_and_update_nodes_references(cls, input_document_dict,
                                           existing_document_dict, collection):
     """
     This function is used to add/remove the references of given document in the
-    child/parent nodes of a parent/child document
+    child/parent nodes of a parent/child document. All the documents are
+    written in a single batch once every reference is updated
     Args:
       input_document_dict: Input document object that is provided by the user
       existing_document_dict: Existing document object that is present in the DB
       collection: The collection of the document"""
+    nodes = {}
     cls.compare_and_update_child_nodes_references(existing_document_dict,
                                                   input_document_dict,
-                                                  collection, "remove")
+                                                  collection, "remove", nodes)
     cls.compare_and_update_child_nodes_references(input_document_dict,
                                                   existing_document_dict,
-                                                  collection, "add")
+                                                  collection, "add", nodes)
     cls.compare_and_update_parent_nodes_references(existing_document_dict,
                                                    input_document_dict,
-                                                   collection, "remove")
+                                                   collection, "remove", nodes)
     cls.compare_and_update_parent_nodes_references(input_document_dict,
                                                    existing_document_dict,
-                                                   collection, "add")
+                                                   collection, "add", nodes)
+    cls.write_nodes(nodes.values())
+    cls.update_ancestors(input_document_dict, existing_document_dict,
+                         collection)
+
+  @classmethod
+  def update_ancestors(cls, input_document_dict, existing_document_dict,
+                       collection):
+    """
+    This function is used to update the stored ancestors of a document whose
+    parent nodes or alias are updated, of its descendants and of the child
+    nodes that are removed from it
+    Args:
+      input_document_dict: Input document object that is provided by the user
+      existing_document_dict: Existing document object that is present in the DB
+      collection: The collection of the document"""
+    collection_name = cls.get_collection_name(collection)
+    document_fields = {
+        **existing_document_dict,
+        **{
+            key: value
+            for key, value in input_document_dict.items()
+            if value is not None
+        }
+    }
+    AncestorPathHandler.update(collection_name, document_fields)
+
+    child_nodes_dict = cls.get_child_nodes(document_fields)
+    for collection_type, document_id_list in cls.get_child_nodes(
+        existing_document_dict).items():
+      AncestorPathHandler.update_nodes(collection_type, [
+          document_id for document_id in document_id_list
+          if document_id not in (child_nodes_dict.get(collection_type) or [])
+      ])
 
   @classmethod
   def delete_tree(cls, document_dict, collection):
-    for collection_name, document_list in document_dict["child_nodes"].items():
-      child_collection = collection_references[collection_name]
-      for child_document_fields in document_list:
-        cls.delete_tree(child_document_fields, child_collection)
-    collection.delete_by_uuid(document_dict["uuid"])
+    """Soft deletes a node and the hierarchy below it"""
+    HierarchyWalker.delete_hierarchy(
+        {cls.get_collection_name(collection): [document_dict["uuid"]]})
 
   @classmethod
   def delete_child_tree(cls, document_dict):
-    document_dict = cls.load_child_nodes_data(document_dict)
-    for collection_name, document_list in document_dict["child_nodes"].items():
-      collection = collection_references[collection_name]
-      for child_document_fields in document_list:
-        cls.delete_tree(child_document_fields, collection)
+    """Soft deletes the hierarchy below a node"""
+    HierarchyWalker.delete_hierarchy(document_dict["child_nodes"])
 
   @classmethod
   def get_collection_name(cls, collection):
@@ -489,9 +625,13 @@ class ParentChildNodesHandler():
   @classmethod
   def update_hierarchy_with_profile_data(cls, learner_profile, node_dict,
                                          collection_type, doc_id,
-                                         parent_id=None):
+                                         parent_id=None, loader=None):
     """This function will find the correct data for a Node Item in LOS in
-    LearnerProfile and update it in the hierarchy"""
+    LearnerProfile and update it in the hierarchy. The nodes it looks up are
+    read through the loader so that they are served from memory when the
+    hierarchy around the node is already loaded"""
+    if loader is None:
+      loader = NodeLoader()
     # Logic to check if the item is locked/unlocked
     # Update the is_locked flag and progress flag from LearnerProfile
     if learner_profile is not None and learner_profile.progress is not None\
@@ -519,22 +659,25 @@ class ParentChildNodesHandler():
       # this flags specifies whether cognitive wrapper is unlocked
       # Ticket 4928
       if collection_type == "learning_resources" and node_dict["order"] == 1:
-        node = collection_references["learning_resources"].find_by_uuid(doc_id)
-        module = collection_references["learning_objects"]\
-          .find_by_uuid(node.parent_nodes["learning_objects"][0])
-        if module.type == "project":
+        module = loader.load("learning_objects",
+                             node_dict["parent_nodes"]["learning_objects"][0])
+        if module["type"] == "project":
+          cognitive_wrapper_uuid = module.get("cognitive_wrapper_uuid")
+          if cognitive_wrapper_uuid is None:
+            # the module is not indexed yet
+            unit = loader.load(
+                "learning_experiences",
+                module["parent_nodes"]["learning_experiences"][0])
+            modules = {}
+            for level in unit["child_nodes"].values():
+              modules.update(loader.load_many("learning_objects", level))
+            cognitive_wrapper_uuid = \
+              CognitiveWrapperIndex.find_cognitive_wrapper(unit, modules)
           cw_is_locked = True
-          unit = collection_references["learning_experiences"].find_by_uuid(
-            module.parent_nodes["learning_experiences"][0])
-          modules = unit.child_nodes
-          for level in modules:
-            for module_id in modules[level][::-1]:
-              neighbor = collection_references["learning_objects"].find_by_uuid(
-                module_id)
-              if neighbor.type == "cognitive_wrapper":
-                cw_is_locked = learner_profile.progress.get("learning_objects",
-                        {}).get(neighbor.id, {}).get("is_locked", True)
-                break
+          if cognitive_wrapper_uuid:
+            cw_is_locked = learner_profile.progress.get(
+                "learning_objects", {}).get(cognitive_wrapper_uuid,
+                                            {}).get("is_locked", True)
           node_dict["ungate"] = not cw_is_locked
 
       if not (progress_parent != parent_id and node_dict["type"] == "srl"
@@ -568,10 +711,10 @@ class ParentChildNodesHandler():
       achievement_intersection = list(
           set(learner_profile.achievements)
           & set(node_dict.get("achievements", [])))
-      node_dict["earned_achievements"] = []
-      for achievement in achievement_intersection:
-        node_dict["earned_achievements"].append(
-            cls.get_document_from_collection("achievements", achievement))
+      achievements = loader.load_many("achievements", achievement_intersection)
+      node_dict["earned_achievements"] = [
+          achievements[achievement] for achievement in achievement_intersection
+      ]
     return node_dict
 
   @classmethod
@@ -228,6 +228,35 @@ def test_update_parent_references_remove_add(clean_firestore, insert_data_to_db)
   assert child_document_id in parent_document_fields[
                         "child_nodes"]["learning_objects"]
 
+def test_update_nodes_references_remove_add(clean_firestore,
+                                            insert_data_to_db):
+  parent_id = insert_data_to_db[0].uuid
+  document_dict = insert_data_to_db[2].to_dict()
+
+  ParentChildNodesHandler.update_nodes_references(
+    document_dict, LearningObject, operation="remove")
+  parent_document = LearningObject.find_by_uuid(parent_id)
+  assert document_dict["uuid"] not in parent_document.child_nodes[
+    "learning_objects"]
+
+  # adding a reference twice keeps a single one
+  for _ in range(2):
+    ParentChildNodesHandler.update_nodes_references(
+      document_dict, LearningObject, operation="add")
+  parent_document = LearningObject.find_by_uuid(parent_id)
+  assert parent_document.child_nodes["learning_objects"].count(
+    document_dict["uuid"]) == 1
+
+
+def test_validate_missing_references(clean_firestore, insert_data_to_db):
+  document_dict = insert_data_to_db[2].to_dict()
+  ParentChildNodesHandler.validate_parent_child_nodes_references(document_dict)
+
+  document_dict["parent_nodes"]["learning_objects"].append("missing_uuid")
+  with pytest.raises(ResourceNotFoundException):
+    ParentChildNodesHandler.validate_parent_child_nodes_references(
+      document_dict)
+
 def test_return_child_nodes_data(clean_firestore, insert_data_to_db):
   document = insert_data_to_db[0]
   document_dict = document.to_dict()
@@ -275,3 +304,16 @@ def test_load_nodes_data(clean_firestore, insert_cirriculum_data_to_db):
                 expansion_list)
   assert func_output != {}
 
+
+
+def test_load_hierarchy_progress(clean_firestore, insert_data_to_db):
+  parent_lo, child_ids, _, _ = insert_data_to_db
+  parent_fields = parent_lo.get_fields(reformat_datetime=True)
+  func_output = ParentChildNodesHandler.load_hierarchy_progress(
+      parent_fields, "learning_objects", None)
+  child_nodes = func_output["child_nodes"]["learning_objects"]
+  assert sorted(node["uuid"] for node in child_nodes) == sorted(child_ids)
+  for node in child_nodes:
+    assert "child_nodes" not in node
+    assert node["recent_child_node"] == {}
+  assert "recent_child_node" in func_output
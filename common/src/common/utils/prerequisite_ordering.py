@@ -0,0 +1,136 @@
+"""Ordering of sibling nodes according to their prerequisites"""
+import heapq
+from common.utils.logging_handler import Logger
+
+
+class PrerequisiteCycleError(Exception):
+  """Raised when the prerequisites of sibling nodes depend on each other"""
+
+  def __init__(self, cycle):
+    self.cycle = cycle
+    super().__init__("Prerequisites form a cycle: " + " -> ".join(cycle))
+
+
+class PrerequisiteOrdering():
+  """Orders sibling nodes so that every node comes after the siblings listed
+  in its prerequisites, the nodes without a dependency between them keeping
+  the order of their order field.
+
+  The prerequisites are read once into an adjacency map and ordered with
+  Kahn's algorithm, which runs in O(n log n + e) for n nodes and e
+  prerequisites.
+  """
+
+  @classmethod
+  def get_prerequisite_indexes(cls, nodes, prerequisite_type):
+    """Returns, for each node, the indexes of the siblings in its
+    prerequisites, the prerequisites that are not siblings are ignored"""
+    indexes = {}
+    for index, node in enumerate(nodes):
+      indexes.setdefault(node["uuid"], index)
+    return [
+        sorted({
+            indexes[uuid]
+            for uuid in (node.get("prerequisites") or {}).get(
+                prerequisite_type) or []
+            if uuid in indexes and indexes[uuid] != index
+        })
+        for index, node in enumerate(nodes)
+    ]
+
+  @classmethod
+  def get_sort_key(cls, node, index):
+    """Returns the key breaking the ties between the nodes that are ready"""
+    order = node.get("order")
+    return (order is None, order or 0, index)
+
+  @classmethod
+  def find_cycle(cls, nodes, prerequisites, indexes):
+    """Returns the uuids of a prerequisite cycle among the given nodes"""
+    remaining = set(indexes)
+    path, positions = [], {}
+    index = min(indexes)
+    # every remaining node has a remaining prerequisite, so following them
+    # reaches a node of the path again
+    while index not in positions:
+      positions[index] = len(path)
+      path.append(index)
+      index = next(prerequisite for prerequisite in prerequisites[index]
+                   if prerequisite in remaining)
+    cycle = path[positions[index]:] + [index]
+    return [nodes[position]["uuid"] for position in reversed(cycle)]
+
+  @classmethod
+  def topological_sort(cls, nodes, prerequisites):
+    """Returns the indexes of the nodes that do not depend on a prerequisite
+    cycle, each after its prerequisites and the ties ordered by order"""
+    dependents = [[] for _ in nodes]
+    in_degrees = [len(indexes) for indexes in prerequisites]
+    for index, indexes in enumerate(prerequisites):
+      for prerequisite in indexes:
+        dependents[prerequisite].append(index)
+
+    ready = [(cls.get_sort_key(node, index), index)
+             for index, node in enumerate(nodes) if not in_degrees[index]]
+    heapq.heapify(ready)
+    ordered = []
+    while ready:
+      _, index = heapq.heappop(ready)
+      ordered.append(index)
+      for dependent in dependents[index]:
+        in_degrees[dependent] -= 1
+        if not in_degrees[dependent]:
+          heapq.heappush(
+              ready, (cls.get_sort_key(nodes[dependent], dependent), dependent))
+    return ordered
+
+  @classmethod
+  def sort_nodes(cls, nodes, parent_uuid=None,
+                 prerequisite_type="learning_objects"):
+    """Sorts sibling nodes according to their prerequisites. The order of
+    every node is raised above the orders of its prerequisites, so that
+    sorting the nodes by order keeps them after their prerequisites. The
+    nodes of a prerequisite cycle are reported and placed after the other
+    nodes, by order
+    Args:
+      nodes: list - fields of the sibling nodes, their order is updated
+      parent_uuid: str - uuid of the parent, reported along with a cycle
+      prerequisite_type: str - key of the prerequisites linking the siblings
+    Returns:
+      list - the sorted nodes
+    """
+    if not nodes:
+      return []
+    ordered, orders = cls.compute_ordering(nodes, parent_uuid,
+                                           prerequisite_type)
+    for index, order in enumerate(orders):
+      nodes[index]["order"] = order
+    return [nodes[index] for index in ordered]
+
+  @classmethod
+  def compute_ordering(cls, nodes, parent_uuid, prerequisite_type):
+    """Returns the indexes of the nodes in prerequisite order and the order
+    of each node raised above the orders of its prerequisites"""
+    prerequisites = cls.get_prerequisite_indexes(nodes, prerequisite_type)
+    ordered = cls.topological_sort(nodes, prerequisites)
+    orders = [node.get("order") for node in nodes]
+    for index in ordered:
+      prerequisite_orders = [
+          orders[prerequisite] for prerequisite in prerequisites[index]
+          if orders[prerequisite] is not None
+      ]
+      if prerequisite_orders and (orders[index] is None or
+                                  orders[index] <= max(prerequisite_orders)):
+        orders[index] = max(prerequisite_orders) + 1
+
+    if len(ordered) < len(nodes):
+      sorted_indexes = set(ordered)
+      remaining = [
+          index for index in range(len(nodes)) if index not in sorted_indexes
+      ]
+      cycle = cls.find_cycle(nodes, prerequisites, remaining)
+      Logger.warning(f"Child nodes of {parent_uuid}: "
+                     f"{PrerequisiteCycleError(cycle)}")
+      ordered += sorted(
+          remaining, key=lambda index: cls.get_sort_key(nodes[index], index))
+    return ordered, orders
@@ -0,0 +1,64 @@
+"""Unit test cases for the prerequisite ordering of sibling nodes"""
+from common.utils.prerequisite_ordering import (PrerequisiteOrdering,
+                                                PrerequisiteCycleError)
+
+
+def create_node(uuid, order, prerequisites=None):
+  return {
+      "uuid": uuid,
+      "order": order,
+      "prerequisites": {
+          "learning_objects": prerequisites or []
+      }
+  }
+
+
+def get_uuids(nodes):
+  return [node["uuid"] for node in nodes]
+
+
+def test_sort_nodes_chain():
+  # c requires b which requires a, the chain runs against the order field
+  nodes = [
+      create_node("c", 1, ["b"]),
+      create_node("b", 2, ["a"]),
+      create_node("a", 3),
+      create_node("d", 4)
+  ]
+  sorted_nodes = PrerequisiteOrdering.sort_nodes(nodes)
+  assert get_uuids(sorted_nodes) == ["a", "b", "c", "d"]
+  assert [node["order"] for node in sorted_nodes] == [3, 4, 5, 4]
+
+
+def test_sort_nodes_ties_and_missing_prerequisites():
+  nodes = [
+      create_node("a", 1),
+      create_node("b", 2, ["outside_lo", "b"]),
+      create_node("c", 2),
+      create_node("d", 3, ["a"])
+  ]
+  nodes[0]["prerequisites"] = None
+  sorted_nodes = PrerequisiteOrdering.sort_nodes(nodes)
+  assert get_uuids(sorted_nodes) == ["a", "b", "c", "d"]
+  assert [node["order"] for node in sorted_nodes] == [1, 2, 2, 3]
+
+
+def test_sort_nodes_cycle(mocker):
+  nodes = [
+      create_node("a", 1),
+      create_node("b", 2, ["d"]),
+      create_node("c", 3, ["b"]),
+      create_node("d", 4, ["c"]),
+      create_node("e", 5, ["b"])
+  ]
+  warning = mocker.patch(
+      "common.utils.prerequisite_ordering.Logger.warning")
+  # the nodes of the cycle and their dependents are placed last by order
+  assert get_uuids(PrerequisiteOrdering.sort_nodes(nodes, "parent")) == [
+      "a", "b", "c", "d", "e"
+  ]
+  # the cycle is reported along with the parent of the nodes
+  warning.assert_called_once_with(
+      "Child nodes of parent: " +
+      str(PrerequisiteCycleError(["b", "c", "d", "b"])))
+
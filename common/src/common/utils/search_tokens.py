@@ -0,0 +1,37 @@
+"""Prefix tokens used to search text fields with firestore queries"""
+import re
+
+# Longest prefix stored for a word or for the whole text
+MAX_TOKEN_LENGTH = 30
+
+
+def normalize_search_text(text):
+  """Returns the lowercase words of a text separated by single spaces"""
+  return " ".join(re.findall(r"\w+", (text or "").lower()))
+
+
+def get_prefix_tokens(*texts, max_length=MAX_TOKEN_LENGTH):
+  """Returns the prefixes of every word and of the whole normalized text of
+  the given texts, so that a text is found with an array_contains query on
+  the normalized search keyword
+  Args:
+    texts: str - texts to be searched, None values are ignored
+    max_length: int - longest prefix stored
+  Returns:
+    list - unique prefix tokens
+  """
+  tokens = []
+  for text in texts:
+    normalized_text = normalize_search_text(text)
+    if not normalized_text:
+      continue
+    for value in [normalized_text] + normalized_text.split(" "):
+      tokens.extend(value[:length]
+                    for length in range(1, min(len(value), max_length) + 1))
+  return list(dict.fromkeys(tokens))
+
+
+def get_search_token(keyword, max_length=MAX_TOKEN_LENGTH):
+  """Returns the token to look up for a search keyword, None when the
+  keyword has no words"""
+  return normalize_search_text(keyword)[:max_length] or None
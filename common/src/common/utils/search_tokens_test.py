@@ -0,0 +1,26 @@
+"""Unit test cases for the search tokens"""
+from common.utils.search_tokens import (get_prefix_tokens, get_search_token,
+                                        normalize_search_text)
+
+
+def test_normalize_search_text():
+  assert normalize_search_text("  Intro to  PYTHON-3 ") == "intro to python 3"
+  assert normalize_search_text(None) == ""
+
+
+def test_get_prefix_tokens():
+  tokens = get_prefix_tokens("Data Tools", None, "data")
+  assert tokens == [
+      "d", "da", "dat", "data", "data ", "data t", "data to", "data too",
+      "data tool", "data tools", "t", "to", "too", "tool", "tools"
+  ]
+  assert get_search_token("Data T") in tokens
+  assert get_search_token("tool") in tokens
+  assert get_search_token("ata") not in tokens
+
+  assert get_prefix_tokens("abcdef", max_length=3) == ["a", "ab", "abc"]
+
+
+def test_get_search_token():
+  assert get_search_token(" Data  Tools ") == "data tools"
+  assert get_search_token("!?") is None
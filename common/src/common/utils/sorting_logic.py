@@ -1,18 +1,22 @@
 """
 Generic function for Sorting is implemented
 """
+from common.utils.pagination import fetch_page, get_order_by
 
 
 def collection_sorting(collection_manager: any, sort_by: str,
-                       sort_order: str, skip: int, limit: int) -> any:
+                       sort_order: str, skip: int, limit: int,
+                       page_token: str = None) -> any:
   """
   Generic Function for Firestore Collection Sorting Logic
   :collection_manager: Object
   :sort_by: string
   :sort_order: const(ascending, descending)
-  :return: Firestore Object
+  :skip: int, not allowed along with page_token
+  :limit: int
+  :page_token: string, next_page_token of the previous page
+  :return: tuple of the page of Firestore Objects and the next page token
   """
 
-  return collection_manager.order(f"{sort_by}").offset(
-    skip).fetch(limit) if sort_order == "ascending" else \
-    collection_manager.order(f"-{sort_by}").offset(skip).fetch(limit)
+  return fetch_page(collection_manager, limit,
+                    get_order_by(sort_by, sort_order), page_token, skip)
@@ -0,0 +1,193 @@
+"""Counts of the filter values of the submitted assessments"""
+import collections
+import zlib
+import fireo
+from fireo.database import db
+from common.config import SUBMITTED_ASSESSMENT_FACET_SHARDS
+from common.models import SubmittedAssessment, SubmittedAssessmentFacet
+from common.utils.logging_handler import Logger
+
+# facet name to the submission field it counts
+FACET_FIELDS = {
+    "discipline_names": "discipline_name",
+    "unit_names": "unit_name",
+    "types": "type",
+    "results": "result"
+}
+# scope of the counts of every submission, spread over shard documents
+ALL_SCOPE = "all"
+
+
+class SubmittedAssessmentFacetHandler():
+  """Keeps, for all the submitted assessments and for those of each
+  assessor, the number of submissions having each discipline name, unit
+  name, type and result, so that the values of the filters of the grading
+  queue are read from a single document.
+
+  The counts are grouped by the autogradable flag and then by the status of
+  the submissions, which the values can be filtered on. Every change of a
+  submission is applied as atomic increments of the counts, written in the
+  same batch as the submission when one is given. The counts of all the
+  submissions are written by every submission, they are spread over
+  SUBMITTED_ASSESSMENT_FACET_SHARDS documents picked from the uuid of the
+  submission and summed on read, so that they are not all written to a
+  single document.
+  """
+
+  @classmethod
+  def get_shard_scopes(cls):
+    """Returns the ids of the documents the counts of all the submissions are
+    spread over"""
+    return [
+        f"{ALL_SCOPE}_{shard}"
+        for shard in range(SUBMITTED_ASSESSMENT_FACET_SHARDS)
+    ]
+
+  @classmethod
+  def get_scopes(cls, fields):
+    """Returns the ids of the facet documents counting a submission, a
+    submission always being counted in the same shard"""
+    shard = zlib.crc32(str(fields.get("uuid") or "").encode(
+        "utf-8")) % SUBMITTED_ASSESSMENT_FACET_SHARDS
+    scopes = [f"{ALL_SCOPE}_{shard}"]
+    if fields.get("assessor_id"):
+      scopes.append(f"assessor_{fields['assessor_id']}")
+    return scopes
+
+  @classmethod
+  def get_grading(cls, is_autogradable):
+    """Returns the key of the counts of the autogradable or human graded
+    submissions"""
+    return "autogradable" if is_autogradable else "human_graded"
+
+  @classmethod
+  def add_counts(cls, counts, fields, step):
+    """Adds step to the counts of the values of a submission
+    Args:
+      counts: dict - (scope, grading, status, facet, value) to count
+      fields: dict - fields of the submission, None if it does not exist
+      step: int - 1 to count the submission, -1 to uncount it
+    """
+    if not fields or fields.get("is_deleted"):
+      return
+    grading = cls.get_grading(fields.get("is_autogradable"))
+    status = str(fields.get("status"))
+    for scope in cls.get_scopes(fields):
+      for facet, field in FACET_FIELDS.items():
+        if fields.get(field):
+          counts[(scope, grading, status, facet, fields[field])] += step
+
+  @classmethod
+  def get_documents(cls, counts, get_value):
+    """Returns the nested counts of each facet document
+    Args:
+      counts: dict - (scope, grading, status, facet, value) to count
+      get_value: function - returns the value stored for a count
+    Returns:
+      dict - scope to grading to status to facet to value to stored value
+    """
+    documents = {}
+    for (scope, *keys, value), count in counts.items():
+      if not count:
+        continue
+      level = documents.setdefault(scope, {})
+      for key in keys:
+        level = level.setdefault(key, {})
+      level[value] = get_value(count)
+    return documents
+
+  @classmethod
+  def submissions_changed(cls, changes, batch=None):
+    """Updates the counts after submissions were created, updated or deleted
+    Args:
+      changes: list - (previous fields, current fields) of each submission,
+        the previous fields are None for a created submission and the
+        current ones are None for a deleted submission
+      batch: firestore batch the increments are added to, they are committed
+        right away when no batch is given
+    Returns:
+      int - number of facet documents written
+    """
+    counts = collections.Counter()
+    for previous_fields, current_fields in changes:
+      cls.add_counts(counts, previous_fields, -1)
+      cls.add_counts(counts, current_fields, 1)
+
+    increments = cls.get_documents(counts, fireo.Increment)
+    if not increments:
+      return 0
+
+    write_batch = batch or fireo.batch()
+    for scope, scope_counts in increments.items():
+      write_batch.set(cls.get_document(scope), {"counts": scope_counts},
+                      merge=True)
+    if batch is None:
+      write_batch.commit()
+    return len(increments)
+
+  @classmethod
+  def get_document(cls, scope):
+    """Returns the firestore reference of the facet document of a scope"""
+    return db.conn.collection(
+        SubmittedAssessmentFacet.collection_name).document(scope)
+
+  @classmethod
+  def get_unique_values(cls, assessor_id=None, is_autogradable=None,
+                        statuses=None):
+    """Returns the values of the filters of the grading queue
+    Args:
+      assessor_id: str - only count the submissions of this assessor
+      is_autogradable: bool - only count the submissions having this flag
+      statuses: list - only count the submissions having these statuses
+    Returns:
+      dict - facet name to the sorted list of values of at least one
+        submission
+    """
+    scopes = [f"assessor_{assessor_id}"
+             ] if assessor_id else cls.get_shard_scopes()
+    totals = {facet_name: collections.Counter() for facet_name in FACET_FIELDS}
+    for snapshot in db.conn.get_all(
+        [cls.get_document(scope) for scope in scopes]):
+      if not snapshot.exists:
+        continue
+      for grading, status_counts in (snapshot.to_dict().get("counts") or
+                                     {}).items():
+        if is_autogradable is not None and \
+            grading != cls.get_grading(is_autogradable):
+          continue
+        for status, facet_counts in status_counts.items():
+          if statuses and status not in statuses:
+            continue
+          for facet_name, value_counts in facet_counts.items():
+            if facet_name in totals:
+              totals[facet_name].update(value_counts)
+    return {
+        facet_name: sorted(
+            value for value, count in value_counts.items() if count > 0)
+        for facet_name, value_counts in totals.items()
+    }
+
+  @classmethod
+  def rebuild(cls):
+    """Recomputes every facet document from the submitted assessments, used
+    to count the submissions created before the counts existed
+    Returns:
+      int - number of facet documents written
+    """
+    counts = collections.Counter()
+    for submission in SubmittedAssessment.collection.filter(
+        "is_deleted", "==", False).fetch():
+      cls.add_counts(counts, submission.get_fields(), 1)
+
+    documents = cls.get_documents(counts, int)
+    stale_scopes = [
+        facet.id for facet in SubmittedAssessmentFacet.collection.fetch()
+        if facet.id not in documents
+    ]
+    for scope, scope_counts in documents.items():
+      cls.get_document(scope).set({"counts": scope_counts})
+    for scope in stale_scopes:
+      cls.get_document(scope).delete()
+    Logger.info(f"Rebuilt the facets of the submitted assessments of "
+                f"{len(documents)} scopes")
+    return len(documents)
@@ -0,0 +1,114 @@
+"""Unit test cases for the facet counts of the submitted assessments"""
+import collections
+from common.models import SubmittedAssessment
+# disabling pylint rules that conflict with pytest fixtures
+# pylint: disable=unused-argument,redefined-outer-name,unused-import
+from common.testing.firestore_emulator import (clean_firestore,
+                                               firestore_emulator)
+from common.utils.submitted_assessment_facets import (
+    SubmittedAssessmentFacetHandler)
+
+SUBMISSION = {
+    "assessor_id": "assessor",
+    "is_autogradable": False,
+    "status": "evaluation_pending",
+    "type": "project",
+    "result": None,
+    "unit_name": "Statistics",
+    "discipline_name": "Data Science"
+}
+
+
+def test_get_documents():
+  counts = collections.Counter()
+  SubmittedAssessmentFacetHandler.add_counts(counts, SUBMISSION, 1)
+  SubmittedAssessmentFacetHandler.add_counts(
+      counts, {
+          **SUBMISSION, "status": "completed",
+          "result": "Pass"
+      }, 1)
+  # a reassigned submission moves to the counts of its new assessor
+  SubmittedAssessmentFacetHandler.add_counts(counts, SUBMISSION, -1)
+  SubmittedAssessmentFacetHandler.add_counts(
+      counts, {
+          **SUBMISSION, "assessor_id": "other_assessor"
+      }, 1)
+  # deleted submissions are not counted
+  SubmittedAssessmentFacetHandler.add_counts(
+      counts, {
+          **SUBMISSION, "is_deleted": True
+      }, 1)
+
+  documents = SubmittedAssessmentFacetHandler.get_documents(counts, int)
+  assert documents["assessor_assessor"] == {
+      "human_graded": {
+          "completed": {
+              "types": {"project": 1},
+              "results": {"Pass": 1},
+              "unit_names": {"Statistics": 1},
+              "discipline_names": {"Data Science": 1}
+          }
+      }
+  }
+  assert documents["assessor_other_assessor"]["human_graded"][
+      "evaluation_pending"]["types"] == {"project": 1}
+  all_scope, = [scope for scope in documents if scope.startswith("all_")]
+  assert documents[all_scope]["human_graded"]["evaluation_pending"][
+      "unit_names"] == {"Statistics": 1}
+
+
+def test_get_scopes():
+  scopes = {
+      SubmittedAssessmentFacetHandler.get_scopes({"uuid": f"uuid_{index}"})[0]
+      for index in range(100)
+  }
+  # the counts of all the submissions are spread over the shards
+  assert scopes == set(SubmittedAssessmentFacetHandler.get_shard_scopes())
+  assert SubmittedAssessmentFacetHandler.get_scopes(SUBMISSION) == \
+    SubmittedAssessmentFacetHandler.get_scopes(SUBMISSION)
+
+
+def create_submission(**fields):
+  """Creates a submitted assessment overriding the fields of SUBMISSION"""
+  submission = SubmittedAssessment.from_dict({
+      **SUBMISSION, "uuid": "",
+      "assessment_id": "assessment_id",
+      "learner_id": "learner_id",
+      **fields
+  })
+  submission.save()
+  submission.uuid = submission.id
+  submission.update()
+  return submission
+
+
+def test_get_unique_values(clean_firestore):
+  submission = create_submission()
+  create_submission(assessor_id="other_assessor", is_autogradable=True,
+                    type="practice", status="completed", result="Pass")
+  # the counts of all the submissions are in one or two shards
+  assert SubmittedAssessmentFacetHandler.rebuild() in (3, 4)
+
+  assert SubmittedAssessmentFacetHandler.get_unique_values() == {
+      "discipline_names": ["Data Science"],
+      "unit_names": ["Statistics"],
+      "types": ["practice", "project"],
+      "results": ["Pass"]
+  }
+  assert SubmittedAssessmentFacetHandler.get_unique_values(
+      "assessor", statuses=["evaluation_pending"])["types"] == ["project"]
+  assert SubmittedAssessmentFacetHandler.get_unique_values(
+      is_autogradable=True)["types"] == ["practice"]
+
+  # the counts are incremented when a submission changes
+  previous_fields = submission.get_fields()
+  submission.result = "Fail"
+  submission.status = "evaluated"
+  submission.update()
+  SubmittedAssessmentFacetHandler.submissions_changed([
+      (previous_fields, submission.get_fields())
+  ])
+  assert SubmittedAssessmentFacetHandler.get_unique_values(
+      "assessor")["results"] == ["Fail"]
+  assert SubmittedAssessmentFacetHandler.get_unique_values(
+      "assessor", statuses=["evaluation_pending"])["types"] == []
@@ -0,0 +1,182 @@
+"""Search fields of the submitted assessments denormalized from the learning
+hierarchy"""
+import fireo
+from common.config import FIRESTORE_BATCH_WRITE_LIMIT
+from common.models import Assessment, SubmittedAssessment
+from common.utils.ancestor_path_handler import AncestorPathHandler
+from common.utils.errors import ResourceNotFoundException
+from common.utils.logging_handler import Logger
+from common.utils.node_loader import NodeLoader
+from common.utils.submitted_assessment_facets import (
+    SubmittedAssessmentFacetHandler)
+from common.utils.search_tokens import get_prefix_tokens
+
+# submissions written per batch, each of them may also change the facet
+# document of its assessor besides the one of all the submissions
+SUBMISSIONS_PER_BATCH = (FIRESTORE_BATCH_WRITE_LIMIT - 1) // 2
+
+
+class SubmittedAssessmentSearchHandler():
+  """Keeps the names of the assessment, unit and discipline of every
+  submitted assessment on the submission itself, so that the grading queue
+  is filtered and sorted by indexed firestore queries without reading the
+  hierarchy for each submission.
+
+  The fields are stored when an assessment is submitted and are updated
+  with batched writes when an assessment, unit or discipline is renamed.
+  """
+
+  # collection type of a node to the submission field referencing it
+  REFERENCE_FIELDS = {
+      "assessments": "assessment_id",
+      "learning_experiences": "unit_id",
+      "curriculum_pathways": "discipline_id"
+  }
+
+  @classmethod
+  def get_assessment_fields(cls, assessment_fields):
+    """Returns the search fields derived from the assessment itself"""
+    return {
+        "assessment_name": assessment_fields.get("display_name"),
+        "assessment_search_tokens":
+            get_prefix_tokens(assessment_fields.get("name"),
+                              assessment_fields.get("display_name"))
+    }
+
+  @classmethod
+  def get_hierarchy_fields(cls, assessment, loader=None):
+    """Returns the search fields of the submissions of an assessment
+    Args:
+      assessment: Assessment object
+      loader: NodeLoader - optionally shared between assessments
+    Returns:
+      dict - assessment name and search tokens, uuid and name of the unit
+        (learning experience) and of the discipline above the assessment
+    """
+    loader = loader or NodeLoader()
+    assessment_fields = assessment.get_fields(reformat_datetime=True)
+    ancestors = assessment_fields.get("ancestors")
+    if ancestors is None:
+      ancestors = AncestorPathHandler.get_ancestors("assessments",
+                                                    assessment_fields, loader)
+    fields = cls.get_assessment_fields(assessment_fields)
+    for prefix, alias in [("unit", "learning_experience"),
+                          ("discipline", "discipline")]:
+      fields[f"{prefix}_id"] = None
+      fields[f"{prefix}_name"] = None
+      ancestor = next((ancestor for ancestor in ancestors
+                       if ancestor.get("alias") == alias), None)
+      if ancestor is None:
+        continue
+      try:
+        node = loader.load(ancestor["collection_type"], ancestor["uuid"])
+      except ResourceNotFoundException as e:
+        Logger.warning(f"Missing {alias} of assessment "
+                       f"{assessment_fields['uuid']}: {e}")
+        continue
+      fields[f"{prefix}_id"] = node["uuid"]
+      fields[f"{prefix}_name"] = node.get("name")
+    return fields
+
+  @classmethod
+  def node_renamed(cls, collection_type, updated_fields, existing_fields):
+    """Updates the names stored on the submissions referencing a node whose
+    name or display name changed
+    Args:
+      collection_type: str - collection type of the node
+      updated_fields: dict - fields of the node after the update
+      existing_fields: dict - fields of the node before the update
+    Returns:
+      int - number of submissions updated
+    """
+    reference_field = cls.REFERENCE_FIELDS.get(collection_type)
+    if reference_field is None or all(
+        updated_fields.get(key) == existing_fields.get(key)
+        for key in ["name", "display_name"]):
+      return 0
+    if collection_type == "assessments":
+      values = cls.get_assessment_fields(updated_fields)
+    elif collection_type == "learning_experiences":
+      values = {"unit_name": updated_fields.get("name")}
+    else:
+      values = {"discipline_name": updated_fields.get("name")}
+    submissions = SubmittedAssessment.collection.filter(
+        reference_field, "==", updated_fields["uuid"]).fetch()
+    return cls.update_submissions(
+        (submission, values) for submission in submissions)
+
+  @classmethod
+  def update_submissions(cls, updates, on_commit=None):
+    """Writes the given values on the submissions with batched writes, along
+    with the changes of the facet counts
+    Args:
+      updates: iterable - (SubmittedAssessment object, dict of the values to
+        set) pairs
+      on_commit: function - called with the number of submissions updated so
+        far after each batch is committed
+    Returns:
+      int - number of submissions updated
+    """
+    updated_count = 0
+    changes = []
+    batch = fireo.batch()
+    for submission, values in updates:
+      previous_fields = submission.get_fields()
+      for key, value in values.items():
+        setattr(submission, key, value)
+      submission.update(batch=batch)
+      changes.append((previous_fields, submission.get_fields()))
+      updated_count += 1
+      if len(changes) == SUBMISSIONS_PER_BATCH:
+        SubmittedAssessmentFacetHandler.submissions_changed(changes, batch)
+        batch.commit()
+        if on_commit:
+          on_commit(updated_count)
+        batch = fireo.batch()
+        changes = []
+    if changes:
+      SubmittedAssessmentFacetHandler.submissions_changed(changes, batch)
+      batch.commit()
+      if on_commit:
+        on_commit(updated_count)
+    return updated_count
+
+  @classmethod
+  def backfill(cls, get_extra_fields=None):
+    """Stores the search fields of the submissions created before they
+    existed
+    Args:
+      get_extra_fields: function - optionally returns the fields that are
+        not derived from the hierarchy, e.g. the instructor, given a
+        submission and its hierarchy fields
+    Returns:
+      int - number of submissions updated
+    """
+    loader = NodeLoader()
+    assessment_map = {}
+
+    def get_updates():
+      submissions = SubmittedAssessment.collection.filter(
+          "is_deleted", "==", False).fetch()
+      for submission in submissions:
+        if submission.assessment_search_tokens is not None:
+          continue
+        assessment_id = submission.assessment_id
+        if assessment_id not in assessment_map:
+          assessments, _ = Assessment.find_by_uuids([assessment_id])
+          assessment_map[assessment_id] = cls.get_hierarchy_fields(
+              assessments[0], loader) if assessments else None
+        values = assessment_map[assessment_id]
+        if values is None:
+          Logger.warning(f"Assessment {assessment_id} of submission "
+                         f"{submission.uuid} not found")
+          continue
+        if get_extra_fields:
+          values = {**values, **get_extra_fields(submission, values)}
+        yield submission, values
+
+    updated_count = cls.update_submissions(get_updates())
+    Logger.info(f"Backfilled the search fields of {updated_count} "
+                "submitted assessments")
+    return updated_count
+
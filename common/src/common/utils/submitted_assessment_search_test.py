@@ -0,0 +1,73 @@
+"""Unit test cases for the search fields of the submitted assessments"""
+from common.models import (Assessment, CurriculumPathway, LearningExperience,
+                           SubmittedAssessment)
+# disabling pylint rules that conflict with pytest fixtures
+# pylint: disable=unused-argument,redefined-outer-name,unused-import
+from common.testing.firestore_emulator import (clean_firestore,
+                                               firestore_emulator)
+from common.utils.submitted_assessment_search import (
+    SubmittedAssessmentSearchHandler)
+
+
+def create_node(model, **fields):
+  node = model()
+  for key, value in fields.items():
+    setattr(node, key, value)
+  node.is_deleted = False
+  node.save()
+  node.uuid = node.id
+  node.update()
+  return node
+
+
+def create_submission(assessment_id):
+  submission = SubmittedAssessment()
+  submission.assessment_id = assessment_id
+  submission.learner_id = "learner_id"
+  submission.type = "practice"
+  submission.save()
+  submission.uuid = submission.id
+  submission.update()
+  return submission
+
+
+def test_search_fields(clean_firestore):
+  discipline = create_node(CurriculumPathway, name="Data Science",
+                           alias="discipline", parent_nodes={})
+  unit = create_node(
+      LearningExperience,
+      name="Statistics",
+      alias="learning_experience",
+      parent_nodes={"curriculum_pathways": [discipline.id]})
+  assessment = create_node(
+      Assessment,
+      name="final_assessment",
+      display_name="Final Assessment",
+      parent_nodes={"learning_experiences": [unit.id]})
+
+  fields = SubmittedAssessmentSearchHandler.get_hierarchy_fields(assessment)
+  assert fields["assessment_name"] == "Final Assessment"
+  assert "fin" in fields["assessment_search_tokens"]
+  assert (fields["unit_id"], fields["unit_name"]) == (unit.id, "Statistics")
+  assert (fields["discipline_id"],
+          fields["discipline_name"]) == (discipline.id, "Data Science")
+
+  # the submissions created before the fields were stored are backfilled
+  submission = create_submission(assessment.id)
+  assert SubmittedAssessmentSearchHandler.backfill(
+      lambda submission, fields: {"instructor_id": "instructor_id"}) == 1
+  submission = SubmittedAssessment.find_by_uuid(submission.uuid)
+  assert submission.unit_name == "Statistics"
+  assert submission.instructor_id == "instructor_id"
+  assert SubmittedAssessmentSearchHandler.backfill() == 0
+
+  # a rename of the unit is propagated to its submissions
+  unit_fields = unit.get_fields(reformat_datetime=True)
+  assert SubmittedAssessmentSearchHandler.node_renamed(
+      "learning_experiences", {
+          **unit_fields, "name": "Probability"
+      }, unit_fields) == 1
+  assert SubmittedAssessment.find_by_uuid(
+      submission.uuid).unit_name == "Probability"
+  assert SubmittedAssessmentSearchHandler.node_renamed(
+      "learning_experiences", unit_fields, unit_fields) == 0
@@ -0,0 +1,150 @@
+"""Materialized snapshots of the learning hierarchy below a root node"""
+import datetime
+import traceback
+from common.config import (TREE_SNAPSHOTS_ENABLED, TREE_SNAPSHOT_MAX_AGE,
+                           TREE_SNAPSHOT_MAX_SIZE)
+from common.models import TreeSnapshot
+from common.models.tree_snapshot import get_node_key
+from common.utils.errors import ResourceNotFoundException
+from common.utils.logging_handler import Logger
+from common.utils.node_loader import NodeLoader
+
+# pylint: disable = broad-except
+
+
+class TreeSnapshotHandler():
+  """Keeps a snapshot of the fields of every node below a root node so that
+  the hierarchy can be expanded without reading the nodes again.
+
+  A snapshot is built on the first read of its root and refreshed whenever
+  a node it contains is created, updated or deleted: only the changed nodes
+  and the nodes newly added below them are read, every other node is taken
+  from the previous snapshot. Learner progress is never stored, it is
+  overlaid on the expanded tree by the callers.
+  """
+
+  @classmethod
+  def get_loader(cls, root_type, root_uuid):
+    """Returns a NodeLoader primed with every node below the root
+    Args:
+      root_type: str - collection type of the root node
+      root_uuid: str - uuid of the root node
+    Returns:
+      NodeLoader - serving the hierarchy from the snapshot, an empty loader
+        if snapshots are disabled or unavailable
+    """
+    loader = NodeLoader()
+    if not TREE_SNAPSHOTS_ENABLED:
+      return loader
+    try:
+      snapshot = TreeSnapshot.find_by_root(root_uuid)
+      if snapshot is not None and not cls.is_expired(snapshot):
+        cls.prime(loader, snapshot.get_nodes())
+        return loader
+      if snapshot is None:
+        snapshot = TreeSnapshot(id=root_uuid, root_type=root_type)
+      cls.save(snapshot, cls.load_subtree(root_type, root_uuid, loader))
+    except Exception as e:
+      Logger.error(f"Failed to load the tree snapshot of {root_uuid}: {e}")
+      Logger.error(traceback.format_exc())
+    return loader
+
+  @classmethod
+  def refresh_nodes(cls, nodes):
+    """Refreshes the snapshots containing any of the given nodes
+    Args:
+      nodes: dict - collection type to list of uuids of the nodes that were
+        created, updated or deleted
+    """
+    node_keys = {
+        get_node_key(collection_type, uuid)
+        for collection_type, uuids in nodes.items() for uuid in uuids
+    }
+    if not TREE_SNAPSHOTS_ENABLED or not node_keys:
+      return
+    try:
+      snapshots = TreeSnapshot.find_by_node_keys(sorted(node_keys))
+    except Exception as e:
+      Logger.error(f"Failed to find the tree snapshots to refresh: {e}")
+      Logger.error(traceback.format_exc())
+      return
+    for snapshot in snapshots:
+      try:
+        cls.refresh(snapshot, node_keys)
+      except Exception as e:
+        Logger.error(f"Failed to refresh the tree snapshot of {snapshot.id}: "
+                     f"{e}")
+        Logger.error(traceback.format_exc())
+
+  @classmethod
+  def refresh(cls, snapshot, changed_node_keys):
+    """Rebuilds a snapshot reading only the changed nodes and their new
+    descendants, deletes it when its root no longer exists"""
+    loader = NodeLoader()
+    cls.prime(loader, {
+        node_key: fields
+        for node_key, fields in snapshot.get_nodes().items()
+        if node_key not in changed_node_keys
+    })
+    try:
+      nodes = cls.load_subtree(snapshot.root_type, snapshot.id, loader)
+    except ResourceNotFoundException as e:
+      Logger.info(f"Deleting the tree snapshot of {snapshot.id}: {e}")
+      TreeSnapshot.delete_by_id(snapshot.id)
+      return
+    cls.save(snapshot, nodes)
+
+  @classmethod
+  def load_subtree(cls, root_type, root_uuid, loader):
+    """Returns the fields of the root and of every node below it by node
+    key, reading the nodes missing in the loader level by level"""
+    nodes = {}
+    current_level = {root_type: [root_uuid]}
+    while current_level:
+      next_level = {}
+      for collection_type, uuids in current_level.items():
+        for uuid, fields in loader.load_many(collection_type, uuids).items():
+          node_key = get_node_key(collection_type, uuid)
+          if node_key in nodes:
+            continue
+          nodes[node_key] = fields
+          for child_type, child_uuids in (fields.get("child_nodes")
+                                          or {}).items():
+            next_level.setdefault(child_type, []).extend(
+                child_uuid for child_uuid in child_uuids
+                if get_node_key(child_type, child_uuid) not in nodes)
+      current_level = {
+          collection_type: uuids
+          for collection_type, uuids in next_level.items() if uuids
+      }
+    return nodes
+
+  @classmethod
+  def save(cls, snapshot, nodes):
+    """Stores the nodes in the snapshot unless the document would exceed the
+    size limit"""
+    snapshot.set_nodes(nodes)
+    size = snapshot.get_size()
+    if size > TREE_SNAPSHOT_MAX_SIZE:
+      Logger.warning(f"Tree snapshot of {snapshot.id} is too large to store "
+                     f"({size} bytes)")
+      if snapshot.version > 1:
+        TreeSnapshot.delete_by_id(snapshot.id)
+      return
+    snapshot.save()
+
+  @classmethod
+  def prime(cls, loader, nodes):
+    for node_key, fields in nodes.items():
+      loader.prime(node_key.split("/", 1)[0], fields)
+
+  @classmethod
+  def is_expired(cls, snapshot):
+    last_modified_time = snapshot.last_modified_time
+    if last_modified_time is None:
+      return True
+    if last_modified_time.tzinfo is None:
+      last_modified_time = last_modified_time.replace(
+          tzinfo=datetime.timezone.utc)
+    age = datetime.datetime.now(datetime.timezone.utc) - last_modified_time
+    return age.total_seconds() > TREE_SNAPSHOT_MAX_AGE
@@ -0,0 +1,88 @@
+"""Unit test cases for the materialized tree snapshots"""
+import pytest
+from common.models import CurriculumPathway, TreeSnapshot
+# disabling pylint rules that conflict with pytest fixtures
+# pylint: disable=unused-argument,redefined-outer-name,unused-import
+from common.testing.example_objects import (PARENT_CURRICULUM_PATHWAY_OBJECT,
+                                            CHILD_CURRICULUM_PATHWAY_OBJECTS)
+from common.testing.firestore_emulator import (clean_firestore,
+                                               firestore_emulator)
+from common.utils.tree_snapshot_handler import TreeSnapshotHandler
+
+
+@pytest.fixture(name="insert_pathways")
+def test_insert_pathways():
+  parent_cp = CurriculumPathway.from_dict(PARENT_CURRICULUM_PATHWAY_OBJECT)
+  parent_cp.version = 1
+  parent_cp.is_deleted = False
+  parent_cp.save()
+  parent_cp.uuid = parent_cp.id
+  parent_cp.update()
+
+  child_ids = []
+  for index in range(3):
+    child_cp = CurriculumPathway.from_dict(CHILD_CURRICULUM_PATHWAY_OBJECTS[0])
+    child_cp.name = f"Kubernetes {index}"
+    child_cp.parent_nodes["curriculum_pathways"] = [parent_cp.id]
+    child_cp.version = 1
+    child_cp.is_deleted = False
+    child_cp.save()
+    child_cp.uuid = child_cp.id
+    child_cp.update()
+    child_ids.append(child_cp.id)
+
+  parent_cp.child_nodes["curriculum_pathways"] = child_ids
+  parent_cp.update()
+  yield parent_cp.id, child_ids
+
+
+def test_snapshot_nodes_round_trip():
+  snapshot = TreeSnapshot(id="root", root_type="curriculum_pathways")
+  nodes = {"curriculum_pathways/root": {"uuid": "root", "name": "Root"}}
+  snapshot.set_nodes(nodes)
+  assert snapshot.get_nodes() == nodes
+  assert snapshot.node_keys == ["curriculum_pathways/root"]
+  assert snapshot.version == 1
+  # the uncompressed node keys count in the size of the document
+  assert snapshot.get_size() == len(snapshot.nodes) + 1 + len(
+      "curriculum_pathways/root") + 1
+
+
+def test_get_loader_serves_snapshot(clean_firestore, insert_pathways):
+  root_uuid, child_ids = insert_pathways
+  TreeSnapshotHandler.get_loader("curriculum_pathways", root_uuid)
+  snapshot = TreeSnapshot.find_by_root(root_uuid)
+  assert len(snapshot.node_keys) == len(child_ids) + 1
+
+  # the nodes are served from the snapshot without reading them again
+  CurriculumPathway.delete_by_id(child_ids[0])
+  loader = TreeSnapshotHandler.get_loader("curriculum_pathways", root_uuid)
+  assert loader.load("curriculum_pathways", child_ids[0])["uuid"] == \
+    child_ids[0]
+
+
+def test_refresh_nodes(clean_firestore, insert_pathways):
+  root_uuid, child_ids = insert_pathways
+  TreeSnapshotHandler.get_loader("curriculum_pathways", root_uuid)
+
+  child_cp = CurriculumPathway.find_by_uuid(child_ids[0])
+  child_cp.name = "Renamed"
+  child_cp.update()
+  TreeSnapshotHandler.refresh_nodes({"curriculum_pathways": [child_ids[0]]})
+  snapshot = TreeSnapshot.find_by_root(root_uuid)
+  assert snapshot.version == 2
+  assert snapshot.get_nodes()[f"curriculum_pathways/{child_ids[0]}"][
+      "name"] == "Renamed"
+
+  # removed children are dropped from the snapshot
+  root_cp = CurriculumPathway.find_by_uuid(root_uuid)
+  root_cp.child_nodes["curriculum_pathways"] = child_ids[1:]
+  root_cp.update()
+  TreeSnapshotHandler.refresh_nodes({"curriculum_pathways": [root_uuid]})
+  snapshot = TreeSnapshot.find_by_root(root_uuid)
+  assert f"curriculum_pathways/{child_ids[0]}" not in snapshot.node_keys
+
+  CurriculumPathway.delete_by_id(root_uuid)
+  TreeSnapshotHandler.refresh_nodes({"curriculum_pathways": [root_uuid]})
+  assert TreeSnapshot.find_by_root(root_uuid) is None
+
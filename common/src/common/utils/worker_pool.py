@@ -0,0 +1,15 @@
+"""Process wide bounded thread pool for concurrent firestore reads"""
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from common.config import HIERARCHY_MAX_WORKERS
+
+
+@functools.lru_cache(maxsize=None)
+def get_worker_pool():
+  """Returns the thread pool shared by every request of the process.
+
+  Tasks submitted to the pool must not wait on other tasks of the pool,
+  otherwise a saturated pool deadlocks.
+  """
+  return ThreadPoolExecutor(max_workers=HIERARCHY_MAX_WORKERS,
+                            thread_name_prefix="hierarchy")
@@ -170,7 +170,7 @@ def get_assessments(skip: int = Query(0, ge=0, le=2000),
             modified_skills.append(modified_skill)
         assessment["references"]["skills"] = modified_skills
 
-    count = 10000
+    count = len(filtered_assessments)
     response = {
       "records": filtered_assessments[skip:fetch_length],
       "total_count": count
@@ -279,9 +279,7 @@ def create_assessment(input_assessment: AssessmentModel):
     new_assessment.update()
     assessment_fields = new_assessment.get_fields(reformat_datetime=True)
 
-    ParentChildNodesHandler.update_child_references(
-        assessment_fields, Assessment, operation="add")
-    ParentChildNodesHandler.update_parent_references(
+    ParentChildNodesHandler.update_nodes_references(
         assessment_fields, Assessment, operation="add")
 
     return {
@@ -368,9 +366,7 @@ def delete_assessment(uuid: str):
 
     ParentChildNodesHandler.validate_parent_child_nodes_references(
         assessment_fields)
-    ParentChildNodesHandler.update_child_references(
-        assessment_fields, Assessment, operation="remove")
-    ParentChildNodesHandler.update_parent_references(
+    ParentChildNodesHandler.update_nodes_references(
         assessment_fields, Assessment, operation="remove")
 
     Assessment.delete_by_uuid(assessment.uuid)
@@ -515,9 +511,7 @@ def create_human_graded_assessment(input_assessment:HumanGradedAssessmentModel):
     new_assessment.update()
     assessment_fields = new_assessment.get_fields(reformat_datetime=True)
 
-    ParentChildNodesHandler.update_child_references(
-        assessment_fields, Assessment, operation="add")
-    ParentChildNodesHandler.update_parent_references(
+    ParentChildNodesHandler.update_nodes_references(
         assessment_fields, Assessment, operation="add")
 
     return {
@@ -5,8 +5,11 @@ from fastapi import APIRouter, UploadFile, File, Query
 from common.models import AssessmentItem
 from common.utils.logging_handler import Logger
 from common.utils.sorting_logic import collection_sorting
+from common.config import LIST_TOTAL_COUNT_CACHE_TTL
+from common.utils.pagination import count_documents
 from common.utils.common_api_handler import CommonAPIHandler
 from common.utils.parent_child_nodes_handler import ParentChildNodesHandler
+from common.utils.node_loader import NodeLoader
 from common.utils.errors import (ResourceNotFoundException, ValidationError,
                                  PayloadTooLargeError)
 from common.utils.http_exceptions import (InternalServerError, BadRequest,
@@ -60,7 +63,8 @@ def get_assessment_items(skip: int = Query(0, ge=0, le=2000),
                          limit: int = Query(10, ge=1, le=100),
                          sort_by: Optional[str] = "created_time",
                          sort_order: Optional[
-                           Literal["ascending", "descending"]] = "descending"):
+                           Literal["ascending", "descending"]] = "descending",
+                         page_token: Optional[str] = None):
   """
     The get assessment items endpoint will return an array assessment items
     from firestore
@@ -70,6 +74,8 @@ def get_assessment_items(skip: int = Query(0, ge=0, le=2000),
     - limit (int): Size of assessment item array to be returned
     - sort_by (str): Data Model Fields name
     - sort_order (str): ascending/descending
+    - page_token (str): next_page_token of the previous page, used instead
+      of skip
 
     ### Raises:
     - Exception: 500 Internal Server Error if something went wrong
@@ -79,14 +85,15 @@ def get_assessment_items(skip: int = Query(0, ge=0, le=2000),
   """
   try:
     collection_manager = AssessmentItem.collection
-    assessment_items = collection_sorting(
+    assessment_items, next_page_token = collection_sorting(
       collection_manager=collection_manager, sort_by=sort_by,
-      sort_order=sort_order, skip=skip, limit=limit)
+      sort_order=sort_order, skip=skip, limit=limit, page_token=page_token)
     assessment_items = [
         i.get_fields(reformat_datetime=True) for i in assessment_items
     ]
-    count = 10000
-    response = {"records": assessment_items, "total_count": count}
+    count = count_documents(collection_manager, LIST_TOTAL_COUNT_CACHE_TTL)
+    response = {"records": assessment_items, "total_count": count,
+                "next_page_token": next_page_token}
     return {
         "success": True,
         "message": "Successfully fetched the assessment items",
@@ -129,11 +136,12 @@ def get_assessment_item(uuid: str, fetch_tree: Optional[bool] = False):
     assessment_item = assessment_item.get_fields(reformat_datetime=True)
 
     if fetch_tree:
+      loader = NodeLoader()
       assessment_item = ParentChildNodesHandler.load_child_nodes_data(
-          assessment_item)
+          assessment_item, loader)
       assessment_item = \
           ParentChildNodesHandler.load_immediate_parent_nodes_data(
-              assessment_item)
+              assessment_item, loader=loader)
     return {
         "success": True,
         "message": "Successfully fetched the assessment item",
@@ -183,9 +191,7 @@ def create_assessment_item(input_assessment_item: AssessmentItemModel):
     assessment_item_fields = new_assessment_item.get_fields(
         reformat_datetime=True)
 
-    ParentChildNodesHandler.update_child_references(
-        assessment_item_fields, AssessmentItem, operation="add")
-    ParentChildNodesHandler.update_parent_references(
+    ParentChildNodesHandler.update_nodes_references(
         assessment_item_fields, AssessmentItem, operation="add")
 
     return {
@@ -266,9 +272,7 @@ def delete_assessment_item(uuid: str):
 
     ParentChildNodesHandler.validate_parent_child_nodes_references(
         assessment_item_fields)
-    ParentChildNodesHandler.update_child_references(
-        assessment_item_fields, AssessmentItem, operation="remove")
-    ParentChildNodesHandler.update_parent_references(
+    ParentChildNodesHandler.update_nodes_references(
         assessment_item_fields, AssessmentItem, operation="remove")
 
     AssessmentItem.delete_by_uuid(assessment_item.uuid)
@@ -8,6 +8,8 @@ from common.utils.errors import (ResourceNotFoundException, ValidationError,
 from common.utils.http_exceptions import (InternalServerError, BadRequest,
                                           ResourceNotFound, PayloadTooLarge)
 from common.models import Rubric
+from common.config import LIST_TOTAL_COUNT_CACHE_TTL
+from common.utils.pagination import count_documents
 from services.rubric import create_rubric
 from schemas.rubric_schema import (RubricModel, RubricModelResponse,
                                    UpdateRubricModel, DeleteRubric,
@@ -77,7 +79,7 @@ def get_rubrics(skip: int = Query(0, ge=0, le=2000),
   try:
     rubrics = Rubric.collection.order("-created_time").offset(skip).fetch(limit)
     rubrics = [i.get_fields(reformat_datetime=True) for i in rubrics]
-    count = 10000
+    count = count_documents(Rubric.collection, LIST_TOTAL_COUNT_CACHE_TTL)
     response = {"records": rubrics, "total_count": count}
     return {
         "success": True,
@@ -4,6 +4,8 @@ from typing import List, Optional
 from fastapi import APIRouter, UploadFile, File, Query
 from json.decoder import JSONDecodeError
 from common.models import RubricCriterion
+from common.config import LIST_TOTAL_COUNT_CACHE_TTL
+from common.utils.pagination import count_documents
 from common.utils.errors import (ResourceNotFoundException, ValidationError,
                                  PayloadTooLargeError)
 from common.utils.http_exceptions import (InternalServerError, BadRequest,
@@ -86,7 +88,8 @@ def get_rubric_criterions(skip: int = Query(0, ge=0, le=2000),
     rubric_criterions = [
         i.get_fields(reformat_datetime=True) for i in rubric_criterions
     ]
-    count = 10000
+    count = count_documents(RubricCriterion.collection,
+                            LIST_TOTAL_COUNT_CACHE_TTL)
     response = {"records": rubric_criterions, "total_count": count}
     return {
         "success": True,
@@ -1,31 +1,41 @@
 """ Submitted Assessment endpoints """
 import traceback
 from datetime import datetime
+import fireo
 from requests.exceptions import ConnectTimeout
 from fastapi import APIRouter, Query, Request
+from starlette.background import BackgroundTasks
 from typing import List, Union, Optional
 from typing_extensions import Literal
 from common.models import (SubmittedAssessment, Assessment, Learner, User,
-                          LearningExperience, Rubric)
+                          LearningExperience, Rubric, CurriculumPathway)
 from common.utils.errors import (ResourceNotFoundException, ValidationError,
                                  PreconditionFailedError)
 from common.utils.http_exceptions import (InternalServerError, BadRequest,
                                           ResourceNotFound, ConnectionTimeout,
                                           PreconditionFailed)
 from common.utils.logging_handler import Logger
+from common.config import (FIRESTORE_IN_QUERY_LIMIT,
+                           LIST_TOTAL_COUNT_CACHE_TTL)
+from common.utils.pagination import (count_documents, fetch_page,
+                                     fetch_filtered_page, get_order_by)
+from common.utils.search_tokens import get_search_token
+from common.utils.submitted_assessment_facets import (
+  SubmittedAssessmentFacetHandler)
 from common.utils.assessor_handler import (
-    traverse_down,
-    remove_assessor_for_submitted_assessments,
-    replace_assessor_of_submitted_assessments,
-    filter_submitted_assessments
+    create_assessor_update_job,
+    get_assessor_update_job,
+    get_dag_id_of_discipline,
+    run_assessor_update_job
 )
 from services.submitted_assessment import (
     traverse_up,
-    traverse_up_uuid,
     submit_assessment,
     get_latest_submission,
     get_all_submission,
     get_submitted_assessment_data,
+    get_grading_queue_fields,
+    backfill_search_fields,
     instructor_handler,
     staff_to_learner_handler)
 from schemas.submitted_assessment_schema import (
@@ -34,7 +44,8 @@ from schemas.submitted_assessment_schema import (
     DeleteSubmittedAssessment, SubmittedAssessmentUniqueResponseModel,
     SubmittedAssessmentAssessorResponseModel, ManualEvaluationResponseModel,
     AllSubmittedAssessmentAssessorResponseModel, UpdateAssessorIdRequestModel,
-    ReplaceAssessorofSubmittedAssessmentsResponseModel)
+    ReplaceAssessorofSubmittedAssessmentsResponseModel,
+    AssessorUpdateJobResponseModel, BackfillSearchFieldsResponseModel)
 
 from schemas.error_schema import (NotFoundErrorResponseModel,
                                   ConnectionTimeoutResponseModel,
@@ -138,8 +149,7 @@ def get_all_submitted_assessment(req: Request, uuid: str,
   """
   try:
     header = {"Authorization": req.headers.get("authorization")}
-    all_submissions = get_all_submission(uuid, skip, limit, header)
-    count = 10000
+    all_submissions, count = get_all_submission(uuid, skip, limit, header)
     response = {"records": all_submissions, "total_count": count}
     return {
         "success": True,
@@ -274,6 +284,7 @@ def update_assessment_item(
     submitted_assessment = SubmittedAssessment.find_by_uuid(uuid)
     submitted_assessment_dict = {**input_submitted_assessment.dict()}
     submitted_assessment_fields = submitted_assessment.get_fields()
+    previous_fields = submitted_assessment.get_fields()
 
     # Update status, pass_status, and result based on submitted_rubrics
     evaluated = False
@@ -326,7 +337,11 @@ def update_assessment_item(
     for key, value in submitted_assessment_fields.items():
       setattr(submitted_assessment, key, value)
 
-    submitted_assessment.update()
+    batch = fireo.batch()
+    submitted_assessment.update(batch=batch)
+    SubmittedAssessmentFacetHandler.submissions_changed(
+      [(previous_fields, submitted_assessment.get_fields())], batch)
+    batch.commit()
 
     submitted_assessment_fields = submitted_assessment.get_fields(
         reformat_datetime=True)
@@ -369,7 +384,14 @@ def delete_submitted_assessment(uuid: str):
     - JSON: Success/Fail Message
   """
   try:
-    SubmittedAssessment.delete_by_uuid(uuid)
+    submitted_assessment = SubmittedAssessment.find_by_uuid(uuid)
+    previous_fields = submitted_assessment.get_fields()
+    submitted_assessment.is_deleted = True
+    batch = fireo.batch()
+    submitted_assessment.update(batch=batch)
+    SubmittedAssessmentFacetHandler.submissions_changed(
+      [(previous_fields, None)], batch)
+    batch.commit()
 
     return {
         "success": True,
@@ -424,6 +446,7 @@ def get_all_submitted_assessment_for_learner(learner_id: str,
     if assessment_id:
       collection_manager = collection_manager.filter("assessment_id",
                                                      "==", assessment_id)
+    count = count_documents(collection_manager, LIST_TOTAL_COUNT_CACHE_TTL)
     submitted_assessments = collection_manager.order("-created_time").offset(
         skip).fetch(limit)
     if submitted_assessments:
@@ -433,7 +456,6 @@ def get_all_submitted_assessment_for_learner(learner_id: str,
       ]
     for assessment in submitted_assessments:
       assessment["timer_start_time"] = str(assessment["timer_start_time"])
-    count = 10000
     response = {"records": submitted_assessments, "total_count": count}
     return {
         "success": True,
@@ -467,15 +489,18 @@ def get_filtered_submitted_assessments(
     result: Union[List[str], None] = Query(default=None),
     is_flagged: Union[bool, None] = Query(default=None),
     skip: int = Query(0, ge=0, le=2000),
-    limit: int = Query(10, ge=1, le=100)):
+    limit: int = Query(10, ge=1, le=100),
+    page_token: Optional[str] = None):
   """
     The get filtered submitted assessments endpoint will return an array
-    of submitted assessments from firestore
+    of submitted assessments from firestore. The filters and the sort are
+    applied by the query on the search fields stored on the submissions
 
     ### Args:
     - sort_by (str): sort submitted assessment based on this parameter value
     - sort_order (str): ascending or descending sort
-    - name (str): search submitted assessment based on assessment name keyword
+    - name (str): search submitted assessment based on the words of the
+      assessment name starting with the keyword
     - assessor_id (str): uuid of assessor
     - is_autogradable (bool): to return autogradable or human gradable or both
       type of assessments
@@ -487,6 +512,8 @@ def get_filtered_submitted_assessments(
     - is_flagged (bool): return flagged assessments or not or both
     - skip (int): Number of objects to be skipped
     - limit (int): Size of array to be returned
+    - page_token (str): next_page_token of the previous page, used instead
+      of skip to fetch the next page
 
     ### Raises:
     - ValidationError: If filters are incorrect
@@ -500,10 +527,9 @@ def get_filtered_submitted_assessments(
     collection_manager = SubmittedAssessment.collection
     collection_manager = collection_manager.filter("is_deleted", "==", False)
 
-    in_query_used = False
-    status_filter_applied = True
-    type_filter_applied = True
-    learner_filter_applied = True
+    # fields to filter on with the list of allowed values
+    value_filters = []
+    instructor_id = None
 
     # assessor_id is a string because an assessor can either view only the
     # submissions assigned to him or all the submissions
@@ -512,24 +538,22 @@ def get_filtered_submitted_assessments(
       if assessor.user_type == "assessor":
         collection_manager = collection_manager.filter("assessor_id", "==",
                                                      assessor_id)
-      elif assessor.user_type in ["coach", "instructor"]:
+      elif assessor.user_type == "instructor":
+        # the instructor of the discipline is stored on the submissions
+        instructor_id = assessor.user_id
+        collection_manager = collection_manager.filter("instructor_id", "==",
+                                                       instructor_id)
+      elif assessor.user_type == "coach":
         ## TODO: Store user_id of the learner instead of user_id
         learner_ids = staff_to_learner_handler(header, assessor_id,
                                                assessor.user_type)
         if not learner_ids:
-          ## FIXME: return statement should be executed in the end only
           return {
             "success": True,
             "message": "Successfully fetched the submitted assessments.",
-            "data": []
+            "data": {"records": [], "total_count": 0}
           }
-        elif len(learner_ids)<=30:
-          in_query_used = True
-          collection_manager = collection_manager.filter("learner_id", "in",
-                                                        learner_ids)
-        else:
-          learner_filter_applied = False
-
+        value_filters.append(("learner_id", learner_ids))
       else:
         raise ResourceNotFoundException(f"User of type {assessor.user_type} "\
           "not found.")
@@ -542,199 +566,68 @@ def get_filtered_submitted_assessments(
       collection_manager = collection_manager.filter("is_autogradable", "==",
                                                      is_autogradable)
 
-    if result:
-      if len(result) == 1:
-        collection_manager = collection_manager.filter("result", "==",
-                                                       result[0])
-      else:
-        in_query_used = True
-        collection_manager = collection_manager.filter("result", "in", result)
+    if name:
+      search_token = get_search_token(name)
+      if search_token:
+        collection_manager = collection_manager.filter(
+          "assessment_search_tokens", "array_contains", search_token)
 
-    if status:
-      if len(status) == 1:
-        collection_manager = collection_manager.filter("status", "==",
-                                                       status[0])
-      elif not in_query_used:
-        in_query_used = True
-        collection_manager = collection_manager.filter("status", "in", status)
-      else:
-        status_filter_applied = False
+    for field, values in [("result", result), ("status", status),
+                          ("type", type), ("unit_name", unit_name),
+                          ("discipline_name", discipline_name)]:
+      if values:
+        value_filters.append((field, values))
 
-    if type:
-      if len(type) == 1:
-        collection_manager = collection_manager.filter("type", "==", type[0])
-      elif not in_query_used:
+    # firestore allows a single "in" filter per query, the values of the
+    # other multi valued filters are checked on the fetched submissions
+    in_query_used = False
+    remaining_filters = {}
+    for field, values in value_filters:
+      values = list(dict.fromkeys(values))
+      if len(values) == 1:
+        collection_manager = collection_manager.filter(field, "==", values[0])
+      elif not in_query_used and len(values) <= FIRESTORE_IN_QUERY_LIMIT:
         in_query_used = True
-        collection_manager = collection_manager.filter("type", "in", type)
+        collection_manager = collection_manager.filter(field, "in", values)
       else:
-        type_filter_applied = False
-
-    # check if the collection can be directly sorted if the field
-    # to sort on is a field in the data model of SubmittedAssessment
-    if sort_by in ["result", "attempt_no", "timer_start_time"]:
-      sorted_collection = True
-      if sort_order == "descending":
-        sort_by = "-" + sort_by
-      submitted_assessments = collection_manager.order(sort_by).fetch()
+        remaining_filters[field] = set(values)
+
+    order_by = get_order_by(sort_by, sort_order)
+    if remaining_filters:
+      submitted_assessments, next_page_token, count = fetch_filtered_page(
+        collection_manager, limit,
+        lambda submitted_assessment: all(
+          getattr(submitted_assessment, field) in values
+          for field, values in remaining_filters.items()),
+        order_by, page_token, skip)
     else:
-      sorted_collection = False
-      submitted_assessments = collection_manager.fetch()
-
-    filtered_submitted_assessments = []
-    le_map = {}
-    discipline_map = {}
+      count = count_documents(collection_manager,
+                              LIST_TOTAL_COUNT_CACHE_TTL)
+      submitted_assessments, next_page_token = fetch_page(
+        collection_manager, limit, order_by, page_token, skip)
+
+    assessments, _ = Assessment.find_by_uuids(list(dict.fromkeys(
+      submitted_assessment.assessment_id
+      for submitted_assessment in submitted_assessments)))
+    assessment_map = {assessment.uuid: assessment for assessment in assessments}
+    hierarchy_map = {}
     instructor_map = {}
-    assessment_map = {}
     assessor_map = {}
-    # iterate through all the submitted assessments
+    filtered_submitted_assessments = []
     for submitted_assessment in submitted_assessments:
-      assessment_id = submitted_assessment.assessment_id
-      # if the submitted assessments are already sorted, then we need to fetch
-      # only limit number of values
-      if not limit:
-        break
-      # if status filter is not applied above and the submitted_assessment
-      # status does not lie in the status query, then do not add this submission
-      if not status_filter_applied and \
-          submitted_assessment.status not in status:
-        continue
-      # if type filter is not applied above and the submitted_assessment
-      # type does not lie in the type query, then do not add this submission
-      elif not type_filter_applied and \
-          submitted_assessment.type not in type:
-        continue
-      # if filter by learner is not applied above and the submitted_assessment
-      # learner_id does not lie in the list of learner_ids query, then do not
-      # add this submission
-      elif not learner_filter_applied and \
-          submitted_assessment.learner_id not in learner_ids:
-        continue
-      if assessment_id in assessment_map:
-        assessment_node = assessment_map[assessment_id]
-      else:
-        assessment_node = Assessment.find_by_uuid(assessment_id)
-        assessment_map[assessment_id] = assessment_node
-
-      assessment_data = assessment_node.get_fields(reformat_datetime=True)
-      assessment_name = assessment_data["name"]
-
-      # 1. If search query (name) is None, or
-      # 2. if it is not None, then it exists in assessment name
-      # Then the submitted assessment document can be added
-      keyword_exists = not name or \
-                  (name and name.lower() in assessment_name.lower())
-      if keyword_exists:
-        try:
-          if assessment_id in le_map:
-            le_data = le_map[assessment_id]
-          else:
-            le_node = traverse_up_uuid(assessment_id, "assessments",
-              "learning_experience")
-            le_data = le_node.get_fields()
-            le_map[assessment_id] = {
-              "name": le_data.get("name", ""),
-              "uuid": le_data.get("uuid")
-            }
-        except Exception as e:
-          Logger.error(e)
-          Logger.error(traceback.print_exc())
-          Logger.info("Passing Empty Dict to Get Success Response")
-          le_data = {}
-
-        try:
-          le_id = le_data.get("uuid")
-          if le_id in discipline_map:
-            discipline_data = discipline_map[le_id]
-          else:
-            discipline_data = traverse_up_uuid(le_id, "learning_experiences",
-                "discipline").get_fields()
-            discipline_map[le_id] = {
-              "name": discipline_data.get("name", ""),
-              "uuid": discipline_data.get("uuid")
-            }
-        except Exception as e:
-          Logger.error(e)
-          Logger.error(traceback.print_exc())
-          Logger.info("Passing Empty Dict to Get Success Response")
-          discipline_data = {}
-
-        # 1a. If unit_name query filter is None, OR
-        # 1b. if it is not None, then the unit pathway's name lies in any
-        #    unit_name, AND
-        # 2a. If discipline_name query filter is None, OR
-        # 2b. if it is not None, then the pathway discipline's name lies in
-        #    any discipline_name
-        # Then the submitted assessment document can be added
-        if (not unit_name or le_data.get("name", "") in unit_name) and (not
-        discipline_name or discipline_data.get("name", "") in discipline_name):
-          # 1. if the submitted assessment collection is already sorted
-          # 2. if the number of assessments to be skipped is not yet complete
-          # Then skip this submitted assessment and reduce skip by 1
-          # else add the submitted assessment
-          if sorted_collection and skip:
-            skip -= 1
-          else:
-            submitted_assessment_data = get_submitted_assessment_data(
-                submitted_assessment, False, None, assessment_node,
-                assessor_map)
-            submitted_assessment_data["assessment_name"] = assessment_data.get(
-              "display_name")
-            submitted_assessment_data["unit_name"] = le_data.get("name", "")
-            submitted_assessment_data["discipline_name"] = discipline_data.get(
-              "name", "")
-            # get instructor data
-            try:
-              discipline_id = discipline_data.get("uuid")
-              if discipline_id in instructor_map:
-                instructor_data = instructor_map[discipline_id]
-              elif assessor and assessor.user_type == "instructor":
-                instructor_id = assessor.user_id
-                instructor_data = User.find_by_user_id(
-                  instructor_id).get_fields()
-                instructor_map[discipline_id] = {
-                  "first_name": instructor_data.get("first_name", ""),
-                  "last_name": instructor_data.get("last_name", ""),
-                  "user_id": instructor_data.get("user_id")
-                }
-              else:
-                instructor_id = instructor_handler(
-                    header, discipline_data["uuid"])
-                instructor_data = User.find_by_user_id(
-                  instructor_id).get_fields()
-                instructor_map[discipline_id] = {
-                  "first_name": instructor_data.get("first_name", ""),
-                  "last_name": instructor_data.get("last_name", ""),
-                  "user_id": instructor_data.get("user_id")
-                }
-              submitted_assessment_data["instructor_id"] = instructor_data.get(
-                "user_id", "")
-              submitted_assessment_data["instructor_name"] = \
-                (instructor_data.get("first_name", "") + " " +
-                  instructor_data.get("last_name", "")).lstrip()
-            except Exception as e:
-              Logger.error(e)
-              Logger.error(traceback.print_exc())
-              submitted_assessment_data["instructor_id"] = ""
-              submitted_assessment_data["instructor_name"] = "Unassigned"
-            filtered_submitted_assessments.append(submitted_assessment_data)
-            if sorted_collection:
-              limit -= 1
-
-    # if the submitted assessments are not sorted, then sort it and return the
-    # only those submissions defined by skip and limit
-    if not sorted_collection:
-      if sort_by == "ascending":
-        filtered_submitted_assessments = sorted(
-            filtered_submitted_assessments, key=lambda i: i[sort_by])
-      else:
-        filtered_submitted_assessments = sorted(
-            filtered_submitted_assessments,
-            key=lambda i: i[sort_by],
-            reverse=True)
-      filtered_submitted_assessments = \
-              filtered_submitted_assessments[skip:skip+limit]
-    count = 10000
-    response = {"records": filtered_submitted_assessments, "total_count": count}
+      assessment_node = assessment_map.get(submitted_assessment.assessment_id)
+      submitted_assessment_data = get_submitted_assessment_data(
+          submitted_assessment, False, None, assessment_node, assessor_map)
+      submitted_assessment_data.update(get_grading_queue_fields(
+          submitted_assessment, assessment_node, header, hierarchy_map,
+          instructor_map, instructor_id))
+      filtered_submitted_assessments.append(submitted_assessment_data)
+
+    response = {
+      "records": filtered_submitted_assessments,
+      "total_count": count,
+      "next_page_token": next_page_token
+    }
     return {
         "success": True,
         "message": "Successfully fetched the submitted assessments.",
@@ -757,6 +650,39 @@ def get_filtered_submitted_assessments(
     raise InternalServerError(str(e)) from e
 
 
+@router.post(
+    "/submitted-assessments/backfill-search-fields",
+    response_model=BackfillSearchFieldsResponseModel,
+    name="Store the search fields of the existing Submitted Assessments")
+def backfill_submitted_assessments_search_fields(
+    req: Request, background_tasks: BackgroundTasks):
+  """
+    Stores the names of the assessment, unit and discipline, the instructor
+    and the learner name on the submitted assessments created before they
+    were stored, so that they are returned by the filtered submitted
+    assessments endpoint, then recounts the facets of the unique values
+    endpoint. The submissions are updated in the background
+
+    ### Raises:
+    - Exception: 500 Internal Server Error if something went wrong
+
+    ### Returns:
+    - BackfillSearchFieldsResponseModel: Success message
+  """
+  try:
+    header = {"Authorization": req.headers.get("authorization")}
+    background_tasks.add_task(backfill_search_fields, header)
+    return {
+      "success": True,
+      "message": "Started storing the search fields of the submitted "
+                 "assessments"
+    }
+  except Exception as e:
+    Logger.error(e)
+    Logger.error(traceback.print_exc())
+    raise InternalServerError(str(e)) from e
+
+
 @router.get(
     "/submitted-assessments/unique",
     response_model=SubmittedAssessmentUniqueResponseModel,
@@ -768,7 +694,8 @@ def get_unique_values_submitted_assessments(
 ):
   """
     The get_unique_values_submitted_assessments endpoint will return an array
-    of unique values for competency, type and result
+    of unique values for competency, type and result, read from the facet
+    counts updated along with the submissions
 
     ### Args:
     - assessor_id (str): filter submitted assessments based on assessor id
@@ -785,70 +712,20 @@ def get_unique_values_submitted_assessments(
       required SubmittedAssessment fields.
   """
   try:
-
-    collection_manager = SubmittedAssessment.collection
     if assessor_id:
       user = User.find_by_user_id(assessor_id)
       if user.user_type != "assessor":
         raise ResourceNotFoundException(
             f"Assessor with uuid {assessor_id} not found")
-      collection_manager = collection_manager.filter("assessor_id", "==",
-                                                     assessor_id)
-
-    if is_autogradable:
-      collection_manager.filter("is_autogradable", "==", is_autogradable)
-
-    if status:
-      if len(status) == 1:
-        collection_manager = collection_manager.filter("status", "==",
-                                                       status[0])
-      else:
-        collection_manager = collection_manager.filter("status", "in", status)
-
-    submitted_assessments = collection_manager.order("timer_start_time").fetch()
-    unique_discipline_names = set()
-    unique_unit_names = set()
-    unique_types = set()
-    unique_results = set()
-
-    for submitted_assessment in submitted_assessments:
-      # adding unique type
-      if submitted_assessment.type:
-        unique_types.add(submitted_assessment.type)
-      # adding unique result
-      if submitted_assessment.result:
-        unique_results.add(submitted_assessment.result)
-      assessment_node = Assessment.find_by_uuid(
-          submitted_assessment.assessment_id)
-
-      try:
-        le_node = traverse_up(assessment_node, "assessments",
-          "learning_experience")
-        le_data = le_node.get_fields(reformat_datetime=True)
-        unique_unit_names.add(le_data.get("name", ""))
-        discipline_data = traverse_up(le_node, "learning_experiences",
-            "discipline").get_fields(reformat_datetime=True)
-        unique_discipline_names.add(discipline_data.get("name", ""))
-      except Exception as e:
-        Logger.error(e)
-        Logger.error(traceback.print_exc())
-        pass
 
-    unique_discipline_names = sorted(list(unique_discipline_names))
-    unique_unit_names = sorted(list(unique_unit_names))
-    unique_types = sorted(list(unique_types))
-    unique_results = sorted(list(unique_results))
+    unique_values = SubmittedAssessmentFacetHandler.get_unique_values(
+      assessor_id, is_autogradable, status)
 
     return {
       "success": True,
       "message": "Successfully fetched the unique " + \
         "values for submitted assessments.",
-      "data": {
-          "discipline_names": unique_discipline_names,
-          "unit_names": unique_unit_names,
-          "types": unique_types,
-          "results": unique_results
-        }
+      "data": unique_values
     }
 
   except ResourceNotFoundException as e:
@@ -971,8 +848,7 @@ def get_all_manual_evaluation_submitted_assessments_for_learner(
             "learning_object_name": lo_node.name,
             "submitted_assessments": [submitted_assessment_data]
           })
-    count = 10000
-    final_response = {"records": response, "total_count": count}
+    final_response = {"records": response, "total_count": len(response)}
     return {
         "success": True,
         "message": "Successfully fetched the submitted assessments",
@@ -995,11 +871,13 @@ def get_all_manual_evaluation_submitted_assessments_for_learner(
       "model": NotFoundErrorResponseModel
   }})
 def update_assessor_of_submitted_assessments_of_a_discipline(
-    req: Request, discipline_id: str,
+    discipline_id: str, background_tasks: BackgroundTasks,
     input_assessor: Optional[UpdateAssessorIdRequestModel] = None):
   """
     Unassign and assign another assessor for all non-evaluated
-    submitted assessments related to a discipline
+    submitted assessments related to a discipline. The submitted assessments
+    are updated by a background job whose progress is returned by the
+    assessor update job endpoint
 
     ### Args:
     - discipline_id (str): Unique identifier of a curriculum_pathway
@@ -1011,35 +889,62 @@ def update_assessor_of_submitted_assessments_of_a_discipline(
     - Exception: 500 Internal Server Error if something went wrong
 
     ### Returns:
-    - JSON: Success/Fail Message
+    - JSON: Success/Fail Message along with the name of the job
   """
   try:
     assessor_id = None
     if input_assessor:
-      input_assessor= {**input_assessor.dict()}
-      assessor_id = input_assessor.get("assessor_id")
-    assessment_ids = []
-    assessment_ids = traverse_down(
-        discipline_id, "curriculum_pathways", "assessments",assessment_ids)
-    assessment_ids = list(set(assessment_ids))
-    response_msg= "No assessments found for discipline "\
-          f"with uuid {discipline_id}"
-    if assessment_ids:
-      submitted_assessments = filter_submitted_assessments(
-                                          assessment_ids, assessor_id)
-      if assessor_id:
-        response_msg = f"Successfully replaced assessor {assessor_id} "\
-          f"for submitted assessments of discipline with uuid {discipline_id}."
-        replace_assessor_of_submitted_assessments(discipline_id,req,
-                    submitted_assessments,assessment_ids,assessor_id)
-      else:
-        remove_assessor_for_submitted_assessments(submitted_assessments)
-        response_msg = "Successfully unassigned assessor for all evaluation "\
-        f"pending submitted assessments of discipline with uuid {discipline_id}"
+      assessor_id = input_assessor.dict().get("assessor_id")
+    CurriculumPathway.find_by_uuid(discipline_id)
+    dag_id = get_dag_id_of_discipline(discipline_id) if assessor_id else None
+    job = create_assessor_update_job(discipline_id, assessor_id, dag_id)
+    background_tasks.add_task(run_assessor_update_job, job.uuid)
+    return {
+        "success": True,
+        "message": "Successfully started the job updating the assessor of "
+                   f"submitted assessments of discipline with uuid "
+                   f"{discipline_id}. Please use the job name to track the "
+                   "job status",
+        "data": get_assessor_update_job(job.uuid)
+    }
 
+  except ResourceNotFoundException as e:
+    print(traceback.print_exc())
+    raise ResourceNotFound(str(e)) from e
+
+  except Exception as e:
+    print(traceback.print_exc())
+    raise InternalServerError(str(e)) from e
+
+
+@router.get(
+  "/submitted-assessments/update-assessor-jobs/{job_name}",
+  include_in_schema=False,
+  response_model=AssessorUpdateJobResponseModel,
+  responses={404: {
+      "model": NotFoundErrorResponseModel
+  }})
+def get_assessor_update_job_status(job_name: str):
+  """
+    Returns the status of a job updating the assessor of the submitted
+    assessments of a discipline, with the number of submitted assessments
+    updated so far and the total number to update
+
+    ### Args:
+    - job_name (str): name of the job returned when it was started
+
+    ### Raises:
+    - ResourceNotFoundException: If the job does not exist
+    - Exception: 500 Internal Server Error if something went wrong
+
+    ### Returns:
+    - AssessorUpdateJobResponseModel: Status and progress of the job
+  """
+  try:
     return {
         "success": True,
-        "message": response_msg
+        "message": "Successfully fetched the assessor update job",
+        "data": get_assessor_update_job(job_name)
     }
 
   except ResourceNotFoundException as e:
@@ -24,6 +24,9 @@ from services.submitted_assessment_test import (create_single_assessment,
 from common.models import (Learner, SubmittedAssessment,
                            LearningExperience, User, LearningObject)
 from common.utils.http_exceptions import add_exception_handlers
+from common.utils.search_tokens import get_prefix_tokens
+from common.utils.submitted_assessment_facets import (
+  SubmittedAssessmentFacetHandler)
 from common.testing.firestore_emulator import (firestore_emulator,
                                                clean_firestore)
 
@@ -246,6 +249,13 @@ def test_filtered_searched_submitted_assessments1(clean_firestore,
   submitted_assessment.learner_id = learner.id
   submitted_assessment.assessment_id = assessment.id
   submitted_assessment.uuid = submitted_assessment.id
+  # search fields stored on the submission when it is created
+  submitted_assessment.assessment_name = assessment.display_name
+  submitted_assessment.assessment_search_tokens = get_prefix_tokens(
+    assessment.name, assessment.display_name)
+  submitted_assessment.unit_id = learning_experience.id
+  submitted_assessment.unit_name = learning_experience.name
+  submitted_assessment.instructor_id = instructor_user.id
   submitted_assessment.update()
 
   learning_experience.child_nodes = {"assessments": [assessment.id]}
@@ -280,6 +290,18 @@ def test_filtered_searched_submitted_assessments1(clean_firestore,
   assert get_resp_json.get("data")["records"][0][
     "unit_name"] == params["unit_name"][0]
   assert get_resp_json.get("data")["records"][0]["type"] == params["type"][0]
+  assert get_resp_json.get("data")["records"][0]["instructor_id"] == \
+      instructor_user.user_id
+  assert get_resp_json.get("data")["total_count"] == 1
+
+  # search on the first letters of a word of the assessment name
+  params = {
+      "name": assessment.name.split()[-1][:3],
+      "assessor_id": [assessor_user.id]
+  }
+  get_resp = client_with_emulator.get(get_url, params=params)
+  assert get_resp.json().get("data")["records"][0]["uuid"] == \
+      submitted_assessment.uuid
 
   # get list of submitted assessments by filter on wrong assessor_id
   params = {"assessor_id": ["assessor_id"], "skip": 0, "limit": 2}
@@ -305,16 +327,18 @@ def test_filtered_searched_submitted_assessments2(mocker,
   learner_user.user_id = learner_user.id
   learner_user.update()
 
-  mocker.patch("routes.submitted_assessment.staff_to_learner_handler",
-                return_value=[learner_user.user_type_ref])
-
   instructor_user.user_type = "instructor"
   instructor_user.update()
 
   submitted_assessment.learner_id = learner.id
   submitted_assessment.assessment_id = assessment.id
   submitted_assessment.uuid = submitted_assessment.id
+  submitted_assessment.instructor_id = instructor_user.user_id
   submitted_assessment.update()
+  # submission of a learner of another instructor
+  other_submitted_assessment = create_single_submitted_assessment(False)
+  other_submitted_assessment.instructor_id = "other_instructor_id"
+  other_submitted_assessment.update()
 
   learning_experience.child_nodes = {"assessments": [assessment.id]}
   learning_experience.uuid = learning_experience.id
@@ -344,6 +368,7 @@ def test_filtered_searched_submitted_assessments2(mocker,
   # check if the created submission and the fetched submissions are same
   assert get_resp_json.get("data")["records"][0]["instructor_id"] == \
       params["assessor_id"]
+  assert get_resp_json.get("data")["total_count"] == 1
 
 
 def test_filtered_searched_submitted_assessments3(mocker,
@@ -363,15 +388,13 @@ def test_filtered_searched_submitted_assessments3(mocker,
   learner_user.user_id = learner_user.id
   learner_user.update()
 
-  mocker.patch("routes.submitted_assessment.staff_to_learner_handler",
-                return_value=[learner_user.user_type_ref])
-
   instructor_user.user_type = "instructor"
   instructor_user.update()
 
   submitted_assessment.learner_id = learner.id
   submitted_assessment.assessment_id = assessment.id
   submitted_assessment.uuid = submitted_assessment.id
+  submitted_assessment.instructor_id = instructor_user.user_id
   submitted_assessment.is_flagged = True
   submitted_assessment.comments = [{
         "comment": "Flagged comment",
@@ -903,6 +926,8 @@ def test_get_unique_values_submitted_assessments(clean_firestore,
   submitted_assessment.learner_id = learner.id
   submitted_assessment.assessment_id = assessment.id
   submitted_assessment.uuid = submitted_assessment.id
+  submitted_assessment.unit_id = learning_experience.id
+  submitted_assessment.unit_name = learning_experience.name
   submitted_assessment.update()
 
   learning_experience.child_nodes = {"assessments": [assessment.id]}
@@ -919,6 +944,9 @@ def test_get_unique_values_submitted_assessments(clean_firestore,
   learner.uuid = learner.id
   learner.update()
 
+  # count the submission created without the submit endpoint
+  SubmittedAssessmentFacetHandler.rebuild()
+
   get_url = f"{api_url}/submitted-assessments/unique"
   query_params = {
     "assessor_id": assessor_user.id,
@@ -939,6 +967,11 @@ def test_get_unique_values_submitted_assessments(clean_firestore,
       set([assessment.type])
   assert set(get_resp_json.get("data")["results"]) == set([])
 
+  # the values of the submissions of another status are not returned
+  query_params["status"] = ["completed"]
+  get_resp = client_with_emulator.get(get_url, params=query_params)
+  assert get_resp.json().get("data")["unit_names"] == []
+
 
 def test_get_all_manual_evaluation_submitted_assessments_for_learner(
     clean_firestore,
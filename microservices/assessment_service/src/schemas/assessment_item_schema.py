@@ -155,6 +155,7 @@ class AssessmentItemSearchModelResponse(BaseModel):
 class TotalCountResponseModel(BaseModel):
   records: Optional[List[FullAssessmentItemDataModel]]
   total_count: int
+  next_page_token: Optional[str] = None
 
 class AllAssessmentItemsModelResponse(BaseModel):
   """Assessment Item Response Pydantic Model"""
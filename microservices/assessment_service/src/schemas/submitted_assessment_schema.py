@@ -162,7 +162,9 @@ class AllSubmittedAssessmentResponseModel(BaseModel):
 
 class ReadyForEvaluationModel(FullSubmittedAssessmentModel):
   assessment_name: Optional[str]
+  unit_id: Optional[str]
   unit_name: Optional[str] = ""
+  discipline_id: Optional[str]
   discipline_name: Optional[str] = ""
   learner_name: Optional[str] = ""
   assigned_to: Optional[str] = ""
@@ -181,6 +183,7 @@ class SubmittedAssessmentAssessorResponseModel(BaseModel):
 class TotalCountResponseModel(BaseModel):
   records: Optional[List[ReadyForEvaluationModel]]
   total_count: int
+  next_page_token: Optional[str] = None
 
 class AllSubmittedAssessmentLearnerResponseModel(BaseModel):
   success: Optional[bool] = True
@@ -194,10 +197,36 @@ class AllSubmittedAssessmentAssessorResponseModel(BaseModel):
     "Successfully fetched the ready for evaluation submitted assessments"
   data: Optional[TotalCountResponseModel]
 
+class AssessorUpdateJobModel(BaseModel):
+  """Status and progress of a job updating the assessor of the submitted
+  assessments of a discipline"""
+  job_name: str
+  status: str
+  message: Optional[str] = ""
+  input_data: Optional[dict] = {}
+  updated_count: Optional[int] = 0
+  total_count: Optional[int] = None
+  errors: Optional[dict] = {}
+
+
 class ReplaceAssessorofSubmittedAssessmentsResponseModel(BaseModel):
   success: Optional[bool] = True
   message: Optional[str] = \
     "Successfully updated the assessor of submitted assessments"
+  data: Optional[AssessorUpdateJobModel]
+
+
+class AssessorUpdateJobResponseModel(BaseModel):
+  success: Optional[bool] = True
+  message: Optional[str] = \
+    "Successfully fetched the assessor update job"
+  data: Optional[AssessorUpdateJobModel]
+
+
+class BackfillSearchFieldsResponseModel(BaseModel):
+  success: Optional[bool] = True
+  message: Optional[str] = \
+    "Started storing the search fields of the submitted assessments"
 
 
 class SubmittedAssessmentUniqueData(BaseModel):
@@ -33,9 +33,7 @@ def create_rubric(input_rubric: RubricModel):
     new_rubric.uuid = new_rubric.id
     new_rubric.update()
     rubric_fields = new_rubric.get_fields(reformat_datetime=True)
-    ParentChildNodesHandler.update_child_references(
-        rubric_fields, Rubric, operation="add")
-    ParentChildNodesHandler.update_parent_references(
+    ParentChildNodesHandler.update_nodes_references(
         rubric_fields, Rubric, operation="add")
 
     return {
@@ -38,9 +38,7 @@ def create_rubric_criterion(input_rubric_criterion: RubricCriterionModel):
     rubric_criterion_fields = new_rubric_criterion.get_fields(
         reformat_datetime=True)
 
-    ParentChildNodesHandler.update_child_references(
-        rubric_criterion_fields, RubricCriterion, operation="add")
-    ParentChildNodesHandler.update_parent_references(
+    ParentChildNodesHandler.update_nodes_references(
         rubric_criterion_fields, RubricCriterion, operation="add")
 
     return {
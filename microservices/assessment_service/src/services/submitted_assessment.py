@@ -1,11 +1,20 @@
 """Functions for submitted assessment endpoints."""
 import json
 import traceback
+import fireo
+import requests
 from common.models import Assessment, Learner, SubmittedAssessment, User
 from common.utils.gcs_adapter import is_valid_path
 from common.utils.collection_references import (collection_references)
-from common.utils.errors import PreconditionFailedError, ValidationError
+from common.utils.errors import (PreconditionFailedError, ValidationError,
+                                 ResourceNotFoundException,
+                                 UserManagementServiceError)
 from common.utils.logging_handler import Logger
+from common.utils.pagination import count_documents
+from common.utils.submitted_assessment_facets import (
+  SubmittedAssessmentFacetHandler)
+from common.utils.submitted_assessment_search import (
+  SubmittedAssessmentSearchHandler)
 from common.utils.rest_method import get_method
 from config import (UM_BASE_URL, USE_LEARNOSITY_SECRET,
                     CONTENT_SERVING_BUCKET)
@@ -61,7 +70,8 @@ def instructor_handler(header, curriculum_pathway_id: str):
 
   # Raise the exception if API call fail
   if instructors.status_code != 200:
-    raise Exception("User management service internal server error")
+    raise UserManagementServiceError(
+        "User management service internal server error")
 
   instructors_list = instructors.json()["data"]
   if instructors_list:
@@ -72,6 +82,114 @@ def instructor_handler(header, curriculum_pathway_id: str):
   return instructor
 
 
+def get_instructor_id(header, discipline_id):
+  """
+  Function to get the instructor of a discipline to be stored on the
+  submissions, returns None if it can not be resolved
+  """
+  if not discipline_id:
+    return None
+  try:
+    return instructor_handler(header, discipline_id)
+  except (requests.exceptions.RequestException,
+          UserManagementServiceError) as e:
+    Logger.error(e)
+    Logger.error(traceback.print_exc())
+    return None
+
+
+def get_learner_name(learner_data):
+  """
+  Function to get the learner name stored on the submissions
+  """
+  return " ".join(name for name in [learner_data.get("first_name"),
+                                    learner_data.get("last_name")] if name)
+
+
+def get_grading_queue_fields(submitted_assessment, assessment_node, header,
+                             hierarchy_map, instructor_map,
+                             instructor_id=None):
+  """
+  Function to get the assessment, unit, discipline and instructor of a
+  submitted assessment from its search fields, which are computed from the
+  hierarchy for the submissions created before they were stored
+  Args:
+    submitted_assessment: SubmittedAssessment object
+    assessment_node: Assessment object of the submission
+    header: Authorization header
+    hierarchy_map: hashmap to store the search fields by assessment uuid
+    instructor_map: hashmap to store the instructors by discipline uuid
+    instructor_id: instructor to be returned instead of the stored one, e.g.
+      the instructor viewing the submissions of their learners
+  Returns:
+    dict: search fields to be returned with the submitted assessment
+  """
+  if submitted_assessment.assessment_search_tokens is not None:
+    fields = {
+      key: getattr(submitted_assessment, key) for key in [
+        "assessment_name", "unit_id", "unit_name", "discipline_id",
+        "discipline_name", "instructor_id"]
+    }
+  else:
+    assessment_id = submitted_assessment.assessment_id
+    if assessment_id not in hierarchy_map:
+      hierarchy_map[assessment_id] = \
+        SubmittedAssessmentSearchHandler.get_hierarchy_fields(assessment_node)
+    fields = {**hierarchy_map[assessment_id], "instructor_id": None}
+    fields.pop("assessment_search_tokens")
+
+  discipline_id = fields["discipline_id"]
+  instructor_id = instructor_id or fields["instructor_id"]
+  instructor_key = instructor_id or f"discipline:{discipline_id}"
+  if instructor_key not in instructor_map:
+    instructor_map[instructor_key] = {"user_id": "", "name": "Unassigned"}
+    instructor_id = instructor_id or get_instructor_id(header, discipline_id)
+    if instructor_id:
+      try:
+        instructor_data = User.find_by_user_id(instructor_id).get_fields()
+        instructor_map[instructor_key] = {
+          "user_id": instructor_data.get("user_id", ""),
+          "name": (instructor_data.get("first_name", "") + " " +
+                   instructor_data.get("last_name", "")).lstrip()
+        }
+      except ResourceNotFoundException as e:
+        Logger.error(e)
+        Logger.error(traceback.print_exc())
+  fields["instructor_id"] = instructor_map[instructor_key]["user_id"]
+  fields["instructor_name"] = instructor_map[instructor_key]["name"]
+  fields["unit_name"] = fields["unit_name"] or ""
+  fields["discipline_name"] = fields["discipline_name"] or ""
+  return fields
+
+
+def backfill_search_fields(header):
+  """
+  Function to store the search fields of the submitted assessments created
+  before they were stored on the submissions, and to count every submission
+  in the facets
+  """
+  instructor_map = {}
+
+  def get_extra_fields(submitted_assessment, fields):
+    discipline_id = fields["discipline_id"]
+    if discipline_id not in instructor_map:
+      instructor_map[discipline_id] = get_instructor_id(header, discipline_id)
+    try:
+      learner_name = get_learner_name(
+        Learner.find_by_uuid(submitted_assessment.learner_id).get_fields())
+    except ResourceNotFoundException as e:
+      Logger.error(e)
+      learner_name = None
+    return {
+      "instructor_id": instructor_map[discipline_id],
+      "learner_name": learner_name
+    }
+
+  updated_count = SubmittedAssessmentSearchHandler.backfill(get_extra_fields)
+  SubmittedAssessmentFacetHandler.rebuild()
+  return updated_count
+
+
 def assessor_handler(header, curriculum_pathway_id: str):
   """
   Function use to assign the assessor to the
@@ -152,9 +270,20 @@ def submit_assessment(submitted_assessment_dict, header):
       f"Allowed number of attempts exceeded ({attempt_no}/{max_attempts})")
 
   learner_id = submitted_assessment_dict["learner_id"]
-  Learner.find_by_uuid(learner_id)
+  learner = Learner.find_by_uuid(learner_id)
   user = User.find_by_user_type_ref(learner_id)
 
+  # fields used to filter and sort the submissions of the grading queue
+  search_fields = SubmittedAssessmentSearchHandler.get_hierarchy_fields(
+    assessment)
+  try:
+    auth_header = {"Authorization": header.headers.get("authorization")}
+  except AttributeError:
+    auth_header = {"Authorization": None}
+  search_fields["instructor_id"] = get_instructor_id(
+    auth_header, search_fields["discipline_id"])
+  search_fields["learner_name"] = get_learner_name(learner.get_fields())
+
   if is_autogradable:
     activity_id = assessment.assessment_reference
     if activity_id is not None and activity_id != {}:
@@ -196,14 +325,12 @@ def submit_assessment(submitted_assessment_dict, header):
     # or pretest
     if assessment.type not in ["srl", "static_srl", "cognitive_wrapper",
                                "pretest"]:
-      discipline = traverse_up(assessment, "assessments", "discipline")
-      pathway_id = discipline.get_fields()[
-        "uuid"] if discipline is not None else ""
+      pathway_id = search_fields["discipline_id"] or ""
       assessor_id = assessor_handler(header, pathway_id)
 
   # create document for submitted_assessment
   submitted_assessment_dict = {
-    **submitted_assessment_dict, "type": assessment.type,
+    **submitted_assessment_dict, **search_fields, "type": assessment.type,
     "pass_status": pass_status,
     "status": status,
     "result": result,
@@ -231,7 +358,12 @@ def submit_assessment(submitted_assessment_dict, header):
           "Some of the GCS Path for the assessment submission does not exist")
   new_submitted_assessment.timer_start_time = \
       new_submitted_assessment.created_time
-  new_submitted_assessment.update()
+  # the submission is counted in the facets along with its last write
+  batch = fireo.batch()
+  new_submitted_assessment.update(batch=batch)
+  SubmittedAssessmentFacetHandler.submissions_changed(
+    [(None, new_submitted_assessment.get_fields())], batch)
+  batch.commit()
 
   submitted_assessment_fields = new_submitted_assessment.get_fields(
       reformat_datetime=True)
@@ -269,6 +401,7 @@ def get_all_submission(submitted_assessment_uuid, skip, limit, header=None):
     limit (int): Size of submitted assessment array to be returned
   Returns:
     submitted_assessments: List of SubmittedAssessment object
+    count: Total number of submissions of the learner on the assessment
   """
   submitted_assessment = SubmittedAssessment.find_by_uuid(
       submitted_assessment_uuid)
@@ -285,6 +418,7 @@ def get_all_submission(submitted_assessment_uuid, skip, limit, header=None):
   collection_manager = collection_manager.filter("learner_id", "==", learner_id)
   collection_manager = collection_manager.filter("assessment_id", "==",
                                                  assessment_id)
+  count = count_documents(collection_manager)
 
   submitted_assessments = collection_manager.order("-created_time").offset(
       skip).fetch(limit)
@@ -293,7 +427,7 @@ def get_all_submission(submitted_assessment_uuid, skip, limit, header=None):
     submitted_assessment_data = \
       get_submitted_assessment_data(submitted_assessment, True, header)
     learner_submitted_assessments.append(submitted_assessment_data)
-  return learner_submitted_assessments
+  return learner_submitted_assessments, count
 
 
 def get_latest_submission(learner_id, assessment_id,
@@ -431,10 +565,18 @@ def get_submitted_assessment_data(submitted_assessment,
 def traverse_up(node, level: str, parent_alias: str):
   """This function is to traverse from child to parent
   till a parent with alias `parent_alias` is encountered
-  The `node` and `level` define the child from where to start"""
+  The `node` and `level` define the child from where to start.
+  The parent is looked up in the stored ancestors of the node, the
+  hierarchy is only climbed for the nodes whose ancestors are not stored"""
   if level not in ["assessments", "learning_resources"] and \
     node.alias == parent_alias:
     return node
+  if getattr(node, "ancestors", None) is not None:
+    ancestor = node.get_ancestor(parent_alias)
+    if ancestor is None:
+      return None
+    return collection_references[ancestor["collection_type"]].find_by_uuid(
+      ancestor["uuid"])
   parent_nodes = node.parent_nodes
   for parent_level in parent_nodes:
     for parent_uuid in parent_nodes[parent_level]:
@@ -448,10 +590,4 @@ def traverse_up_uuid(uuid: str, level: str, parent_alias: str):
   till a parent with alias `parent_alias` is encountered
   The `uuid` and `level` define the child from where to start"""
   node = collection_references[level].find_by_uuid(uuid)
-  if level not in ["assessments", "learning_resources"] and \
-    node.alias == parent_alias:
-    return node
-  parent_nodes = node.parent_nodes
-  for parent_level in parent_nodes:
-    for parent_uuid in parent_nodes[parent_level]:
-      return traverse_up_uuid(parent_uuid, parent_level, parent_alias)
+  return traverse_up(node, level, parent_alias)
@@ -198,6 +198,13 @@ def test_submit_assessment(clean_firestore, mocker, input_submitted_assessment,
   del submission_output["archived_at_timestamp"]
   del submission_output["deleted_by"]
   del submission_output["deleted_at_timestamp"]
+  # search fields stored for the grading queue
+  assert submission_output.pop("assessment_name") == assessment.display_name
+  assert submission_output.pop("assessment_search_tokens")
+  assert submission_output.pop("learner_name") is not None
+  for key in ["unit_id", "unit_name", "discipline_id", "discipline_name",
+              "instructor_id"]:
+    assert submission_output.pop(key) is None
   output["assessment_id"]= assessment.uuid
   assert submission_output == output
 
@@ -250,8 +257,9 @@ def test_get_all_submission(mocker, clean_firestore):
   submitted_assessment_dict["attempt_no"] = 1
 
   submitted_assessment_uuid = submitted_assessment_dict["uuid"]
-  all_submissions = get_all_submission(submitted_assessment_uuid, 0, 2)
+  all_submissions, count = get_all_submission(submitted_assessment_uuid, 0, 2)
   assert all_submissions == [submitted_assessment_dict]
+  assert count == 1
 
 
 def test_latest_submitted_assessment(mocker, clean_firestore):
@@ -1,4 +1,6 @@
 """Utility methods for token validation."""
+import hashlib
+import time
 
 from services.firebase_authentication import verify_token
 from common.utils.logging_handler import Logger
@@ -18,11 +20,16 @@ def validate_token(bearer_token):
         Decoded Token and User type: Dict
   """
   token = bearer_token
-  cached_token = get_key(f"cache::{token}")
+  token_hash = hashlib.sha256(token.encode("utf-8")).hexdigest()
+  cached_token = get_key(f"cache::{token_hash}")
   if cached_token is None:
     decoded_token = verify_token(token)
-    cache_token = set_key(f"cache::{token}", decoded_token, 1800)
-    Logger.info(f"Id Token caching status: {cache_token}")
+    # the cached token must not outlive its expiry
+    expires_in = int(decoded_token.get("exp", 0) - time.time())
+    if expires_in > 0:
+      cache_token = set_key(f"cache::{token_hash}", decoded_token,
+                            min(1800, expires_in))
+      Logger.info(f"Id Token caching status: {cache_token}")
   else:
     decoded_token = cached_token
 
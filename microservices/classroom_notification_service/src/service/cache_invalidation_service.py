@@ -0,0 +1,56 @@
+# Copyright 2023 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Invalidate the LMS data cached from classroom
+"""
+from common.models import User
+from common.models.section import Section
+from common.utils.cache_service import invalidate_tag
+from common.utils.errors import ResourceNotFoundException
+from common.utils.logging_handler import Logger
+# disabling for linting to pass
+# pylint: disable = broad-except
+
+def invalidate_cached_data(course_id=None, gaia_id=None):
+  """Invalidates the cached progress and analytics affected by a
+  classroom notification
+
+  Args:
+    course_id (string): classroom course id whose course work changed
+    gaia_id (string): classroom user id whose submissions or roster changed
+
+  Returns:
+    list: invalidated cache tags
+  """
+  tags = []
+  try:
+    if course_id:
+      try:
+        section = Section.find_by_classroom_id(course_id)
+        tags.extend([f"section:{section.id}", f"cohort:{section.cohort.id}"])
+      except ResourceNotFoundException as e:
+        Logger.info(e)
+    if gaia_id:
+      try:
+        user = User.find_by_gaia_id(gaia_id)
+        tags.append(f"user:{user.user_id}")
+      except ResourceNotFoundException as e:
+        Logger.info(e)
+    if tags:
+      invalidate_tag(*tags)
+  except Exception as e:
+    # a failed invalidation must not fail the notification, the cached
+    # entries still expire with their TTL
+    Logger.error(e)
+  return tags
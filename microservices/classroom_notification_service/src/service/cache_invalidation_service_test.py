@@ -0,0 +1,45 @@
+# Copyright 2023 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Cache Invalidation Service Unit Test
+"""
+import mock
+from common.utils.errors import ResourceNotFoundException
+from service.cache_invalidation_service import invalidate_cached_data
+
+
+def test_invalidate_cached_data():
+  section = mock.Mock(id="section_id")
+  section.cohort.id = "cohort_id"
+  user = mock.Mock(user_id="user_id")
+  with mock.patch("service.cache_invalidation_service.Section."
+                  "find_by_classroom_id", return_value=section):
+    with mock.patch("service.cache_invalidation_service.User.find_by_gaia_id",
+                    return_value=user):
+      with mock.patch("service.cache_invalidation_service.invalidate_tag"
+                      ) as mock_invalidate_tag:
+        tags = invalidate_cached_data(course_id="550005555",
+                                      gaia_id="12345678900")
+  assert tags == ["section:section_id", "cohort:cohort_id", "user:user_id"]
+  mock_invalidate_tag.assert_called_once_with(*tags)
+
+
+def test_invalidate_cached_data_unknown_user():
+  with mock.patch("service.cache_invalidation_service.User.find_by_gaia_id",
+                  side_effect=ResourceNotFoundException("not found")):
+    with mock.patch("service.cache_invalidation_service.invalidate_tag"
+                    ) as mock_invalidate_tag:
+      tags = invalidate_cached_data(gaia_id="12345678900")
+  assert not tags
+  mock_invalidate_tag.assert_not_called()
@@ -22,6 +22,7 @@ from common.utils.bq_helper import insert_rows_to_bq
 from googleapiclient.errors import HttpError
 from helper.classroom_helper import get_course_work, get_student_submissions, get_course_work_material
 from helper.json_helper import convert_dict_array_to_json,convert_to_json
+from service.cache_invalidation_service import invalidate_cached_data
 from config import BQ_TABLE_DICT,BQ_DATASET
 # disabling for linting to pass
 # pylint: disable = broad-except
@@ -43,11 +44,13 @@ def save_course_work(data):
         }]
 
     if data["eventType"] == "DELETED":
-      return insert_rows_to_bq(
+      result = insert_rows_to_bq(
             rows=rows,
             dataset=BQ_DATASET,
             table_name=BQ_TABLE_DICT["BQ_LOG_CW_TABLE"]
         )
+      invalidate_cached_data(course_id=data["resourceId"].get("courseId"))
+      return result
 
     if len(data["collection"].split(".")) == 3:
       if data["collection"].split(".")[2] == "studentSubmissions":
@@ -105,9 +108,11 @@ def save_course_work_collection(course_id,course_work_id,message_id,event_type):
       course_work,"materials")
     course_work["event_type"] = event_type
     course_work["timestamp"] = datetime.datetime.utcnow()
-    return insert_rows_to_bq(rows=[course_work],
+    result = insert_rows_to_bq(rows=[course_work],
                             dataset=BQ_DATASET,
                             table_name=BQ_TABLE_DICT["BQ_COLL_CW_TABLE"])
+    invalidate_cached_data(course_id=course_id)
+    return result
   except HttpError as hte:
     Logger.info(hte)
     if hte.status_code == 404:
@@ -146,9 +151,11 @@ def save_student_submission(course_id, course_work_id,
       submission, "multipleChoiceSubmission")
   submission["event_type"] = event_type
   submission["timestamp"] = datetime.datetime.utcnow()
-  return insert_rows_to_bq(rows=[submission],
+  result = insert_rows_to_bq(rows=[submission],
                            dataset=BQ_DATASET,
                            table_name=BQ_TABLE_DICT["BQ_COLL_SCW_TABLE"])
+  invalidate_cached_data(gaia_id=submission.get("userId"))
+  return result
 
 
 
@@ -21,6 +21,7 @@ from common.utils.bq_helper import insert_rows_to_bq
 from helper.classroom_helper import get_user
 from helper.json_helper import convert_dict_array_to_json
 from googleapiclient.errors import HttpError
+from service.cache_invalidation_service import invalidate_cached_data
 from config import BQ_TABLE_DICT,BQ_DATASET
 # disabling for linting to pass
 # pylint: disable = broad-except
@@ -40,15 +41,18 @@ def save_roster(data):
       "publish_time":data["publish_time"],"timestamp":datetime.datetime.utcnow()
     }]
     if data["eventType"] == "DELETED":
-      return insert_rows_to_bq(
+      result = insert_rows_to_bq(
           rows=rows,
           dataset=BQ_DATASET,
           table_name=BQ_TABLE_DICT["BQ_LOG_RS_TABLE"])
-    return insert_rows_to_bq(
-        rows=rows,
-        dataset=BQ_DATASET,
-        table_name=BQ_TABLE_DICT["BQ_LOG_RS_TABLE"]) & save_user(
-        data["resourceId"]["userId"], data["message_id"], data["eventType"])
+    else:
+      result = insert_rows_to_bq(
+          rows=rows,
+          dataset=BQ_DATASET,
+          table_name=BQ_TABLE_DICT["BQ_LOG_RS_TABLE"]) & save_user(
+          data["resourceId"]["userId"], data["message_id"], data["eventType"])
+    invalidate_cached_data(gaia_id=data["resourceId"].get("userId"))
+    return result
   except HttpError as ae:
     Logger.error(ae)
     return False
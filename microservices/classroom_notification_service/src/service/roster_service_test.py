@@ -29,10 +29,14 @@ def test_save_roster():
   with mock.patch("service.roster_service.save_user",return_value=True):
     with mock.patch("service.roster_service.insert_rows_to_bq",
                     return_value=True):
-      result=save_roster(data)
+      with mock.patch("service.roster_service.invalidate_cached_data"
+                      ) as mock_invalidate:
+        result=save_roster(data)
   assert result is True
+  mock_invalidate.assert_called_once_with(gaia_id="12345678900")
 
-def test_save_roster_negative():
+@mock.patch("service.roster_service.invalidate_cached_data")
+def test_save_roster_negative(_):
   data = {
       "message_id": "90000003344",
       "collection": "courses.teachers",
@@ -10,8 +10,12 @@ def update_user_abilites(user_ability, learning_unit_id):
   if learning_unit:
     batch = fireo.batch()
     count = 0
+    users, missing_user_ids = User.find_by_ids(list(user_ability.keys()))
+    if missing_user_ids:
+      print(f"Skipping abilities of unknown users {missing_user_ids}")
+    users = {user.id: user for user in users}
     for user_id, ability in user_ability.items():
-      user = User.find_by_id(user_id)
+      user = users.get(user_id)
       if count >450:
         batch.commit()
         count = 0
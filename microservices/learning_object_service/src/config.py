@@ -50,6 +50,12 @@ SERVICE_NAME = os.getenv("SERVICE_NAME")
 PAYLOAD_FILE_SIZE = 2097152 #2MB
 CONTENT_FILE_SIZE = 1024*1024*200 #200MB
 
+# Assessments created concurrently and firestore batches committed
+# concurrently by the bulk import of a learning hierarchy
+BULK_IMPORT_MAX_WORKERS = int(os.getenv("BULK_IMPORT_MAX_WORKERS", "8"))
+# Seconds to wait for the assessment service to create an assessment
+BULK_IMPORT_HTTP_TIMEOUT = float(os.getenv("BULK_IMPORT_HTTP_TIMEOUT", "60"))
+
 ERROR_RESPONSES = {
     500: {
         "model": InternalServerErrorResponseModel
@@ -67,6 +73,9 @@ FAQ_BASE_PATH = "faq-resources"
 
 # Batch Job types
 VALIDATE_AND_UPLOAD_ZIP = "validate_and_upload_zip"
+BACKFILL_ANCESTOR_PATHS = "backfill_ancestor_paths"
+COPY_LEARNING_HIERARCHY = "copy_learning_hierarchy"
+DELETE_LEARNING_HIERARCHY = "delete_learning_hierarchy"
 ZIP_EXTRACTION_FOLDER = "zip_extraction_folder"
 
 with open("testing/valid_themes.json") as json_file:
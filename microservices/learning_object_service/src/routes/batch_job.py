@@ -1,14 +1,19 @@
 """ Batch job endpoints """
+from typing import Optional
 from fastapi import APIRouter
 from typing_extensions import Literal
 from services.batch_job import (get_all_jobs, get_job_status, delete_batch_job,
-                                remove_job_and_update_status)
+                                remove_job_and_update_status,
+                                initiate_batch_job)
 import traceback
+from common.models import CurriculumPathway
 from common.utils.logging_handler import Logger
-from common.utils.errors import ResourceNotFoundException
-from common.utils.http_exceptions import InternalServerError, ResourceNotFound
+from common.utils.errors import ResourceNotFoundException, ConflictError
+from common.utils.http_exceptions import (InternalServerError, ResourceNotFound,
+                                          Conflict)
 from schemas.error_schema import NotFoundErrorResponseModel
-from config import ERROR_RESPONSES
+from config import (ERROR_RESPONSES, DATABASE_PREFIX, BACKFILL_ANCESTOR_PATHS,
+                    COPY_LEARNING_HIERARCHY, DELETE_LEARNING_HIERARCHY)
 # pylint: disable = broad-except
 # pylint: disable = invalid-name
 
@@ -17,7 +22,86 @@ router = APIRouter(
     tags=["Batch Jobs"],
     responses=ERROR_RESPONSES)
 
-JOB_TYPES = Literal["validate_and_upload_zip"]
+JOB_TYPES = Literal["validate_and_upload_zip", "backfill_ancestor_paths",
+                    "copy_learning_hierarchy", "delete_learning_hierarchy"]
+
+
+@router.post("/backfill_ancestor_paths")
+def backfill_ancestor_paths():
+  """Start a batch job storing the ancestors of every node of the learning
+  hierarchy created before the ancestors were stored"""
+  try:
+    env_vars = {"DATABASE_PREFIX": DATABASE_PREFIX}
+    return initiate_batch_job({}, BACKFILL_ANCESTOR_PATHS, env_vars)
+  except ConflictError as e:
+    raise Conflict(str(e)) from e
+  except Exception as e:
+    Logger.error(e)
+    Logger.error(traceback.print_exc())
+    raise InternalServerError(str(e)) from e
+
+
+@router.post(
+    "/copy_learning_hierarchy/{cp_id}",
+    responses={404: {
+        "model": NotFoundErrorResponseModel
+    }})
+def copy_learning_hierarchy(cp_id: str, resume_job_name: Optional[str] = None):
+  """Start a batch job copying a curriculum pathway along with the whole
+  learning hierarchy below it. The progress of the job is stored in its
+  result data after each level of the hierarchy, a failed job is resumed by
+  passing its name as resume_job_name"""
+  try:
+    CurriculumPathway.find_by_uuid(cp_id)
+    env_vars = {"DATABASE_PREFIX": DATABASE_PREFIX}
+    return initiate_batch_job({
+        "uuid": cp_id,
+        "resume_job_name": resume_job_name
+    }, COPY_LEARNING_HIERARCHY, env_vars)
+  except ResourceNotFoundException as e:
+    raise ResourceNotFound(str(e)) from e
+  except ConflictError as e:
+    raise Conflict(str(e)) from e
+  except Exception as e:
+    Logger.error(e)
+    Logger.error(traceback.print_exc())
+    raise InternalServerError(str(e)) from e
+
+
+@router.post(
+    "/delete_learning_hierarchy/{cp_id}",
+    responses={404: {
+        "model": NotFoundErrorResponseModel
+    }})
+def delete_learning_hierarchy(cp_id: str,
+                              delete_achievements: bool = False,
+                              delete_skills: bool = False,
+                              delete_competencies: bool = False,
+                              resume_job_name: Optional[str] = None):
+  """Start a batch job deleting a curriculum pathway along with the whole
+  learning hierarchy below it. The progress of the job is stored in its
+  result data after each level of the hierarchy, a failed job is resumed by
+  passing its name as resume_job_name"""
+  try:
+    if not resume_job_name:
+      CurriculumPathway.find_by_uuid(cp_id)
+    env_vars = {"DATABASE_PREFIX": DATABASE_PREFIX}
+    return initiate_batch_job({
+        "uuid": cp_id,
+        "delete_achievements": delete_achievements,
+        "delete_skills": delete_skills,
+        "delete_competencies": delete_competencies,
+        "resume_job_name": resume_job_name
+    }, DELETE_LEARNING_HIERARCHY, env_vars)
+  except ResourceNotFoundException as e:
+    raise ResourceNotFound(str(e)) from e
+  except ConflictError as e:
+    raise Conflict(str(e)) from e
+  except Exception as e:
+    Logger.error(e)
+    Logger.error(traceback.print_exc())
+    raise InternalServerError(str(e)) from e
+
 
 @router.get(
     "/{job_type}/{job_name}",
@@ -1,4 +1,5 @@
 """ Content Serving endpoints """
+import os
 import pathlib
 from zipfile import BadZipFile
 from typing import Optional
@@ -28,8 +29,12 @@ from common.utils.http_exceptions import (BadRequest, ResourceNotFound,
                                           InternalServerError as
                                           InternalServerException,
                                           PayloadTooLarge)
-from common.utils.gcs_adapter import GcsCrudService, is_valid_path, upload_file_to_bucket, upload_folder
+from common.utils.gcs_adapter import (GcsCrudService, is_valid_path,
+                                     upload_file_to_bucket, upload_folder,
+                                     upload_stream_to_bucket,
+                                     upload_zip_to_bucket)
 from common.utils.logging_handler import Logger
+from common.utils.hierarchy_change_handler import HierarchyChangeHandler
 from config import (SIGNURL_SA_KEY_PATH, RESOURCE_BASE_PATH,
                     CONTENT_SERVING_BUCKET, ERROR_RESPONSES, DATABASE_PREFIX,
                     VALIDATE_AND_UPLOAD_ZIP, CONTENT_FILE_SIZE,
@@ -211,11 +216,6 @@ async def upload_content_sync(content_file: UploadFile = File(...), is_faq: bool
 
   try:
 
-    # check file size
-    if len(await content_file.read()) > CONTENT_FILE_SIZE:
-      raise PayloadTooLargeError(
-          f"File size is too large: {content_file.filename}")
-
     # check if the valid content type header is set
     if content_file.content_type not in ALLOWED_CONTENT_TYPES:
       raise ValidationError("content_type not allowed")
@@ -237,36 +237,28 @@ async def upload_content_sync(content_file: UploadFile = File(...), is_faq: bool
     content_upload_folder = f"{UPLOAD_BASE_PATH}/{file_name_without_ext}"
 
     if file_extension == "zip":
-      # save zip file locally
-      await content_file.seek(0)
-      content = await content_file.read()
+      # the members of a zip are read from the end of the archive, so its
+      # size is taken from the spooled upload before any of them is read
+      content_file.file.seek(0, os.SEEK_END)
+      if content_file.file.tell() > CONTENT_FILE_SIZE:
+        raise PayloadTooLargeError(
+            f"File size is too large: {content_file.filename}")
 
-      zipfile_path = pathlib.Path.cwd(
-      ) / f"{ZIP_EXTRACTION_FOLDER}/{content_file.filename}"
-      zipfile_path.write_bytes(content)
-
-      zipfile_path = f"{ZIP_EXTRACTION_FOLDER}/{content_file.filename}"
-
-      # unzip files to zip_extraction folder
-      filename_without_ext = file_name.split(".")[0]
-      local_dest_path = f"{ZIP_EXTRACTION_FOLDER}/extracted/{filename_without_ext}"
-      fileHandler.unzipPackage(zipfile_path, local_dest_path)
-
-      # recreate zip structure on GCS
-      upload_folder(CONTENT_SERVING_BUCKET, local_dest_path,
-                    content_upload_folder)
-
-      # Cleanup Temporary Files
-      fileHandler.deleteFile(zipfile_path)
-      fileHandler.deleteFolder(local_dest_path)
+      # stream every file of the zip to GCS without extracting it
+      upload_zip_to_bucket(CONTENT_SERVING_BUCKET, content_file.file,
+                           content_upload_folder)
 
     else:
-      # Go to the start of stream by file.seek(0)
-      await content_file.seek(0)
-
-      # Upload to GCS
-      upload_file_to_bucket(CONTENT_SERVING_BUCKET, content_upload_folder,
-                            content_file.filename, content_file.file)
+      # stream the file to GCS, aborting the upload once the size limit is
+      # exceeded
+      try:
+        upload_stream_to_bucket(
+            CONTENT_SERVING_BUCKET,
+            f"{content_upload_folder}/{content_file.filename}",
+            content_file.file, content_file.content_type, CONTENT_FILE_SIZE)
+      except PayloadTooLargeError as e:
+        raise PayloadTooLargeError(
+            f"File size is too large: {content_file.filename}") from e
 
     prefix, folders_list, files_list = get_file_and_folder_list(
         content_upload_folder)
@@ -619,6 +611,9 @@ async def upload_madcap_export(le_uuid: str,
         _, _, new_file_paths = get_file_and_folder_list(
             learning_experience.resource_path, True)
         update_lr_resource_path(learning_experience.uuid, new_file_paths)
+    HierarchyChangeHandler.node_changed(
+        "learning_experiences",
+        learning_experience.get_fields(reformat_datetime=True))
 
     if is_srl is False:
       return {
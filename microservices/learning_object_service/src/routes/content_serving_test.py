@@ -928,8 +928,8 @@ def test_upload_api_positive(clean_firestore, mocker):
       "services.hierarchy_content_mapping.GcsCrudService",
       return_value=GcsCrudService("GCP_LEARNING_RESOURCE_BUCKET"))
   mocker.patch("routes.content_serving.is_valid_path", return_value=True)
-  mocker.patch("routes.content_serving.upload_file_to_bucket")
-  mocker.patch("routes.content_serving.upload_folder")
+  mocker.patch("routes.content_serving.upload_stream_to_bucket")
+  mocker.patch("routes.content_serving.upload_zip_to_bucket")
 
   file_path = f"{TESTING_FOLDER_PATH}/content_serving/sample_upload_pdf.pdf"
   upload_file = open(file_path)
@@ -948,6 +948,34 @@ def test_upload_api_positive(clean_firestore, mocker):
   assert resp_json["data"].get("folders") is not None
 
 
+def test_upload_api_zip(clean_firestore, mocker):
+  mocker.patch(
+      "services.hierarchy_content_mapping.GcsCrudService",
+      return_value=GcsCrudService("GCP_LEARNING_RESOURCE_BUCKET"))
+  upload_zip = mocker.patch("routes.content_serving.upload_zip_to_bucket")
+  mocker.patch("routes.content_serving.CONTENT_FILE_SIZE", 10)
+
+  file_path = f"{TESTING_FOLDER_PATH}/content_serving/dummy_madcap.zip"
+  resp = client_with_emulator.post(
+      f"{api_url}/upload/sync",
+      files={
+          "content_file":
+              ("dummy_madcap.zip", open(file_path, "rb"), "application/zip")
+      })
+  assert resp.status_code == 413
+  upload_zip.assert_not_called()
+
+  mocker.patch("routes.content_serving.CONTENT_FILE_SIZE", 1024 * 1024 * 200)
+  resp = client_with_emulator.post(
+      f"{api_url}/upload/sync",
+      files={
+          "content_file":
+              ("dummy_madcap.zip", open(file_path, "rb"), "application/zip")
+      })
+  assert resp.status_code == 200
+  assert upload_zip.call_args.args[2] == "learning-resources/dummy_madcap"
+
+
 def test_upload_api_negative(clean_firestore, mocker):
   """
     Negative Scenarios:
@@ -958,8 +986,8 @@ def test_upload_api_negative(clean_firestore, mocker):
       "services.hierarchy_content_mapping.GcsCrudService",
       return_value=GcsCrudService("GCP_LEARNING_RESOURCE_BUCKET"))
   mocker.patch("routes.content_serving.is_valid_path", return_value=True)
-  mocker.patch("routes.content_serving.upload_file_to_bucket")
-  mocker.patch("routes.content_serving.upload_folder")
+  mocker.patch("routes.content_serving.upload_stream_to_bucket")
+  mocker.patch("routes.content_serving.upload_zip_to_bucket")
 
   file_path = f"{TESTING_FOLDER_PATH}/content_serving/sample_upload_pdf.pdf"
   upload_file = open(file_path)
@@ -6,7 +6,10 @@ from common.models import CurriculumPathway, LearnerProfile
 from common.utils.rest_method import put_method
 from common.utils.logging_handler import Logger
 from common.utils.parent_child_nodes_handler import ParentChildNodesHandler
+from common.utils.tree_snapshot_handler import TreeSnapshotHandler
+from common.utils.hierarchy_change_handler import HierarchyChangeHandler
 from common.utils.common_api_handler import CommonAPIHandler
+from common.utils.pagination import fetch_page
 from common.utils.errors import (ResourceNotFoundException, ValidationError,
                                 PayloadTooLargeError)
 from common.utils.http_exceptions import (InternalServerError, BadRequest,
@@ -84,7 +87,8 @@ def get_curriculum_pathways(
                             author: str = None,
                             version: int = None,
                             skip: int = Query(0, ge=0, le=2000),
-                            limit: int = Query(10, ge=1, le=100)):
+                            limit: int = Query(10, ge=1, le=100),
+                            page_token: Optional[str] = None):
   """The get curriculum pathways endpoint will return an array learning
   experiences from firestore
   ### Args:
@@ -106,6 +110,8 @@ def get_curriculum_pathways(
     Number of experiences to be skipped <br/>
   limit: `int`
     Size of curriculum pathway array to be returned <br/>
+  page_token: `str`
+    next_page_token of the previous page, used instead of skip <br/>
   ### Raises:
   ValueError:
     Raised when input angles are outside range. <br/>
@@ -167,15 +173,16 @@ def get_curriculum_pathways(
     elif fetch_archive is False:
       collection_manager = collection_manager.filter("is_archived", "==", False)
 
-    curriculum_pathways = collection_manager.order("-created_time").offset(
-        skip).fetch(limit)
+    curriculum_pathways, next_page_token = fetch_page(
+        collection_manager, limit, "-created_time", page_token, skip)
     curriculum_pathways = [
         i.get_fields(reformat_datetime=True) for i in curriculum_pathways
     ]
     return {
         "success": True,
         "message": "Data fetched successfully",
-        "data": curriculum_pathways
+        "data": curriculum_pathways,
+        "next_page_token": next_page_token
     }
 
   except ValidationError as e:
@@ -314,16 +321,18 @@ def get_curriculum_pathway(uuid: str,
         expansion_map.append("prerequisites")
       if achievements:
         expansion_list.append("achievements")
+      loader = TreeSnapshotHandler.get_loader("curriculum_pathways", uuid)
       curriculum_pathway = ParentChildNodesHandler.load_nodes_data(
         curriculum_pathway,
         "curriculum_pathways",
         learner_profile,
         expansion_map,
-        expansion_list
+        expansion_list,
+        loader
         )
       curriculum_pathway = \
         ParentChildNodesHandler.load_immediate_parent_nodes_data(
-              curriculum_pathway, learner_profile)
+              curriculum_pathway, learner_profile, loader)
       if learner_id:
         count_completed_child_nodes = 0
         for child_key in curriculum_pathway["child_nodes"]:
@@ -393,9 +402,7 @@ def create_curriculum_pathway(input_curriculum_pathway: CurriculumPathwayModel):
 
     curriculum_pathway_fields = new_curriculum_pathway.get_fields(
         reformat_datetime=True)
-    ParentChildNodesHandler.update_child_references(
-        curriculum_pathway_fields, CurriculumPathway, operation="add")
-    ParentChildNodesHandler.update_parent_references(
+    ParentChildNodesHandler.update_nodes_references(
         curriculum_pathway_fields, CurriculumPathway, operation="add")
 
     return {
@@ -513,9 +520,7 @@ def delete_curriculum_pathway(uuid: str):
 
     ParentChildNodesHandler.validate_parent_child_nodes_references(
         curriculum_pathway_fields)
-    ParentChildNodesHandler.update_child_references(
-        curriculum_pathway_fields, CurriculumPathway, operation="remove")
-    ParentChildNodesHandler.update_parent_references(
+    ParentChildNodesHandler.update_nodes_references(
         curriculum_pathway_fields, CurriculumPathway, operation="remove")
 
     CurriculumPathway.delete_by_uuid(curriculum_pathway.uuid)
@@ -676,6 +681,7 @@ def delete_hierarchy(cp_id: str,
                             delete_achievements,
                             delete_skills,
                             delete_competencies)
+    HierarchyChangeHandler.nodes_changed({"curriculum_pathways": [cp_id]})
 
     return {}
   except ResourceNotFoundException as e:
@@ -5,6 +5,7 @@ from fastapi import APIRouter, UploadFile, File, Query
 from common.models import LearningExperience
 from common.utils.logging_handler import Logger
 from common.utils.parent_child_nodes_handler import ParentChildNodesHandler
+from common.utils.node_loader import NodeLoader
 from common.utils.common_api_handler import CommonAPIHandler
 from common.utils.errors import (ResourceNotFoundException, ValidationError,
                                 PayloadTooLargeError)
@@ -206,11 +207,12 @@ def get_learning_experience(uuid: str, fetch_tree: Optional[bool] = False):
     learning_experience = learning_experience.get_fields(reformat_datetime=True)
 
     if fetch_tree:
+      loader = NodeLoader()
       learning_experience = ParentChildNodesHandler.load_child_nodes_data(
-          learning_experience)
+          learning_experience, loader)
       learning_experience = \
         ParentChildNodesHandler.load_immediate_parent_nodes_data(
-              learning_experience)
+              learning_experience, loader=loader)
     return {
         "success": True,
         "message": "Successfully fetched the learning object",
@@ -277,9 +279,7 @@ def create_learning_experience(
 
     learning_experience_fields = new_learning_experience.get_fields(
         reformat_datetime=True)
-    ParentChildNodesHandler.update_child_references(
-        learning_experience_fields, LearningExperience, operation="add")
-    ParentChildNodesHandler.update_parent_references(
+    ParentChildNodesHandler.update_nodes_references(
         learning_experience_fields, LearningExperience, operation="add")
 
     return {
@@ -374,9 +374,7 @@ def delete_learning_experience(uuid: str):
 
     ParentChildNodesHandler.validate_parent_child_nodes_references(
         learning_experience_fields)
-    ParentChildNodesHandler.update_child_references(
-        learning_experience_fields, LearningExperience, operation="remove")
-    ParentChildNodesHandler.update_parent_references(
+    ParentChildNodesHandler.update_nodes_references(
         learning_experience_fields, LearningExperience, operation="remove")
 
     LearningExperience.delete_by_uuid(learning_experience.uuid)
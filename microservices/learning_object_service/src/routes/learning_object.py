@@ -5,6 +5,7 @@ from fastapi import APIRouter, UploadFile, File, Query
 from common.models import LearningObject
 from common.utils.logging_handler import Logger
 from common.utils.parent_child_nodes_handler import ParentChildNodesHandler
+from common.utils.node_loader import NodeLoader
 from common.utils.common_api_handler import CommonAPIHandler
 from common.utils.errors import (ResourceNotFoundException, ValidationError,
                                 PayloadTooLargeError)
@@ -214,11 +215,12 @@ def get_learning_object(uuid: str, fetch_tree: Optional[bool] = False):
     learning_object = learning_object.get_fields(reformat_datetime=True)
 
     if fetch_tree:
+      loader = NodeLoader()
       learning_object = ParentChildNodesHandler.load_child_nodes_data(
-          learning_object)
+          learning_object, loader)
       learning_object = \
         ParentChildNodesHandler.load_immediate_parent_nodes_data(
-              learning_object)
+              learning_object, loader=loader)
     return {
         "success": True,
         "message": "Successfully fetched the learning object",
@@ -286,9 +288,7 @@ def create_learning_object(input_learning_object: LearningObjectModel):
     learning_object_fields = new_learning_object.get_fields(
         reformat_datetime=True)
 
-    ParentChildNodesHandler.update_child_references(
-        learning_object_fields, LearningObject, operation="add")
-    ParentChildNodesHandler.update_parent_references(
+    ParentChildNodesHandler.update_nodes_references(
         learning_object_fields, LearningObject, operation="add")
 
     return {
@@ -384,9 +384,7 @@ def delete_learning_object(uuid: str):
 
     ParentChildNodesHandler.validate_parent_child_nodes_references(
         learning_object_fields)
-    ParentChildNodesHandler.update_child_references(
-        learning_object_fields, LearningObject, operation="remove")
-    ParentChildNodesHandler.update_parent_references(
+    ParentChildNodesHandler.update_nodes_references(
         learning_object_fields, LearningObject, operation="remove")
 
     LearningObject.delete_by_uuid(learning_object.uuid)
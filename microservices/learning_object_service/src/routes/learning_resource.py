@@ -6,6 +6,7 @@ from fastapi import APIRouter, UploadFile, File, Query
 from common.models import LearningResource
 from common.utils.logging_handler import Logger
 from common.utils.parent_child_nodes_handler import ParentChildNodesHandler
+from common.utils.node_loader import NodeLoader
 from common.utils.common_api_handler import CommonAPIHandler
 from common.utils.errors import (ResourceNotFoundException, ValidationError,
                                 PayloadTooLargeError)
@@ -187,11 +188,12 @@ def get_learning_resource(uuid: str, fetch_tree: Optional[bool] = False):
     learning_resource = learning_resource.get_fields(reformat_datetime=True)
 
     if fetch_tree:
+      loader = NodeLoader()
       learning_resource = ParentChildNodesHandler.load_child_nodes_data(
-          learning_resource)
+          learning_resource, loader)
       learning_resource = \
         ParentChildNodesHandler.load_immediate_parent_nodes_data(
-              learning_resource)
+              learning_resource, loader=loader)
     return {
         "success": True,
         "message": "Successfully fetched the learning object",
@@ -258,9 +260,7 @@ def create_learning_resource(input_learning_resource: LearningResourceModel):
     learning_resource_fields = new_learning_resource.get_fields(
         reformat_datetime=True)
 
-    ParentChildNodesHandler.update_child_references(
-        learning_resource_fields, LearningResource, operation="add")
-    ParentChildNodesHandler.update_parent_references(
+    ParentChildNodesHandler.update_nodes_references(
         learning_resource_fields, LearningResource, operation="add")
 
     return {
@@ -355,9 +355,7 @@ def delete_learning_resource(uuid: str):
 
     ParentChildNodesHandler.validate_parent_child_nodes_references(
         learning_resource_fields)
-    ParentChildNodesHandler.update_child_references(
-        learning_resource_fields, LearningResource, operation="remove")
-    ParentChildNodesHandler.update_parent_references(
+    ParentChildNodesHandler.update_nodes_references(
         learning_resource_fields, LearningResource, operation="remove")
 
     LearningResource.delete_by_uuid(learning_resource.uuid)
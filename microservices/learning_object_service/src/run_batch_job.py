@@ -4,10 +4,15 @@ from absl import flags, app
 from common.utils.logging_handler import Logger
 from common.utils.kf_job_app import kube_delete_job
 from common.models.batch_job import BatchJobModel
+from common.utils.ancestor_path_handler import AncestorPathHandler
 
 from services.zip_file_processor import recreate_zip_structure_on_gcs
+from services.learning_hierarchy_job import (run_copy_hierarchy_job,
+                                             run_delete_hierarchy_job)
 
-from config import (JOB_NAMESPACE, VALIDATE_AND_UPLOAD_ZIP)
+from config import (JOB_NAMESPACE, VALIDATE_AND_UPLOAD_ZIP,
+                    BACKFILL_ANCESTOR_PATHS, COPY_LEARNING_HIERARCHY,
+                    DELETE_LEARNING_HIERARCHY)
 # pylint: disable = broad-exception-raised
 
 FLAGS = flags.FLAGS
@@ -26,6 +31,15 @@ def main(argv):
     request_body = json.loads(job.input_data)
     if job.type == VALIDATE_AND_UPLOAD_ZIP:
       _ = recreate_zip_structure_on_gcs(request_body)
+    elif job.type == BACKFILL_ANCESTOR_PATHS:
+      updated_count = AncestorPathHandler.backfill()
+      Logger.info(f"Stored the ancestors of {updated_count} nodes")
+    elif job.type == COPY_LEARNING_HIERARCHY:
+      copy_uuid = run_copy_hierarchy_job(job, request_body)
+      Logger.info(f"Copied the learning hierarchy to {copy_uuid}")
+    elif job.type == DELETE_LEARNING_HIERARCHY:
+      deleted_count = run_delete_hierarchy_job(job, request_body)
+      Logger.info(f"Deleted {deleted_count} nodes of the learning hierarchy")
     else:
       raise Exception("Invalid job type")
     job.status = "succeeded"
@@ -283,6 +283,7 @@ class AllCurriculumPathwaysResponseModel(BaseModel):
   success: Optional[bool] = True
   message: Optional[str] = "Data fetched successfully"
   data: List[FullCurriculumPathwayModel]
+  next_page_token: Optional[str] = None
 
   class Config():
     orm_mode = True
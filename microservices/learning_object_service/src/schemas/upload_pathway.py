@@ -281,6 +281,8 @@ class PathwayImportJsonResponse(BaseModel):
   success: Optional[bool] = True
   message: Optional[str] = "Successfully inserted the Learning Hierarchy"
   data: Optional[List[str]] = []
+  # seconds taken by each stage of the import
+  timings: Optional[dict] = None
 
   class Config():
     orm_mode = True
@@ -288,7 +290,15 @@ class PathwayImportJsonResponse(BaseModel):
         "example": {
             "success": True,
             "message": "Successfully inserted the Learning Hierarchy",
-            "data": ["jmFNsNRc0He4m22dxEUc"]
+            "data": ["jmFNsNRc0He4m22dxEUc"],
+            "timings": {
+                "validate": 0.012,
+                "plan": 0.153,
+                "assessments": 1.204,
+                "write": 0.847,
+                "link": 0.096,
+                "hierarchy": 0.512
+            }
         }
     }
 
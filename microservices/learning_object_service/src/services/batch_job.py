@@ -61,6 +61,7 @@ def get_job_status(job_type, job_name):
       job_response["status"] = job.status
       job_response["errors"] = job.errors
       job_response["type"] = job.type
+      job_response["result_data"] = job.result_data
       if job.output_gcs_path:
         job_response["output_gcs_path"] = job.output_gcs_path
       return job_response
@@ -1,506 +1,449 @@
 """ Import of the JSON file """
-import copy
+import contextlib
+import datetime
 import json
-import requests
+import time
+from concurrent.futures import ThreadPoolExecutor
 from json.decoder import JSONDecodeError
+import requests
+from requests.adapters import HTTPAdapter
+from fireo.database import db
+from common.config import FIRESTORE_BATCH_WRITE_LIMIT
 from common.utils.logging_handler import Logger
 from common.utils.collection_references import (LOS_COLLECTIONS,
                                                 collection_references)
 from common.utils.errors import ValidationError
-from common.utils.parent_child_nodes_handler import ParentChildNodesHandler
-from config import ASSESSMENT_SERVICE_BASE_URL
+from common.utils.ancestor_path_handler import AncestorPathHandler
+from common.utils.hierarchy_change_handler import HierarchyChangeHandler
+from common.utils.hierarchy_walker import HierarchyWalker
+from config import (ASSESSMENT_SERVICE_BASE_URL, BULK_IMPORT_MAX_WORKERS,
+                    BULK_IMPORT_HTTP_TIMEOUT)
 from pydantic.error_wrappers import ValidationError as PydanticValidationError
 from schemas.upload_pathway import UploadPathwayModel
 
-# pylint: disable = global-variable-not-assigned
-# creating global variable of SRL to insert its again directly
-SRL_COLLECTIONS = {}
-header = None
-
-def get_all_nodes_for_project(uuid: str, level: str, nodes: list):
-  """
-  This method traverses the learning hierarchy from given level uuid till the
-  final_alias and retrieves all the node where alias=final_alias.
-  Args:
-    uuid (str): uuid of the node from where to traverse.
-    level (str): current level/type of the Node for given uuid.
-    nodes (list): list to be used to return list of nodes
-  Returns:
-    nodes (list): List of nodes of alias=module and type=project
-  """
-  node = collection_references[level].find_by_uuid(uuid)
-  if node.type == "project" and node.alias == "module":
-    nodes.append(node)
-    return
-  child_nodes = node.child_nodes
-  if child_nodes:
-    for child_level in child_nodes:
-      for child_uuid in child_nodes[child_level]:
-        get_all_nodes_for_project(child_uuid, child_level, nodes)
-  return nodes
-
-
-def module_assessment_prerequisite_handler(uuid):
-  """Module assessment prerequisite handler"""
-  learning_object_project = get_all_nodes_for_project(uuid,
-                                                      "curriculum_pathways", [])
-  for learning_object in learning_object_project:
-    if learning_object.child_nodes.get("assessments"):
-      for assessment_id in learning_object.child_nodes.get("assessments"):
-        assessment = collection_references["assessments"].find_by_uuid(
-            assessment_id)
-        assessment.prerequisites[
-            "learning_objects"] = learning_object.prerequisites[
-                "learning_objects"]
-        assessment.update()
-
-
-def skill_update_handler(content, new_content_obj):
-  skills = new_content_obj.find_by_name(content["name"])
-  skills = [skill.get_fields(reformat_datetime=True) for skill in skills]
-  if len(skills) > 0:
-    for i, skill in enumerate(skills):
-      if skill["name"] == content["name"] and \
-        skill["description"] == content["description"]:
-        new_content_uuid, new_content_field = skills[i]["uuid"], skills[i]
-        return new_content_uuid, new_content_field
-  return None, None
-
-
-def add_data_to_db_handler(content, new_content_obj, collection_name):
-  """Add data to the database handler"""
-  if collection_name == "assessments":
-    global header
-    url = ASSESSMENT_SERVICE_BASE_URL+"/assessment"
-    # pylint: disable = missing-timeout, broad-exception-raised
-    assessment = requests.post(url=url, json=content, headers=header)
-    if assessment.status_code != 200:
-      raise Exception("Post Request to Assessment service Fail with"\
-                      f" status code {assessment.status_code}")
-    content = assessment.json()["data"]
-    new_content_obj = new_content_obj.find_by_uuid(content["uuid"])
-  else:
-    new_content_obj = new_content_obj.from_dict(content)
-    new_content_obj.uuid = ""
-    new_content_obj.save()
-    new_content_obj.uuid = new_content_obj.id
-    new_content_obj.is_locked = False
-  if collection_name in LOS_COLLECTIONS:
-    if not new_content_obj.prerequisites:
-      new_content_obj.prerequisites = {}
-    for prereq_level in new_content_obj.prerequisites:
-      if new_content_obj.prerequisites[prereq_level]:
-        new_content_obj.is_locked = True
-        if new_content_obj.type == "project" and \
-          new_content_obj.alias == "module":
-          new_content_obj.is_locked = False
-        break
-    new_content_obj.root_version_uuid = new_content_obj.id
-  new_content_obj.update()
-  new_content_uuid = new_content_obj.uuid
-  new_content_field = new_content_obj.get_fields(reformat_datetime=True)
-  return new_content_uuid, new_content_field
-
-
-def add_data_to_db(content, new_content_obj, collection_name):
-  """
-  Inserting the data into the database
-  ### Args:
-  content: `dict`
-    The JSON object contains the data
-  new_content_obj: `class object`
-    fireo class object which is used to inject data in
-    firestore
-  ### Returns:
-  new_content_uuid: `str`
-    UUID of the ingested data
-  new_content_field: `dict`
-    JSON object contain the ingested data
-  """
-  new_content_field = None
-  new_content_uuid = None
-
-  if collection_name in ["skills", "competencies"]:
-    new_content_uuid, new_content_field = skill_update_handler(
-        content, new_content_obj)
-
-  if not new_content_uuid and not new_content_field:
-
-    if collection_name == "learning_objects":
-      # converting dictionary into the class object
-      new_content_srl_object = new_content_obj.from_dict(content)
-      # if object_type == "srl" then we need to update
-      # the prerequisites and parent_nodes
-      # new srl object will only be create only once
-      global SRL_COLLECTIONS
-
-      if new_content_srl_object.type == "srl":
-        if SRL_COLLECTIONS.get(content["name"]):
-          trigger_srl = new_content_obj.find_by_uuid(
-              SRL_COLLECTIONS.get(content["name"]))
-          trigger_srl.parent_nodes["learning_experiences"].extend(
-              new_content_srl_object.parent_nodes["learning_experiences"])
-          trigger_srl.prerequisites["learning_objects"].extend(
-              new_content_srl_object.prerequisites["learning_objects"])
-          trigger_srl.update()
-          new_content_uuid = trigger_srl.uuid
-          new_content_field = trigger_srl.get_fields(reformat_datetime=True)
-          return new_content_uuid, new_content_field
-        else:
-          new_content_uuid, new_content_field = add_data_to_db_handler(
-              content, new_content_obj, collection_name)
-          SRL_COLLECTIONS[content["name"]] = new_content_uuid
-          return new_content_uuid, new_content_field
-
-    new_content_uuid, new_content_field = add_data_to_db_handler(
-        content, new_content_obj, collection_name)
-  return new_content_uuid, new_content_field
-
-
-def node_update_handler(content):
-  """
-  creating the key dynamically in the child_nodes
-  of the content object
-  ### Args:
-  content: `dict`
-    The JSON object contains the data
-  ### Returns:
-    None: we are modifying the same array
-  """
-  try:
-    for obj, _ in content["child_nodes"].items():
-      content["child_nodes"][obj] = []
-  except KeyError:
-    pass
-
-
-def update_reference(node, obj):
-  """
-  Add data into the firestore and update the parent-child reference
-  ### Args:
-  node: `dict`
-    JSON object containing the data
-  obj: `str`
-    object wrt to which this node added ingested in firestore
-  """
-  child_uuid, content_field = add_data_to_db(node, collection_references[obj],
-                                             obj)
-  # Updating the parent-child relationship
-  ParentChildNodesHandler.update_child_references(
-      content_field, collection_references[obj], operation="add")
-  ParentChildNodesHandler.update_parent_references(
-      content_field, collection_references[obj], operation="add")
-  # Returning the uuid of the recently added node
-  return child_uuid
-
-
-def create_deep_copy_handler(content):
-  """
-  Separating the child_nodes data from the content object.
-  we need to insert only the UUID of the child nodes.
-  ### Args:
-  content: `dict`
-    JSON object contains the data
-  ### Returns:
-  deepcopy: list containing the child_nodes data
-  """
-  deepcopy = []
-  try:
-    # Coping the child_nodes content into the deepcopy array to
-    # process it in later stage
-    data = copy.deepcopy(content["child_nodes"])
-    deepcopy.append(data)
-  except KeyError:
-    # If child_nodes key is not present means we need to stop recursion
-    pass
-  return deepcopy
-
-
-def parent_node_key_generator(node, key, uuid):
-  """
-  The parent_node_key_generator function will create the parent_node key at
-  a run time and add the UUID of its parent_node in the parent_node
-  field of the current object
-  ### Args:
-  node: `dict`
-    The JSON object contains the data
-  key: `str`
-    parent key
-  UUID: `str`
-    parent UUID
-  ### Returns:
-    None: we are modifying the same array
-  """
-  if node.get("parent_node", None) is not None:
-    try:
-      node["parent_nodes"][key].append(uuid)
-    except KeyError:
-      node["parent_nodes"][key] = [uuid]
-  else:
-    try:
-      node["parent_nodes"] = {}
-      node["parent_nodes"][key].append(uuid)
-    except KeyError:
-      node["parent_nodes"] = {}
-      node["parent_nodes"][key] = [uuid]
-
-
-def missing_order_insertion(vals):
-  """Function to insert default order value in case
-  the order value is not defined in the bulk import json"""
-  for val in vals:
-    if val.get("order", None) is None:
-      val["order"] = 1
-
-
-def ordered_content(content):
-  """
-  if object having two key
-  this will make sure content
-  that it will insert in the
-  given order
-  """
-  content_list = []
-  for key, values in content.items():
-    missing_order_insertion(values)
-    for val in values:
-      content_list.append({key: val})
-  content_list.sort(key=lambda x: next(iter(x.values()))["order"])
-  return content_list
-
-
-def handler(node, order_id, key):
-  """
-  Handler to decouple same logic from the
-  support upload handler
-  """
-  upload_reference_handler(node)
-  upload_achievements_handler(node)
-  deepcopy = create_deep_copy_handler(node)
-  node_update_handler(node)
-  child_uuid = update_reference(node, key)
-  if node["order"] == 0:
-    pass
-  elif node["order"] in order_id:
-    order_id[node["order"]].append(child_uuid)
-  else:
-    order_id[node["order"]] = [child_uuid]
-  support_upload_handler(key, deepcopy, child_uuid)
-
-
-def support_upload_handler(key, contents, uuid):
-  """
-  Helper function to achieve ingestion of data
-  into the firestore using recursion
-  ### Args:
-  key: `str`
-    parent key string of which the particular content belongs
-  content: `dict`
-    JSON object contain the data
-  UUID: `str`
-    UUID of the parent_nodes which was ingested in the firestore
-  ### Return:
-  None: we are terminating the recursion using the for-loop
-  """
-  for content in contents:
-
-    if len(content.keys()) > 1:
-
-      # let content = {
-      #   "learning_experience": [
-      #       {"order":1},
-      #       {"order":3}
-      #       ],
-      #   "assessments" : [
-      #     {"order":2},
-      #     {"order":3}
-      #   ]
-      # }
-
-      # According to the problem we need to
-      # maintain the prerequisites such that order 2
-      # the object will contain the UUID of order 1 in their
-      # prerequisites["learning_experience"] field and soon...
-
-      # we have created one function
-      # def ordered_content(content)-> LIST
-      # which will return the list in the below format
-
-      # ordered_list = [
-      #   {"learning_experience":{"order":1}},
-      #   {"assessments":{"order":2}},
-      #   {"learning_experience":{"order":1}},
-      #   {"assessments":{"order":3}}
-      # ]
-
-      # Let UUID of the order:1 object is UUID1
-      # then insert this in the object of order:2
-
-      # we need to find the exact key inside the
-      # prerequisites where we need to add this UUID1
-
-      # key = list(ordered_list[count -1].keys())[0]]
-
-      # After getting the key insert it into the
-
-      # Object["prerequisites"] = UUID1
-
-      # And rest of the logic is simple recursion to
-      # do the same above process again and again
-      # util we reach at the end of the
-      # hierarchy
-
-      previous_order_id = {}
-      ordered_list = ordered_content(content)
-      count = 0
-      for val in ordered_list:
-        for obj, value in val.items():
-          parent_node_key_generator(value, key, uuid)
-          if value["order"] > 1:
-            value["prerequisites"] = {}
-            value["prerequisites"][list(
-                ordered_list[count -
-                             1].keys())[0]] = previous_order_id[value["order"] -
-                                                                1]
-          count += 1
-          handler(value, previous_order_id, obj)
-    else:
-      for obj, vals in content.items():
-        previous_order_id = {}
-        missing_order_insertion(vals)
-        vals = sorted(vals, key=lambda x: x["order"])
-        for parent_node in vals:
-          parent_node_key_generator(parent_node, key, uuid)
-          if parent_node["order"] > 1:
-            parent_node["prerequisites"] = {}
-            parent_node["prerequisites"][obj] = previous_order_id[
-                parent_node["order"] - 1]
-          handler(parent_node, previous_order_id, obj)
-
-
-def upload_reference_handler(contents):
-  """
-  Add the reference key data recursively into the database
-  before the insertion of child_nodes because reference requires only
-  uni-directional link
-  ### Args:
-  content: `dict`
-    The JSON object contains the data
-  ### Returns:
-  None: we are terminating the recursion using the for-loop
-  """
-  references = contents.get("references", None)
-  if references is not None:
-    for key, values in references.items():
-      id_list = []
-      for value in values:
-        deepcopy = create_deep_copy_handler(value)
-        node_update_handler(value)
-        uuid, _ = add_data_to_db(value, collection_references[key], key)
-        support_upload_handler(key, deepcopy, uuid)
-        id_list.append(uuid)
-      references[key] = id_list
-
-
-def upload_achievements_handler(contents):
-  """
-  Helper function to update achievements key
-  in the firestore
-  ### Args:
-  content: `dict`
-    The JSON object contains the data
-  ### Returns:
-  None: we are terminating the recursion using the for-loop
+# nodes of these collections are reused when one with the same name and
+# description already exists
+REUSED_COLLECTIONS = ["skills", "competencies"]
+# children of the srl learning objects that are kept once per name, as the
+# srl learning objects of the same name are merged into one
+SRL_MERGED_COLLECTIONS = ["learning_resources", "assessments"]
+# fields of an assessment set by the import once it is created
+ASSESSMENT_HIERARCHY_FIELDS = [
+    "uuid", "parent_nodes", "child_nodes", "prerequisites", "ancestors",
+    "root_version_uuid"
+]
+
+# keep-alive connections to the assessment service shared by the imports
+session = requests.Session()
+session.mount("http://", HTTPAdapter(pool_connections=BULK_IMPORT_MAX_WORKERS,
+                                     pool_maxsize=BULK_IMPORT_MAX_WORKERS))
+
+
+def get_ordered_children(child_nodes):
+  """Returns the (collection type, node) of the children of a node sorted by
+  order, a missing order being 1"""
+  children = []
+  for collection_type, nodes in child_nodes.items():
+    for node in nodes or []:
+      if node.get("order", None) is None:
+        node["order"] = 1
+      children.append((collection_type, node))
+  children.sort(key=lambda child: child[1]["order"])
+  return children
+
+
+def add_reference(nodes, collection_type, uuid):
+  """Adds a uuid to the child or parent nodes of a collection type"""
+  uuids = nodes.setdefault(collection_type, [])
+  if uuid not in uuids:
+    uuids.append(uuid)
+
+
+class HierarchyImporter():
+  """Imports a learning hierarchy in stages instead of writing its nodes one
+  at a time while walking it:
+
+  1. validate: the whole file is validated before anything is written
+  2. plan: the uuids of the nodes are generated up front so that the parent,
+     child and prerequisite references are resolved in memory
+  3. assessments: the assessments are created concurrently through the
+     assessment service, without their hierarchy fields
+  4. write: the other nodes are written level by level in batches
+  5. link: the hierarchy fields of the assessments are written in batches
+  6. hierarchy: the data derived from the hierarchy is updated once
+
+  The duration of each stage is logged and returned in timings.
   """
-  key = "achievements"
-  achievements = contents.get(key, None)
 
-  if achievements is not None:
-    id_list = []
-    for achievement in achievements:
+  def __init__(self, headers):
+    self.headers = headers
+    # uuid to the (collection type, fields) of the nodes to create
+    self.nodes = {}
+    # uuids of the nodes to create at each depth of the hierarchy
+    self.levels = []
+    # uuid to the (collection type, fields) of the existing nodes reused by
+    # the import, and uuids of those whose child nodes changed
+    self.reused_nodes = {}
+    self.updated_reused_uuids = []
+    # (collection type, name, description) to the uuid of a reusable node
+    self.reusable_uuids = {}
+    # name to the uuid of the first srl learning object of that name
+    self.srl_uuids = {}
+    # (srl uuid, collection type, name) to the uuid of a child of an srl
+    self.srl_child_uuids = {}
+    self.timings = {}
+
+  @contextlib.contextmanager
+  def stage(self, name):
+    """Measures the duration of a stage of the import"""
+    start_time = time.monotonic()
+    yield
+    self.timings[name] = round(time.monotonic() - start_time, 3)
+    Logger.info(f"Bulk import stage {name} took {self.timings[name]}s")
+
+  def run(self, contents):
+    """Imports the learning hierarchies of the file
+    Args:
+      contents: dict - collection type to the root node of a hierarchy
+    Returns:
+      list - uuids of the root nodes
+    """
+    with self.stage("validate"):
+      self.validate(contents)
+    with self.stage("plan"):
+      self.load_reusable_nodes(contents)
+      root_uuids = [
+          self.plan_node(collection_type, content, 0)
+          for collection_type, content in contents.items()
+      ]
+      self.apply_module_prerequisites()
+    with self.stage("assessments"):
+      created_uuids = self.create_assessments()
+      root_uuids = [created_uuids.get(uuid, uuid) for uuid in root_uuids]
+    with self.stage("write"):
+      self.write_levels()
+    with self.stage("link"):
+      self.link_nodes()
+    with self.stage("hierarchy"):
+      changed_nodes = {}
+      for collection_type, fields in self.nodes.values():
+        changed_nodes.setdefault(collection_type, []).append(fields["uuid"])
+      HierarchyChangeHandler.nodes_changed(changed_nodes)
+    return root_uuids
+
+  @classmethod
+  def iter_nodes(cls, collection_type, content):
+    """Yields the (collection type, node) of a node, of its references and
+    achievements and of its descendants"""
+    yield collection_type, content
+    if not isinstance(content, dict):
+      return
+    for reference_type, references in (content.get("references") or
+                                       {}).items():
+      for reference in references or []:
+        yield from cls.iter_nodes(reference_type, reference)
+    for achievement in content.get("achievements") or []:
       if achievement is not None:
-        deepcopy = create_deep_copy_handler(achievement)
-        node_update_handler(achievement)
-        uuid, _ = add_data_to_db(achievement, collection_references[key], key)
-        support_upload_handler(key, deepcopy, uuid)
-        id_list.append(uuid)
-    contents[key] = id_list
-
+        yield from cls.iter_nodes("achievements", achievement)
+    for child_type, children in (content.get("child_nodes") or {}).items():
+      for child in children or []:
+        yield from cls.iter_nodes(child_type, child)
+
+  def validate(self, contents):
+    """Validates the whole file before anything is written
+    Raises:
+      PydanticValidationError: if a node has an invalid field
+      ValidationError: if a node belongs to an unknown collection
+    """
+    for collection_type, content in contents.items():
+      UploadPathwayModel(**content)
+      for node_type, node in self.iter_nodes(collection_type, content):
+        if node_type not in collection_references or \
+            not isinstance(node, dict):
+          raise ValidationError(f"Invalid {node_type} node in the "\
+            "learning hierarchy")
+
+  def load_reusable_nodes(self, contents):
+    """Reads the existing skills and competencies having the names of those
+    of the file with a query per chunk of names"""
+    names = {}
+    for collection_type, content in contents.items():
+      for node_type, node in self.iter_nodes(collection_type, content):
+        if node_type in REUSED_COLLECTIONS and node.get("name"):
+          names.setdefault(node_type, []).append(node["name"])
+    for node_type, node_names in names.items():
+      for node in collection_references[node_type].find_all_by_field_values(
+          "name", node_names):
+        fields = node.get_fields(reformat_datetime=True)
+        key = (node_type, fields.get("name"), fields.get("description"))
+        if key not in self.reusable_uuids:
+          self.reusable_uuids[key] = fields["uuid"]
+          self.reused_nodes[fields["uuid"]] = (node_type, fields)
+
+  def get_fields(self, uuid):
+    """Returns the fields of a node to create or of a reused node"""
+    return (self.nodes.get(uuid) or self.reused_nodes[uuid])[1]
+
+  def plan_node(self, collection_type, content, depth):
+    """Plans the creation of a node with its references, achievements and
+    descendants, the parent and prerequisites of the node being already set
+    Returns:
+      str - uuid of the node, an existing one if the node is reused
+    """
+    child_nodes = content.get("child_nodes") or {}
+    if isinstance(content.get("child_nodes"), dict):
+      content["child_nodes"] = {child_type: [] for child_type in child_nodes}
+
+    if collection_type == "learning_objects" and \
+        content.get("type") == "srl" and content.get("name") in self.srl_uuids:
+      # the srl learning objects of the same name are merged into the first
+      uuid = self.srl_uuids[content["name"]]
+      srl_fields = self.get_fields(uuid)
+      for key in ["parent_nodes", "prerequisites"]:
+        for node_type, uuids in (content.get(key) or {}).items():
+          for node_uuid in uuids or []:
+            add_reference(srl_fields.setdefault(key, {}), node_type,
+                          node_uuid)
+      self.plan_children(collection_type, uuid, child_nodes, depth + 1)
+      return uuid
+
+    for reference_type, references in (content.get("references") or
+                                       {}).items():
+      content["references"][reference_type] = [
+          self.plan_node(reference_type, reference, depth)
+          for reference in references or []
+      ]
+    if content.get("achievements") is not None:
+      content["achievements"] = [
+          self.plan_node("achievements", achievement, depth)
+          for achievement in content["achievements"]
+          if achievement is not None
+      ]
+
+    reusable_key = (collection_type, content.get("name"),
+                    content.get("description"))
+    if collection_type in REUSED_COLLECTIONS and \
+        reusable_key in self.reusable_uuids:
+      uuid = self.reusable_uuids[reusable_key]
+      if child_nodes:
+        self.updated_reused_uuids.append(uuid)
+      self.plan_children(collection_type, uuid, child_nodes, depth + 1)
+      return uuid
+
+    uuid = db.conn.collection(
+        collection_references[collection_type].collection_name).document().id
+    content["uuid"] = uuid
+    if collection_type in LOS_COLLECTIONS:
+      self.set_locked(collection_type, content)
+      content["root_version_uuid"] = uuid
+    self.nodes[uuid] = (collection_type, content)
+    if collection_type in REUSED_COLLECTIONS:
+      self.reusable_uuids[reusable_key] = uuid
+    if collection_type == "learning_objects" and content.get("type") == "srl":
+      self.srl_uuids[content.get("name")] = uuid
+    while len(self.levels) <= depth:
+      self.levels.append([])
+    self.levels[depth].append(uuid)
+    self.plan_children(collection_type, uuid, child_nodes, depth + 1)
+    return uuid
+
+  @classmethod
+  def set_locked(cls, collection_type, content):
+    """Locks the nodes having prerequisites, except the project modules"""
+    if collection_type != "assessments":
+      content["is_locked"] = False
+    if not content.get("prerequisites"):
+      content["prerequisites"] = {}
+    for uuids in content["prerequisites"].values():
+      if uuids:
+        content["is_locked"] = not (content.get("type") == "project" and
+                                    content.get("alias") == "module")
+        break
 
-def upload_handler(key, content, uuid):
-  """
-  Helper function to upload the learning hierarchy into the
-  firestore database
-  ### Args:
-  key: `str`
-    parent key string of which the particular content belongs
-  content: `dict`
-    JSON object contain the data
-  UUID: `str`
-    UUID of the parent_nodes which was ingested in the firestore
-  ### Return:
-  UUID: `str`
-    UUID of the topmost parent node
-  """
-  upload_reference_handler(content)
-  upload_achievements_handler(content)
-  deepcopy = create_deep_copy_handler(content)
-  node_update_handler(content)
-  uuid, _ = add_data_to_db(content, collection_references[key], key)
-  support_upload_handler(key, deepcopy, uuid)
-  return uuid
-
-
-def find_redundent_id(content):
-  """Find the redundent ID"""
-
-  result = {"learning_resources": [], "assessments": []}
-  input_dict = {"learning_resources": [], "assessments": []}
-
-  for key, vals in content.items():
-    for val in vals:
-      redundent_object = collection_references[key].find_by_uuid(val)
-      input_dict[key].append(
-          redundent_object.get_fields(reformat_datetime=True))
-
-  for key, val in input_dict.items():
-    lr_dict = {}
-    for lr in val:
-      if lr["name"] in lr_dict:
-        lr_dict[lr["name"]].append(lr["uuid"])
+  def plan_children(self, collection_type, uuid, child_nodes, depth):
+    """Plans the children of a node in order, every child having the
+    children of the previous order of its parent as prerequisites
+    Raises:
+      ValidationError: if an order is missing among the children of a node
+    """
+    fields = self.get_fields(uuid)
+    ancestors = None
+    if collection_type in LOS_COLLECTIONS:
+      ancestors = AncestorPathHandler.get_path(collection_type, fields)
+    is_srl = collection_type == "learning_objects" and \
+      fields.get("type") == "srl"
+
+    children = get_ordered_children(child_nodes)
+    uuids_by_order = {}
+    for index, (child_type, child) in enumerate(children):
+      srl_child_key = (uuid, child_type, child.get("name"))
+      if is_srl and child_type in SRL_MERGED_COLLECTIONS and \
+          srl_child_key in self.srl_child_uuids:
+        child_uuid = self.srl_child_uuids[srl_child_key]
       else:
-        lr_dict[lr["name"]] = [lr["uuid"]]
-
-    for _, uuids in lr_dict.items():
-      if len(uuids) > 1:
-        result[key].append(uuids[0])
-  return result
-
-
-def srl_redundency_cleaner():
-  """SRL Redundency Cleaner"""
-  learning_objects = collection_references["learning_objects"].find_by_type(
-      "srl")
-  for learning_object in learning_objects:
-    id_dict = find_redundent_id(learning_object.child_nodes)
-
-    for key, val in id_dict.items():
-      if len(val) > 0:
-        for ids in val:
-          learning_object.child_nodes[key].remove(ids)
-          delete_object = collection_references[key].find_by_uuid(ids)
-          collection_references[key].collection.delete(delete_object.key)
-
-    learning_object.update()
+        if ancestors is not None:
+          child["ancestors"] = ancestors
+        child["parent_nodes"] = {collection_type: [uuid]}
+        if child["order"] > 1:
+          previous_uuids = uuids_by_order.get(child["order"] - 1)
+          if previous_uuids is None:
+            raise ValidationError(
+                f"{child_type} {child.get('name')} of order {child['order']}"\
+                f" has no sibling of order {child['order'] - 1}")
+          child["prerequisites"] = {children[index - 1][0]: previous_uuids}
+        child_uuid = self.plan_node(child_type, child, depth)
+        if is_srl and child_type in SRL_MERGED_COLLECTIONS:
+          self.srl_child_uuids[srl_child_key] = child_uuid
+        if child_uuid in self.nodes:
+          add_reference(fields["child_nodes"], child_type, child_uuid)
+      if child["order"] != 0:
+        uuids_by_order[child["order"]] = uuids_by_order.get(
+            child["order"], []) + [child_uuid]
+
+  def apply_module_prerequisites(self):
+    """Gives the assessments of the project modules the learning object
+    prerequisites of their module"""
+    for collection_type, fields in self.nodes.values():
+      if collection_type == "learning_objects" and \
+          fields.get("type") == "project" and fields.get("alias") == "module":
+        for uuid in (fields.get("child_nodes") or {}).get("assessments", []):
+          self.get_fields(uuid)["prerequisites"]["learning_objects"] = list(
+              fields["prerequisites"].get("learning_objects") or [])
+
+  def create_assessment(self, fields):
+    """Creates an assessment through the assessment service, its hierarchy
+    fields are written by the import once every node is created
+    Returns:
+      str - uuid of the assessment
+    """
+    assessment = {
+        key: value for key, value in fields.items()
+        if key not in ASSESSMENT_HIERARCHY_FIELDS
+    }
+    assessment.update({"parent_nodes": {}, "child_nodes": {},
+                       "prerequisites": {}})
+    response = session.post(url=f"{ASSESSMENT_SERVICE_BASE_URL}/assessment",
+                            json=assessment, headers=self.headers,
+                            timeout=BULK_IMPORT_HTTP_TIMEOUT)
+    if response.status_code != 200:
+      # pylint: disable = broad-exception-raised
+      raise Exception("Post Request to Assessment service Fail with"\
+                      f" status code {response.status_code}")
+    return response.json()["data"]["uuid"]
+
+  def create_assessments(self):
+    """Creates the assessments concurrently and replaces their planned uuids
+    with the uuids they were created with
+    Returns:
+      dict - planned uuid to the uuid of each assessment
+    """
+    planned_uuids = [
+        uuid for uuid, (collection_type, _) in self.nodes.items()
+        if collection_type == "assessments"
+    ]
+    if not planned_uuids:
+      return {}
+    with ThreadPoolExecutor(max_workers=min(
+        len(planned_uuids), BULK_IMPORT_MAX_WORKERS)) as executor:
+      created_uuids = dict(
+          zip(
+              planned_uuids,
+              executor.map(self.create_assessment,
+                           [self.nodes[uuid][1] for uuid in planned_uuids])))
+    self.replace_uuids(created_uuids)
+    return created_uuids
+
+  def replace_uuids(self, uuids):
+    """Replaces uuids in the nodes and in their references"""
+    self.nodes = {uuids.get(uuid, uuid): node
+                  for uuid, node in self.nodes.items()}
+    self.levels = [[uuids.get(uuid, uuid) for uuid in level]
+                   for level in self.levels]
+    for _, fields in list(self.nodes.values()) + list(
+        self.reused_nodes.values()):
+      fields["uuid"] = uuids.get(fields["uuid"], fields["uuid"])
+      for key in ["parent_nodes", "child_nodes", "prerequisites"]:
+        for node_type, node_uuids in (fields.get(key) or {}).items():
+          if isinstance(node_uuids, list):
+            fields[key][node_type] = [
+                uuids.get(node_uuid, node_uuid) for node_uuid in node_uuids
+            ]
+      if fields.get("ancestors"):
+        fields["ancestors"] = [{
+            **ancestor, "uuid": uuids.get(ancestor["uuid"], ancestor["uuid"])
+        } for ancestor in fields["ancestors"]]
+
+  def commit_in_chunks(self, writes, add_write):
+    """Commits writes in concurrent batches of the firestore write limit"""
+    chunks = [
+        writes[index:index + FIRESTORE_BATCH_WRITE_LIMIT]
+        for index in range(0, len(writes), FIRESTORE_BATCH_WRITE_LIMIT)
+    ]
+
+    def commit_chunk(chunk):
+      batch = db.conn.batch()
+      for write in chunk:
+        add_write(batch, write)
+      batch.commit()
+
+    if chunks:
+      with ThreadPoolExecutor(
+          max_workers=min(len(chunks), BULK_IMPORT_MAX_WORKERS)) as executor:
+        list(executor.map(commit_chunk, chunks))
+
+  def write_levels(self):
+    """Writes the nodes other than the assessments, parents first"""
+    timestamp = datetime.datetime.utcnow()
+
+    def add_write(batch, uuid):
+      collection_type, fields = self.nodes[uuid]
+      node = collection_references[collection_type].from_dict(fields)
+      node.created_time = timestamp
+      node.last_modified_time = timestamp
+      batch.set(
+          db.conn.collection(node.collection_name).document(uuid),
+          node.get_fields())
+
+    for level in self.levels:
+      self.commit_in_chunks([
+          uuid for uuid in level if self.nodes[uuid][0] != "assessments"
+      ], add_write)
+
+  def link_nodes(self):
+    """Writes the hierarchy fields of the assessments and the child nodes of
+    the reused nodes that got children"""
+    timestamp = datetime.datetime.utcnow()
+    writes = [(collection_type, fields, {
+        "parent_nodes": fields.get("parent_nodes") or {},
+        "child_nodes": fields.get("child_nodes") or {},
+        "prerequisites": fields.get("prerequisites") or {},
+        "ancestors": fields.get("ancestors") or [],
+        "is_locked": fields.get("is_locked", False),
+        "last_modified_time": timestamp
+    }) for collection_type, fields in self.nodes.values()
+              if collection_type == "assessments"]
+    writes.extend((self.reused_nodes[uuid][0], self.reused_nodes[uuid][1], {
+        "child_nodes": self.reused_nodes[uuid][1]["child_nodes"],
+        "last_modified_time": timestamp
+    }) for uuid in dict.fromkeys(self.updated_reused_uuids))
+
+    def add_write(batch, write):
+      collection_type, fields, updated_fields = write
+      batch.update(
+          db.conn.collection(collection_references[collection_type]
+                             .collection_name).document(fields["uuid"]),
+          updated_fields)
+
+    self.commit_in_chunks(writes, add_write)
 
 
 def bulk_import(headers, json_file):
   """
   Importing a JSON file and validating the schema
-  before inserting the data into the database and
-  initiating the helper function to do the ingestion
-  of the content into the firestore
+  before inserting the data into the database, see HierarchyImporter
   ### Args:
+  headers: dict
+    authorization headers of the calls to the assessment service
   json_file: file
     learning hierarchy file
   ### Raises:
@@ -510,7 +453,8 @@ def bulk_import(headers, json_file):
     If data in the learning hierarchy is containing the
     invalid field
   ### Returns:
-  Return the success message with UUID of the topmost parent node
+  Return the success message with UUID of the topmost parent node and the
+  duration of each stage of the import
   """
   try:
     if not json_file.filename.endswith(".json"):
@@ -518,23 +462,13 @@ def bulk_import(headers, json_file):
     else:
       contents = json.load(json_file.file)
       if isinstance(contents, dict):
-        for _, content in contents.items():
-          UploadPathwayModel(**content)
-
-        data = []
-
-        for key, content in contents.items():
-          global header
-          header = headers
-          data.append(upload_handler(key=key, content=content, uuid=""))
-
-        # to remove the redundent data from the object
-        srl_redundency_cleaner()
-        module_assessment_prerequisite_handler(data[0])
+        importer = HierarchyImporter(headers)
+        data = importer.run(contents)
         return {
             "success": True,
             "message": "Successfully inserted the pathway",
-            "data": data
+            "data": data,
+            "timings": importer.timings
         }
       else:
         raise ValidationError("Provided JSON is invalid")
@@ -548,14 +482,6 @@ def bulk_import(headers, json_file):
         ",".join("'"+i+"'" for i in req_fields)
     raise ValidationError(req_fields_str, data=error_res) from err
 
-  except Exception as err:
-    raise err
-
-  finally:
-    # resetting the global variable SRL_COLLECTIONS
-    global SRL_COLLECTIONS
-    SRL_COLLECTIONS = {}
-
 
 def delete_hierarchy_handler(node_id: str,
                              node_type: str,
@@ -563,46 +489,27 @@ def delete_hierarchy_handler(node_id: str,
                              delete_skills: bool = True,
                              delete_competencies: bool = True):
   """
-  Function to delete the entire hierarchy and all of its components
+  Function to delete the entire hierarchy and all of its components. The
+  hierarchy is read level by level and soft deleted with batched writes
   Args:
-      cp_id: str
+      node_id: str
+      node_type: str
       delete_achievements: bool, Set to true to delete achievements
       delete_skills: bool, Set to true to delete skills
       delete_competencies: bool, Set to true to delete competencies
   Returns:
       None
   """
-  node = collection_references[node_type].find_by_uuid(node_id)
-  node_data = node.get_fields()
-  node_name = node_data["name"]
-  collection_references[node_type].delete_by_uuid(node_id)
-
-  Logger.info(f"DELETED NODE_ID={node_id} NODE_TYPE={node_type} \
-              NODE_NAME={node_name}")
-  if node_data["child_nodes"]:
-    for coll_name in node_data["child_nodes"].keys():
-      if node_data["child_nodes"][coll_name]:
-        for id_ in node_data["child_nodes"][coll_name]:
-          delete_hierarchy_handler(id_, coll_name)
-
+  collection_references[node_type].find_by_uuid(node_id)
   # NOTE: Achievements, Skills and Competencies will be deleted by ID and hence,
   # will be deleted from firestore
-  if delete_achievements:
-    if node_data.get("achievements", []):
-      for ac_id in node_data["achievements"]:
-        collection_references["achievements"].delete_by_id(ac_id)
-        Logger.info(f"DELETED NODE_ID = {ac_id} NODE_TYPE=Achievement")
-
-  if delete_skills:
-    if node_data.get("references", []):
-      if node_data["references"].get("skills", []):
-        for ac_id in node_data["references"]["skills"]:
-          collection_references["skills"].delete_by_id(ac_id)
-          Logger.info(f"DELETED NODE_ID = {ac_id} NODE_TYPE=Skill")
-
-  if delete_competencies:
-    if node_data.get("references", []):
-      if node_data["references"].get("competencies", []):
-        for ac_id in node_data["references"]["competencies"]:
-          collection_references["competencies"].delete_by_id(ac_id)
-          Logger.info(f"DELETED NODE_ID = {ac_id} NODE_TYPE=Competency")
+  reference_types = [
+      reference_type for reference_type, is_deleted in [(
+          "achievements", delete_achievements), (
+              "skills", delete_skills), ("competencies", delete_competencies)]
+      if is_deleted
+  ]
+  deleted_count = HierarchyWalker.delete_hierarchy({node_type: [node_id]},
+                                                   reference_types)
+  Logger.info(f"DELETED NODE_ID={node_id} NODE_TYPE={node_type} "
+              f"with {deleted_count} nodes of its hierarchy")
@@ -0,0 +1,85 @@
+"""Unit test for bulk_import service"""
+import io
+import json
+from types import SimpleNamespace
+from services.bulk_import import bulk_import
+from common.models import (Assessment, CurriculumPathway, LearningExperience,
+                           LearningObject)
+
+# disabling pylint rules that conflict with pytest fixtures
+# pylint: disable=unused-argument,redefined-outer-name,unused-import
+from common.testing.firestore_emulator import (firestore_emulator,
+                                               clean_firestore)
+
+
+def create_node(name, node_type, alias, order=1, child_nodes=None):
+  return {
+      "name": name,
+      "type": node_type,
+      "alias": alias,
+      "order": order,
+      "child_nodes": child_nodes or {}
+  }
+
+
+def create_assessment(url, json, headers, timeout):
+  """Creates the assessment posted to the assessment service"""
+  assessment = Assessment.from_dict(json)
+  assessment.save()
+  assessment.uuid = assessment.id
+  assessment.update()
+  return SimpleNamespace(status_code=200,
+                         json=lambda: {"data": {"uuid": assessment.uuid}})
+
+
+def test_bulk_import(clean_firestore, mocker):
+  mocker.patch("services.bulk_import.session.post",
+               side_effect=create_assessment)
+  lesson = create_node("Guide", "html", "lesson")
+  learning_objects = [
+      create_node("Reflect", "srl", "module", 1,
+                  {"learning_resources": [lesson]}),
+      create_node("Project", "project", "module", 2, {
+          "assessments": [create_node("Submit", "project", "assessment")]
+      }),
+      create_node("Reflect", "srl", "module", 3, {
+          "learning_resources": [
+              lesson, create_node("Extra", "html", "lesson", 2)
+          ]
+      })
+  ]
+  contents = {
+      "curriculum_pathways": create_node("Program", "pathway", "program", 1, {
+          "learning_experiences": [
+              create_node("Experience", "learning_experience",
+                          "learning_experience", 1,
+                          {"learning_objects": learning_objects})
+          ]
+      })
+  }
+
+  result = bulk_import({}, SimpleNamespace(
+      filename="hierarchy.json", file=io.StringIO(json.dumps(contents))))
+  assert set(result["timings"]) == {
+      "validate", "plan", "assessments", "write", "link", "hierarchy"
+  }
+
+  program = CurriculumPathway.find_by_uuid(result["data"][0])
+  experience = LearningExperience.find_by_uuid(
+      program.child_nodes["learning_experiences"][0])
+  # the srl learning objects of the same name are merged into the first
+  srl_uuid, project_uuid = experience.child_nodes["learning_objects"]
+  srl = LearningObject.find_by_uuid(srl_uuid)
+  assert srl.prerequisites["learning_objects"] == [project_uuid]
+  assert len(srl.child_nodes["learning_resources"]) == 2
+
+  project = LearningObject.find_by_uuid(project_uuid)
+  assert project.prerequisites == {"learning_objects": [srl_uuid]}
+  assert project.is_locked is False
+  assert [ancestor["alias"] for ancestor in project.ancestors
+         ] == ["learning_experience", "program"]
+
+  assessment = Assessment.find_by_uuid(project.child_nodes["assessments"][0])
+  assert assessment.parent_nodes == {"learning_objects": [project_uuid]}
+  assert assessment.prerequisites["learning_objects"] == [srl_uuid]
+  assert assessment.ancestors[0]["uuid"] == project_uuid
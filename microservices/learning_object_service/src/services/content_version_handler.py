@@ -7,6 +7,7 @@ from common.utils.http_exceptions import (BadRequest, ResourceNotFound,
                                           InternalServerError as
                                           InternalServerException)
 from common.utils.common_api_handler import CommonAPIHandler
+from common.utils.hierarchy_change_handler import HierarchyChangeHandler
 from common.utils.parent_child_nodes_handler import ParentChildNodesHandler
 from common.utils.gcs_adapter import is_valid_path
 from schemas.learning_resource_schema import (UpdateLearningResourceModel)
@@ -98,19 +99,32 @@ def lazy_sync(content_version_uuid, linked_version_uuid):
         setattr(current_content_data, key, value)
 
   current_content_data.update()
+  # the synced fields are served from the tree snapshots
+  HierarchyChangeHandler.node_changed("learning_resources",
+                                      current_content_data.get_fields())
 
 
 def update_hierarchy_references(existing_document_dict, input_document_dict,
                                 collection):
-  """Update the hierarchy references for the given document"""
+  """Update the hierarchy references for the given document, the references
+  of the previous version are replaced in a single batch"""
+  nodes = {}
   ParentChildNodesHandler.update_child_references(existing_document_dict,
-                                                  collection, "remove")
+                                                  collection, "remove", nodes)
   ParentChildNodesHandler.update_child_references(input_document_dict,
-                                                  collection, "add")
+                                                  collection, "add", nodes)
   ParentChildNodesHandler.update_parent_references(existing_document_dict,
-                                                   collection, "remove")
+                                                   collection, "remove", nodes)
   ParentChildNodesHandler.update_parent_references(input_document_dict,
-                                                   collection, "add")
+                                                   collection, "add", nodes)
+  ParentChildNodesHandler.write_nodes(nodes.values())
+  collection_name = ParentChildNodesHandler.get_collection_name(collection)
+  ParentChildNodesHandler.parent_references_updated(existing_document_dict,
+                                                    collection_name, "remove",
+                                                    nodes)
+  ParentChildNodesHandler.parent_references_updated(input_document_dict,
+                                                    collection_name, "add",
+                                                    nodes)
 
   updated_doc = collection.find_by_uuid(input_document_dict["uuid"])
   return updated_doc.get_fields(reformat_datetime=True)
@@ -129,6 +143,7 @@ def unpublish_other_versions(content_version_uuid):
   version_list_manager = version_list_manager.order("-created_time").fetch()
 
   # Mark all other LR versions as unpublished
+  unpublished_fields = []
   for doc in version_list_manager:
     if doc.uuid != content_version_uuid:
 
@@ -136,6 +151,9 @@ def unpublish_other_versions(content_version_uuid):
       if doc.status == "published":
         doc.status = "unpublished"
         doc.update()
+        unpublished_fields.append(doc.get_fields())
+  HierarchyChangeHandler.node_changed("learning_resources",
+                                      *unpublished_fields)
 
 
 def handle_publish_event(linked_lr_uuid, content_version_uuid):
@@ -205,6 +223,8 @@ def handle_publish_event(linked_lr_uuid, content_version_uuid):
       connected_lr.status = "published"
       connected_lr.last_published_on = publish_timestamp
       connected_lr.update()
+      HierarchyChangeHandler.node_changed("learning_resources",
+                                          connected_lr.get_fields())
 
       return connected_lr.get_fields(reformat_datetime=True)
     else:
@@ -376,3 +396,5 @@ def update_lr_resource_path(le_uuid,new_file_paths):
         index = new_file_name_list.index(file_name)
         lr_doc_list[i].resource_path = new_file_paths[index]
         lr_doc_list[i].update()
+  HierarchyChangeHandler.nodes_changed(
+      {"learning_resources": [lr_doc.uuid for lr_doc in lr_doc_list]})
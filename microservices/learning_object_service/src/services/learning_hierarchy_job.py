@@ -0,0 +1,252 @@
+""" Copy and deletion of whole learning hierarchies run as batch jobs """
+import datetime
+import uuid as uuid_module
+from common.models import CurriculumPathway
+from common.models.batch_job import BatchJobModel
+from common.utils.logging_handler import Logger
+from common.utils.collection_references import collection_references
+from common.utils.errors import ResourceNotFoundException
+from common.utils.ancestor_path_handler import AncestorPathHandler
+from common.utils.hierarchy_walker import HierarchyWalker
+from common.utils.hierarchy_change_handler import HierarchyChangeHandler
+from common.utils.parent_child_nodes_handler import ParentChildNodesHandler
+
+# flags of the delete request to the collections deleted along the hierarchy
+DELETED_REFERENCES = {
+    "delete_achievements": "achievements",
+    "delete_skills": "skills",
+    "delete_competencies": "competencies"
+}
+
+
+def get_copy_uuid(copy_id, uuid):
+  """Returns the uuid of the copy of a node, derived from the id of the copy
+  so that a resumed copy writes the same documents again"""
+  return uuid_module.uuid5(uuid_module.NAMESPACE_OID, f"{copy_id}/{uuid}").hex
+
+
+def remap_nodes(nodes_dict, copy_id, copied_keys, keep_others):
+  """Replaces the uuids of the copied nodes of a child_nodes, parent_nodes or
+  prerequisites dict with the uuids of their copies
+  Args:
+    nodes_dict: dict - uuids of the nodes by collection type
+    copy_id: str - id of the copy
+    copied_keys: set - (collection type, uuid) of the copied nodes
+    keep_others: bool - whether the nodes that are not copied are kept
+  Returns:
+    dict - the remapped uuids by collection type
+  """
+  return {
+      collection_type: [
+          get_copy_uuid(copy_id, uuid)
+          if (collection_type, uuid) in copied_keys else uuid
+          for uuid in uuids
+          if keep_others or (collection_type, uuid) in copied_keys
+      ] for collection_type, uuids in (nodes_dict or {}).items()
+  }
+
+
+def copy_node(fields, copy_id, copied_keys, paths, is_root):
+  """Returns the fields of the copy of a node
+  Args:
+    fields: dict - fields of the node
+    copy_id: str - id of the copy
+    copied_keys: set - (collection type, uuid) of the copied nodes
+    paths: dict - uuid of the copied nodes to the chain of their children
+    is_root: bool - whether the node is the root of the copy, whose parents
+      and ancestors are kept
+  Returns:
+    dict - fields of the copy
+  """
+  copy_fields = {
+      key: value
+      for key, value in fields.items()
+      if key not in ["created_time", "last_modified_time", "last_published_on"]
+  }
+  uuid = get_copy_uuid(copy_id, fields["uuid"])
+  copy_fields.update({
+      "uuid": uuid,
+      "root_version_uuid": uuid,
+      "version": 1,
+      "child_nodes": remap_nodes(fields.get("child_nodes"), copy_id,
+                                 copied_keys, False),
+      "prerequisites": remap_nodes(fields.get("prerequisites"), copy_id,
+                                   copied_keys, True)
+  })
+  copy_fields["is_locked"] = any(copy_fields["prerequisites"].values())
+  # the indexes derived from the hierarchy point at the copied nodes
+  if fields.get("assessment_ids") is not None:
+    copy_fields["assessment_ids"] = remap_nodes(
+        {"assessments": fields["assessment_ids"]}, copy_id, copied_keys,
+        False)["assessments"]
+  wrapper_uuid = fields.get("cognitive_wrapper_uuid")
+  if wrapper_uuid:
+    copy_fields["cognitive_wrapper_uuid"] = get_copy_uuid(
+        copy_id, wrapper_uuid) if ("learning_objects",
+                                   wrapper_uuid) in copied_keys else None
+  if not is_root:
+    copy_fields["parent_nodes"] = remap_nodes(fields.get("parent_nodes"),
+                                              copy_id, copied_keys, False)
+    # the parent the node was reached from is copied on an earlier level
+    parent_uuid = next(
+        (parent_uuid
+         for parent_uuids in copy_fields["parent_nodes"].values()
+         for parent_uuid in parent_uuids
+         if parent_uuid in paths), None)
+    if parent_uuid is None:
+      # the parent listing the node in its child_nodes is missing in the
+      # parent_nodes of the node, its ancestors are left to the backfill
+      Logger.error(f"Node {fields['uuid']} is not listed as a child in the "
+                   f"parent_nodes of its copied parents, copying it without "
+                   f"ancestors")
+      copy_fields["ancestors"] = None
+    else:
+      copy_fields["ancestors"] = paths[parent_uuid]
+  return copy_fields
+
+
+def copy_hierarchy(collection_type,
+                   uuid,
+                   copy_id,
+                   completed_levels=0,
+                   on_level=None):
+  """Copies a node and the hierarchy below it. The hierarchy is read level by
+  level before anything is written, the copies are then written a level per
+  step, parents first, with batched writes
+  Args:
+    collection_type: str - key of the collection of the node
+    uuid: str - uuid of the node
+    copy_id: str - id the uuids of the copies are derived from
+    completed_levels: int - number of levels written by a previous copy of
+      the same id
+    on_level: function - called with the number of levels written and the
+      number of nodes of the level after each level
+  Returns:
+    dict - fields of the copy of the node
+  Raises:
+    ResourceNotFoundException: if the node does not exist
+  """
+  levels = list(
+      HierarchyWalker.iter_levels({collection_type: [uuid]},
+                                  skip_deleted=True))
+  if not levels:
+    raise ResourceNotFoundException(
+        f"{collection_references[collection_type].__name__} with uuid "
+        f"{uuid} not found")
+  copied_keys = {(node_type, fields["uuid"])
+                 for level in levels for node_type, fields in level}
+  timestamp = datetime.datetime.utcnow()
+
+  def add_write(batch, write):
+    node_type, fields = write
+    node = collection_references[node_type].from_dict(fields)
+    node.created_time = timestamp
+    node.last_modified_time = timestamp
+    batch.set(HierarchyWalker.get_reference(node_type, fields["uuid"]),
+              node.get_fields())
+
+  paths = {}
+  root_fields = None
+  copied_nodes = {}
+  for index, level in enumerate(levels):
+    copies = [(node_type,
+               copy_node(fields, copy_id, copied_keys, paths, not index))
+              for node_type, fields in level]
+    if not index:
+      root_fields = copies[0][1]
+    for node_type, fields in copies:
+      paths[fields["uuid"]] = AncestorPathHandler.get_path(node_type, fields)
+      copied_nodes.setdefault(node_type, []).append(fields["uuid"])
+    if index < completed_levels:
+      continue
+    HierarchyWalker.commit_writes(copies, add_write)
+    if on_level:
+      on_level(index + 1, len(copies))
+
+  # the copy is added to the children of the parents of the node once the
+  # whole hierarchy is written
+  nodes = {}
+  ParentChildNodesHandler.update_parent_references(
+      root_fields, collection_references[collection_type], "add", nodes)
+  ParentChildNodesHandler.write_nodes(nodes.values())
+  # the indexes and snapshots of every copied node are checked, along with
+  # the parents the copy was added to
+  for parent_type, parent_uuids in (root_fields.get("parent_nodes") or
+                                    {}).items():
+    copied_nodes.setdefault(parent_type, []).extend(parent_uuids)
+  HierarchyChangeHandler.nodes_changed(copied_nodes)
+  return root_fields
+
+
+def get_progress(job_name):
+  """Returns the progress stored by the job a job resumes, if any"""
+  if not job_name:
+    return {}
+  return dict(BatchJobModel.find_by_uuid(job_name).result_data or {})
+
+
+def store_progress(job, progress):
+  """Returns a callback storing the progress of a job in its result data
+  after each level"""
+
+  def on_level(completed_levels, node_count):
+    progress["completed_levels"] = completed_levels
+    progress["processed_nodes"] = progress.get("processed_nodes", 0) + \
+      node_count
+    job.result_data = dict(progress)
+    job.update()
+    Logger.info(f"Job {job.uuid}: {completed_levels} levels and "
+                f"{progress['processed_nodes']} nodes processed")
+
+  return on_level
+
+
+def run_copy_hierarchy_job(job, request_body):
+  """Copies the hierarchy of a curriculum pathway, resuming the job given in
+  the request if any
+  Args:
+    job: BatchJobModel - the running job
+    request_body: dict - uuid of the curriculum pathway and the name of the
+      job to resume
+  Returns:
+    str - uuid of the copy of the curriculum pathway
+  """
+  progress = get_progress(request_body.get("resume_job_name"))
+  progress.setdefault("copy_id", job.uuid)
+  root_fields = copy_hierarchy("curriculum_pathways",
+                               request_body["uuid"],
+                               progress["copy_id"],
+                               progress.get("completed_levels", 0),
+                               store_progress(job, progress))
+  progress["copy_uuid"] = root_fields["uuid"]
+  job.result_data = dict(progress)
+  job.update()
+  return root_fields["uuid"]
+
+
+def run_delete_hierarchy_job(job, request_body):
+  """Soft deletes the hierarchy of a curriculum pathway, resuming the job
+  given in the request if any
+  Args:
+    job: BatchJobModel - the running job
+    request_body: dict - uuid of the curriculum pathway, the delete flags of
+      the referenced collections and the name of the job to resume
+  Returns:
+    int - number of nodes deleted
+  """
+  progress = get_progress(request_body.get("resume_job_name"))
+  if not request_body.get("resume_job_name"):
+    # the pathway is removed from the children of its parents once, by the
+    # first run of the deletion
+    ParentChildNodesHandler.update_parent_references(
+        CurriculumPathway.find_by_uuid(request_body["uuid"]).get_fields(
+            reformat_datetime=True), CurriculumPathway, "remove")
+  deleted_count = HierarchyWalker.delete_hierarchy(
+      {"curriculum_pathways": [request_body["uuid"]]}, [
+          reference_type
+          for flag, reference_type in DELETED_REFERENCES.items()
+          if request_body.get(flag)
+      ], progress.get("completed_levels", 0), store_progress(job, progress))
+  HierarchyChangeHandler.nodes_changed(
+      {"curriculum_pathways": [request_body["uuid"]]})
+  return deleted_count
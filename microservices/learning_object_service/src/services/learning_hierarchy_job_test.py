@@ -0,0 +1,162 @@
+"""Unit test for the learning hierarchy jobs"""
+from services.learning_hierarchy_job import (copy_hierarchy, copy_node,
+                                             get_copy_uuid,
+                                             run_delete_hierarchy_job)
+from common.models import (CurriculumPathway, LearningExperience,
+                           LearningObject, Assessment)
+
+# disabling pylint rules that conflict with pytest fixtures
+# pylint: disable=unused-argument,redefined-outer-name,unused-import
+from common.testing.firestore_emulator import (firestore_emulator,
+                                               clean_firestore)
+
+
+def create_node(collection, name, parent_nodes=None, prerequisites=None):
+  """Creates a node of the hierarchy"""
+  node = collection.from_dict({
+      "uuid": "",
+      "name": name,
+      "parent_nodes": parent_nodes or {},
+      "child_nodes": {},
+      "prerequisites": prerequisites or {},
+      "is_deleted": False
+  })
+  node.save()
+  node.uuid = node.id
+  node.update()
+  return node
+
+
+def test_copy_node():
+  fields = {
+      "uuid": "lo_2",
+      "name": "Module",
+      "version": 3,
+      "created_time": "2023-01-01 00:00:00",
+      "parent_nodes": {
+          "learning_experiences": ["le_1", "other_le"]
+      },
+      "child_nodes": {
+          "learning_resources": ["lr_1", "deleted_lr"]
+      },
+      "prerequisites": {
+          "learning_objects": ["lo_1", "other_lo"]
+      },
+      "assessment_ids": ["as_1", "deleted_as"],
+      "cognitive_wrapper_uuid": "lo_1"
+  }
+  copied_keys = {("learning_experiences", "le_1"),
+                 ("learning_resources", "lr_1"), ("learning_objects", "lo_1"),
+                 ("learning_objects", "lo_2"), ("assessments", "as_1")}
+  parent_path = [{"uuid": get_copy_uuid("copy", "le_1")}]
+  paths = {get_copy_uuid("copy", "le_1"): parent_path}
+
+  copy_fields = copy_node(fields, "copy", copied_keys, paths, False)
+  assert copy_fields["uuid"] == get_copy_uuid("copy", "lo_2") != "lo_2"
+  assert copy_fields["version"] == 1
+  assert "created_time" not in copy_fields
+  assert copy_fields["parent_nodes"] == {
+      "learning_experiences": [get_copy_uuid("copy", "le_1")]
+  }
+  assert copy_fields["child_nodes"] == {
+      "learning_resources": [get_copy_uuid("copy", "lr_1")]
+  }
+  assert copy_fields["prerequisites"] == {
+      "learning_objects": [get_copy_uuid("copy", "lo_1"), "other_lo"]
+  }
+  assert copy_fields["is_locked"] is True
+  assert copy_fields["ancestors"] == parent_path
+
+  # a node missing the parent it was reached from is copied without ancestors
+  orphan_fields = copy_node({
+      **fields, "parent_nodes": {"learning_experiences": ["other_le"]}
+  }, "copy", copied_keys, paths, False)
+  assert orphan_fields["parent_nodes"] == {"learning_experiences": []}
+  assert orphan_fields["ancestors"] is None
+  assert copy_fields["assessment_ids"] == [get_copy_uuid("copy", "as_1")]
+  assert copy_fields["cognitive_wrapper_uuid"] == get_copy_uuid("copy", "lo_1")
+
+
+def test_copy_hierarchy(clean_firestore):
+  pathway = create_node(CurriculumPathway, "Program")
+  experience = create_node(LearningExperience, "Experience",
+                           {"curriculum_pathways": [pathway.uuid]})
+  first = create_node(LearningObject, "Module 1",
+                      {"learning_experiences": [experience.uuid]})
+  second = create_node(LearningObject, "Module 2",
+                       {"learning_experiences": [experience.uuid]},
+                       {"learning_objects": [first.uuid]})
+  assessment = Assessment.from_dict({
+      "uuid": "",
+      "name": "Project",
+      "type": "project",
+      "parent_nodes": {"learning_objects": [second.uuid]},
+      "is_deleted": False
+  })
+  assessment.save()
+  assessment.uuid = assessment.id
+  assessment.update()
+  second.child_nodes = {"assessments": [assessment.uuid]}
+  second.assessment_ids = [assessment.uuid]
+  second.update()
+  experience.child_nodes = {"learning_objects": [first.uuid, second.uuid]}
+  experience.assessment_ids = [assessment.uuid]
+  experience.update()
+  pathway.child_nodes = {"learning_experiences": [experience.uuid]}
+  pathway.update()
+
+  progress = []
+  copy_fields = copy_hierarchy(
+      "curriculum_pathways", pathway.uuid, "copy",
+      on_level=lambda levels, count: progress.append((levels, count)))
+  assert progress == [(1, 1), (2, 1), (3, 2), (4, 1)]
+
+  pathway_copy = CurriculumPathway.find_by_uuid(copy_fields["uuid"])
+  experience_copy = LearningExperience.find_by_uuid(
+      pathway_copy.child_nodes["learning_experiences"][0])
+  assert experience_copy.uuid != experience.uuid
+  assert experience_copy.parent_nodes == {
+      "curriculum_pathways": [pathway_copy.uuid]
+  }
+  first_uuid, second_uuid = experience_copy.child_nodes["learning_objects"]
+  second_copy = LearningObject.find_by_uuid(second_uuid)
+  assert second_copy.prerequisites == {"learning_objects": [first_uuid]}
+  assert second_copy.is_locked is True
+  assert [ancestor["uuid"] for ancestor in second_copy.ancestors
+         ] == [experience_copy.uuid, pathway_copy.uuid]
+
+  # the assessment index of the copies lists the copied assessments
+  assessment_copy_uuid = get_copy_uuid("copy", assessment.uuid)
+  assert second_copy.child_nodes == {"assessments": [assessment_copy_uuid]}
+  assert second_copy.assessment_ids == [assessment_copy_uuid]
+  assert LearningExperience.find_by_uuid(
+      experience_copy.uuid).assessment_ids == [assessment_copy_uuid]
+  assert Assessment.find_by_uuid(assessment_copy_uuid).parent_nodes == {
+      "learning_objects": [second_uuid]
+  }
+
+  # the original hierarchy is left untouched
+  assert LearningExperience.find_by_uuid(
+      experience.uuid).child_nodes["learning_objects"] == [
+          first.uuid, second.uuid
+      ]
+
+
+def test_delete_hierarchy_job(clean_firestore, mocker):
+  program = create_node(CurriculumPathway, "Program")
+  pathway = create_node(CurriculumPathway, "Discipline",
+                        {"curriculum_pathways": [program.uuid]})
+  experience = create_node(LearningExperience, "Experience",
+                           {"curriculum_pathways": [pathway.uuid]})
+  pathway.child_nodes = {"learning_experiences": [experience.uuid]}
+  pathway.update()
+  program.child_nodes = {"curriculum_pathways": [pathway.uuid]}
+  program.update()
+
+  job = mocker.Mock(uuid="job")
+  assert run_delete_hierarchy_job(job, {"uuid": pathway.uuid}) == 2
+  assert job.result_data == {"completed_levels": 2, "processed_nodes": 2}
+  assert LearningExperience.find_by_id(experience.uuid).is_deleted is True
+  # the deleted pathway is no longer a child of its parent
+  assert CurriculumPathway.find_by_uuid(
+      program.uuid).child_nodes == {"curriculum_pathways": []}
@@ -26,6 +26,7 @@ from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 from pathlib import Path
 from common.utils.logging_handler import Logger
+from common.utils.gcs_adapter import GcsBackend, TransferEngine
 from common.models import (UserQuery, QueryResult,
                           QueryEngine, QueryDocument,
                           QueryReference,
@@ -453,16 +454,14 @@ def _process_documents(doc_url: str, bucket_name: str,
 
 def _download_files_to_local(storage_client, local_dir, doc_url: str) -> \
     List[Tuple[str, str, str]]:
-  """ Download files from GCS to a local tmp directory """
-  docs = []
+  """ Download files from GCS to a local tmp directory, concurrently """
   bucket_name = doc_url.split("gs://")[1].split("/")[0]
-  for blob in storage_client.list_blobs(bucket_name):
-    # Download the file to the tmp folder flattening all directories
-    file_name = Path(blob.name).name
-    file_path = os.path.join(local_dir, file_name)
-    blob.download_to_filename(file_path)
-    docs.append((blob.name, blob.path, file_path))
-  return docs
+  bucket = storage_client.bucket(bucket_name)
+  # Download the files to the tmp folder flattening all directories
+  files = TransferEngine(GcsBackend(storage_client)).download_folder(
+      bucket_name, "", local_dir, flatten=True)
+  return [(blob_name, bucket.blob(blob_name).path, file_path)
+          for blob_name, file_path in files]
 
 
 def _read_doc(doc_name:str, doc_filepath: str) -> List[str]:
@@ -61,6 +61,11 @@ USER_MANAGEMENT_BASE_URL = f"http://{SERVICES['user-management']['host']}:" \
                   f"{SERVICES['user-management']['port']}" \
                   f"/user-management/api/v1"
 
+# Progress and analytics cache entries are invalidated through cache tags by
+# the classroom notification service, the TTLs only bound their staleness
+PROGRESS_CACHE_TTL = int(os.getenv("PROGRESS_CACHE_TTL", "86400"))
+ANALYTICS_CACHE_TTL = int(os.getenv("ANALYTICS_CACHE_TTL", "86400"))
+
 try:
   LMS_BACKEND_ROBOT_USERNAME = secrets.access_secret_version(
       request={
@@ -15,7 +15,7 @@ from schemas.error_schema import (InternalServerErrorResponseModel,
                                   ConflictResponseModel,
                                   ValidationErrorResponseModel)
 from schemas.analytics import AnalyticsResponse
-from config import BQ_DATASET,PROJECT_ID,BQ_TABLE_DICT
+from config import BQ_DATASET,PROJECT_ID,BQ_TABLE_DICT,ANALYTICS_CACHE_TTL
 
 router = APIRouter(prefix="/analytics",
                    tags=["Students"],
@@ -65,7 +65,7 @@ def get_student_analytics(student_id: str,request: Request):
     res_data=convert_query_result_to_analytics_model(result,
                                           student_id,user_id)
     set_key(f"analytics::{user_email}::{user_id}::response",
-            res_data.dict(),3600)
+            res_data.dict(),ANALYTICS_CACHE_TTL,tags=[f"user:{user_id}"])
     return res_data
   except ValidationError as ve:
     Logger.error(ve)
@@ -8,7 +8,6 @@ from common.utils.logging_handler import Logger
 from common.utils.errors import ResourceNotFoundException, ValidationError
 from common.utils.http_exceptions import ResourceNotFound, InternalServerError, BadRequest
 from common.utils import classroom_crud
-from common.utils.cache_service import set_key, get_key
 from common.utils.bq_helper import insert_rows_to_bq
 from schemas.cohort import (CohortListResponseModel, CohortModel,
                             CreateCohortResponseModel, InputCohortModel,
@@ -24,6 +23,9 @@ from config import BQ_TABLE_DICT,BQ_DATASET
 from utils.helper import (convert_cohort_to_cohort_model,
                           convert_section_to_section_model)
 from utils.user_helper import get_user_id
+from services.student_service import (
+    get_cohort_progress_percentage,
+    get_cohort_progress_percentage_not_turned_in)
 
 
 router = APIRouter(prefix="/cohorts",
@@ -304,42 +306,8 @@ def get_progress_percentage(cohort_id: str, user: str, request: Request):
     headers = {"Authorization": request.headers.get("Authorization")}
     user_id = get_user_id(user=user.strip(), headers=headers)
     Logger.info(f"user id : {user_id}")
-    section_with_progress_percentage = []
-    cached_progress_percentage = get_key(f"{cohort_id}::{user_id}")
-    if cached_progress_percentage is not None:
-      section_with_progress_percentage = cached_progress_percentage
-    else:
-      cohort = Cohort.find_by_id(cohort_id)
-      # Using the cohort object reference key query sections model to get a list
-      # of section of a perticular cohort
-      result = Section.fetch_all_by_cohort(cohort_key=cohort.key)
-      for section in result:
-        submitted_course_work_list = 0
-        record = CourseEnrollmentMapping.\
-          find_active_enrolled_student_record(section.key,user_id)
-        if record is not None:
-          course_work_list = len\
-            (classroom_crud.get_course_work_list(section.key.split("/")[1]))
-          submitted_course_work = classroom_crud.get_submitted_course_work_list(
-          section.key.split("/")[1], user_id,headers)
-          for submission_obj in submitted_course_work:
-            if submission_obj["state"] == "TURNED_IN":
-              submitted_course_work_list = submitted_course_work_list + 1
-          progress_percent=0
-          if course_work_list !=0:
-            progress_percent = round\
-          ((submitted_course_work_list / course_work_list) * 100, 2)
-          else:
-            progress_percent = 0
-          data = {"section_id":\
-          section.key.split("/")[1],"progress_percentage":\
-            progress_percent}
-          section_with_progress_percentage.append(data)
-      cached_value = set_key(f"{cohort_id}::{user_id}",\
-      section_with_progress_percentage, 3600)
-      Logger.info\
-      (f"progress percentage caching status for cohort_id \
-      {cohort_id}, user_id {user_id} : {cached_value}")
+    section_with_progress_percentage = get_cohort_progress_percentage(
+        cohort_id, user_id, headers)
     return {"data":section_with_progress_percentage}
 
   except ResourceNotFoundException as err:
@@ -374,45 +342,8 @@ def get_progress_percentage_not_turned_in(\
   try:
     headers = {"Authorization": request.headers.get("Authorization")}
     user_id = get_user_id(user=user.strip(), headers=headers)
-    section_with_progress_percentage = []
-    cached_progress_percentage = get_key(\
-    f"not_turned_in::{cohort_id}::{user_id}")
-    if cached_progress_percentage is not None:
-      section_with_progress_percentage = cached_progress_percentage
-    else:
-      cohort = Cohort.find_by_id(cohort_id)
-      # Using the cohort object reference key query sections model to get a list
-      # of section of a perticular cohort
-      result = Section.fetch_all_by_cohort(cohort_key=cohort.key)
-      for section in result:
-        submitted_course_work_list = 0
-        record = CourseEnrollmentMapping.\
-          find_active_enrolled_student_record(section.key,user_id)
-        if record is not None:
-          course_work_list = len\
-            (classroom_crud.get_course_work_list(section.key.split("/")[1]))
-          submitted_course_work = classroom_crud.get_submitted_course_work_list(
-          section.key.split("/")[1], user_id,headers)
-          for submission_obj in submitted_course_work:
-            if "assignedGrade" in submission_obj:
-              submitted_course_work_list = submitted_course_work_list + 1
-          progress_percent=0
-          if course_work_list !=0:
-            progress_percent = round\
-          ((submitted_course_work_list / course_work_list) * 100, 2)
-          else:
-            progress_percent = 0
-          data = {"section_id":\
-          section.key.split("/")[1],"progress_percentage":\
-            progress_percent}
-          section_with_progress_percentage.append(data)
-      cached_value = set_key(\
-      f"not_turned_in::{cohort_id}::{user_id}",\
-      section_with_progress_percentage, 3600)
-      Logger.info\
-      (f"progress percentage caching status for \
-       not_turned_in cohort_id \
-      {cohort_id}, user_id {user_id} : {cached_value}")
+    section_with_progress_percentage = \
+      get_cohort_progress_percentage_not_turned_in(cohort_id, user_id, headers)
     return {"data":section_with_progress_percentage}
 
   except ResourceNotFoundException as err:
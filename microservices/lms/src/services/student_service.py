@@ -1,11 +1,13 @@
 """Student API services"""
 import requests
 import traceback
-from config import USER_MANAGEMENT_BASE_URL
+from config import USER_MANAGEMENT_BASE_URL, PROGRESS_CACHE_TTL
 from services.section_service import insert_section_enrollment_to_bq
 from common.utils import classroom_crud
 from common.utils.logging_handler import Logger
-from common.models import CourseEnrollmentMapping, User
+from common.models import CourseEnrollmentMapping, User, Cohort
+from common.models.section import Section
+from common.utils.cache_service import cached, get_many, set_many
 from common.utils.errors import (ResourceNotFoundException,
                                  UserManagementServiceError)
 from common.utils.http_exceptions import (Conflict, InternalServerError)
@@ -143,3 +145,83 @@ def invite_student(section, student_email, headers):
       "classroom_id": section.classroom_id,
       "classroom_url": section.classroom_url
   }
+
+
+def get_sections_progress_percentage(cohort_id, user_id, headers,
+                                     is_counted, key_prefix):
+  """Get progress percentage of a student for every section of a cohort.
+  The progress of each section is cached separately and all of them are
+  read from the cache in a single round trip
+  Args:
+  cohort_id : cohort_id for which progess is required
+  user_id : user_id of the student
+  headers : authorization headers
+  is_counted : function returning True for submissions counted as progress
+  key_prefix : prefix of the cache keys of the section progress
+  Returns: list of dicts with section_id and progress_percentage
+  """
+  section_with_progress_percentage = []
+  cohort = Cohort.find_by_id(cohort_id)
+  # Using the cohort object reference key query sections model to get a list
+  # of section of a perticular cohort
+  result = Section.fetch_all_by_cohort(cohort_key=cohort.key)
+  cache_keys = {
+      section.key: f"{key_prefix}::{section.key.split('/')[1]}::{user_id}"
+      for section in result
+  }
+  cached_progress = get_many(list(cache_keys.values()))
+  progress_to_cache = {}
+  progress_tags = {}
+  for section_key, cache_key in cache_keys.items():
+    section_id = section_key.split("/")[1]
+    data = cached_progress[cache_key]
+    if data is not None:
+      section_with_progress_percentage.append(data)
+      continue
+    submitted_course_work_list = 0
+    record = CourseEnrollmentMapping.\
+      find_active_enrolled_student_record(section_key,user_id)
+    if record is not None:
+      course_work_list = len\
+        (classroom_crud.get_course_work_list(section_id))
+      submitted_course_work = classroom_crud.get_submitted_course_work_list(
+      section_id, user_id,headers)
+      for submission_obj in submitted_course_work:
+        if is_counted(submission_obj):
+          submitted_course_work_list = submitted_course_work_list + 1
+      progress_percent=0
+      if course_work_list !=0:
+        progress_percent = round\
+      ((submitted_course_work_list / course_work_list) * 100, 2)
+      else:
+        progress_percent = 0
+      data = {"section_id":section_id,"progress_percentage":\
+        progress_percent}
+      section_with_progress_percentage.append(data)
+      progress_to_cache[cache_key] = data
+      progress_tags[cache_key] = [f"section:{section_id}", f"user:{user_id}"]
+  if progress_to_cache:
+    set_many(progress_to_cache, PROGRESS_CACHE_TTL, progress_tags)
+  return section_with_progress_percentage
+
+
+@cached(key="{cohort_id}::{user_id}", ttl=PROGRESS_CACHE_TTL,
+        tags=["cohort:{cohort_id}", "user:{user_id}"])
+def get_cohort_progress_percentage(cohort_id, user_id, headers):
+  """Get cached progress percentage of turned in assignments of a student
+  for every section of a cohort"""
+  return get_sections_progress_percentage(
+      cohort_id, user_id, headers,
+      lambda submission: submission["state"] == "TURNED_IN",
+      "section_progress")
+
+
+@cached(key="not_turned_in::{cohort_id}::{user_id}", ttl=PROGRESS_CACHE_TTL,
+        tags=["cohort:{cohort_id}", "user:{user_id}"])
+def get_cohort_progress_percentage_not_turned_in(cohort_id, user_id, headers):
+  """Get cached progress percentage of graded assignments of a student
+  for every section of a cohort"""
+  return get_sections_progress_percentage(
+      cohort_id, user_id, headers,
+      lambda submission: "assignedGrade" in submission,
+      "not_turned_in::section_progress")
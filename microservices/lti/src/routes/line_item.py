@@ -423,7 +423,7 @@ def get_results_of_line_item(context_id: str,
       raise ResourceNotFoundException(
           f"Line item with id {line_item_id} in {context_id} not found")
 
-    result_fields = get_line_item_results(
+    result_fields, _ = get_line_item_results(
         context_id=context_id,
         line_item_id=line_item_id,
         user_id=user_id,
@@ -4,10 +4,11 @@ from fastapi import APIRouter
 from fastapi.security import HTTPBearer
 from config import ERROR_RESPONSES, LTI_ISSUER_DOMAIN
 from common.models import LineItem, Result
-from common.utils.errors import (ResourceNotFoundException, InvalidTokenError)
+from common.utils.errors import (ResourceNotFoundException, InvalidTokenError,
+                                 ValidationError)
 from common.utils.logging_handler import Logger
 from common.utils.http_exceptions import (InternalServerError, ResourceNotFound,
-                                          Unauthenticated)
+                                          Unauthenticated, BadRequest)
 from schemas.results_schema import (UpdateResultModel,
                                     GetAllResultsResponseModel,
                                     ResultResponseModel)
@@ -35,7 +36,8 @@ def get_results_of_line_item_for_admin(
     skip: int = 0,
     limit: int = 10,
     user_id: Optional[str] = None,
-    is_grade_sync_completed: Optional[bool] = None):
+    is_grade_sync_completed: Optional[bool] = None,
+    page_token: Optional[str] = None):
   """The get all results of a line item endpoint will return all the
   results of a line item from firestore
   ### Args:
@@ -47,6 +49,8 @@ def get_results_of_line_item_for_admin(
     Size of results array to be returned <br/>
   user_id: `str`
     Unique identifier of the user <br/>
+  page_token: `str`
+    next_page_token of the previous page, used instead of skip <br/>
   ### Raises:
   ResourceNotFoundException:
     If the line item does not exist. <br/>
@@ -62,23 +66,28 @@ def get_results_of_line_item_for_admin(
       raise ResourceNotFoundException(
           f"Line item with id {line_item_id} in {context_id} not found")
 
-    result_fields = get_line_item_results(
+    result_fields, next_page_token = get_line_item_results(
         context_id=context_id,
         line_item_id=line_item_id,
         user_id=user_id,
         is_grade_sync_completed=is_grade_sync_completed,
         skip=skip,
-        limit=limit)
+        limit=limit,
+        page_token=page_token)
 
     return {
         "success": True,
         "data": result_fields,
+        "next_page_token": next_page_token,
         "message": "Sucessfully fetched results"
     }
 
   except InvalidTokenError as e:
     Logger.error(e)
     raise Unauthenticated(str(e)) from e
+  except ValidationError as e:
+    Logger.error(e)
+    raise BadRequest(str(e)) from e
   except ResourceNotFoundException as e:
     Logger.error(e)
     raise ResourceNotFound(str(e)) from e
@@ -42,6 +42,7 @@ class GetAllResultsResponseModel(BaseModel):
   success: Optional[bool] = True
   message: Optional[str] = "Successfully fetched results"
   data: List[FullResultModel]
+  next_page_token: Optional[str] = None
 
   class Config():
     orm_mode = True
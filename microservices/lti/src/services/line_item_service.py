@@ -1,6 +1,7 @@
 """Line item service"""
 from common.models import LineItem, LTIContentItem, Result
 from common.utils.errors import ResourceNotFoundException
+from common.utils.pagination import fetch_page
 from config import LTI_ISSUER_DOMAIN
 # pylint: disable=line-too-long
 
@@ -55,8 +56,10 @@ def get_line_item_results(context_id,
                           user_id=None,
                           is_grade_sync_completed=None,
                           skip=0,
-                          limit=10):
-  """Get the results of a given line item for a specific context id"""
+                          limit=10,
+                          page_token=None):
+  """Get the results of a given line item for a specific context id along
+  with the token of the next page"""
   result_fields = []
 
   result_collection_manager = Result.collection
@@ -73,7 +76,8 @@ def get_line_item_results(context_id,
     result_collection_manager = result_collection_manager.filter(
         "isGradeSyncCompleted", "==", is_grade_sync_completed)
 
-  result = result_collection_manager.offset(skip).fetch(limit)
+  result, next_page_token = fetch_page(
+      result_collection_manager, limit, page_token=page_token, skip=skip)
 
   for i in result:
     result_data = i.get_fields(reformat_datetime=True)
@@ -83,7 +87,7 @@ def get_line_item_results(context_id,
         "scoreOf"] = f"{LTI_ISSUER_DOMAIN}/lti/api/v1/{context_id}/line_items/{line_item_id}"
     result_fields.append(result_data)
 
-  return result_fields
+  return result_fields, next_page_token
 
 
 def get_result_of_line_item(context_id, line_item_id, result_id):
@@ -7,6 +7,8 @@ from typing import Union, List, Optional
 from typing_extensions import Literal
 from fastapi import APIRouter, UploadFile, File, Query
 from common.utils.logging_handler import Logger
+from common.config import LIST_TOTAL_COUNT_CACHE_TTL
+from common.utils.pagination import count_documents
 from common.utils.errors import (ResourceNotFoundException, ValidationError,
                                 PayloadTooLargeError)
 from common.utils.http_exceptions import (InternalServerError, BadRequest,
@@ -166,7 +168,8 @@ def get_approved_experiences(skip: int = Query(0, ge=0, le=2000),
     approved_experiences = [
       i.get_fields(reformat_datetime=True) for i in approved_experiences
     ]
-    count = 10000
+    count = count_documents(ApprovedExperience.collection,
+                            LIST_TOTAL_COUNT_CACHE_TTL)
     response = {"records": approved_experiences, "total_count": count}
     return {
         "success": True,
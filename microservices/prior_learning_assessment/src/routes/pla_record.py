@@ -8,6 +8,8 @@ from typing import Optional,Union, List
 from typing_extensions import Literal
 from common.utils.common_api_handler import CommonAPIHandler
 from common.utils.logging_handler import Logger
+from common.config import LIST_TOTAL_COUNT_CACHE_TTL
+from common.utils.pagination import count_documents
 from common.utils.errors import (ResourceNotFoundException, ValidationError,
                                 PayloadTooLargeError)
 from common.utils.http_exceptions import (InternalServerError, BadRequest,
@@ -51,7 +53,7 @@ def get_all_pla_records(skip: int = Query(0, ge=0, le=2000),
     pla_records = [
       i.get_fields(reformat_datetime=True) for i in pla_records
     ]
-    count = 10000
+    count = count_documents(PLARecord.collection, LIST_TOTAL_COUNT_CACHE_TTL)
     response = {"records": pla_records, "total_count": count}
     return {
       "success": True,
@@ -7,6 +7,8 @@ from common.utils.errors import (ResourceNotFoundException, ValidationError,
 from common.utils.http_exceptions import (InternalServerError, BadRequest,
                                           ResourceNotFound, PayloadTooLarge)
 from common.models.prior_learning_assessment import PriorExperience
+from common.config import LIST_TOTAL_COUNT_CACHE_TTL
+from common.utils.pagination import count_documents
 from schemas.prior_experience_schema import (GetPriorExperienceResponseModel,
         AllPriorExperienceResponseModel, PostPriorExperienceResponseModel,
         PriorExperienceModel, UpdatePriorExperienceResponseModel,
@@ -50,7 +52,8 @@ def get_prior_experiences(skip: int = Query(0, ge=0, le=2000),
     prior_experiences = [
       i.get_fields(reformat_datetime=True) for i in prior_experiences
     ]
-    count = 10000
+    count = count_documents(PriorExperience.collection,
+                            LIST_TOTAL_COUNT_CACHE_TTL)
     response = {"records": prior_experiences, "total_count": count}
     return {
         "success": True,
@@ -125,9 +125,10 @@ def get_learners(skip: int = Query(0, ge=0, le=2000),
       collection_manager = collection_manager.filter("is_archived", "==",
                                                      fetch_archive)
 
-    learners = collection_sorting(collection_manager=collection_manager,
-                                  sort_by=sort_by, sort_order=sort_order,
-                                  skip=skip, limit=limit)
+    # the response is a plain list without a next page token
+    learners, _ = collection_sorting(collection_manager=collection_manager,
+                                     sort_by=sort_by, sort_order=sort_order,
+                                     skip=skip, limit=limit)
 
     learners = [i.get_fields(reformat_datetime=True) for i in learners]
 
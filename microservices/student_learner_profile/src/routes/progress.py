@@ -14,6 +14,7 @@ from common.utils.logging_handler import Logger
 from common.utils.errors import ResourceNotFoundException
 from common.utils.collection_references import collection_references
 from common.utils.parent_child_nodes_handler import ParentChildNodesHandler
+from common.utils.tree_snapshot_handler import TreeSnapshotHandler
 from common.utils.http_exceptions import (
   InternalServerError,
   ResourceNotFound
@@ -75,8 +76,11 @@ def get_learner_progress(learner_id: str, node_id: str,
     # Variable to identify if recent child nodes are to be added in response
     # and if child nodes are to be sorted based on recent activity
     # Currently, added only when node_type == curriculum_pathways
+    loader = None
+    if node_type == "curriculum_pathways":
+      loader = TreeSnapshotHandler.get_loader("curriculum_pathways", node_id)
     root_node = ParentChildNodesHandler.load_hierarchy_progress(
-        root_node, node_type, learner_profile)
+        root_node, node_type, learner_profile, loader=loader)
     return {
       "success": True,
       "message": f"Successfully fetched the {node_type} progress for the"
@@ -1,10 +1,13 @@
 """ Learner Association Group endpoints """
 import traceback
 from fastapi import APIRouter, Query
+from starlette.background import BackgroundTasks
 from typing import Optional
 from traceback import print_exc
 from common.models import AssociationGroup, User, CurriculumPathway
+from common.utils.learner_memberships import LearnerMembershipHandler
 from common.utils.logging_handler import Logger
+from common.utils.pagination import fetch_page, count_documents
 from common.utils.errors import (ResourceNotFoundException, ValidationError,
                                  ConflictError)
 from common.utils.http_exceptions import (Conflict, InternalServerError,
@@ -21,7 +24,7 @@ from schemas.learner_association_group_schema import (
   AddInstructorToLearnerAssociationGroupResponseModel,
   RemoveInstructorFromLearnerAssociationGroup,
   RemoveInstructorFromLearnerAssociationGroupResponseModel,
-  GetAllLearnerForCoachORInstructor)
+  GetAllLearnerForCoachORInstructor, RebuildLearnerMembershipsResponseModel)
 from schemas.error_schema import (NotFoundErrorResponseModel,
                                 ConflictResponseModel)
 from services.association_group_handler import (load_learner_group_field_data,
@@ -43,13 +46,16 @@ router = APIRouter(
 def get_learner_association_groups(
                           skip: int = Query(0, ge=0, le=2000),
                           limit: int = Query(10, ge=1, le=100),
-                          fetch_tree: Optional[bool] = False):
+                          fetch_tree: Optional[bool] = False,
+                          page_token: Optional[str] = None):
   """The get association groups endpoint will return an array of learner
   association groups from firestore
 
   ### Args:
       skip (int): Number of objects to be skipped
       limit (int): Size of group array to be returned
+      page_token (str): next_page_token of the previous page, used
+                        instead of skip
       fetch_tree (bool): To fetch the entire object
                         instead of the UUID of the object
 
@@ -65,11 +71,10 @@ def get_learner_association_groups(
     collection_manager = collection_manager.filter("association_type", "==",
                                                    "learner")
 
-    learner_groups= collection_manager.fetch()
-    for idx, _ in enumerate(learner_groups):
-      count = idx + 1
+    count = count_documents(collection_manager)
 
-    groups = collection_manager.order("-created_time").offset(skip).fetch(limit)
+    groups, next_page_token = fetch_page(
+      collection_manager, limit, "-created_time", page_token, skip)
 
     if fetch_tree:
       association_groups = []
@@ -81,7 +86,8 @@ def get_learner_association_groups(
       association_groups = [i.get_fields(reformat_datetime=True) for i \
                           in groups]
 
-    response = {"records": association_groups, "total_count": count}
+    response = {"records": association_groups, "total_count": count,
+                "next_page_token": next_page_token}
 
     return {
         "success": True,
@@ -94,6 +100,32 @@ def get_learner_association_groups(
     raise InternalServerError(str(e)) from e
 
 
+@router.post("/learner-associations/rebuild-memberships",
+             response_model=RebuildLearnerMembershipsResponseModel,
+             name="Index the learners of the learner association groups")
+def rebuild_learner_memberships(background_tasks: BackgroundTasks):
+  """Recomputes the learner association group of every learner from the
+  users of the learner association groups, used to index the learners added
+  before the memberships existed. The memberships are written in the
+  background
+
+  ### Raises:
+      Exception: 500 Internal Server Error if something went wrong
+
+  ### Returns:
+      RebuildLearnerMembershipsResponseModel: Success message
+  """
+  try:
+    background_tasks.add_task(LearnerMembershipHandler.rebuild)
+    return {
+        "success": True,
+        "message": "Started indexing the learners of the learner "\
+          "association groups"
+    }
+  except Exception as e:
+    raise InternalServerError(str(e)) from e
+
+
 @router.get(
     "/learner-association/{uuid}",
     response_model=GetLearnerAssociationGroupResponseModel,
@@ -310,6 +342,8 @@ def delete_learner_association_group(uuid: str):
 
     if is_learner_association_group(group_fields):
       AssociationGroup.collection.delete(association_group.key)
+      LearnerMembershipHandler.delete_memberships(
+        uuid, [user["user"] for user in group_fields.get("users") or []])
 
     else:
       raise ValidationError(f"AssociationGroup for given uuid: {uuid} "
@@ -364,49 +398,25 @@ def add_user_to_learner_association_group(uuid: str,
       raise ValidationError(f"AssociationGroup for given uuid: {uuid} "
                             "is not learner type")
 
-    if not isinstance(group_fields.get("users"), list):
-      group_fields["users"] = []
-
-    learner_association_groups = AssociationGroup.collection.filter(
-        "association_type", "==", "learner").fetch()
-
-    learner_association_groups = [i.get_fields(reformat_datetime=True) for i \
-                          in learner_association_groups]
-
-    for input_user in input_users_dict.get("users"):
-
-      # Checking wheather given user is of type learner or not
-      learner = User.find_by_user_id(input_user)
-
-      learner_fields = learner.get_fields(reformat_datetime=True)
-      if learner_fields["user_type"] != "learner":
+    user_ids = list(dict.fromkeys(input_users_dict.get("users")))
+    # Checking wheather given users are of type learner or not
+    learners, missing_user_ids = User.find_by_user_ids(user_ids)
+    if missing_user_ids:
+      raise ResourceNotFoundException(
+        f"User with user_id {missing_user_ids[0]} not found")
+    for learner in learners:
+      if learner.user_type != "learner":
         raise ValidationError(
-          f"User for given user_id {input_user} is not of learner type")
+          f"User for given user_id {learner.user_id} is not of learner type")
 
-      # TODO: A user can be part of only
-      # one learner association group at a time
-      if any(input_user == user_dict.get("user","")
-             for learner_association_group in learner_association_groups
-             for user_dict in learner_association_group["users"]):
-        raise ValidationError("A user can be part of only one learner "\
-          "association group at a time")
+    # FIXME: To add validation wheather that user belongs
+    # to leaner user-group or not
 
-      # FIXME: To add validation wheather that user belongs
-      # to leaner user-group or not
-
-      # Only insert the User if its not exist in the learner association group
-      if not any(
-          users["user"] == input_user for users in group_fields["users"]):
-        group_fields["users"].append({
-            "user": input_user,
-            "status": input_users_dict.get("status")
-        })
-
-    for key, value in group_fields.items():
-      setattr(existing_association_group, key, value)
-
-    # Update the data once all the incoming users validate
-    existing_association_group.update()
+    # A user can be part of only one learner association group at a time,
+    # which is checked on the learner memberships when they are added
+    LearnerMembershipHandler.add_learners(
+      existing_association_group, user_ids, input_users_dict.get("status"))
+    existing_association_group = AssociationGroup.find_by_uuid(uuid)
     group_fields = existing_association_group.get_fields(reformat_datetime=True)
 
     return {
@@ -471,21 +481,14 @@ def remove_user_from_learner_association_group(uuid: str,
         user_exists = True
         break
 
-    if user_exists:
-      # The filter returns an iterator containing all the users
-      group_fields["users"][:] = filter(
-          lambda x: x["user"] != input_users_dict["user"],
-          group_fields.get("users"))
-    else:
+    if not user_exists:
       input_user_id = input_users_dict["user"]
       raise ValidationError(f"The given user_id {input_user_id} does not " + \
               f"exist in the Learner Association Group for given uuid {uuid}")
 
-    for key, value in group_fields.items():
-      setattr(existing_association_group, key, value)
-
-    # Update the data once all the incoming users validate
-    existing_association_group.update()
+    LearnerMembershipHandler.remove_learners(existing_association_group,
+                                             [input_users_dict["user"]])
+    existing_association_group = AssociationGroup.find_by_uuid(uuid)
     group_fields = existing_association_group.get_fields(reformat_datetime=True)
 
     return {
@@ -849,8 +852,12 @@ def add_instructors(uuid: str,
                             f"doesn't belong to the program {program_id} "\
                               "tagged to the learner association group")
 
-    users = [i for i in data["instructors"] if User.find_by_user_id(
-      i).user_type != "instructor"]
+    instructors, missing_user_ids = User.find_by_user_ids(
+      data["instructors"])
+    if missing_user_ids:
+      raise ResourceNotFoundException(
+        f"Users with user_ids {missing_user_ids} not found")
+    users = [i.user_id for i in instructors if i.user_type != "instructor"]
 
     # validating User Type as instructor
     if len(users) > 0:
@@ -1047,8 +1054,11 @@ def get_all_the_learners_of_instructor(
     )
 
     if fetch_tree:
-      user_list = [User.find_by_user_id(user_id).get_fields(
-        reformat_datetime=True) for user_id in user_list]
+      users, missing_user_ids = User.find_by_user_ids(user_list)
+      if missing_user_ids:
+        raise ResourceNotFoundException(
+          f"Users with user_ids {missing_user_ids} not found")
+      user_list = [user.get_fields(reformat_datetime=True) for user in users]
 
     return {
       "success": True,
@@ -1109,8 +1119,11 @@ def get_all_the_learners_of_coach(
     )
 
     if fetch_tree:
-      user_list = [User.find_by_user_id(user_id).get_fields(
-        reformat_datetime=True) for user_id in user_list]
+      users, missing_user_ids = User.find_by_user_ids(user_list)
+      if missing_user_ids:
+        raise ResourceNotFoundException(
+          f"Users with user_ids {missing_user_ids} not found")
+      user_list = [user.get_fields(reformat_datetime=True) for user in users]
 
     return {
       "success": True,
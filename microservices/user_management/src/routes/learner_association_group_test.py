@@ -22,6 +22,7 @@ from common.models import AssociationGroup, User, UserGroup, CurriculumPathway
 from common.testing.firestore_emulator import (firestore_emulator,
                                                clean_firestore)
 from common.utils.http_exceptions import add_exception_handlers
+from common.utils.learner_memberships import LearnerMembershipHandler
 
 app = FastAPI()
 add_exception_handlers(app)
@@ -730,6 +731,33 @@ def test_remove_user_from_learner_association_group(clean_firestore):
   assert post_resp.status_code == 200, "Status 200"
   assert len(post_resp_json.get("data").get("users")) == 1
   assert add_users["users"][0] != post_resp_json["data"]["users"][0]["user"]
+  assert LearnerMembershipHandler.get_association_group_ids(
+    add_users["users"]) == {add_users["users"][1]: uuid}
+
+
+def test_add_user_of_another_learner_association_group(clean_firestore):
+  uuids = []
+  for name in ["first group", "second group"]:
+    post_resp = client_with_emulator.post(
+      api_url, json={**BASIC_ASSOCIATION_GROUP_EXAMPLE, "name": name})
+    uuids.append(post_resp.json()["data"]["uuid"])
+
+  user_ids = create_user_and_group("learner group", "learner")
+  post_resp = client_with_emulator.post(
+    api_url + f"/{uuids[0]}/users/add",
+    json={"users": user_ids[:1], "status": "active"})
+  assert post_resp.status_code == 200, "Status 200"
+  assert LearnerMembershipHandler.get_association_group_ids(user_ids) == {
+    user_ids[0]: uuids[0]}
+
+  # none of the users is added when one belongs to another group
+  post_resp = client_with_emulator.post(
+    api_url + f"/{uuids[1]}/users/add",
+    json={"users": user_ids, "status": "active"})
+  assert post_resp.status_code == 422, "Status 422"
+  assert post_resp.json()["message"] == "A user can be part of only one "\
+    "learner association group at a time"
+  assert AssociationGroup.find_by_uuid(uuids[1]).users == []
 
 
 def test_add_coach_to_learner_association_group(clean_firestore):
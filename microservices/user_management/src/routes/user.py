@@ -7,9 +7,11 @@ from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 from typing_extensions import Literal
 from fastapi import APIRouter, UploadFile, File, Request, Query
+from starlette.background import BackgroundTasks
 from common.models import User, Staff, UserGroup
 from common.utils.logging_handler import Logger
-from common.utils.sorting_logic import collection_sorting
+from common.utils.pagination import (fetch_page, get_order_by,
+                                     count_documents)
 from common.utils.errors import ConflictError, ResourceNotFoundException, \
   ValidationError
 from common.utils.http_exceptions import (Conflict, InternalServerError,
@@ -24,7 +26,7 @@ from schemas.user_schema import (
   AllUserResponseModel, BasicUserModel, GetUserResponseModel, UserModel,
   PostUserResponseModel, UpdateUserModel, UpdateUserResponseModel, DeleteUser,
   UserSearchResponseModel, BulkImportUserResponseModel, UpdateStatusModel,
-  GetApplicationsOfUser)
+  GetApplicationsOfUser, BackfillSearchTokensResponseModel)
 from schemas.staff_schema import UpdateStaffModel
 from schemas.error_schema import NotFoundErrorResponseModel
 from services.json_import import json_import, add_user_to_db
@@ -32,6 +34,7 @@ from services.collection_handler import CollectionHandler
 from services.learner import (delete_learner, delete_learner_profile,
                               update_learner)
 from services.staff import update_staff
+from services.user_search import backfill_search_tokens, search_users
 from services.agent import delete_agent, get_agent, update_agent
 from services.association_group_handler import (update_refs_for_user_by_type)
 from config import ERROR_RESPONSES
@@ -80,41 +83,60 @@ def search_user_by_email(email: str):
 @router.get("/user/search", response_model=UserSearchResponseModel)
 def search_user(search_query: str,
                 skip: int = Query(0, ge=0, le=2000),
-                limit: int = Query(10, ge=1, le=100)):
-  """Filter users based on the user email, first name and last name
+                limit: int = Query(10, ge=1, le=100),
+                page_token: Optional[str] = None):
+  """Filter users based on the user email, first name and last name. A user
+  matches when the search query is the start of a word or of the whole
+  email, full name or last name, ignoring the case and the punctuation
 
   ### Args:
       search_query(str): key to search against email, first name and last name
       skip (int): Number of objects to be skipped
       limit (int): Size of group array to be returned
+      page_token (str): next_page_token of the previous page, used
+      instead of skip
 
   ### Returns:
       UserSearchResponseModel: List of user objects
   """
   try:
-    filtered_user_list = []
-    users = User.collection.order("-created_time").filter(
-      "is_deleted", "==", False).fetch()
-    fetch_length = skip + limit
-    for user in users:
-      user_dict = user.get_fields(reformat_datetime=True)
+    users, next_page_token = search_users(search_query, limit, page_token,
+                                          skip)
+    result = [user.get_fields(reformat_datetime=True) for user in users]
+    return {
+      "success": True,
+      "message": "Successfully fetched the users",
+      "data": result,
+      "next_page_token": next_page_token
+    }
+  except ValidationError as e:
+    Logger.error(e)
+    Logger.error(traceback.print_exc())
+    raise BadRequest(str(e)) from e
+  except Exception as e:
+    Logger.error(e)
+    Logger.error(traceback.print_exc())
+    raise InternalServerError(str(e)) from e
 
-      if search_query.lower() in user_dict["email"].lower():
-        filtered_user_list.append(user_dict)
 
-      elif search_query.lower() in user_dict["first_name"].lower():
-        filtered_user_list.append(user_dict)
+@router.post("/users/backfill-search-tokens",
+             response_model=BackfillSearchTokensResponseModel)
+def backfill_user_search_tokens(background_tasks: BackgroundTasks):
+  """Stores the search tokens of the users created before they existed, so
+  that they are returned by the search users endpoint. The users are
+  updated in the background
 
-      elif search_query.lower() in user_dict["last_name"].lower():
-        filtered_user_list.append(user_dict)
+  ### Raises:
+      Exception: 500 Internal Server Error if something went wrong
 
-      if len(filtered_user_list) == fetch_length:
-        break
-    result = filtered_user_list[skip:fetch_length]
+  ### Returns:
+      BackfillSearchTokensResponseModel: Success message
+  """
+  try:
+    background_tasks.add_task(backfill_search_tokens)
     return {
       "success": True,
-      "message": "Successfully fetched the users",
-      "data": result
+      "message": "Started storing the search tokens of the users"
     }
   except Exception as e:
     Logger.error(e)
@@ -132,7 +154,8 @@ def get_users(user_type: Optional[str] = None,
               sort_by: Optional[Literal["first_name", "last_name",
               "email", "created_time"]] = "created_time",
               sort_order: Optional[Literal["ascending", "descending"]] =
-              "descending"):
+              "descending",
+              page_token: Optional[str] = None):
   """The get users endpoint will return an array users from
   firestore
 
@@ -146,6 +169,8 @@ def get_users(user_type: Optional[str] = None,
       user_type (str): Type of the user example: faculty or learner etc.
       sort_by (str): sorting field name
       sort_order (str): ascending / descending
+      page_token (str): next_page_token of the previous page, used
+      instead of skip
 
   ### Raises:
       Exception: 500 Internal Server Error if something went wrong
@@ -165,14 +190,11 @@ def get_users(user_type: Optional[str] = None,
     if status is not None:
       collection_manager = collection_manager.filter("status", "==", status)
 
-    total_users = collection_manager.fetch()
-    count = 0
-    for idx, i in enumerate(total_users):
-      count = idx + 1
+    count = count_documents(collection_manager)
 
-    users = collection_sorting(collection_manager=collection_manager,
-                               sort_by=sort_by, sort_order=sort_order,
-                               skip=skip, limit=limit)
+    users, next_page_token = fetch_page(
+      collection_manager, limit, get_order_by(sort_by, sort_order),
+      page_token, skip)
     if fetch_tree:
       users = [
         CollectionHandler.loads_field_data_from_collection(
@@ -181,7 +203,8 @@ def get_users(user_type: Optional[str] = None,
     else:
       users = [i.get_fields(reformat_datetime=True) for i in users]
 
-    response = {"records": users, "total_count": count}
+    response = {"records": users, "total_count": count,
+                "next_page_token": next_page_token}
 
     return {
         "success": True,
@@ -10,6 +10,7 @@ from common.utils.errors import (ResourceNotFoundException, ValidationError,
 from common.utils.http_exceptions import (Conflict, InternalServerError,
                                           BadRequest, ResourceNotFound)
 from common.utils.sorting_logic import collection_sorting
+from common.utils.pagination import count_documents
 from schemas.user_group_schema import (
     AddUserToUserGroupResponseModel, AllUserGroupResponseModel,
     GetUserGroupResponseModel, PostUserGroupModel, PostUserGroupResponseModel,
@@ -67,13 +68,16 @@ def get_user_groups(skip: int = Query(0, ge=0, le=2000),
                     sort_by: Optional[Literal["name", "created_time"]] =
                     "created_time",
                     sort_order: Optional[Literal["ascending", "descending"]] =
-                    "descending"):
+                    "descending",
+                    page_token: Optional[str] = None):
   """The get user groups endpoint will return an array of user groups from
   firestore
 
   ### Args:
       skip (int): Number of objects to be skipped
       limit (int): Size of user-group array to be returned
+      page_token (str): next_page_token of the previous page, used
+                        instead of skip
       sort_by (str): Data Model Fields name
       sort_order (str): ascending/descending
       fetch_tree (bool): To fetch the entire object
@@ -91,14 +95,11 @@ def get_user_groups(skip: int = Query(0, ge=0, le=2000),
       collection_manager = collection_manager.filter("is_immutable", "==",
                                                      is_immutable)
 
-    total_user_groups= collection_manager.fetch()
-    count = 0
-    for idx, _ in enumerate(total_user_groups):
-      count = idx + 1
+    count = count_documents(collection_manager)
 
-    groups = collection_sorting(collection_manager=collection_manager,
-                                sort_by=sort_by, sort_order=sort_order,
-                                skip=skip, limit=limit)
+    groups, next_page_token = collection_sorting(
+        collection_manager=collection_manager, sort_by=sort_by,
+        sort_order=sort_order, skip=skip, limit=limit, page_token=page_token)
 
     if fetch_tree:
       groups = [
@@ -108,7 +109,8 @@ def get_user_groups(skip: int = Query(0, ge=0, le=2000),
     else:
       groups = [i.get_fields(reformat_datetime=True) for i in groups]
 
-    response = {"records": groups, "total_count": count}
+    response = {"records": groups, "total_count": count,
+                "next_page_token": next_page_token}
 
     return {
         "success": True,
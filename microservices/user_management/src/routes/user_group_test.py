@@ -111,6 +111,32 @@ def test_sort_user_groups(clean_firestore):
   assert group.uuid in retrieved_ids, "expected data not retrieved"
 
 
+def test_user_groups_pagination(clean_firestore):
+  group_ids = []
+  for name in ["group a", "group b", "group c"]:
+    group = UserGroup.from_dict({**BASIC_GROUP_MODEL_EXAMPLE, "name": name})
+    group.uuid = ""
+    group.save()
+    group.uuid = group.id
+    group.update()
+    group_ids.append(group.uuid)
+
+  params = {"limit": 2, "sort_by": "name", "sort_order": "ascending"}
+
+  url = f"{api_url}s"
+  resp = client_with_emulator.get(url, params=params)
+  json_response = resp.json()
+  assert resp.status_code == 200, "Status should be 200"
+  assert [i["uuid"] for i in json_response["data"]["records"]] == \
+    group_ids[:2]
+  resp = client_with_emulator.get(url, params={
+    **params, "page_token": json_response["data"]["next_page_token"]})
+  json_response = resp.json()
+  assert [i["uuid"] for i in json_response["data"]["records"]] == \
+    group_ids[2:]
+  assert json_response["data"]["next_page_token"] is None
+
+
 def test_sort_user_groups_negative(clean_firestore):
   params = {"skip": 0, "limit": "30", "sort_by": "name",
             "sort_order": "desc"}
@@ -9,6 +9,7 @@ from copy import deepcopy
 from unittest import mock
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
+from fireo.database import db
 
 with mock.patch(
   "google.cloud.secretmanager.SecretManagerServiceClient",
@@ -885,6 +886,54 @@ def test_search_users(clean_firestore):
   for i in json_response.get("data"):
     assert i["first_name"] == filter_key, "Filtered output is wrong"
 
+  # the users are matched on the start of a word of the email or the names
+  for search_query in ["STEVE J", "jobs", "steve.jobs@ex"]:
+    resp = client_with_emulator.get(url, params={"search_query": search_query})
+    assert [i["user_id"] for i in resp.json()["data"]] == [user.user_id]
+  resp = client_with_emulator.get(url, params={"search_query": "teve"})
+  assert resp.json()["data"] == []
+
+
+def test_search_users_pagination(clean_firestore):
+  user_ids = []
+  for _ in range(3):
+    user = User.from_dict({**BASIC_USER_MODEL_EXAMPLE, "user_type_ref": ""})
+    user.user_id = ""
+    user.save()
+    user.user_id = user.id
+    user.update()
+    user_ids.append(user.user_id)
+
+  url = f"{api_url}/search"
+  resp = client_with_emulator.get(
+    url, params={"search_query": "steve", "limit": 2})
+  json_response = resp.json()
+  assert len(json_response["data"]) == 2
+  resp = client_with_emulator.get(
+    url, params={"search_query": "steve", "limit": 2,
+                 "page_token": json_response["next_page_token"]})
+  assert len(resp.json()["data"]) == 1
+  assert resp.json()["next_page_token"] is None
+
+
+def test_backfill_user_search_tokens(clean_firestore):
+  user = User.from_dict({**BASIC_USER_MODEL_EXAMPLE, "user_type_ref": ""})
+  user.user_id = ""
+  user.save()
+  user.user_id = user.id
+  user.update()
+  # users created before the tokens existed are not found
+  db.conn.document(user.key).update({"search_tokens": None})
+
+  url = f"{api_url}/search"
+  resp = client_with_emulator.get(url, params={"search_query": "steve"})
+  assert resp.json()["data"] == []
+
+  resp = client_with_emulator.post(f"{API_URL}/users/backfill-search-tokens")
+  assert resp.status_code == 200, "Status should be 200"
+  resp = client_with_emulator.get(url, params={"search_query": "steve"})
+  assert [i["user_id"] for i in resp.json()["data"]] == [user.user_id]
+
 
 def test_search_users_negative(clean_firestore):
   user_dict = {**BASIC_USER_MODEL_EXAMPLE, "user_type_ref": ""}
@@ -144,9 +144,18 @@ class DeleteLearnerAssociationGroup(BaseModel):
         }
     }
 
+
+class RebuildLearnerMembershipsResponseModel(BaseModel):
+  """Rebuild Learner Memberships Pydantic Model"""
+  success: Optional[bool] = True
+  message: Optional[str] = "Started indexing the learners of the learner "\
+    "association groups"
+
+
 class TotalCountResponseModel(BaseModel):
   records: Optional[List[FullLearnerAssociationGroupModel]]
   total_count: int
+  next_page_token: Optional[str] = None
 
 class AllAssociationGroupResponseModel(BaseModel):
   """Association Group Response Pydantic Model"""
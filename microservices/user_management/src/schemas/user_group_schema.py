@@ -182,6 +182,7 @@ class DeleteUserGroup(BaseModel):
 class TotalCountResponseModel(BaseModel):
   records: Optional[List[FullUserGroupDataModel]]
   total_count: int
+  next_page_token: Optional[str] = None
 
 class AllUserGroupResponseModel(BaseModel):
   """UserGroup Response Pydantic Model"""
@@ -73,6 +73,7 @@ class UserSearchResponseModel(BaseModel):
   success: bool = True
   message: str = "Successfully fetched the users"
   data: List[FullUserDataModel]
+  next_page_token: Optional[str] = None
 
   class Config():
     orm_mode = True
@@ -85,6 +86,12 @@ class UserSearchResponseModel(BaseModel):
     }
 
 
+class BackfillSearchTokensResponseModel(BaseModel):
+  """Backfill Search Tokens Response Pydantic Model"""
+  success: bool = True
+  message: str = "Started storing the search tokens of the users"
+
+
 class UpdateUserModel(BaseModel):
   """Update User Pydantic Request Model"""
   first_name: Optional[str] = None
@@ -203,6 +210,7 @@ class DeleteUser(BaseModel):
 class TotalCountResponseModel(BaseModel):
   records: Optional[List[FullUserDataModel]]
   total_count: int
+  next_page_token: Optional[str] = None
 
 class AllUserResponseModel(BaseModel):
   """User Response Pydantic Model"""
@@ -1,6 +1,7 @@
 """Functions to fetch data from association groups"""
 from services.collection_handler import CollectionHandler
 from common.models import AssociationGroup
+from common.utils.learner_memberships import LearnerMembershipHandler
 from concurrent.futures import ThreadPoolExecutor
 # pylint:disable=line-too-long
 
@@ -264,6 +265,9 @@ def remove_user_from_association_group(user_uuid, user_type, user_status):
         association_group_doc.associations["coaches"] = user_list
 
       association_group_doc.update()
+      if user_type == "learner":
+        LearnerMembershipHandler.delete_memberships(
+            association_group_doc.uuid, [user_uuid])
 
   except Exception as e:
     print(e)
@@ -0,0 +1,54 @@
+"""Functions to search the users by their prefix tokens"""
+import fireo
+from common.config import FIRESTORE_BATCH_WRITE_LIMIT
+from common.models import User
+from common.utils.logging_handler import Logger
+from common.utils.pagination import fetch_page, get_order_by
+from common.utils.search_tokens import get_search_token
+
+
+def search_users(search_query, limit, page_token=None, skip=0):
+  """Returns the users whose email, full name or last name has a word or a
+  start matching the search query, newest first
+  Args:
+    search_query: str - text typed in the search box
+    limit: int - number of users to return
+    page_token: str - next_page_token of the previous page, used instead of
+      skip
+    skip: int - number of users to skip
+  Returns:
+    tuple - list of User objects and the token of the next page
+  """
+  search_token = get_search_token(search_query)
+  if search_token is None:
+    return [], None
+  query = User.collection.filter("is_deleted", "==", False).filter(
+      "search_tokens", "array_contains", search_token)
+  return fetch_page(query, limit, get_order_by("created_time", "descending"),
+                    page_token, skip)
+
+
+def backfill_search_tokens():
+  """Stores the search tokens of the users whose tokens are missing or out
+  of date, e.g. the users created before the tokens existed
+  Returns:
+    int - number of users updated
+  """
+  updated_count = 0
+  batch = fireo.batch()
+  batch_size = 0
+  for user in User.collection.fetch():
+    if user.search_tokens == user.get_search_tokens():
+      continue
+    # the modification time is kept as the user itself did not change
+    user.update(input_datetime=user.last_modified_time, batch=batch)
+    batch_size += 1
+    updated_count += 1
+    if batch_size == FIRESTORE_BATCH_WRITE_LIMIT:
+      batch.commit()
+      batch = fireo.batch()
+      batch_size = 0
+  if batch_size:
+    batch.commit()
+  Logger.info(f"Backfilled the search tokens of {updated_count} users")
+  return updated_count